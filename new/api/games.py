@@ -9,11 +9,11 @@ WOPR API - games CRUD endpoints.
 
 from wopr import logging as woprlogging
 from app import globals as woprvar
+from app import db_pool
 
 import logging
 from typing import Optional, List
 from datetime import datetime
-from contextlib import contextmanager
 
 from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel, Field
@@ -24,19 +24,6 @@ logger = woprlogging.setup_logging(woprvar.APP_NAME)
 
 router = APIRouter()
 
-# Database connection - adjust to match your actual connection string
-DATABASE_URL = woprvar.DATABASE_URL  # Assumes you have this in globals
-
-
-@contextmanager
-def get_db():
-    """Database connection context manager"""
-    conn = psycopg.connect(DATABASE_URL, row_factory=dict_row)
-    try:
-        yield conn
-    finally:
-        conn.close()
-
 
 class GameCreate(BaseModel):
     """Model for creating a game"""
@@ -96,10 +83,10 @@ async def list_games(
     """
     logger.debug(f"Listing games: limit={limit}, offset={offset}, locale={locale}")
     
-    with get_db() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
+    async with db_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
             if locale:
-                cur.execute(
+                await cur.execute(
                     """
                     SELECT * FROM games
                     WHERE locale = %s
@@ -109,7 +96,7 @@ async def list_games(
                     (locale, limit, offset)
                 )
             else:
-                cur.execute(
+                await cur.execute(
                     """
                     SELECT * FROM games
                     ORDER BY created_at DESC
@@ -118,7 +105,7 @@ async def list_games(
                     (limit, offset)
                 )
             
-            games = cur.fetchall()
+            games = await cur.fetchall()
             return games
 
 
@@ -132,13 +119,13 @@ async def get_game(game_id: int):
     """
     logger.debug(f"Getting game {game_id}")
     
-    with get_db() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
-            cur.execute(
+    async with db_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
                 "SELECT * FROM games WHERE id = %s",
                 (game_id,)
             )
-            game = cur.fetchone()
+            game = await cur.fetchone()
             
             if not game:
                 raise HTTPException(
@@ -161,9 +148,9 @@ async def create_game(game: GameCreate):
     
     now = datetime.utcnow()
     
-    with get_db() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
-            cur.execute(
+    async with db_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
                 """
                 INSERT INTO games (
                     document_id, uid, name, description,
@@ -187,8 +174,8 @@ async def create_game(game: GameCreate):
                     now
                 )
             )
-            conn.commit()
-            new_game = cur.fetchone()
+            await conn.commit()
+            new_game = await cur.fetchone()
             
             logger.info(f"Created game {new_game['id']}: {new_game['name']}")
             return new_game
@@ -227,8 +214,8 @@ async def update_game(game_id: int, game: GameUpdate):
     values.extend([now, now])
     values.append(game_id)
     
-    with get_db() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
+    async with db_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
             query = f"""
                 UPDATE games
                 SET {', '.join(update_fields)}
@@ -236,9 +223,9 @@ async def update_game(game_id: int, game: GameUpdate):
                 RETURNING *
             """
             
-            cur.execute(query, values)
-            conn.commit()
-            updated_game = cur.fetchone()
+            await cur.execute(query, values)
+            await conn.commit()
+            updated_game = await cur.fetchone()
             
             if not updated_game:
                 raise HTTPException(
@@ -260,14 +247,14 @@ async def delete_game(game_id: int):
     """
     logger.info(f"Deleting game {game_id}")
     
-    with get_db() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
-            cur.execute(
+    async with db_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
                 "DELETE FROM games WHERE id = %s RETURNING id",
                 (game_id,)
             )
-            conn.commit()
-            deleted = cur.fetchone()
+            await conn.commit()
+            deleted = await cur.fetchone()
             
             if not deleted:
                 raise HTTPException(
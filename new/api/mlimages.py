@@ -9,11 +9,11 @@ WOPR API - ml_image_metadatas CRUD endpoints.
 
 from wopr import logging as woprlogging
 from app import globals as woprvar
+from app import db_pool
 
 import logging
 from typing import Optional, List
 from datetime import datetime
-from contextlib import contextmanager
 
 from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel, Field
@@ -24,20 +24,6 @@ logger = woprlogging.setup_logging(woprvar.APP_NAME)
 
 router = APIRouter()
 
-DATABASE_URL = woprvar.DATABASE_URL
-
-
-@contextmanager
-def get_db():
-    """Database connection context manager"""
-    logger.debug("Opening database connection")
-    conn = psycopg.connect(DATABASE_URL, row_factory=dict_row)
-    try:
-        yield conn
-    finally:
-        conn.close()
-        logger.debug("Closed database connection")
-
 
 class MLImageCreate(BaseModel):
     """Model for creating ML image metadata"""
@@ -104,8 +90,8 @@ async def list_mlimages(
     """
     logger.debug(f"Listing ML images: limit={limit}, offset={offset}, locale={locale}, game_id={game_id}, piece_id={piece_id}")
     
-    with get_db() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
+    async with db_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
             if game_id and piece_id:
                 # Filter by both game and piece
                 query = """
@@ -123,7 +109,7 @@ async def list_mlimages(
                 query += " ORDER BY m.created_at DESC LIMIT %s OFFSET %s"
                 params.extend([limit, offset])
                 
-                cur.execute(query, params)
+                await cur.execute(query, params)
             elif game_id:
                 # Filter by game only
                 query = """
@@ -140,7 +126,7 @@ async def list_mlimages(
                 query += " ORDER BY m.created_at DESC LIMIT %s OFFSET %s"
                 params.extend([limit, offset])
                 
-                cur.execute(query, params)
+                await cur.execute(query, params)
             elif piece_id:
                 # Filter by piece only
                 query = """
@@ -157,9 +143,9 @@ async def list_mlimages(
                 query += " ORDER BY m.created_at DESC LIMIT %s OFFSET %s"
                 params.extend([limit, offset])
                 
-                cur.execute(query, params)
+                await cur.execute(query, params)
             elif locale:
-                cur.execute(
+                await cur.execute(
                     """
                     SELECT * FROM ml_image_metadatas
                     WHERE locale = %s
@@ -169,7 +155,7 @@ async def list_mlimages(
                     (locale, limit, offset)
                 )
             else:
-                cur.execute(
+                await cur.execute(
                     """
                     SELECT * FROM ml_image_metadatas
                     ORDER BY created_at DESC
@@ -178,7 +164,7 @@ async def list_mlimages(
                     (limit, offset)
                 )
             
-            images = cur.fetchall()
+            images = await cur.fetchall()
             logger.debug(f"Fetched {len(images)} ML images from DB")
             return images
 
@@ -193,13 +179,13 @@ async def get_mlimage(mlimage_id: int):
     """
     logger.debug(f"Getting ML image {mlimage_id}")
     
-    with get_db() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
-            cur.execute(
+    async with db_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
                 "SELECT * FROM ml_image_metadatas WHERE id = %s",
                 (mlimage_id,)
             )
-            image = cur.fetchone()
+            image = await cur.fetchone()
             if not image:
                 logger.debug(f"ML image {mlimage_id} not found in DB")
                 raise HTTPException(
@@ -224,9 +210,9 @@ async def create_mlimage(image: MLImageCreate):
     
     now = datetime.utcnow()
     
-    with get_db() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
-            cur.execute(
+    async with db_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
                 """
                 INSERT INTO ml_image_metadatas (
                     document_id, filename, uid,
@@ -252,8 +238,8 @@ async def create_mlimage(image: MLImageCreate):
                     now
                 )
             )
-            conn.commit()
-            new_image = cur.fetchone()
+            await conn.commit()
+            new_image = await cur.fetchone()
             logger.debug(f"Inserted ML image row: {new_image}")
             logger.info(f"Created ML image metadata {new_image['id']}: {new_image['filename']}")
             return new_image
@@ -290,8 +276,8 @@ async def update_mlimage(mlimage_id: int, image: MLImageUpdate):
     values.extend([now, now])
     values.append(mlimage_id)
     logger.debug(f"Update fields: {update_fields} | values (pre-query): {values}")
-    with get_db() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
+    async with db_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
             query = f"""
                 UPDATE ml_image_metadatas
                 SET {', '.join(update_fields)}
@@ -299,9 +285,9 @@ async def update_mlimage(mlimage_id: int, image: MLImageUpdate):
                 RETURNING *
             """
             logger.debug(f"Executing update query: {query}")
-            cur.execute(query, values)
-            conn.commit()
-            updated_image = cur.fetchone()
+            await cur.execute(query, values)
+            await conn.commit()
+            updated_image = await cur.fetchone()
             
             if not updated_image:
                 raise HTTPException(
@@ -323,14 +309,14 @@ async def delete_mlimage(mlimage_id: int):
     """
     logger.info(f"Deleting ML image metadata {mlimage_id}")
     
-    with get_db() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
-            cur.execute(
+    async with db_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
                 "DELETE FROM ml_image_metadatas WHERE id = %s RETURNING id",
                 (mlimage_id,)
             )
-            conn.commit()
-            deleted = cur.fetchone()
+            await conn.commit()
+            deleted = await cur.fetchone()
             logger.debug(f"Delete result for ML image {mlimage_id}: {deleted}")
             if not deleted:
                 logger.debug(f"ML image {mlimage_id} not found when attempting delete")
@@ -353,11 +339,11 @@ async def link_mlimage_to_game(mlimage_id: int, game_id: int):
     """
     logger.info(f"Linking ML image {mlimage_id} to game {game_id}")
     
-    with get_db() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
+    async with db_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
             # Verify ML image exists
-            cur.execute("SELECT id FROM ml_image_metadatas WHERE id = %s", (mlimage_id,))
-            if not cur.fetchone():
+            await cur.execute("SELECT id FROM ml_image_metadatas WHERE id = %s", (mlimage_id,))
+            if not await cur.fetchone():
                 logger.debug(f"ML image {mlimage_id} not found when linking to game {game_id}")
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -365,8 +351,8 @@ async def link_mlimage_to_game(mlimage_id: int, game_id: int):
                 )
 
             # Verify game exists
-            cur.execute("SELECT id FROM games WHERE id = %s", (game_id,))
-            if not cur.fetchone():
+            await cur.execute("SELECT id FROM games WHERE id = %s", (game_id,))
+            if not await cur.fetchone():
                 logger.debug(f"Game {game_id} not found when linking ML image {mlimage_id}")
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -375,14 +361,14 @@ async def link_mlimage_to_game(mlimage_id: int, game_id: int):
 
             # Create link
             try:
-                cur.execute(
+                await cur.execute(
                     """
                     INSERT INTO ml_image_metadatas_game_lnk (ml_image_metadata_id, game_id)
                     VALUES (%s, %s)
                     """,
                     (mlimage_id, game_id)
                 )
-                conn.commit()
+                await conn.commit()
                 logger.debug(f"Inserted ml_image_metadatas_game_lnk row for mlimage={mlimage_id}, game={game_id}")
                 logger.info(f"Linked ML image {mlimage_id} to game {game_id}")
                 return {"mlimage_id": mlimage_id, "game_id": game_id, "status": "linked"}
@@ -405,9 +391,9 @@ async def unlink_mlimage_from_game(mlimage_id: int, game_id: int):
     """
     logger.info(f"Unlinking ML image {mlimage_id} from game {game_id}")
     
-    with get_db() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
-            cur.execute(
+    async with db_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
                 """
                 DELETE FROM ml_image_metadatas_game_lnk
                 WHERE ml_image_metadata_id = %s AND game_id = %s
@@ -415,8 +401,8 @@ async def unlink_mlimage_from_game(mlimage_id: int, game_id: int):
                 """,
                 (mlimage_id, game_id)
             )
-            conn.commit()
-            deleted = cur.fetchone()
+            await conn.commit()
+            deleted = await cur.fetchone()
 
             logger.debug(f"Delete link result for mlimage={mlimage_id}, game={game_id}: {deleted}")
             if not deleted:
@@ -440,11 +426,11 @@ async def link_mlimage_to_piece(mlimage_id: int, piece_id: int):
     """
     logger.info(f"Linking ML image {mlimage_id} to piece {piece_id}")
     
-    with get_db() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
+    async with db_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
             # Verify ML image exists
-            cur.execute("SELECT id FROM ml_image_metadatas WHERE id = %s", (mlimage_id,))
-            if not cur.fetchone():
+            await cur.execute("SELECT id FROM ml_image_metadatas WHERE id = %s", (mlimage_id,))
+            if not await cur.fetchone():
                 logger.debug(f"ML image {mlimage_id} not found when linking to piece {piece_id}")
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -452,8 +438,8 @@ async def link_mlimage_to_piece(mlimage_id: int, piece_id: int):
                 )
 
             # Verify piece exists
-            cur.execute("SELECT id FROM pieces WHERE id = %s", (piece_id,))
-            if not cur.fetchone():
+            await cur.execute("SELECT id FROM pieces WHERE id = %s", (piece_id,))
+            if not await cur.fetchone():
                 logger.debug(f"Piece {piece_id} not found when linking ML image {mlimage_id}")
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -462,14 +448,14 @@ async def link_mlimage_to_piece(mlimage_id: int, piece_id: int):
 
             # Create link
             try:
-                cur.execute(
+                await cur.execute(
                     """
                     INSERT INTO ml_image_metadatas_piece_lnk (ml_image_metadata_id, piece_id)
                     VALUES (%s, %s)
                     """,
                     (mlimage_id, piece_id)
                 )
-                conn.commit()
+                await conn.commit()
                 logger.debug(f"Inserted ml_image_metadatas_piece_lnk row for mlimage={mlimage_id}, piece={piece_id}")
                 logger.info(f"Linked ML image {mlimage_id} to piece {piece_id}")
                 return {"mlimage_id": mlimage_id, "piece_id": piece_id, "status": "linked"}
@@ -492,9 +478,9 @@ async def unlink_mlimage_from_piece(mlimage_id: int, piece_id: int):
     """
     logger.info(f"Unlinking ML image {mlimage_id} from piece {piece_id}")
     
-    with get_db() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
-            cur.execute(
+    async with db_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
                 """
                 DELETE FROM ml_image_metadatas_piece_lnk
                 WHERE ml_image_metadata_id = %s AND piece_id = %s
@@ -502,8 +488,8 @@ async def unlink_mlimage_from_piece(mlimage_id: int, piece_id: int):
                 """,
                 (mlimage_id, piece_id)
             )
-            conn.commit()
-            deleted = cur.fetchone()
+            await conn.commit()
+            deleted = await cur.fetchone()
             logger.debug(f"Delete link result for mlimage={mlimage_id}, piece={piece_id}: {deleted}")
             if not deleted:
                 logger.debug(f"Link between ML image {mlimage_id} and piece {piece_id} not found when unlinking")
@@ -9,11 +9,11 @@ WOPR API - pieces CRUD endpoints.
 
 from wopr import logging as woprlogging
 from app import globals as woprvar
+from app import db_pool
 
 import logging
 from typing import Optional, List
 from datetime import datetime
-from contextlib import contextmanager
 
 from fastapi import APIRouter, HTTPException, status
 from pydantic import BaseModel, Field
@@ -24,20 +24,6 @@ logger = woprlogging.setup_logging(woprvar.APP_NAME)
 
 router = APIRouter()
 
-DATABASE_URL = woprvar.DATABASE_URL
-
-
-@contextmanager
-def get_db():
-    """Database connection context manager"""
-    logger.debug("Opening database connection")
-    conn = psycopg.connect(DATABASE_URL, row_factory=dict_row)
-    try:
-        yield conn
-    finally:
-        conn.close()
-        logger.debug("Closed database connection")
-
 
 class PieceCreate(BaseModel):
     """Model for creating a piece"""
@@ -93,8 +79,8 @@ async def list_pieces(
     """
     logger.debug(f"Listing pieces: limit={limit}, offset={offset}, locale={locale}, game_id={game_id}")
     
-    with get_db() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
+    async with db_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
             if game_id:
                 # Filter by game via junction table
                 query = """
@@ -111,9 +97,9 @@ async def list_pieces(
                 query += " ORDER BY p.created_at DESC LIMIT %s OFFSET %s"
                 params.extend([limit, offset])
                 
-                cur.execute(query, params)
+                await cur.execute(query, params)
             elif locale:
-                cur.execute(
+                await cur.execute(
                     """
                     SELECT * FROM pieces
                     WHERE locale = %s
@@ -123,7 +109,7 @@ async def list_pieces(
                     (locale, limit, offset)
                 )
             else:
-                cur.execute(
+                await cur.execute(
                     """
                     SELECT * FROM pieces
                     ORDER BY created_at DESC
@@ -132,7 +118,7 @@ async def list_pieces(
                     (limit, offset)
                 )
             
-            pieces = cur.fetchall()
+            pieces = await cur.fetchall()
             logger.debug(f"Fetched {len(pieces)} pieces from DB")
             return pieces
 
@@ -147,13 +133,13 @@ async def get_piece(piece_id: int):
     """
     logger.debug(f"Getting piece {piece_id}")
     
-    with get_db() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
-            cur.execute(
+    async with db_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
                 "SELECT * FROM pieces WHERE id = %s",
                 (piece_id,)
             )
-            piece = cur.fetchone()
+            piece = await cur.fetchone()
             if not piece:
                 logger.debug(f"Piece {piece_id} not found in DB")
                 raise HTTPException(
@@ -178,9 +164,9 @@ async def create_piece(piece: PieceCreate):
     
     now = datetime.utcnow()
     
-    with get_db() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
-            cur.execute(
+    async with db_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
                 """
                 INSERT INTO pieces (
                     document_id, name, uid, description, locale,
@@ -201,8 +187,8 @@ async def create_piece(piece: PieceCreate):
                     now
                 )
             )
-            conn.commit()
-            new_piece = cur.fetchone()
+            await conn.commit()
+            new_piece = await cur.fetchone()
             logger.debug(f"Inserted piece row: {new_piece}")
             logger.info(f"Created piece {new_piece['id']}: {new_piece['name']}")
             return new_piece
@@ -239,8 +225,8 @@ async def update_piece(piece_id: int, piece: PieceUpdate):
     values.extend([now, now])
     values.append(piece_id)
     logger.debug(f"Update fields: {update_fields} | values (pre-query): {values}")
-    with get_db() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
+    async with db_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
             query = f"""
                 UPDATE pieces
                 SET {', '.join(update_fields)}
@@ -248,9 +234,9 @@ async def update_piece(piece_id: int, piece: PieceUpdate):
                 RETURNING *
             """
             logger.debug(f"Executing update query: {query}")
-            cur.execute(query, values)
-            conn.commit()
-            updated_piece = cur.fetchone()
+            await cur.execute(query, values)
+            await conn.commit()
+            updated_piece = await cur.fetchone()
             
             if not updated_piece:
                 raise HTTPException(
@@ -272,14 +258,14 @@ async def delete_piece(piece_id: int):
     """
     logger.info(f"Deleting piece {piece_id}")
     
-    with get_db() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
-            cur.execute(
+    async with db_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
                 "DELETE FROM pieces WHERE id = %s RETURNING id",
                 (piece_id,)
             )
-            conn.commit()
-            deleted = cur.fetchone()
+            await conn.commit()
+            deleted = await cur.fetchone()
             logger.debug(f"Delete result for piece {piece_id}: {deleted}")
             if not deleted:
                 logger.debug(f"Piece {piece_id} not found when attempting delete")
@@ -302,11 +288,11 @@ async def link_piece_to_game(piece_id: int, game_id: int):
     """
     logger.info(f"Linking piece {piece_id} to game {game_id}")
     
-    with get_db() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
+    async with db_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
             # Verify piece exists
-            cur.execute("SELECT id FROM pieces WHERE id = %s", (piece_id,))
-            if not cur.fetchone():
+            await cur.execute("SELECT id FROM pieces WHERE id = %s", (piece_id,))
+            if not await cur.fetchone():
                 logger.debug(f"Piece {piece_id} not found when linking to game {game_id}")
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -314,8 +300,8 @@ async def link_piece_to_game(piece_id: int, game_id: int):
                 )
 
             # Verify game exists
-            cur.execute("SELECT id FROM games WHERE id = %s", (game_id,))
-            if not cur.fetchone():
+            await cur.execute("SELECT id FROM games WHERE id = %s", (game_id,))
+            if not await cur.fetchone():
                 logger.debug(f"Game {game_id} not found when linking piece {piece_id}")
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
@@ -324,14 +310,14 @@ async def link_piece_to_game(piece_id: int, game_id: int):
 
             # Create link (assuming pieces_game_lnk has piece_id, game_id columns)
             try:
-                cur.execute(
+                await cur.execute(
                     """
                     INSERT INTO pieces_game_lnk (piece_id, game_id)
                     VALUES (%s, %s)
                     """,
                     (piece_id, game_id)
                 )
-                conn.commit()
+                await conn.commit()
                 logger.debug(f"Inserted pieces_game_lnk row for piece={piece_id}, game={game_id}")
                 logger.info(f"Linked piece {piece_id} to game {game_id}")
                 return {"piece_id": piece_id, "game_id": game_id, "status": "linked"}
@@ -354,9 +340,9 @@ async def unlink_piece_from_game(piece_id: int, game_id: int):
     """
     logger.info(f"Unlinking piece {piece_id} from game {game_id}")
     
-    with get_db() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
-            cur.execute(
+    async with db_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
                 """
                 DELETE FROM pieces_game_lnk
                 WHERE piece_id = %s AND game_id = %s
@@ -364,8 +350,8 @@ async def unlink_piece_from_game(piece_id: int, game_id: int):
                 """,
                 (piece_id, game_id)
             )
-            conn.commit()
-            deleted = cur.fetchone()
+            await conn.commit()
+            deleted = await cur.fetchone()
             logger.debug(f"Delete link result for piece={piece_id}, game={game_id}: {deleted}")
             if not deleted:
                 logger.debug(f"Link between piece {piece_id} and game {game_id} not found when unlinking")
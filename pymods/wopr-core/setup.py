@@ -25,6 +25,12 @@ setup(
         "requests>=2.31.0",
         "pyyaml>=6.0",
     ],
+    extras_require={
+        "images": ["Pillow>=10.0"],
+    },
+    entry_points={
+        "console_scripts": ["wopr-derivatives=wopr.storage:main"],
+    },
     python_requires=">=3.11",
     classifiers=[
         "Development Status :: 3 - Alpha",
@@ -12,9 +12,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import os
 import pytest
 from unittest.mock import Mock, patch
-from wopr.storage import imagefilename, StorageError
+from wopr.storage import (
+    imagefilename,
+    derivativefilename,
+    find_derivative,
+    make_derivatives,
+    backfill_derivatives,
+    list_game_images,
+    StorageError,
+)
+
+SIZES = {'preview': (400, 400), 'thumb': (100, 100)}
 
 
 def test_imagefilename_basic():
@@ -86,3 +97,85 @@ def test_imagefilename_invalid_sequence_type():
     """Test that non-integer sequence raises TypeError"""
     with pytest.raises(TypeError, match="sequence must be an integer"):
         imagefilename('test123', 'capture', sequence="not_an_int")
+
+
+def _jpeg(path, size=(1600, 1200)):
+    Image = pytest.importorskip('PIL.Image')
+    Image.new('RGB', size, (200, 40, 40)).save(path, 'JPEG')
+    return str(path)
+
+
+def test_derivativefilename():
+    """Test derivative names follow the -thumb template convention"""
+    assert derivativefilename('/x/ml/1-2-abc.jpg') == '/x/ml/1-2-abc-thumb.jpg'
+    assert derivativefilename('/x/ml/1-2-abc.png', 'preview') == '/x/ml/1-2-abc-preview.jpg'
+    with pytest.raises(ValueError, match="Invalid derivative"):
+        derivativefilename('/x/ml/1-2-abc.jpg', 'huge')
+
+
+def test_make_derivatives(tmp_path):
+    """Test thumbnail and preview are written within their bounding boxes"""
+    from PIL import Image
+    original = _jpeg(tmp_path / 'capture.jpg')
+    
+    paths = make_derivatives(original, SIZES)
+    
+    with Image.open(paths['preview']) as preview:
+        assert preview.size == (400, 300)
+    with Image.open(paths['thumb']) as thumb:
+        assert thumb.size == (100, 75)
+    assert find_derivative(original, 'thumb') == paths['thumb']
+
+
+def test_find_derivative_stale(tmp_path):
+    """Test a derivative older than its original is not returned"""
+    original = _jpeg(tmp_path / 'capture.jpg')
+    paths = make_derivatives(original, SIZES)
+    os.utime(paths['thumb'], (0, 0))
+    
+    assert find_derivative(original, 'thumb') is None
+    assert find_derivative(str(tmp_path / 'missing.jpg'), 'thumb') is None
+
+
+def test_backfill_derivatives(tmp_path):
+    """Test backfill makes missing derivatives once and skips them after"""
+    (tmp_path / 'incoming').mkdir()
+    (tmp_path / 'archive' / 'old').mkdir(parents=True)
+    _jpeg(tmp_path / 'incoming' / 'a.jpg')
+    _jpeg(tmp_path / 'archive' / 'old' / 'b.jpg')
+    (tmp_path / 'incoming' / 'broken.jpg').write_bytes(b'not a jpeg')
+    roots = [str(tmp_path / 'incoming'), str(tmp_path / 'archive')]
+    
+    first = backfill_derivatives(roots, workers=2, sizes=SIZES, extensions=['jpg'])
+    second = backfill_derivatives(roots, workers=2, sizes=SIZES, extensions=['jpg'])
+    
+    assert first == {'images': 3, 'made': 2, 'up_to_date': 0, 'failed': 1}
+    assert second == {'images': 3, 'made': 0, 'up_to_date': 2, 'failed': 1}
+    assert os.path.exists(tmp_path / 'archive' / 'old' / 'b-thumb.jpg')
+
+
+def test_backfill_derivatives_counts_decode_errors(tmp_path):
+    """Test a non-OSError from Pillow (a decompression bomb) fails one image, not the run"""
+    Image = pytest.importorskip('PIL.Image')
+    _jpeg(tmp_path / 'a.jpg')
+    _jpeg(tmp_path / 'z.jpg', size=(4000, 3000))
+    
+    with patch.object(Image, 'MAX_IMAGE_PIXELS', 1_000_000):
+        summary = backfill_derivatives([str(tmp_path)], workers=2, sizes=SIZES, extensions=['jpg'])
+    
+    assert summary == {'images': 2, 'made': 1, 'up_to_date': 0, 'failed': 1}
+    with pytest.raises(StorageError, match="z.jpg"):
+        with patch.object(Image, 'MAX_IMAGE_PIXELS', 1_000_000):
+            make_derivatives(str(tmp_path / 'z.jpg'), SIZES, overwrite=True)
+
+
+def test_list_game_images_skips_derivatives(tmp_path):
+    """Test thumbnails and previews next to captures aren't listed as game images"""
+    game_dir = tmp_path / 'games' / 'g1'
+    game_dir.mkdir(parents=True)
+    original = _jpeg(game_dir / '20260101-120000-capture.jpg')
+    make_derivatives(original, SIZES)
+    
+    with patch('wopr.storage.get_game_directory', return_value=game_dir), \
+         patch('wopr.storage.get_list', return_value=['jpg']):
+        assert list_game_images('g1') == [game_dir / '20260101-120000-capture.jpg']
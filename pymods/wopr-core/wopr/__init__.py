@@ -33,6 +33,12 @@ from wopr.storage import (
     ensure_path,
     get_game_directory,
     list_game_images,
+    derivativefilename,
+    find_derivative,
+    derivative_or_original,
+    make_derivatives,
+    backfill_derivatives,
+    DerivativePool,
     StorageError
 )
 from wopr.logging import setup_logging, get_logger
@@ -57,6 +63,12 @@ __all__ = [
     'ensure_path',
     'get_game_directory',
     'list_game_images',
+    'derivativefilename',
+    'find_derivative',
+    'derivative_or_original',
+    'make_derivatives',
+    'backfill_derivatives',
+    'DerivativePool',
     'StorageError',
     # Logging
     'setup_logging',
@@ -12,13 +12,27 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import argparse
+import logging
 import os
+import tempfile
 
 from wopr.config import get_str, get_list, get_bool
 
+logger = logging.getLogger(__name__)
+
+# Derivative kinds, largest first; files are {stem}-{kind}.jpg beside the original
+DERIVATIVES = ("preview", "thumb")
+DERIVATIVE_SIZE_KEYS = {
+    "preview": ('storage.preview_size', [1600, 1600]),
+    "thumb": ('storage.thumbnail_size', [480, 480]),
+}
+DERIVATIVE_QUALITY = 85
+
 
 class StorageError(Exception):
     """Raised when storage operations fail"""
@@ -200,7 +214,7 @@ def list_game_images(game_id: str, extension: Optional[str] = None) -> list:
         extension: Filter by extension (default: all allowed extensions)
     
     Returns:
-        List of Path objects, sorted chronologically
+        List of Path objects, sorted chronologically (derivatives excluded)
     """
     game_dir = get_game_directory(game_id)
     
@@ -215,7 +229,289 @@ def list_game_images(game_id: str, extension: Optional[str] = None) -> list:
     
     images = []
     for ext in extensions:
-        images.extend(game_dir.glob(f"*.{ext}"))
+        # Thumbnails/previews written next to captures aren't game images
+        images.extend(p for p in game_dir.glob(f"*.{ext}") if not is_derivative(p))
     
     # Sort by name (includes timestamp)
     return sorted(images)
+
+
+def derivativefilename(image_path: str, kind: str = "thumb") -> str:
+    """
+    Path of a derivative of an image.
+    
+    Follows the thumbnail templates ({...}-thumb.jpg): the original's stem
+    plus -{kind}, always JPEG, in the same directory.
+    
+    Args:
+        image_path: Path to the full-size image
+        kind: 'thumb' or 'preview'
+    
+    Returns:
+        Full path to the derivative file
+    
+    Examples:
+        >>> derivativefilename("/remote/wopr/ml/incoming/12-3-abc.jpg")
+        '/remote/wopr/ml/incoming/12-3-abc-thumb.jpg'
+    """
+    if kind not in DERIVATIVES:
+        raise ValueError(f"Invalid derivative '{kind}'. Must be one of: {list(DERIVATIVES)}")
+    p = Path(image_path)
+    return str(p.with_name(f"{p.stem}-{kind}.jpg"))
+
+
+def is_derivative(image_path: str) -> bool:
+    """True for a file named like a derivative ({stem}-thumb.jpg etc.)"""
+    stem = Path(image_path).stem
+    return any(stem.endswith(f"-{kind}") for kind in DERIVATIVES)
+
+
+def derivative_sizes() -> Dict[str, Tuple[int, int]]:
+    """
+    Bounding box for each derivative kind, from storage.*_size config.
+    
+    Returns:
+        Dict mapping kind to (width, height)
+    """
+    sizes = {}
+    for kind, (key, default) in DERIVATIVE_SIZE_KEYS.items():
+        width, height = get_list(key, default)
+        sizes[kind] = (int(width), int(height))
+    return sizes
+
+
+def find_derivative(image_path: str, kind: str = "thumb") -> Optional[str]:
+    """
+    Look up an existing derivative.
+    
+    Args:
+        image_path: Path to the full-size image
+        kind: 'thumb' or 'preview'
+    
+    Returns:
+        Path to the derivative, or None if missing or older than the image
+    """
+    derivative = derivativefilename(image_path, kind)
+    try:
+        if os.stat(derivative).st_mtime >= os.stat(image_path).st_mtime:
+            return derivative
+    except FileNotFoundError:
+        pass
+    return None
+
+
+def derivative_or_original(image_path: str, kind: str = "thumb") -> str:
+    """
+    Path to serve for an image at a given size.
+    
+    Returns:
+        The derivative if it is up to date, otherwise the original
+    """
+    return find_derivative(image_path, kind) or str(image_path)
+
+
+def _save_atomic(image, path: str, quality: int) -> None:
+    """Save a PIL image as JPEG via a temp file and rename"""
+    directory = os.path.dirname(path) or "."
+    fd, tmp = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            image.save(f, "JPEG", quality=quality, optimize=True)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def make_derivatives(
+    image_path: str,
+    sizes: Optional[Dict[str, Tuple[int, int]]] = None,
+    quality: int = DERIVATIVE_QUALITY,
+    overwrite: bool = False,
+) -> Dict[str, str]:
+    """
+    Write the thumbnail and preview for an image.
+    
+    JPEGs are decoded in draft mode: libjpeg scales by 1/2, 1/4 or 1/8
+    while decoding, so a 12MP capture is decoded at roughly the preview's
+    size rather than in full.  Each smaller derivative is resized from
+    the one before it.
+    
+    Args:
+        image_path: Path to the full-size image
+        sizes: Kind -> (width, height) bounding box (default: derivative_sizes())
+        quality: JPEG quality for the derivatives
+        overwrite: Rewrite derivatives that are already up to date
+    
+    Returns:
+        Dict mapping kind to the derivative path
+    
+    Raises:
+        StorageError: If Pillow is missing or the image cannot be read or written
+    """
+    try:
+        from PIL import Image
+    except ImportError as e:
+        raise StorageError(f"Pillow is required for image derivatives (pip install wopr-core[images]): {e}")
+    
+    if sizes is None:
+        sizes = derivative_sizes()
+    kinds = [kind for kind in DERIVATIVES if kind in sizes]
+    paths = {kind: derivativefilename(image_path, kind) for kind in kinds}
+    todo = [kind for kind in kinds if overwrite or find_derivative(image_path, kind) is None]
+    if not todo:
+        return paths
+    
+    try:
+        with Image.open(image_path) as image:
+            # Scale the boxes to the image's aspect ratio first: draft() only
+            # reduces while both sides stay at or above the requested size
+            width, height = image.size
+            largest = max(min(sizes[kind][0] / width, sizes[kind][1] / height) for kind in todo)
+            image.draft("RGB", (max(1, int(width * largest)), max(1, int(height * largest))))
+            current = image.convert("RGB")
+        for kind in kinds:
+            current.thumbnail(sizes[kind], Image.Resampling.LANCZOS)
+            if kind in todo:
+                _save_atomic(current, paths[kind], quality)
+    except Exception as e:
+        # Not just OSError: Pillow raises DecompressionBombError, ValueError,
+        # SyntaxError etc. for images it can't decode
+        raise StorageError(f"Failed to make derivatives for {image_path}: {e}") from e
+    
+    return paths
+
+
+class DerivativePool:
+    """
+    Background worker pool for make_derivatives().
+    
+    Sizes are read from config once, when the pool is created, so
+    submitting stays cheap right after a capture.
+    """
+    
+    def __init__(
+        self,
+        workers: int = 2,
+        sizes: Optional[Dict[str, Tuple[int, int]]] = None,
+        quality: int = DERIVATIVE_QUALITY,
+    ):
+        self.sizes = sizes if sizes is not None else derivative_sizes()
+        self.quality = quality
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="wopr-derivatives")
+    
+    def _run(self, image_path: str, overwrite: bool) -> Dict[str, str]:
+        try:
+            return make_derivatives(image_path, self.sizes, self.quality, overwrite)
+        except StorageError as e:
+            logger.error(str(e))
+            raise
+    
+    def submit(self, image_path: str, overwrite: bool = False) -> Future:
+        """Queue derivatives for an image; the Future resolves to make_derivatives()' result"""
+        return self._executor.submit(self._run, str(image_path), overwrite)
+    
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+
+def iter_images(roots: Iterable[str], extensions: Optional[List[str]] = None) -> Iterator[str]:
+    """
+    Walk directories for original images (derivatives are skipped).
+    
+    Args:
+        roots: Directories to walk
+        extensions: Extensions to include (default: storage.image_extensions)
+    """
+    if extensions is None:
+        extensions = get_list('storage.image_extensions')
+    suffixes = {f".{ext.lower().lstrip('.')}" for ext in extensions}
+    for root in roots:
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            for name in sorted(filenames):
+                path = os.path.join(dirpath, name)
+                if name.startswith(".") or Path(name).suffix.lower() not in suffixes or is_derivative(path):
+                    continue
+                yield path
+
+
+def backfill_derivatives(
+    roots: Iterable[str],
+    workers: int = 4,
+    overwrite: bool = False,
+    dry_run: bool = False,
+    sizes: Optional[Dict[str, Tuple[int, int]]] = None,
+    extensions: Optional[List[str]] = None,
+) -> Dict[str, int]:
+    """
+    Make missing or stale derivatives for every image under roots.
+    
+    Returns:
+        Counts: images seen, made, up_to_date, failed
+    """
+    if sizes is None:
+        sizes = derivative_sizes()
+    summary = {"images": 0, "made": 0, "up_to_date": 0, "failed": 0}
+    pool = None if dry_run else DerivativePool(workers, sizes)
+    pending: List[Tuple[str, Future]] = []
+    
+    def collect(limit: int) -> None:
+        # Bound the in-flight futures so a huge tree isn't queued all at once
+        while len(pending) > limit:
+            path, future = pending.pop(0)
+            try:
+                future.result()
+                summary["made"] += 1
+            except StorageError:
+                summary["failed"] += 1
+    
+    try:
+        for path in iter_images(roots, extensions):
+            summary["images"] += 1
+            if not overwrite and all(find_derivative(path, kind) for kind in sizes):
+                summary["up_to_date"] += 1
+                continue
+            if dry_run:
+                summary["made"] += 1
+                continue
+            pending.append((path, pool.submit(path, overwrite)))
+            collect(workers * 4)
+        collect(0)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Backfill thumbnails and previews (wopr-derivatives).
+    
+    With no paths, walks storage.base_path's incoming and archive subdirs.
+    """
+    parser = argparse.ArgumentParser(prog="wopr-derivatives", description="Backfill image thumbnails and previews")
+    parser.add_argument("paths", nargs="*", help="Directories to walk (default: incoming and archive)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--overwrite", action="store_true", help="Rewrite derivatives that are up to date")
+    parser.add_argument("--dry-run", action="store_true", help="Only count what would be made")
+    args = parser.parse_args(argv)
+    
+    roots = args.paths
+    if not roots:
+        base_path = get_str('storage.base_path')
+        roots = [
+            str(Path(base_path) / get_str('storage.incoming_subdir')),
+            str(Path(base_path) / get_str('storage.archive_subdir')),
+        ]
+    summary = backfill_derivatives(roots, args.workers, args.overwrite, args.dry_run)
+    print(" ".join(f"{key}={value}" for key, value in summary.items()))
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -9,15 +9,17 @@ WOPR API - ML image metadata CRUD endpoints (Directus schema).
 
 from wopr import logging as woprlogging
 from app import globals as woprvar
+from app import db_pool
 
+import base64
+import json
 import logging
 import sys
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from datetime import datetime
-from contextlib import contextmanager
 from uuid import UUID, uuid4
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, status
 from pydantic import BaseModel, Field
 import psycopg
 from psycopg.rows import dict_row
@@ -27,18 +29,6 @@ logging.basicConfig(filename="/var/log/wopr-api.log", level="DEBUG")
 logging.getLogger().addHandler(logging.StreamHandler(sys.stdout))
 router = APIRouter()
 
-DATABASE_URL = woprvar.DATABASE_URL
-logger.debug(f"Using database URL: {DATABASE_URL}")
-
-@contextmanager
-def get_db():
-    """Database connection context manager"""
-    conn = psycopg.connect(DATABASE_URL, row_factory=dict_row)
-    try:
-        yield conn
-    finally:
-        conn.close()
-
 
 class MLImageCreate(BaseModel):
     """Model for creating ML image metadata"""
@@ -84,6 +74,50 @@ class MLImageResponse(BaseModel):
     date_updated: Optional[datetime]
 
 
+class MLImagePage(BaseModel):
+    """One keyset page of ML image metadata"""
+    items: List[MLImageResponse]
+    next_cursor: Optional[str] = None
+
+
+def _filters(game_id: Optional[int], piece_id: Optional[int], status: Optional[str]) -> Tuple[str, list]:
+    """WHERE clause and params for the listing filters"""
+    query = "SELECT * FROM ml_image_metadata WHERE 1=1"
+    params = []
+    
+    if game_id:
+        query += " AND game_uuid = %s"
+        params.append(game_id)
+    
+    if piece_id:
+        query += " AND piece_id = %s"
+        params.append(piece_id)
+    
+    if status:
+        query += " AND status = %s"
+        params.append(status)
+    
+    return query, params
+
+
+def _encode_cursor(row: dict) -> str:
+    """Opaque cursor for the (date_created, id) of the last row on a page"""
+    raw = json.dumps([row["date_created"].isoformat(), row["id"]]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        date_created, mlimage_id = json.loads(raw)
+        return datetime.fromisoformat(date_created), int(mlimage_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
 @router.get("", response_model=List[MLImageResponse])
 async def list_mlimages(
     limit: int = 100,
@@ -95,6 +129,9 @@ async def list_mlimages(
     """
     List all ML image metadata with optional pagination and filtering.
     
+    Deep offsets read and discard every earlier row; /page walks the
+    same listing with a cursor instead.
+    
     Args:
         limit: Maximum number of results (default 100)
         offset: Number of results to skip (default 0)
@@ -104,33 +141,67 @@ async def list_mlimages(
     """
     logger.debug(f"Listing ML images: limit={limit}, offset={offset}, game_id={game_id}, piece_id={piece_id}, status={status}")
     
-    with get_db() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
-            query = "SELECT * FROM ml_image_metadata WHERE 1=1"
-            params = []
-            
-            if game_id:
-                query += " AND game_uuid = %s"
-                params.append(game_id)
+    async with db_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            query, params = _filters(game_id, piece_id, status)
             
-            if piece_id:
-                query += " AND piece_id = %s"
-                params.append(piece_id)
-            
-            if status:
-                query += " AND status = %s"
-                params.append(status)
-            
-            query += " ORDER BY date_created DESC LIMIT %s OFFSET %s"
+            # id breaks date_created ties, so pages don't overlap or skip rows
+            query += " ORDER BY date_created DESC, id DESC LIMIT %s OFFSET %s"
             params.extend([limit, offset])
             
             logger.debug(f"Executing query: {query} with params: {params}")
-            cur.execute(query, params)
-            mlimages = cur.fetchall()
+            await cur.execute(query, params)
+            mlimages = await cur.fetchall()
             logger.debug(f"Found {len(mlimages)} ML images")
             return mlimages
 
 
+@router.get("/page", response_model=MLImagePage)
+async def list_mlimages_page(
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    game_id: Optional[int] = None,
+    piece_id: Optional[int] = None,
+    status: Optional[str] = None
+):
+    """
+    List ML image metadata newest first, a page at a time by cursor.
+    
+    Same order and filters as the offset listing, but each page starts
+    right after the previous one's last (date_created, id), so it costs
+    the same however deep it is (see migrations/001_ml_image_metadata_keyset.sql
+    for the indexes).  Pass next_cursor back as cursor; it is null on the
+    last page.
+    
+    Args:
+        limit: Maximum number of results (default 100, at most 1000)
+        cursor: next_cursor from the previous page; omit for the first page
+        game_id: Optional filter by game ID (direct FK to game_catalog)
+        piece_id: Optional filter by piece ID (direct FK to pieces)
+        status: Optional filter by status (draft|published)
+    """
+    logger.debug(f"Paging ML images: limit={limit}, cursor={cursor}, game_id={game_id}, piece_id={piece_id}, status={status}")
+    
+    query, params = _filters(game_id, piece_id, status)
+    if cursor:
+        query += " AND (date_created, id) < (%s, %s)"
+        params.extend(_decode_cursor(cursor))
+    
+    # One extra row says whether there is a next page
+    query += " ORDER BY date_created DESC, id DESC LIMIT %s"
+    params.append(limit + 1)
+    
+    async with db_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            logger.debug(f"Executing query: {query} with params: {params}")
+            await cur.execute(query, params)
+            mlimages = await cur.fetchall()
+    
+    next_cursor = _encode_cursor(mlimages[limit - 1]) if len(mlimages) > limit else None
+    logger.debug(f"Found {min(len(mlimages), limit)} ML images, more: {next_cursor is not None}")
+    return {"items": mlimages[:limit], "next_cursor": next_cursor}
+
+
 @router.get("/{mlimage_id}", response_model=MLImageResponse)
 async def get_mlimage(mlimage_id: int):
     """
@@ -141,13 +212,13 @@ async def get_mlimage(mlimage_id: int):
     """
     logger.debug(f"Getting ML image {mlimage_id}")
     
-    with get_db() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
-            cur.execute(
+    async with db_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
                 "SELECT * FROM ml_image_metadata WHERE id = %s",
                 (mlimage_id,)
             )
-            mlimage = cur.fetchone()
+            mlimage = await cur.fetchone()
             
             if not mlimage:
                 raise HTTPException(
@@ -172,12 +243,12 @@ async def create_mlimage(mlimage: MLImageCreate):
     mlimage_uuid = uuid4()
     now = datetime.utcnow()
     
-    with get_db() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
+    async with db_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
             # Verify game exists if provided
             if mlimage.game_uuid:
-                cur.execute("SELECT id FROM game_catalog WHERE id = %s", (mlimage.game_uuid,))
-                if not cur.fetchone():
+                await cur.execute("SELECT id FROM game_catalog WHERE id = %s", (mlimage.game_uuid,))
+                if not await cur.fetchone():
                     raise HTTPException(
                         status_code=status.HTTP_404_NOT_FOUND,
                         detail=f"Game with ID {mlimage.game_uuid} not found"
@@ -185,14 +256,14 @@ async def create_mlimage(mlimage: MLImageCreate):
             
             # Verify piece exists if provided
             if mlimage.piece_id:
-                cur.execute("SELECT id FROM pieces WHERE id = %s", (mlimage.piece_id,))
-                if not cur.fetchone():
+                await cur.execute("SELECT id FROM pieces WHERE id = %s", (mlimage.piece_id,))
+                if not await cur.fetchone():
                     raise HTTPException(
                         status_code=status.HTTP_404_NOT_FOUND,
                         detail=f"Piece with ID {mlimage.piece_id} not found"
                     )
             
-            cur.execute(
+            await cur.execute(
                 """
                 INSERT INTO ml_image_metadata (
                     uuid, filename, object_rotation, object_position,
@@ -216,8 +287,8 @@ async def create_mlimage(mlimage: MLImageCreate):
                     now
                 )
             )
-            conn.commit()
-            new_mlimage = cur.fetchone()
+            await conn.commit()
+            new_mlimage = await cur.fetchone()
             
             logger.info(f"Created ML image metadata {new_mlimage['id']}: {new_mlimage['filename']}")
             return new_mlimage
@@ -253,12 +324,12 @@ async def update_mlimage(mlimage_id: int, mlimage: MLImageUpdate):
     values.append(datetime.utcnow())
     values.append(mlimage_id)
     
-    with get_db() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
+    async with db_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
             # Verify game exists if updating game_uuid
             if mlimage.game_uuid:
-                cur.execute("SELECT id FROM game_catalog WHERE id = %s", (mlimage.game_uuid,))
-                if not cur.fetchone():
+                await cur.execute("SELECT id FROM game_catalog WHERE id = %s", (mlimage.game_uuid,))
+                if not await cur.fetchone():
                     raise HTTPException(
                         status_code=status.HTTP_404_NOT_FOUND,
                         detail=f"Game with ID {mlimage.game_uuid} not found"
@@ -266,8 +337,8 @@ async def update_mlimage(mlimage_id: int, mlimage: MLImageUpdate):
             
             # Verify piece exists if updating piece_id
             if mlimage.piece_id:
-                cur.execute("SELECT id FROM pieces WHERE id = %s", (mlimage.piece_id,))
-                if not cur.fetchone():
+                await cur.execute("SELECT id FROM pieces WHERE id = %s", (mlimage.piece_id,))
+                if not await cur.fetchone():
                     raise HTTPException(
                         status_code=status.HTTP_404_NOT_FOUND,
                         detail=f"Piece with ID {mlimage.piece_id} not found"
@@ -280,9 +351,9 @@ async def update_mlimage(mlimage_id: int, mlimage: MLImageUpdate):
                 RETURNING *
             """
             
-            cur.execute(query, values)
-            conn.commit()
-            updated_mlimage = cur.fetchone()
+            await cur.execute(query, values)
+            await conn.commit()
+            updated_mlimage = await cur.fetchone()
             
             if not updated_mlimage:
                 raise HTTPException(
@@ -304,14 +375,14 @@ async def delete_mlimage(mlimage_id: int):
     """
     logger.info(f"Deleting ML image metadata {mlimage_id}")
     
-    with get_db() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
-            cur.execute(
+    async with db_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
                 "DELETE FROM ml_image_metadata WHERE id = %s RETURNING id",
                 (mlimage_id,)
             )
-            conn.commit()
-            deleted = cur.fetchone()
+            await conn.commit()
+            deleted = await cur.fetchone()
             
             if not deleted:
                 raise HTTPException(
@@ -332,9 +403,9 @@ async def publish_mlimage(mlimage_id: int):
     """
     logger.info(f"Publishing ML image metadata {mlimage_id}")
     
-    with get_db() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
-            cur.execute(
+    async with db_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
                 """
                 UPDATE ml_image_metadata
                 SET status = 'published', date_updated = %s
@@ -343,8 +414,8 @@ async def publish_mlimage(mlimage_id: int):
                 """,
                 (datetime.utcnow(), mlimage_id)
             )
-            conn.commit()
-            updated_mlimage = cur.fetchone()
+            await conn.commit()
+            updated_mlimage = await cur.fetchone()
             
             if not updated_mlimage:
                 raise HTTPException(
@@ -366,9 +437,9 @@ async def unpublish_mlimage(mlimage_id: int):
     """
     logger.info(f"Unpublishing ML image metadata {mlimage_id}")
     
-    with get_db() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
-            cur.execute(
+    async with db_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
                 """
                 UPDATE ml_image_metadata
                 SET status = 'draft', date_updated = %s
@@ -377,8 +448,8 @@ async def unpublish_mlimage(mlimage_id: int):
                 """,
                 (datetime.utcnow(), mlimage_id)
             )
-            conn.commit()
-            updated_mlimage = cur.fetchone()
+            await conn.commit()
+            updated_mlimage = await cur.fetchone()
             
             if not updated_mlimage:
                 raise HTTPException(
@@ -9,12 +9,12 @@ WOPR API - pieces CRUD endpoints (Directus schema).
 
 from wopr import logging as woprlogging
 from app import globals as woprvar
+from app import db_pool
 
 import logging
 import sys
 from typing import Optional, List
 from datetime import datetime
-from contextlib import contextmanager
 from uuid import UUID, uuid4
 
 from fastapi import APIRouter, HTTPException, status
@@ -27,18 +27,6 @@ logging.basicConfig(filename="/var/log/wopr-api.log", level="DEBUG")
 logging.getLogger().addHandler(logging.StreamHandler(sys.stdout))
 router = APIRouter()
 
-DATABASE_URL = woprvar.DATABASE_URL
-logger.debug(f"Using DATABASE_URL: {DATABASE_URL}")
-
-@contextmanager
-def get_db():
-    """Database connection context manager"""
-    conn = psycopg.connect(DATABASE_URL, row_factory=dict_row)
-    try:
-        yield conn
-    finally:
-        conn.close()
-
 
 class PieceCreate(BaseModel):
     """Model for creating a piece"""
@@ -87,8 +75,8 @@ async def list_pieces(
     """
     logger.debug(f"Listing pieces: limit={limit}, offset={offset}, game_id={game_id}, status={status}")
     
-    with get_db() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
+    async with db_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
             query = "SELECT * FROM pieces WHERE 1=1"
             params = []
             
@@ -103,8 +91,8 @@ async def list_pieces(
             query += " ORDER BY date_created DESC LIMIT %s OFFSET %s"
             params.extend([limit, offset])
             
-            cur.execute(query, params)
-            pieces = cur.fetchall()
+            await cur.execute(query, params)
+            pieces = await cur.fetchall()
             return pieces
 
 
@@ -118,13 +106,13 @@ async def get_piece(piece_id: int):
     """
     logger.debug(f"Getting piece {piece_id}")
     
-    with get_db() as conn:
-        with conn.cursor(row_factory=dict_row) as cur:
-            cur.execute(
+    async with db_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(
                 "SELECT * FROM pieces WHERE id = %s",
                 (piece_id,)
             )
-            piece = cur.fetchone()
+            piece = await cur.fetchone()
             
             if not piece:
                 raise HTTPException(
@@ -10,7 +10,13 @@ WOPR API - cameras api.
 from wopr import config as woprconfig
 from wopr import storage as woprstorage
 from app import globals as woprvar
+from app import db_pool
+from app import status_db
+from app import status_prober
+from app import status_retention
+from app.webhook_token import require_webhook_token
 from datetime import datetime, timezone
+import asyncio
 import logging
 import os
 import asyncpg
@@ -20,10 +26,10 @@ import json
 import httpx
 
 import logging
-import sys
+from app.logging import configure_logging
 logger = logging.getLogger(woprvar.APP_NAME)
-logging.basicConfig(filename="/var/log/wopr-api.log", level="DEBUG")
-logging.getLogger().addHandler(logging.StreamHandler(sys.stdout))
+# Guarded: main.py mounts this router after configuring logging itself
+configure_logging("/var/log/wopr-api.log")
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
@@ -78,12 +84,9 @@ async def check_db_up() -> StatusCheck:
     start_time = datetime.now(timezone.utc)
     logger.debug("Checking database connectivity... starttime=%s", start_time)
     try:
-        db_uri = await get_db_uri()
-        logger.debug("Database URI obtained.")
-        # Connect and run simplest possible query
-        conn = await asyncpg.connect(db_uri)
-        logger.debug("Database connection established.")
-        try:
+        # Borrow a pooled connection and run the simplest possible query
+        async with (await status_db.get_pool()).acquire() as conn:
+            logger.debug("Database connection acquired from pool.")
             result = await conn.fetchval("SELECT 1")
             logger.debug("Database query executed, result=%s", result)
             if result == 1:
@@ -94,9 +97,6 @@ async def check_db_up() -> StatusCheck:
                     test_result="pass",
                     test_end_timestamp=datetime.now(timezone.utc),
                 )
-        finally:
-            await conn.close()
-            logger.debug("Database connection closed.")
             
     except Exception as e:
         logger.error("Database connectivity check failed: %s", str(e))
@@ -117,11 +117,8 @@ async def check_db_queriable() -> StatusCheck:
     start_time = datetime.now(timezone.utc)
     logger.debug("Checking database queriability... starttime=%s", start_time)
     try:
-        db_uri = await get_db_uri()
-        logger.debug("Database URI obtained.")
-        conn = await asyncpg.connect(db_uri)
-        logger.debug("Database connection established.")
-        try:
+        async with (await status_db.get_pool()).acquire() as conn:
+            logger.debug("Database connection acquired from pool.")
             # Query something we actually care about
             result = await conn.fetchval(
                 "SELECT COUNT(*) FROM settings"
@@ -135,9 +132,6 @@ async def check_db_queriable() -> StatusCheck:
                     test_result="pass",
                     test_end_timestamp=datetime.now(timezone.utc),
                 )
-        finally:
-            await conn.close()
-            logger.debug("Database connection closed.")
             
     except Exception as e:
         logger.error("Database queriability check failed: %s", str(e))
@@ -160,11 +154,8 @@ async def check_db_writable() -> StatusCheck:
     start_time = datetime.now(timezone.utc)
     logger.debug("Checking database writability... starttime=%s", start_time)
     try:
-        db_uri = await get_db_uri()
-        logger.debug("Database URI obtained.")
-        conn = await asyncpg.connect(db_uri)
-        logger.debug("Database connection established.")
-        try:
+        async with (await status_db.get_pool()).acquire() as conn:
+            logger.debug("Database connection acquired from pool.")
             # Write a test record
             test_time = datetime.now(timezone.utc)
             logger.debug("Inserting test record into status_checks table at %s", test_time)
@@ -186,9 +177,6 @@ async def check_db_writable() -> StatusCheck:
                 test_result="pass",
                 test_end_timestamp=datetime.now(timezone.utc),
             )
-        finally:
-            await conn.close()
-            logger.debug("Database connection closed.")
             
     except Exception as e:
         logger.error("Database writability check failed: %s", str(e))
@@ -200,17 +188,15 @@ async def check_db_writable() -> StatusCheck:
             error_message=str(e),
         )
 
-@router.get("/inittable")
+@router.get("/inittable", dependencies=[Depends(require_webhook_token)])
 async def init_status_checks_table() -> str:
     """
     Initialize the status_checks table in the database.
     
-    This should be run once during setup.
+    This should be run once during setup.  Runs DDL, so it needs
+    X-WOPR-Webhook-Token (see app/webhook_token.py).
     """
-    db_uri = await get_db_uri()
-    
-    conn = await asyncpg.connect(db_uri)
-    try:
+    async with (await status_db.get_pool()).acquire() as conn:
         await conn.execute(
             """
             CREATE TABLE IF NOT EXISTS status_checks (
@@ -227,9 +213,8 @@ async def init_status_checks_table() -> str:
             CREATE INDEX IF NOT EXISTS idx_status_checks_created_at ON status_checks(created_at DESC);
             """
         )
-        return "status_checks table initialized successfully."
-    finally:
-        await conn.close()
+        await conn.execute(status_retention.ROLLUP_DDL)
+    return "status_checks table initialized successfully."
 
 @router.get("/wopr-web-up")
 async def check_wopr_web_up() -> StatusCheck:
@@ -433,57 +418,148 @@ async def check_config_map_present() -> StatusCheck:
             error_message=str(e),
         )
 
-@router.get("/")
-@router.get("")
-async def get_system_status() -> SystemStatus:
+# (test_name, check) in SystemStatus field order
+SYSTEM_CHECKS = (
+    ("db_up", check_db_up),
+    ("db_queriable", check_db_queriable),
+    ("db_writable", check_db_writable),
+    ("wopr_web_up", check_wopr_web_up),
+    ("wopr_web_functional", check_wopr_web_functional),
+    ("wopr_api_up", check_wopr_api_up),
+    ("wopr_api_functional", check_wopr_api_functional),
+    ("wopr_cam_up", check_wopr_cam_up),
+    ("wopr_cam_functional", check_wopr_cam_functional),
+    ("wopr_config_map_present", check_config_map_present),
+)
+
+async def _run_check(test_name: str, check, timeout: float | None = None) -> StatusCheck:
     """
-    Get current status of all WOPR components.
-    
-    Returns aggregated health check results.
+    Run one check within its timeout; a timeout or an unexpected error is a
+    fail result rather than an exception, so one check can't sink the rest.
+    """
+    timeout = woprvar.STATUS_CHECK_TIMEOUT_SECONDS if timeout is None else timeout
+    start_time = datetime.now(timezone.utc)
+    try:
+        result = await asyncio.wait_for(check(), timeout)
+        if result is not None:
+            return result
+        error = "check returned no result"
+    except asyncio.TimeoutError:
+        error = f"timed out after {timeout}s"
+    except Exception as e:
+        error = str(e)
+    logger.error("%s check failed: %s", test_name, error)
+    return StatusCheck(
+        test_name=test_name,
+        test_start_timestamp=start_time,
+        test_result="fail",
+        test_end_timestamp=datetime.now(timezone.utc),
+        error_message=error,
+    )
+
+async def probe_system() -> tuple[SystemStatus, list[StatusCheck]]:
+    """
+    Run every check at once, each within its own timeout, so the slowest
+    check rather than the sum of them sets the time.  Returns the summary
+    and the individual results (app/status_prober.py keeps both).
     """
     before = datetime.now(timezone.utc)
     logger.debug("Gathering system status... starttime=%s", before)
-    # Run all checks (placeholder - you'll implement these)
-    db_up = await check_db_up()
-    logger.debug("Database up check result: %s", db_up)
-    db_queriable = await check_db_queriable()
-    logger.debug("Database queriable check result: %s", db_queriable)
-    db_writable = await check_db_writable()
-    logger.debug("Database writable check result: %s", db_writable)
-    
-    # TODO: Implement other checks
-    wopr_web_up = await check_wopr_web_up()
-    logger.debug("WOPR web up check result: %s", wopr_web_up)
-    wopr_web_functional = await check_wopr_web_functional()
-    logger.debug("WOPR web functional check result: %s", wopr_web_functional)
-    wopr_api_up = await check_wopr_api_up()
-    logger.debug("WOPR API up check result: %s", wopr_api_up)
-    wopr_api_functional = await check_wopr_api_functional()
-    logger.debug("WOPR API functional check result: %s", wopr_api_functional)
-    wopr_cam_up = await check_wopr_cam_up()
-    logger.debug("WOPR camera up check result: %s", wopr_cam_up)
-    wopr_cam_functional = await check_wopr_cam_functional()
-    logger.debug("WOPR camera functional check result: %s", wopr_cam_functional)
-    config_map_present = await check_config_map_present()
-    logger.debug("WOPR config map present check result: %s", config_map_present)
-    
+    results = await asyncio.gather(*(_run_check(name, check) for name, check in SYSTEM_CHECKS))
+    for result in results:
+        logger.debug("%s check result: %s", result.test_name, result)
     after = datetime.now(timezone.utc)
     logger.debug("System status gathered... endtime=%s", after)
-    
-    return SystemStatus(
+
+    passed = {result.test_name: result.test_result == "pass" for result in results}
+    summary = SystemStatus(
         timestamp_right_before_data_pull=before,
-        db_up=(db_up.test_result == "pass"),
-        db_queriable=(db_queriable.test_result == "pass"),
-        db_writable=(db_writable.test_result == "pass"),
-        wopr_web_up=(wopr_web_up.test_result == "pass"),
-        wopr_web_functional=(wopr_web_functional.test_result == "pass"),
-        wopr_api_up=(wopr_api_up.test_result == "pass"),
-        wopr_api_functional=(wopr_api_functional.test_result == "pass"),
-        wopr_cam_up=(wopr_cam_up.test_result == "pass"),
-        wopr_cam_functional=(wopr_cam_functional.test_result == "pass"),
-        wopr_config_map_present=(config_map_present.test_result == "pass"),
+        db_up=passed["db_up"],
+        db_queriable=passed["db_queriable"],
+        db_writable=passed["db_writable"],
+        wopr_web_up=passed["wopr_web_up"],
+        wopr_web_functional=passed["wopr_web_functional"],
+        wopr_api_up=passed["wopr_api_up"],
+        wopr_api_functional=passed["wopr_api_functional"],
+        wopr_cam_up=passed["wopr_cam_up"],
+        wopr_cam_functional=passed["wopr_cam_functional"],
+        wopr_config_map_present=passed["wopr_config_map_present"],
         timestamp_right_after_data_pull=after,
         diff_timestamp_ms=int((after - before).total_seconds() * 1000),
         # timestamp in seconds to a significand of 4 digits
         diff_timestamp_s=float(f"{(after - before).total_seconds():.4f}"),
         )
+    return summary, list(results)
+
+@router.get("/history")
+async def get_status_history(windows: str | None = None) -> dict:
+    """
+    Per-check success ratio and p50/p95/p99 latency over sliding windows,
+    from the background prober's ring buffers.
+
+    windows: comma-separated seconds (default status.history_windows_seconds)
+    """
+    try:
+        spans = [float(w) for w in windows.split(",") if w] if windows else woprvar.STATUS_HISTORY_WINDOWS_SECONDS
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="windows must be comma-separated seconds")
+    return {"prober": status_prober.status(), "checks": status_prober.history(spans)}
+
+@router.get("/rollup")
+async def get_status_rollup(test_name: str | None = None, hours: float = 24.0) -> list[dict]:
+    """
+    Per-minute pass/fail counts and durations from status_checks_minutely,
+    newest first, for the last `hours` (raw rows only go back
+    status.raw_retention_hours).
+    """
+    if not 0 < hours <= woprvar.STATUS_ROLLUP_RETENTION_DAYS * 24:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="hours out of range")
+    async with (await status_db.get_pool()).acquire() as conn:
+        rows = await conn.fetch(
+            """
+            SELECT minute, test_name, pass_count, fail_count, other_count, total_ms, max_ms
+            FROM status_checks_minutely
+            WHERE minute >= now() - make_interval(secs => $1) AND ($2::text IS NULL OR test_name = $2)
+            ORDER BY minute DESC, test_name
+            """,
+            hours * 3600,
+            test_name,
+        )
+    return [dict(row) for row in rows]
+
+@router.get("/db-pools")
+async def get_db_pools() -> dict:
+    """
+    Checkouts, timeouts and wait-time percentiles of the shared psycopg
+    pool (app/db_pool.py) and the status checks' asyncpg pool.
+    """
+    return {"database": db_pool.metrics(), "status": status_db.metrics()}
+
+@router.get("/maintenance")
+async def get_status_maintenance() -> dict:
+    """Retention task state and the last run's rollup/purge counts"""
+    return status_retention.status()
+
+@router.post("/maintenance", dependencies=[Depends(require_webhook_token)])
+async def run_status_maintenance() -> dict:
+    """Roll up and purge status_checks now (needs X-WOPR-Webhook-Token)"""
+    try:
+        return await status_retention.run_once()
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=f"Maintenance failed: {e}")
+
+@router.get("/")
+@router.get("")
+async def get_system_status(fresh: bool = False) -> SystemStatus:
+    """
+    Get current status of all WOPR components.
+    
+    Returns aggregated health check results: the background prober's latest
+    from memory, or a probe run now if it has none recent (or ?fresh=true);
+    concurrent requests share one probe.
+    """
+    if not fresh and status_prober.running():
+        summary = status_prober.latest(max_age=woprvar.STATUS_PROBE_INTERVAL_SECONDS * 3)
+        if summary is not None:
+            return summary
+    return await status_prober.probe_now(probe_system)
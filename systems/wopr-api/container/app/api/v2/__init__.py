@@ -13,10 +13,20 @@
 # limitations under the License.
 
 # app/api/v2/__init__.py
+import json
 import logging
+from typing import Any, Dict, Optional
 from fastapi import APIRouter
 from app import globals as woprvar
 from app.logging import configure_logging
 
 router = APIRouter()
 logger = logging.getLogger(woprvar.APP_NAME)
+
+
+def ndjson_trailer(sent: int, error: Optional[str] = None) -> str:
+    """Last line of an NDJSON stream: {"_stream": "end", "rows": n}, or "error" with the reason"""
+    record: Dict[str, Any] = {"_stream": "error" if error else "end", "rows": sent}
+    if error:
+        record["error"] = error
+    return json.dumps(record) + "\n"
@@ -0,0 +1,184 @@
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+WOPR Batch API - run several v2 requests in one round-trip
+
+POST /api/v2/batch
+{
+  "timeout_ms": 3000,
+  "requests": [
+    {"id": "config", "path": "/api/v2/config/all"},
+    {"id": "games", "path": "/api/v2/games"},
+    {"id": "human", "method": "POST", "path": "/api/v2/players/human", "body": {"name": "bpfx"}}
+  ]
+}
+
+Sub-requests are dispatched concurrently through the app's own ASGI stack,
+so routing, validation, middleware and tracing behave exactly as for a
+direct call.  Results come back keyed by id, each with its own status.
+Anything still running when the batch budget runs out is cancelled and
+reported as 504; a write cancelled that way may or may not have landed.
+
+Paths are checked as the router will see them (percent-decoded, dot
+segments resolved), and a batch can't run inside another batch however
+its path is spelled.
+"""
+import asyncio
+import contextvars
+import json
+import posixpath
+import time
+from urllib.parse import unquote, urlsplit
+from typing import Any, Dict, List, Literal, Optional
+
+import httpx
+from fastapi import APIRouter, HTTPException, Request, status
+from opentelemetry import trace
+from pydantic import BaseModel, Field
+
+from app import globals as woprvar
+from . import logger
+
+router = APIRouter(tags=["batch"])
+tracer = trace.get_tracer(woprvar.APP_NAME, woprvar.APP_VERSION)
+
+ALLOWED_PREFIX = "/api/v2/"
+BATCH_PATH = "/api/v2/batch"
+# Request headers passed through to every sub-request
+FORWARD_HEADERS = ("authorization", "accept-language", "user-agent")
+
+# Set while a batch dispatches; sub-requests run in copies of that context
+_in_batch: contextvars.ContextVar[bool] = contextvars.ContextVar("wopr_in_batch", default=False)
+
+
+class SubRequest(BaseModel):
+    id: str = Field(..., min_length=1)
+    method: Literal["GET", "POST", "PATCH", "PUT", "DELETE"] = "GET"
+    path: str
+    params: Optional[Dict[str, Any]] = None
+    body: Optional[Any] = None
+
+
+class BatchPayload(BaseModel):
+    requests: List[SubRequest]
+    timeout_ms: Optional[int] = Field(None, ge=1)
+
+
+def _validate(payload: BatchPayload) -> None:
+    if not payload.requests:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="No requests in batch")
+    if len(payload.requests) > woprvar.BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Batch holds {len(payload.requests)} requests, limit is {woprvar.BATCH_MAX_REQUESTS}",
+        )
+    ids = [sub.id for sub in payload.requests]
+    if len(set(ids)) != len(ids):
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Request ids must be unique")
+    for sub in payload.requests:
+        if not _allowed_path(sub.path):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Request {sub.id}: path must be a v2 route other than {BATCH_PATH}",
+            )
+
+
+def _allowed_path(path: str) -> bool:
+    """A v2 path, other than the batch route, however it's encoded"""
+    parts = urlsplit(path)
+    if parts.scheme or parts.netloc:
+        return False
+    decoded = unquote(parts.path)
+    if ".." in decoded.split("/") or "\\" in decoded:
+        return False
+    normalized = posixpath.normpath(decoded)
+    return (
+        normalized.startswith(ALLOWED_PREFIX)
+        and normalized != BATCH_PATH
+        and not normalized.startswith(BATCH_PATH + "/")
+    )
+
+
+def _decode(response: httpx.Response) -> Any:
+    if "json" in response.headers.get("content-type", ""):
+        try:
+            return response.json()
+        except json.JSONDecodeError:
+            pass
+    return response.text
+
+
+async def _dispatch(client: httpx.AsyncClient, sub: SubRequest) -> Dict[str, Any]:
+    start = time.perf_counter()
+    kwargs: Dict[str, Any] = {"params": sub.params}
+    if sub.body is not None:
+        kwargs["json"] = sub.body
+    response = await client.request(sub.method, sub.path, **kwargs)
+    return {
+        "status": response.status_code,
+        "body": _decode(response),
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+    }
+
+
+@router.post("")
+@router.post("/")
+async def run_batch(payload: BatchPayload, request: Request):
+    """Run v2 sub-requests concurrently; results keyed by request id"""
+    if _in_batch.get():
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Batches can't be nested")
+    _validate(payload)
+    budget_ms = min(payload.timeout_ms or woprvar.BATCH_TIMEOUT_MS, woprvar.BATCH_MAX_TIMEOUT_MS)
+    headers = {k: v for k, v in request.headers.items() if k in FORWARD_HEADERS}
+    start = time.perf_counter()
+
+    with tracer.start_as_current_span("batch") as span:
+        span.set_attribute("batch.size", len(payload.requests))
+        span.set_attribute("batch.budget_ms", budget_ms)
+        transport = httpx.ASGITransport(app=request.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://batch", headers=headers) as client:
+            token = _in_batch.set(True)
+            try:
+                tasks = {
+                    sub.id: asyncio.create_task(_dispatch(client, sub), name=f"batch:{sub.id}")
+                    for sub in payload.requests
+                }
+            finally:
+                _in_batch.reset(token)
+            done, pending = await asyncio.wait(tasks.values(), timeout=budget_ms / 1000)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        results: Dict[str, Dict[str, Any]] = {}
+        for sub_id, task in tasks.items():
+            if task in pending:
+                results[sub_id] = {"status": status.HTTP_504_GATEWAY_TIMEOUT,
+                                   "body": {"detail": f"Batch budget of {budget_ms}ms exceeded"}}
+            elif task.exception() is not None:
+                logger.error(f"Batch sub-request {sub_id} failed: {task.exception()}")
+                results[sub_id] = {"status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+                                   "body": {"detail": str(task.exception())}}
+            else:
+                results[sub_id] = task.result()
+
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+        span.set_attribute("batch.timed_out", len(pending))
+        logger.info(
+            f"Batch of {len(tasks)} finished in {elapsed_ms}ms "
+            f"({len(pending)} over the {budget_ms}ms budget)"
+        )
+        return {"results": results, "elapsed_ms": elapsed_ms, "budget_ms": budget_ms}
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+WOPR Catalog Cache - stats and manual invalidation
+"""
+from fastapi import APIRouter
+import logging
+from app import globals as woprvar
+from app.catalog_cache import catalog_cache
+
+logger = logging.getLogger(woprvar.APP_NAME)
+
+router = APIRouter(tags=["cache"])
+
+
+@router.get("")
+async def get_cache_stats():
+    """Hit/miss/eviction counters and entry counts per cached collection"""
+    return catalog_cache.stats()
+
+
+@router.delete("")
+async def clear_cache():
+    """Drop every cached entry"""
+    logger.info("Clearing catalog cache")
+    catalog_cache.clear()
+    return catalog_cache.stats()
+
+
+@router.delete("/{collection}")
+async def invalidate_collection(collection: str):
+    """Drop cached entries for one collection"""
+    dropped = catalog_cache.invalidate(collection)
+    logger.info(f"Invalidated {dropped} catalog cache entries for {collection}")
+    return {"collection": collection, "dropped": dropped}
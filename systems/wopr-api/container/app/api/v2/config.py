@@ -16,14 +16,18 @@
 """
 WOPR Config Service - Directus API Proxy
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Request, Response
 import httpx
 import os
 import logging
 import sys
 from opentelemetry import trace
 from contextlib import nullcontext
-from app.directus_client import get_one, get_all, post, update, delete
+from app import directus_client
+from app import config_bootstrap
+from app import config_watcher
+from app import globals as woprvar
+from app import webhook_token
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(filename="/var/log/wopr-api.log", level="DEBUG")
@@ -40,17 +44,51 @@ DIRECTUS_TOKEN = os.getenv('DIRECTUS_TOKEN', '')
 
 # Get tracer (if tracing enabled)
 try:
-    from app import globals as woprvar
     tracer = trace.get_tracer(woprvar.APP_NAME, woprvar.APP_VERSION)
 except:
     tracer = None
 
 
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match check (weak comparison, lists and * allowed)"""
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in (tag.removeprefix("W/") for tag in candidates)
+
+
+@router.get("/status")
+async def get_config_status():
+    """
+    Where the running WOPR_CONFIG came from (snapshot or Directus), how old
+    it is, and whether the background refresh has seen it change since,
+    plus the hot-reload version and hash.
+    """
+    return {**config_bootstrap.status(), "watcher": config_watcher.status()}
+
+
+@router.post("/reload")
+async def reload_config(x_wopr_webhook_token: str = Header("")):
+    """
+    Re-check WOPR_CONFIG against Directus now (Directus Flow webhook target).
+    
+    Requires X-WOPR-Webhook-Token when WOPR_CONFIG_WEBHOOK_TOKEN is set.
+    
+    Returns:
+        Whether the config changed, and the watcher status
+    """
+    if not webhook_token.token_ok(x_wopr_webhook_token):
+        raise HTTPException(status_code=403, detail="Invalid webhook token")
+    changed = await config_watcher.refresh("webhook")
+    return {"changed": changed, **config_watcher.status()}
+
+
 @router.get("/all")
-async def get_all(environment: str = "production"):
+async def get_all(request: Request, environment: str = "production"):
     """
     Get entire configuration for specified environment.
-    Proxies request to Directus API.
+    
+    This service's own environment is served from memory (kept current by
+    app/config_watcher.py) with an ETag; a matching If-None-Match gets a
+    304.  Other environments are proxied to the Directus API.
     
     Args:
         environment: Config environment (production, stage, dev)
@@ -62,6 +100,24 @@ async def get_all(environment: str = "production"):
     with tracer.start_as_current_span("config.get_all") if tracer else nullcontext() as span:
         if span and span.is_recording():
             span.set_attribute("config.environment", environment)
+        
+        if environment == woprvar.ENVIRONMENT:
+            config = config_watcher.current()
+            headers = {
+                "ETag": config.etag,
+                "Cache-Control": "no-cache",
+                "X-Config-Version": str(config.version),
+            }
+            not_modified = _etag_matches(request.headers.get("if-none-match", ""), config.etag)
+            if span and span.is_recording():
+                span.set_attribute("config.source", "memory")
+                span.set_attribute("config.version", config.version)
+                span.set_attribute("config.not_modified", not_modified)
+            if not_modified:
+                return Response(status_code=304, headers=headers)
+            return Response(config.body, media_type="application/json", headers=headers)
+        
+        if span and span.is_recording():
             span.set_attribute("config.source", "directus")
         
         logger.info(f"Fetching config for environment: {environment}")
@@ -217,24 +273,24 @@ async def health_check():
 @router.get("")
 async def get_config():
     logger.info("Fetching all config")
-    return get_all("woprconfig")
+    return await directus_client.get_all("woprconfig")
 
 @router.get("/{config_id}")
 async def get_config_item(config_id: str):
     logger.info(f"Fetching config item with ID: {config_id}")
-    return get_one("woprconfig", config_id)
+    return await directus_client.get_one("woprconfig", config_id)
 
 @router.post("")
 async def create_config_item(payload: dict):
 	logger.info(f"Creating a new config item with payload: {payload}")
-	return post("woprconfig", payload)
+	return await directus_client.post("woprconfig", payload)
 
 @router.patch("/{config_id}")
 async def update_config_item(config_id: str, payload: dict):
     logger.info(f"Updating config item {config_id} with payload: {payload}")
-    return update("woprconfig", config_id, payload)
+    return await directus_client.update("woprconfig", config_id, payload)
 
 @router.delete("/{config_id}")
 async def delete_config_item(config_id: str):
     logger.info(f"Deleting config item with ID: {config_id}")
-    return delete("woprconfig", config_id)
\ No newline at end of file
+    return await directus_client.delete("woprconfig", config_id)
\ No newline at end of file
@@ -12,9 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from . import router, logger
-from fastapi import APIRouter, HTTPException, status
+from . import router, logger, ndjson_trailer
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional
+from fastapi import APIRouter, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from app import globals as woprvar
+from app import directus_client
 import requests
 
 router = APIRouter(tags=["images"])
@@ -51,15 +55,87 @@ def oneGet(url: str, headers: dict, params: dict) -> list[dict]:
         )
 
 
+async def _ndjson(first: List[Dict[str, Any]], pages: AsyncIterator, limit: Optional[int]):
+    """Write rows as NDJSON while iter_pages fetches the next page upstream"""
+    sent = 0
+    page = first
+    try:
+        while page is not None:
+            if limit is not None:
+                page = page[:limit - sent]
+            if page:
+                yield "".join(json.dumps(row, default=str) + "\n" for row in page)
+                sent += len(page)
+            if limit is not None and sent >= limit:
+                break
+            page = await anext(pages, None)
+    except Exception as e:
+        # Headers (and a 200) are already out: say so in-band so clients don't take this as complete
+        detail = e.detail if isinstance(e, HTTPException) else str(e)
+        logger.error(f"mlimages stream aborted after {sent} rows: {detail}")
+        yield ndjson_trailer(sent, str(detail))
+        return
+    finally:
+        await pages.aclose()
+    yield ndjson_trailer(sent)
+    logger.info(f"Streamed {sent} mlimages rows")
+
+
+async def list_mlimages(
+    response: Response,
+    filters: Optional[Dict] = None,
+    limit: Optional[int] = None,
+    after: Optional[int] = None,
+    stream: bool = False,
+):
+    """
+    List mlimages by keyset on id.
+
+    limit/after return one page and set X-Next-Cursor when there may be more
+    rows.  stream=true returns NDJSON of every row after `after` (capped at
+    limit if given), fetched upstream page by page.  With neither, every row
+    is returned as a JSON list as before.  A stream always ends with a
+    {"_stream": ...} record (see ndjson_trailer); one without it was cut off.
+    """
+    if stream:
+        page_size = min(limit, woprvar.DIRECTUS_PAGE_SIZE) if limit else None
+        pages = directus_client.iter_pages("mlimages", filters=filters, page_size=page_size, after=after)
+        # Pull the first page before answering so upstream errors keep their status code
+        first = await anext(pages, None)
+        if first is None:
+            await pages.aclose()
+            return StreamingResponse(iter((ndjson_trailer(0),)), media_type="application/x-ndjson")
+        return StreamingResponse(_ndjson(first, pages, limit), media_type="application/x-ndjson")
+
+    if limit is not None or after is not None:
+        limit = limit or woprvar.DIRECTUS_PAGE_SIZE
+        page_filters = dict(filters or {})
+        if after is not None:
+            page_filters["id"] = {"_gt": after}
+        page = await directus_client.get_all("mlimages", filters=page_filters, sort=["id"], limit=limit)
+        if len(page) == limit:
+            response.headers["X-Next-Cursor"] = str(page[-1]["id"])
+        return page
+
+    rows: List[Dict[str, Any]] = []
+    async for page in directus_client.iter_pages("mlimages", filters=filters):
+        rows.extend(page)
+    return rows
+
+
 @router.get("/gameid/{game_catalog_id}/", response_model=list[dict])
 @router.get("/gameid/{game_catalog_id}", response_model=list[dict])
-def get_images_by_game_catalog_id(game_catalog_id: int):
+async def get_images_by_game_catalog_id(
+    game_catalog_id: int,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=woprvar.DIRECTUS_MAX_PAGE_SIZE, description="Page size"),
+    after: Optional[int] = Query(None, description="Keyset cursor: only rows with id > after"),
+    stream: bool = Query(False, description="Stream every row as NDJSON"),
+):
     logger.info(f"Fetching images for game catalog ID {game_catalog_id} from the directus api")
-    url = f"{woprvar.DIRECTUS_URL}/items/mlimages"
-    params = {
-        "filter[game_catalog_id][_eq]": game_catalog_id,
-    }
-    return oneGet(url, woprvar.DIRECTUS_HEADERS, params)
+    return await list_mlimages(
+        response, {"game_catalog_id": game_catalog_id}, limit=limit, after=after, stream=stream
+    )
 
 
 @router.get("/gameid/names/{game_catalog_id}/", response_model=list[dict])
@@ -88,10 +164,14 @@ def get_images_by_piece_id(piece_id: int):
 
 @router.get("/all/", response_model=list[dict])
 @router.get("/all", response_model=list[dict])
-def get_all_images():
+async def get_all_images(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=woprvar.DIRECTUS_MAX_PAGE_SIZE, description="Page size"),
+    after: Optional[int] = Query(None, description="Keyset cursor: only rows with id > after"),
+    stream: bool = Query(False, description="Stream every row as NDJSON"),
+):
     logger.info("Fetching all images from the directus api")
-    url = f"{woprvar.DIRECTUS_URL}/items/mlimages"
-    return oneGet(url, woprvar.DIRECTUS_HEADERS, {})
+    return await list_mlimages(response, limit=limit, after=after, stream=stream)
 
 @router.get("/byfilename/{imagefilename}", response_model=list[dict])
 def get_images_by_filename(imagefilename: str):
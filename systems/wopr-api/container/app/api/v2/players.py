@@ -5,13 +5,14 @@
 """
 WOPR Players API - Player management endpoints
 """
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
 import logging
 import sys
 from opentelemetry import trace
 from typing import Optional
 from app.directus_client import get_one, get_all, post, update, delete
+from app.directus_query import directus_query
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(filename="/var/log/wopr-api.log", level="DEBUG")
@@ -35,23 +36,23 @@ class PlayerPayload(BaseModel):
 async def doesplayerexist(name: str) -> list:
     """Check if player with given name exists"""
     logger.info(f"Checking if player exists: {name}")
-    players = get_all("players", filters={"name": {"_eq": name}})
+    players = await get_all("players", filters={"name": {"_eq": name}})
     return players
 
 
 # GET endpoints
 @router.get("")
-async def get_players():
+async def get_players(query: dict = Depends(directus_query("players"))):
     """Get all players (humans and bots)"""
-    logger.info("Fetching all players")
-    return get_all("players")
+    logger.info(f"Fetching all players, query: {query}")
+    return await get_all("players", **query)
 
 
 @router.get("/{player_id}")
 async def get_player(player_id: str):
     """Get specific player by ID"""
     logger.info(f"Fetching player with ID: {player_id}")
-    return get_one("players", player_id)
+    return await get_one("players", player_id)
 
 
 @router.get("/human")
@@ -61,7 +62,7 @@ async def get_player(player_id: str):
 async def get_humans():
     """Get all human players (isbot=false)"""
     logger.info("Fetching human players")
-    return get_all("players", filters={"isbot": {"_eq": False}})
+    return await get_all("players", filters={"isbot": {"_eq": False}})
 
 
 @router.get("/bot")
@@ -71,7 +72,7 @@ async def get_humans():
 async def get_bots():
     """Get all bot players (isbot=true)"""
     logger.info("Fetching bot players")
-    return get_all("players", filters={"isbot": {"_eq": True}})
+    return await get_all("players", filters={"isbot": {"_eq": True}})
 
 
 # POST endpoints
@@ -80,7 +81,7 @@ async def get_bots():
 async def create_players(payload: PlayerPayload):
     """Create a new player"""
     logger.info(f"Creating new player: {payload.name}")
-    return post("players", payload.model_dump())
+    return await post("players", payload.model_dump())
 
 
 @router.post("/human")
@@ -99,7 +100,7 @@ async def post_humans(payload: PlayerPayload):
     
     # Force isbot=False and create
     payload.isbot = False
-    return post("players", payload.model_dump())
+    return await post("players", payload.model_dump())
 
 
 @router.post("/bot")
@@ -118,7 +119,7 @@ async def post_bots(payload: PlayerPayload):
     
     # Force isbot=True and create
     payload.isbot = True
-    return post("players", payload.model_dump())
+    return await post("players", payload.model_dump())
 
 
 # PATCH/DELETE endpoints
@@ -126,11 +127,11 @@ async def post_bots(payload: PlayerPayload):
 async def update_player(player_id: str, payload: dict):
     """Update existing player"""
     logger.info(f"Updating player {player_id}")
-    return update("players", player_id, payload)
+    return await update("players", player_id, payload)
 
 
 @router.delete("/{player_id}")
 async def delete_player(player_id: str):
     """Delete player"""
     logger.info(f"Deleting player {player_id}")
-    return delete("players", player_id)
\ No newline at end of file
+    return await delete("players", player_id)
\ No newline at end of file
@@ -16,12 +16,13 @@
 """
 WOPR Plays Service
 """
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
 import logging
 import httpx
 from pydantic import BaseModel
 from app import globals as woprvar
 from app.directus_client import get_one, get_all, post, update, delete
+from app.directus_query import directus_query
 
 logger = logging.getLogger(woprvar.APP_NAME)
 
@@ -39,26 +40,26 @@ class PlayPayload(BaseModel):
 # UPDATE / - updates entry
 
 @router.get("")
-async def get_plays():
-    logger.info("Fetching all plays")
-    return get_all("playtracker")
+async def get_plays(query: dict = Depends(directus_query("playtracker"))):
+    logger.info(f"Fetching all plays, query: {query}")
+    return await get_all("playtracker", **query)
 
 @router.get("/{play_id}")
 async def get_play(play_id: str):
     logger.info(f"Fetching play with ID: {play_id}")
-    return get_one("playtracker", play_id)
+    return await get_one("playtracker", play_id)
 
 @router.post("")
 async def create_play(payload: dict):
 	logger.info(f"Creating a new play with payload: {payload}")
-	return post("playtracker", payload)
+	return await post("playtracker", payload)
 
 @router.patch("/{play_id}")
 async def update_play(play_id: str, payload: dict):
     logger.info(f"Updating play {play_id} with payload: {payload}")
-    return update("playtracker", play_id, payload)
+    return await update("playtracker", play_id, payload)
 
 @router.delete("/{play_id}")
 async def delete_play(play_id: str):
     logger.info(f"Deleting play with ID: {play_id}")
-    return delete("playtracker", play_id)
\ No newline at end of file
+    return await delete("playtracker", play_id)
\ No newline at end of file
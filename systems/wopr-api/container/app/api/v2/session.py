@@ -16,13 +16,14 @@
 """
 WOPR Config Service - Directus API Proxy
 """
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
 import requests
 import logging
 from app import globals as woprvar
 from opentelemetry import trace
 from contextlib import nullcontext
 from app.directus_client import get_one, get_all, post, update, delete
+from app.directus_query import directus_query
 
 logger = logging.getLogger(woprvar.APP_NAME)
 
@@ -33,19 +34,11 @@ async def getnewsession(game_id: int):
 	logger.info(f"Creating new session for game_id: {game_id}")
 	
 	# Create the record in directus first, then get the uuid, then return that
-	URL = f"{woprvar.DIRECTUS_URL}/items/sessiontracker"
 	payload = {
 		"gameid": game_id
 	}
-
-	try:
-		response = requests.post(URL, json=payload, headers=woprvar.DIRECTUS_HEADERS)
-		response.raise_for_status()
-		logger.info("Successfully created new session, response: %s", response.json())
-		session = response.json().get('data', {})
-	except requests.RequestException as e:
-		logger.error(f"Error creating new session: {e}")
-		raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error creating new session, error: {e}")
+	session = await post("sessiontracker", payload)
+	logger.info("Successfully created new session, response: %s", session)
 	return session
 	
 @router.post("/capture")
@@ -76,26 +69,26 @@ async def capture_session(payload: dict):
 # UPDATE / - updates entry
 
 @router.get("")
-async def get_sessions():
-    logger.info("Fetching all sessions")
-    return get_all("sessiontracker")
+async def get_sessions(query: dict = Depends(directus_query("sessiontracker"))):
+    logger.info(f"Fetching all sessions, query: {query}")
+    return await get_all("sessiontracker", **query)
 
 @router.get("/{session_id}")
 async def get_session(session_id: str):
     logger.info(f"Fetching session with ID: {session_id}")
-    return get_one("sessiontracker", session_id)
+    return await get_one("sessiontracker", session_id)
 
 @router.post("")
 async def create_session(payload: dict):
 	logger.info(f"Creating a new session with payload: {payload}")
-	return post("sessiontracker", payload)
+	return await post("sessiontracker", payload)
 
 @router.patch("/{session_id}")
 async def update_session(session_id: str, payload: dict):
     logger.info(f"Updating session {session_id} with payload: {payload}")
-    return update("sessiontracker", session_id, payload)
+    return await update("sessiontracker", session_id, payload)
 
 @router.delete("/{session_id}")
 async def delete_session(session_id: str):
     logger.info(f"Deleting session with ID: {session_id}")
-    return delete("sessiontracker", session_id)
\ No newline at end of file
+    return await delete("sessiontracker", session_id)
\ No newline at end of file
@@ -17,29 +17,82 @@ WOPR API - games CRUD endpoints (Directus schema)
   Both return json.
   
 """
+import base64
+import json
+import uuid
+from typing import Optional
 from . import router, logger
-from fastapi import APIRouter, HTTPException, status, Response
+from fastapi import APIRouter, HTTPException, Query, status, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 from app import globals as woprvar
-import requests
+from app import camera_relay
 router = APIRouter(tags=["stream"])
 
 @router.get("/grab/{camera_id}")
 @router.get("/grab/{camera_id}/")
-def grab(camera_id: str):
+async def grab(camera_id: str):
     """
     Grab a stream from a specific camera.
+
+    Relayed through app.camera_relay: pooled client per camera host, bytes
+    streamed through as they arrive, per-camera concurrency limit and
+    deadline.
     """
     logger.info(f"Grabbing stream from camera ID {camera_id}")
-    CAMURL = woprvar.WOPR_CONFIG['camera']['camDict'][camera_id]['host']
-    CAMPORT = woprvar.WOPR_CONFIG['camera']['camDict'][camera_id]['port']
-    CAMLCLID = woprvar.WOPR_CONFIG['camera']['camDict'][camera_id]['id']
-    URL = f"http://{CAMURL}:{CAMPORT}/grab/{CAMLCLID}"
-    
-    try:
-        response = requests.get(URL)
-        response.raise_for_status()
-        return Response(content=response.content)
-    except requests.RequestException as e:
-        logger.error(f"Error grabbing stream from WOPR API: {e}")
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Error grabbing stream, error: {e}")
+    status_code, headers, body = await camera_relay.open_stream(camera_id)
+    headers.setdefault("content-type", "image/jpeg")
+    return StreamingResponse(body, status_code=status_code, headers=headers, media_type=headers["content-type"])
+
+
+@router.get("/grab-all")
+@router.get("/grab-all/")
+async def grab_all(
+    format: str = Query("json", pattern="^(json|multipart)$"),
+    cameras: Optional[str] = Query(None, description="Comma-separated camera ids; default every camera"),
+    timeout: Optional[float] = Query(None, gt=0, le=30, description="Per-camera timeout in seconds"),
+):
+    """
+    One frame from every camera, fetched concurrently.
+
+    json: a manifest with each camera's status, timing and frame as a
+    data: URI (or its error).  multipart: multipart/mixed, one part per
+    camera with X-Camera-Id/X-Camera-Status headers; failed cameras get
+    an application/json part with the error.
+    """
+    camera_ids = [c for c in cameras.split(",") if c] if cameras else None
+    results = await camera_relay.grab_all(camera_ids, timeout)
+    ok = sum(1 for r in results if "data" in r)
+    logger.info(f"grab-all: {ok}/{len(results)} cameras in {max((r['ms'] for r in results), default=0)}ms")
+    summary = {"X-Cameras": str(len(results)), "X-Cameras-Ok": str(ok)}
+
+    if format == "multipart":
+        boundary = f"wopr-{uuid.uuid4().hex}"
+        parts = []
+        for r in results:
+            if "data" in r:
+                content_type, data = r["content_type"], r["data"]
+            else:
+                content_type, data = "application/json", json.dumps({"error": r["error"]}).encode()
+            head = (
+                f"--{boundary}\r\nContent-Type: {content_type}\r\nContent-Length: {len(data)}\r\n"
+                f"X-Camera-Id: {r['camera_id']}\r\nX-Camera-Status: {r['status']}\r\nX-Camera-Ms: {r['ms']}\r\n\r\n"
+            )
+            parts += [head.encode(), data, b"\r\n"]
+        parts.append(f"--{boundary}--\r\n".encode())
+        return Response(content=b"".join(parts), media_type=f"multipart/mixed; boundary={boundary}", headers=summary)
+
+    manifest = []
+    for r in results:
+        entry = {k: v for k, v in r.items() if k != "data"}
+        if "data" in r:
+            entry["bytes"] = len(r["data"])
+            entry["data"] = f"data:{r['content_type']};base64,{base64.b64encode(r['data']).decode()}"
+        manifest.append(entry)
+    return JSONResponse({"cameras": manifest}, headers=summary)
+
+
+@router.get("/metrics")
+async def relay_metrics():
+    """Per-camera relay counters and queue/TTFB/total latency percentiles"""
+    return camera_relay.metrics()
@@ -16,15 +16,18 @@
 """
 WOPR Vision Service - Label Studio API Integration
 """
-from fastapi import APIRouter, HTTPException, status
-from pydantic import BaseModel
-import httpx
-import os
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+import json
 import logging
 import sys
 from opentelemetry import trace
 from contextlib import nullcontext
 from typing import Optional, List, Dict, Any
+from app import labelstudio_client
+from app.api.v2 import ndjson_trailer
+from app.celery_app import celery_app
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(filename="/var/log/wopr-api.log", level="DEBUG")
@@ -43,11 +46,8 @@ try:
 except Exception:
     tracer = None
 
-# Label Studio configuration
-LABEL_STUDIO_URL = woprvar.WOPR_CONFIG["vision"]["label_studio_url"]
-LABEL_STUDIO_TOKEN = os.getenv('LABEL_STUDIO_TOKEN', '')
-if not LABEL_STUDIO_TOKEN:
-    logger.warning("LABEL_STUDIO_TOKEN not set - vision endpoints will fail")
+# Label Studio configuration (client pool lives in app.labelstudio_client)
+LABEL_STUDIO_URL = woprvar.LABEL_STUDIO_URL
 # Request/Response models
 class ProjectListResponse(BaseModel):
     """Label Studio projects list response"""
@@ -68,18 +68,21 @@ class TaskCreateResponse(BaseModel):
     data: Dict[str, Any]
 
 
-def get_ls_headers() -> Dict[str, str]:
-    """Build Label Studio API headers with Bearer token"""
-    if not LABEL_STUDIO_TOKEN:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="LABEL_STUDIO_TOKEN not configured"
-        )
-    
-    return {
-        "Authorization": f"Token {LABEL_STUDIO_TOKEN}",
-        "Content-Type": "application/json"
-    }
+class ImportRequest(BaseModel):
+    """Select mlimages for a bulk import; all filters are optional and combine with AND"""
+    game_catalog_id: Optional[int] = None
+    piece_id: Optional[int] = None
+    created_after: Optional[str] = None  # date_created >= (ISO 8601)
+    created_before: Optional[str] = None  # date_created < (ISO 8601)
+    chunk_size: Optional[int] = Field(None, ge=1, le=1000)
+    dry_run: bool = False
+
+
+class ImportJobResponse(BaseModel):
+    """Bulk import job state; progress holds the running import summary"""
+    job_id: str
+    state: str
+    progress: Optional[Dict[str, Any]] = None
 
 
 @router.get("/projects")
@@ -96,32 +99,9 @@ async def list_projects() -> ProjectListResponse:
         
         logger.info("Fetching Label Studio projects")
         
-        url = f"{LABEL_STUDIO_URL}/api/projects"
-        
-        try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    url,
-                    headers=get_ls_headers()
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                logger.info(f"Retrieved {len(data.get('results', []))} projects")
-                return ProjectListResponse(**data)
-                
-        except httpx.HTTPStatusError as e:
-            logger.error(f"Label Studio API error: {e.response.status_code} - {e.response.text}")
-            raise HTTPException(
-                status_code=e.response.status_code,
-                detail=f"Label Studio API error: {e.response.text}"
-            )
-        except httpx.HTTPError as e:
-            logger.error(f"Failed to reach Label Studio: {str(e)}")
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=f"Failed to communicate with Label Studio: {str(e)}"
-            )
+        data = await labelstudio_client.list_projects()
+        logger.info(f"Retrieved {len(data.get('results', []))} projects")
+        return ProjectListResponse(**data)
 
 
 @router.get("/projects/{project_id}")
@@ -142,29 +122,7 @@ async def get_project(project_id: int) -> Dict[str, Any]:
         
         logger.info(f"Fetching Label Studio project {project_id}")
         
-        url = f"{LABEL_STUDIO_URL}/api/projects/{project_id}"
-        
-        try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    url,
-                    headers=get_ls_headers()
-                )
-                response.raise_for_status()
-                return response.json()
-                
-        except httpx.HTTPStatusError as e:
-            logger.error(f"Label Studio API error: {e.response.status_code} - {e.response.text}")
-            raise HTTPException(
-                status_code=e.response.status_code,
-                detail=f"Label Studio API error: {e.response.text}"
-            )
-        except httpx.HTTPError as e:
-            logger.error(f"Failed to reach Label Studio: {str(e)}")
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=f"Failed to communicate with Label Studio: {str(e)}"
-            )
+        return await labelstudio_client.get_project(project_id)
 
 
 @router.post("/tasks")
@@ -185,37 +143,75 @@ async def create_task(request: TaskCreateRequest) -> TaskCreateResponse:
         
         logger.info(f"Creating task in Label Studio project {request.project_id}")
         
-        url = f"{LABEL_STUDIO_URL}/api/projects/{request.project_id}/tasks"
-        
         payload = {
             "data": request.data
         }
         
-        try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    url,
-                    headers=get_ls_headers(),
-                    json=payload
-                )
-                response.raise_for_status()
-                task_data = response.json()
-                
-                logger.info(f"Created task {task_data.get('id')} in project {request.project_id}")
-                return TaskCreateResponse(**task_data)
-                
-        except httpx.HTTPStatusError as e:
-            logger.error(f"Label Studio API error: {e.response.status_code} - {e.response.text}")
-            raise HTTPException(
-                status_code=e.response.status_code,
-                detail=f"Label Studio API error: {e.response.text}"
-            )
-        except httpx.HTTPError as e:
-            logger.error(f"Failed to reach Label Studio: {str(e)}")
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=f"Failed to communicate with Label Studio: {str(e)}"
-            )
+        response = await labelstudio_client.request(
+            "POST", f"/api/projects/{request.project_id}/tasks", json=payload
+        )
+        task_data = response.json()
+        # Project task counts just changed
+        labelstudio_client.invalidate_projects()
+        
+        logger.info(f"Created task {task_data.get('id')} in project {request.project_id}")
+        return TaskCreateResponse(**task_data)
+
+
+@router.post("/projects/{project_id}/import", status_code=status.HTTP_202_ACCEPTED)
+async def import_mlimages(project_id: int, request: ImportRequest) -> ImportJobResponse:
+    """
+    Bulk-import mlimages into a Label Studio project.
+    
+    Queues the labelstudio_bulk_import Celery task, which sends the
+    selected images through Label Studio's import API in chunks.  Images
+    already in the project are skipped, so posting the same selection
+    again resumes an interrupted import.
+    
+    Args:
+        project_id: Label Studio project ID
+        request: mlimages selection (game, piece, date_created range)
+    
+    Returns:
+        Job id to poll at /import/{job_id}
+    """
+    with tracer.start_as_current_span("vision.import_mlimages") if tracer else nullcontext() as span:
+        if span and span.is_recording():
+            span.set_attribute("labelstudio.operation", "import_mlimages")
+            span.set_attribute("labelstudio.project_id", project_id)
+        
+        # Fail fast on a bad project id instead of in the worker
+        await labelstudio_client.get_project(project_id)
+        
+        job = celery_app.send_task(
+            "labelstudio_bulk_import",
+            kwargs={"project_id": project_id, **request.model_dump()},
+        )
+        logger.info(f"Queued Label Studio import {job.id} into project {project_id}: {request.model_dump()}")
+        return ImportJobResponse(job_id=job.id, state=job.state)
+
+
+@router.get("/import/{job_id}")
+async def get_import(job_id: str) -> ImportJobResponse:
+    """
+    Progress of a bulk import job.
+    
+    Args:
+        job_id: Job id returned by POST /projects/{project_id}/import
+    
+    Returns:
+        Celery state (PENDING, STARTED, PROGRESS, RETRY, SUCCESS, FAILURE)
+        with the import summary so far
+    """
+    job = celery_app.AsyncResult(job_id)
+    info = job.info
+    if isinstance(info, Exception):
+        # ImportIncomplete carries the final summary as its only argument
+        summary = info.args[0] if info.args and isinstance(info.args[0], dict) else {}
+        progress = {**summary, "error": str(info)}
+    else:
+        progress = info if isinstance(info, dict) else None
+    return ImportJobResponse(job_id=job_id, state=job.state, progress=progress)
 
 
 @router.get("/health")
@@ -229,36 +225,71 @@ async def health_check() -> Dict[str, str]:
     with tracer.start_as_current_span("vision.health") if tracer else nullcontext():
         logger.debug("Vision service health check")
         
-        url = f"{LABEL_STUDIO_URL}/api/projects"
-        
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(
-                    url,
-                    headers=get_ls_headers()
-                )
-                response.raise_for_status()
-                
-                return {
-                    "status": "healthy",
-                    "label_studio_url": LABEL_STUDIO_URL,
-                    "token_configured": bool(LABEL_STUDIO_TOKEN)
-                }
-                
+            await labelstudio_client.request("GET", "/api/projects", params={"page_size": 1}, timeout=5.0)
+            
+            return {
+                "status": "healthy",
+                "label_studio_url": LABEL_STUDIO_URL,
+                "token_configured": bool(labelstudio_client.LABEL_STUDIO_TOKEN)
+            }
+            
         except Exception as e:
             logger.error(f"Label Studio health check failed: {str(e)}")
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=f"Label Studio unavailable: {str(e)}"
+                detail=f"Label Studio unavailable: {getattr(e, 'detail', str(e))}"
             )
 
+async def _stream_tasks(first: List[Dict[str, Any]], pages, ndjson: bool):
+    """
+    Write tasks as a JSON array (or NDJSON) while the next page is fetched.
+
+    NDJSON ends with an ndjson_trailer() record; a JSON array cut off by an
+    upstream failure is left unterminated.
+    """
+    sent = 0
+    page = first
+    if not ndjson:
+        yield "["
+    try:
+        while page is not None:
+            if ndjson:
+                yield "".join(json.dumps(task) + "\n" for task in page)
+            else:
+                yield ("," if sent else "") + ",".join(json.dumps(task) for task in page)
+            sent += len(page)
+            page = await anext(pages, None)
+    except Exception as e:
+        # Headers (and a 200) are already out: say so in-band, or leave the array unterminated
+        detail = e.detail if isinstance(e, HTTPException) else str(e)
+        logger.error(f"Task stream aborted after {sent} tasks: {detail}")
+        if ndjson:
+            yield ndjson_trailer(sent, str(detail))
+        return
+    finally:
+        await pages.aclose()
+    yield ndjson_trailer(sent) if ndjson else "]"
+    logger.info(f"Streamed {sent} tasks")
+
+
 @router.get("/projects/{project_id}/tasks")
-async def list_tasks(project_id: int) -> List[Dict[str, Any]]:
+async def list_tasks(
+    project_id: int,
+    page_size: Optional[int] = Query(None, ge=1, le=1000, description="Label Studio page size"),
+    stream: bool = Query(False, description="NDJSON instead of a JSON array"),
+):
     """
     List all annotation tasks (images) in a Label Studio project.
     
+    Pages through Label Studio's tasks API and streams the result, so
+    large projects neither time out upstream nor sit in memory here.
+    
     Args:
         project_id: Label Studio project ID
+        page_size: Upstream page size (default from WOPR_CONFIG['labelstudio'])
+        stream: Return NDJSON (one task per line, then a {"_stream": ...}
+            record; one without it was cut off) instead of a JSON array
     
     Returns:
         Tasks list with image data
@@ -270,26 +301,11 @@ async def list_tasks(project_id: int) -> List[Dict[str, Any]]:
         
         logger.info(f"Fetching tasks for Label Studio project {project_id}")
         
-        url = f"{LABEL_STUDIO_URL}/api/projects/{project_id}/tasks"
-        
-        try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(
-                    url,
-                    headers=get_ls_headers()
-                )
-                response.raise_for_status()
-                return response.json()
-                
-        except httpx.HTTPStatusError as e:
-            logger.error(f"Label Studio API error: {e.response.status_code} - {e.response.text}")
-            raise HTTPException(
-                status_code=e.response.status_code,
-                detail=f"Label Studio API error: {e.response.text}"
-            )
-        except httpx.HTTPError as e:
-            logger.error(f"Failed to reach Label Studio: {str(e)}")
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=f"Failed to communicate with Label Studio: {str(e)}"
-            )
\ No newline at end of file
+        pages = labelstudio_client.iter_tasks(project_id, page_size)
+        # First page before answering so upstream errors keep their status code
+        first = await anext(pages, None)
+        media_type = "application/x-ndjson" if stream else "application/json"
+        if first is None:
+            await pages.aclose()
+            return StreamingResponse(iter((ndjson_trailer(0) if stream else "[]",)), media_type=media_type)
+        return StreamingResponse(_stream_tasks(first, pages, stream), media_type=media_type)
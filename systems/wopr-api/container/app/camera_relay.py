@@ -0,0 +1,341 @@
+#
+# open_stream()
+# grab_frame()
+# grab_all()
+# close_clients()
+# metrics()
+#
+# Async relay for camera frames (GET /api/v2/stream/grab/{camera_id}).
+#
+# One pooled httpx.AsyncClient per camDict host:port, created on first use
+# and closed by the FastAPI lifespan (see app/main.py).  Hosts come from
+# WOPR_CONFIG on every call, so a camera moved via the config watcher gets
+# a new client; the old one is retired the next time the pool is pruned.
+# Every grab holds a lease on its client, and a retired client is only
+# closed once its last lease is released, never under an in-flight grab.
+#
+# A host's client allows cameras-on-host x CAMERA_RELAY_MAX_CONCURRENT
+# connections, and is replaced (retired as above) when that count changes.
+#
+# Each camera has a semaphore of CAMERA_RELAY_MAX_CONCURRENT slots.  A
+# request waits at most CAMERA_RELAY_QUEUE_TIMEOUT_SECONDS for one (503
+# otherwise) and holds it until the frame has been relayed, so a slow
+# camera can't soak up the whole event loop's worth of connections.  The
+# whole grab is bounded by CAMERA_RELAY_DEADLINE_SECONDS: before the
+# headers that's a 504, after them the body is cut short.
+#
+# Latency (queue wait, time to first byte, total) is kept per camera over
+# the last CAMERA_RELAY_METRICS_WINDOW grabs.
+#
+# grab_all() fetches one frame from every camera at once (GET
+# /api/v2/stream/grab-all), each within its own timeout, so the slowest
+# camera rather than the sum of them sets the response time.  A camera
+# that fails or times out gets an error entry; the others still return.
+#
+# app/camera_relay.py
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+import httpx
+from fastapi import HTTPException, status
+
+from app import globals as woprvar
+from app.stats import percentile
+
+logger = logging.getLogger(__name__)
+
+# Headers passed back from the camera
+RELAY_HEADERS = ("content-type", "content-length", "last-modified", "etag")
+
+# base_url -> pooled client, and the camera count it was sized for
+clients: Dict[str, httpx.AsyncClient] = {}
+_client_cameras: Dict[str, int] = {}
+# client -> grabs using it; retired clients wait here until theirs reach 0
+_leases: Dict[httpx.AsyncClient, int] = {}
+_semaphores: Dict[str, asyncio.Semaphore] = {}
+_metrics: Dict[str, "CameraMetrics"] = {}
+
+
+class CameraMetrics:
+    """Rolling latency samples and counters for one camera"""
+
+    def __init__(self, window: int):
+        self.queue_ms: Deque[float] = deque(maxlen=window)
+        self.ttfb_ms: Deque[float] = deque(maxlen=window)
+        self.total_ms: Deque[float] = deque(maxlen=window)
+        self.counts = {"ok": 0, "upstream_error": 0, "timeout": 0, "busy": 0, "aborted": 0}
+        self.bytes = 0
+        self.in_flight = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            **self.counts,
+            "in_flight": self.in_flight,
+            "bytes": self.bytes,
+            **{
+                f"{name}_p{pct}": percentile(samples, pct)
+                for name, samples in (("queue_ms", self.queue_ms), ("ttfb_ms", self.ttfb_ms), ("total_ms", self.total_ms))
+                for pct in (50, 95, 99)
+            },
+        }
+
+
+def _camera(camera_id: str) -> Tuple[str, str]:
+    """(base_url, camera-local id) for a camDict entry"""
+    cameras = woprvar.WOPR_CONFIG['camera']['camDict']
+    if camera_id not in cameras:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"Unknown camera {camera_id}")
+    camera = cameras[camera_id]
+    return f"http://{camera['host']}:{camera['port']}", str(camera['id'])
+
+
+def _metrics_for(camera_id: str) -> CameraMetrics:
+    if camera_id not in _metrics:
+        _metrics[camera_id] = CameraMetrics(woprvar.CAMERA_RELAY_METRICS_WINDOW)
+    return _metrics[camera_id]
+
+
+def _semaphore(camera_id: str) -> asyncio.Semaphore:
+    if camera_id not in _semaphores:
+        _semaphores[camera_id] = asyncio.Semaphore(woprvar.CAMERA_RELAY_MAX_CONCURRENT)
+    return _semaphores[camera_id]
+
+
+def _host_cameras() -> Dict[str, int]:
+    """base_url -> how many camDict cameras live there"""
+    counts: Dict[str, int] = {}
+    for camera_id in woprvar.WOPR_CONFIG['camera']['camDict']:
+        base_url = _camera(camera_id)[0]
+        counts[base_url] = counts.get(base_url, 0) + 1
+    return counts
+
+
+async def _retire(base_url: str) -> None:
+    """Drop base_url's client from the pool; close it now unless a grab still holds it"""
+    client = clients.pop(base_url)
+    _client_cameras.pop(base_url, None)
+    if not _leases.get(client):
+        _leases.pop(client, None)
+        await client.aclose()
+
+
+async def _prune(keep: str) -> None:
+    """Retire clients for hosts no longer in camDict"""
+    live = set(_host_cameras()) | {keep}
+    for base_url in [url for url in clients if url not in live]:
+        logger.info(f"Closing camera client for {base_url} (no longer configured)")
+        await _retire(base_url)
+
+
+async def _client(base_url: str) -> httpx.AsyncClient:
+    """base_url's pooled client, leased to the caller until _unlease()"""
+    cameras = max(_host_cameras().get(base_url, 0), 1)
+    client = clients.get(base_url)
+    if client is not None and not client.is_closed and _client_cameras.get(base_url) != cameras:
+        logger.info(f"Resizing camera client for {base_url} to {cameras} cameras")
+        await _retire(base_url)
+        client = None
+    if client is None or client.is_closed:
+        connections = cameras * woprvar.CAMERA_RELAY_MAX_CONCURRENT
+        client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=httpx.Timeout(
+                woprvar.CAMERA_RELAY_DEADLINE_SECONDS,
+                connect=woprvar.CAMERA_RELAY_CONNECT_TIMEOUT_SECONDS,
+            ),
+            limits=httpx.Limits(
+                max_connections=connections,
+                max_keepalive_connections=connections,
+            ),
+        )
+        clients[base_url] = client
+        _client_cameras[base_url] = cameras
+        logger.info(f"Camera client opened for {base_url} ({connections} connections)")
+        await _prune(base_url)
+    _leases[client] = _leases.get(client, 0) + 1
+    return client
+
+
+async def _unlease(client: httpx.AsyncClient) -> None:
+    """Give back a lease; a retired client is closed with its last one"""
+    _leases[client] -= 1
+    if _leases[client] == 0:
+        del _leases[client]
+        if client not in clients.values():
+            await client.aclose()
+
+
+async def close_clients() -> None:
+    """Close every pooled camera client, retired ones included"""
+    everything: Set[httpx.AsyncClient] = set(clients.values()) | set(_leases)
+    for client in everything:
+        await client.aclose()
+    if everything:
+        logger.info(f"Closed {len(everything)} camera clients")
+    clients.clear()
+    _client_cameras.clear()
+    _leases.clear()
+
+
+async def open_stream(camera_id: str, path: str = "grab") -> Tuple[int, Dict[str, str], AsyncIterator[bytes]]:
+    """
+    Start relaying GET {camera}/{path}/{local id}.
+
+    Returns the camera's status, the headers worth passing on and a body
+    iterator.  Errors before the first byte raise HTTPException (404
+    unknown camera, 503 busy, 504 deadline, camera status or 502).  The
+    iterator must be consumed or closed: it holds the camera's slot.
+    """
+    base_url, local_id = _camera(camera_id)
+    metrics = _metrics_for(camera_id)
+    semaphore = _semaphore(camera_id)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + woprvar.CAMERA_RELAY_DEADLINE_SECONDS
+    start = time.perf_counter()
+
+    try:
+        await asyncio.wait_for(semaphore.acquire(), woprvar.CAMERA_RELAY_QUEUE_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        metrics.counts["busy"] += 1
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Camera {camera_id} busy ({woprvar.CAMERA_RELAY_MAX_CONCURRENT} grabs in flight)",
+        )
+    metrics.queue_ms.append((time.perf_counter() - start) * 1000)
+    metrics.in_flight += 1
+
+    response: Optional[httpx.Response] = None
+    client: Optional[httpx.AsyncClient] = None
+    try:
+        client = await _client(base_url)
+        request = client.build_request("GET", f"/{path}/{local_id}")
+        async with asyncio.timeout_at(deadline):
+            response = await client.send(request, stream=True)
+        if response.status_code >= 400:
+            body = (await response.aread())[:500]
+            metrics.counts["upstream_error"] += 1
+            raise HTTPException(status_code=response.status_code, detail=f"Camera {camera_id}: {body.decode(errors='replace')}")
+    except asyncio.TimeoutError:
+        metrics.counts["timeout"] += 1
+        await _release(semaphore, metrics, response, client)
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=f"Camera {camera_id} timed out")
+    except httpx.HTTPError as e:
+        metrics.counts["upstream_error"] += 1
+        await _release(semaphore, metrics, response, client)
+        logger.error(f"Error grabbing from camera {camera_id} at {base_url}: {e}")
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Error grabbing from camera {camera_id}: {e}")
+    except BaseException:
+        await _release(semaphore, metrics, response, client)
+        raise
+
+    headers = {k: v for k, v in response.headers.items() if k.lower() in RELAY_HEADERS}
+    return response.status_code, headers, _relay(camera_id, client, response, semaphore, metrics, start, deadline)
+
+
+async def _release(
+    semaphore: asyncio.Semaphore,
+    metrics: CameraMetrics,
+    response: Optional[httpx.Response],
+    client: Optional[httpx.AsyncClient],
+) -> None:
+    try:
+        if response is not None:
+            await response.aclose()
+    finally:
+        metrics.in_flight -= 1
+        semaphore.release()
+        if client is not None:
+            await _unlease(client)
+
+
+async def _relay(
+    camera_id: str,
+    client: httpx.AsyncClient,
+    response: httpx.Response,
+    semaphore: asyncio.Semaphore,
+    metrics: CameraMetrics,
+    start: float,
+    deadline: float,
+) -> AsyncIterator[bytes]:
+    """Yield the camera's bytes as they arrive; releases the slot when done"""
+    first = True
+    sent = 0
+    try:
+        # One timer for the whole body rather than one per chunk
+        async with asyncio.timeout_at(deadline):
+            async for chunk in response.aiter_raw():
+                if first:
+                    metrics.ttfb_ms.append((time.perf_counter() - start) * 1000)
+                    first = False
+                sent += len(chunk)
+                yield chunk
+        metrics.counts["ok"] += 1
+        metrics.total_ms.append((time.perf_counter() - start) * 1000)
+    except asyncio.TimeoutError:
+        # Headers are out: all we can do is stop, leaving a short body
+        metrics.counts["timeout"] += 1
+        logger.error(f"Camera {camera_id} missed its deadline after {sent} bytes")
+    except (httpx.HTTPError, asyncio.CancelledError, GeneratorExit):
+        metrics.counts["aborted"] += 1
+        raise
+    finally:
+        metrics.bytes += sent
+        await _release(semaphore, metrics, response, client)
+
+
+async def grab_frame(camera_id: str, timeout: float) -> Dict[str, Any]:
+    """
+    One whole frame from a camera, never raising.
+
+    Returns camera_id, status, elapsed ms and either content_type/headers/
+    data or error.  A body shorter than its content-length (the relay
+    deadline cut it) counts as a 504.
+    """
+    start = time.perf_counter()
+    result: Dict[str, Any] = {"camera_id": camera_id}
+    body: Optional[AsyncIterator[bytes]] = None
+    try:
+        async with asyncio.timeout(timeout):
+            status_code, headers, body = await open_stream(camera_id)
+            data = b"".join([chunk async for chunk in body])
+        expected = headers.get("content-length")
+        if expected is not None and int(expected) != len(data):
+            raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=f"Camera {camera_id} frame cut short")
+        result.update(
+            status=status_code,
+            content_type=headers.get("content-type", "image/jpeg"),
+            headers={k: v for k, v in headers.items() if k.lower() != "content-length"},
+            data=data,
+        )
+    except asyncio.TimeoutError:
+        result.update(status=status.HTTP_504_GATEWAY_TIMEOUT, error=f"Camera {camera_id} timed out after {timeout}s")
+    except HTTPException as e:
+        result.update(status=e.status_code, error=e.detail)
+    finally:
+        if body is not None:
+            await body.aclose()
+    result["ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return result
+
+
+async def grab_all(camera_ids: Optional[Iterable[str]] = None, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+    """grab_frame() for every camDict camera (or camera_ids) concurrently"""
+    if camera_ids is None:
+        camera_ids = woprvar.WOPR_CONFIG['camera']['camDict'].keys()
+    timeout = woprvar.CAMERA_RELAY_GRAB_ALL_TIMEOUT_SECONDS if timeout is None else timeout
+    return list(await asyncio.gather(*(grab_frame(str(camera_id), timeout) for camera_id in camera_ids)))
+
+
+def metrics() -> Dict[str, Any]:
+    """Per-camera relay counters and latency percentiles"""
+    return {
+        "max_concurrent_per_camera": woprvar.CAMERA_RELAY_MAX_CONCURRENT,
+        "deadline_seconds": woprvar.CAMERA_RELAY_DEADLINE_SECONDS,
+        "clients": {base_url: _client_cameras.get(base_url, 0) * woprvar.CAMERA_RELAY_MAX_CONCURRENT for base_url in sorted(clients)},
+        "retired_clients_in_use": sum(1 for client in _leases if client not in clients.values()),
+        "cameras": {camera_id: m.snapshot() for camera_id, m in sorted(_metrics.items())},
+    }
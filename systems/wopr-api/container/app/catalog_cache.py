@@ -0,0 +1,177 @@
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# app/catalog_cache.py
+"""
+In-process read-through cache for Directus catalog collections.
+
+Only collections with a TTL in globals.CACHE_TTL_SECONDS are cached (game_catalog,
+pieces and players by default, overridable via WOPR_CONFIG['cache']), each
+with its own TTL.  Entries live in a single size-bounded LRU.  Any
+write through directus_client (post/update/delete) drops every entry for
+that collection.  Hit/miss/eviction counts are kept locally for the
+/api/v2/cache endpoint and published as OpenTelemetry counters.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from opentelemetry import metrics
+from app import globals as woprvar
+
+logger = logging.getLogger(__name__)
+
+meter = metrics.get_meter(woprvar.APP_NAME, woprvar.APP_VERSION)
+cache_requests = meter.create_counter(
+    "wopr.api.cache.requests",
+    description="Cache lookups by cache, collection and result (hit|miss)",
+    unit="1",
+)
+cache_evictions = meter.create_counter(
+    "wopr.api.cache.evictions",
+    description="Cache entries dropped by LRU, TTL or invalidation, by cache and collection",
+    unit="1",
+)
+
+# What get() returns for an absent or expired entry
+MISSING = object()
+
+
+class CatalogCache:
+    """Per-collection TTL cache on top of one LRU; `name` labels its metrics"""
+
+    def __init__(self, ttls: Dict[str, float], max_entries: int = 512, name: str = "directus"):
+        self.name = name
+        self.ttls = dict(ttls)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        # Bumped on every invalidation so a read that raced a write can't
+        # repopulate the cache with the pre-write result
+        self._generations: Dict[str, int] = {}
+
+    def enabled_for(self, collection: str) -> bool:
+        return self.ttls.get(collection, 0) > 0
+
+    def _count(self, collection: str, result: str, n: int = 1) -> None:
+        counts = self._stats.setdefault(
+            collection, {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+        )
+        counts[result] += n
+
+    def get(self, collection: str, key: Hashable) -> Any:
+        """Return the cached value or MISSING"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get((collection, key))
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end((collection, key))
+                self._count(collection, "hits")
+                cache_requests.add(1, {"cache": self.name, "collection": collection, "result": "hit"})
+                return entry[1]
+            if entry is not None:
+                del self._entries[(collection, key)]
+                self._count(collection, "evictions")
+                cache_evictions.add(1, {"cache": self.name, "collection": collection, "reason": "ttl"})
+            self._count(collection, "misses")
+        cache_requests.add(1, {"cache": self.name, "collection": collection, "result": "miss"})
+        return MISSING
+
+    def generation(self, collection: str) -> int:
+        return self._generations.get(collection, 0)
+
+    def set(self, collection: str, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        expires = time.monotonic() + self.ttls[collection]
+        with self._lock:
+            if generation is not None and generation != self.generation(collection):
+                return
+            self._entries[(collection, key)] = (expires, value)
+            self._entries.move_to_end((collection, key))
+            while len(self._entries) > self.max_entries:
+                (old_collection, _), _ = self._entries.popitem(last=False)
+                self._count(old_collection, "evictions")
+                cache_evictions.add(1, {"cache": self.name, "collection": old_collection, "reason": "lru"})
+
+    async def get_or_load(self, collection: str, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        """The cached value, else await load() and cache it (unless a write invalidated meanwhile)"""
+        if not self.enabled_for(collection):
+            return await load()
+        value = self.get(collection, key)
+        if value is not MISSING:
+            return value
+        generation = self.generation(collection)
+        value = await load()
+        self.set(collection, key, value, generation)
+        return value
+
+    def invalidate(self, collection: str) -> int:
+        """Drop every entry for collection; returns how many were dropped"""
+        with self._lock:
+            self._generations[collection] = self.generation(collection) + 1
+            keys = [k for k in self._entries if k[0] == collection]
+            for k in keys:
+                del self._entries[k]
+            if collection in self.ttls:
+                self._count(collection, "invalidations")
+        if keys:
+            cache_evictions.add(len(keys), {"cache": self.name, "collection": collection, "reason": "write"})
+            logger.debug(f"Catalog cache invalidated {len(keys)} entries for {collection}")
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            for collection in set(self.ttls) | set(self._generations):
+                self._generations[collection] = self.generation(collection) + 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            sizes: Dict[str, int] = {}
+            for collection, _ in self._entries:
+                sizes[collection] = sizes.get(collection, 0) + 1
+            collections = {}
+            for collection in sorted(set(self.ttls) | set(self._stats)):
+                counts = dict(self._stats.get(
+                    collection, {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+                ))
+                lookups = counts["hits"] + counts["misses"]
+                counts["hit_ratio"] = round(counts["hits"] / lookups, 4) if lookups else None
+                counts["entries"] = sizes.get(collection, 0)
+                counts["ttl_seconds"] = self.ttls.get(collection, 0)
+                collections[collection] = counts
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "collections": collections,
+            }
+
+
+catalog_cache = CatalogCache(
+    ttls=woprvar.CACHE_TTL_SECONDS,
+    max_entries=woprvar.CACHE_MAX_ENTRIES,
+)
+
+
+async def get_or_load(collection: str, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+    """Read-through on the shared catalog cache; uncached collections always load"""
+    return await catalog_cache.get_or_load(collection, key, load)
+
+
+def invalidate(collection: str) -> int:
+    return catalog_cache.invalidate(collection)
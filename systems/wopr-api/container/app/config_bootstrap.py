@@ -0,0 +1,209 @@
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# app/config_bootstrap.py
+"""
+WOPR_CONFIG bootstrap: last known-good snapshot first, Directus in the background.
+
+app/globals.py calls load() at import.  If the snapshot file exists (and
+is younger than WOPR_CONFIG_SNAPSHOT_MAX_AGE_SECONDS, when that's set) it
+is used immediately and a daemon thread refreshes it from Directus,
+retrying with backoff until it gets a valid document, then rewrites the
+snapshot atomically (temp file + fsync + os.replace, so concurrent
+uvicorn/Celery workers never see a torn file).  Only a process with no
+usable snapshot waits on Directus, and it still exits if that fails, as
+before.
+
+The refreshed config is written to disk but not swapped into the running
+process here; that's app/config_watcher.py's job once the app is up.
+status() reports whether Directus had moved on from what was loaded.
+
+Environment:
+    WOPR_CONFIG_SNAPSHOT                   snapshot path
+    WOPR_CONFIG_SNAPSHOT_MAX_AGE_SECONDS   ignore older snapshots (0 = any age)
+    WOPR_CONFIG_FETCH_TIMEOUT_SECONDS      per-request Directus timeout
+
+Nothing here may import app.globals: it runs while globals is importing.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger("Bootup")
+
+SNAPSHOT_MAX_AGE_SECONDS = float(os.getenv('WOPR_CONFIG_SNAPSHOT_MAX_AGE_SECONDS', '0'))
+FETCH_TIMEOUT_SECONDS = float(os.getenv('WOPR_CONFIG_FETCH_TIMEOUT_SECONDS', '10'))
+REFRESH_MAX_BACKOFF_SECONDS = 60.0
+
+_lock = threading.Lock()
+_state: Dict[str, Any] = {
+    "source": None,            # "snapshot" or "directus"
+    "snapshot_path": None,
+    "fetched_at": None,        # when the loaded config came from Directus (epoch seconds)
+    "refreshed_at": None,      # last successful background refresh
+    "refresh_attempts": 0,
+    "refresh_error": None,
+    "changed_since_load": False,
+}
+
+
+class ConfigError(Exception):
+    """Directus didn't return a usable WOPR_CONFIG"""
+
+
+def snapshot_path(environment: str) -> Path:
+    default = f"/var/cache/wopr-api/woprconfig-{environment}.json"
+    return Path(os.getenv('WOPR_CONFIG_SNAPSHOT', default))
+
+
+def validate(config: Any) -> Dict[str, Any]:
+    """The same sanity check globals has always made"""
+    if not isinstance(config, dict) or config.get('nelson') != "haha":
+        raise ConfigError("WOPR_CONFIG is missing or invalid")
+    return config
+
+
+def fetch(endpoint: str, headers: Dict[str, str], timeout: float = FETCH_TIMEOUT_SECONDS) -> Dict[str, Any]:
+    """GET the woprconfig item from Directus and unwrap it"""
+    import requests
+    try:
+        response = requests.get(endpoint, headers=headers, timeout=timeout)
+        response.raise_for_status()
+        return validate(response.json()['data'][0]['data'])
+    except (requests.RequestException, ValueError, KeyError, IndexError, TypeError) as e:
+        raise ConfigError(f"Error fetching config from Directus: {e}") from e
+
+
+def read_snapshot(path: Path) -> Optional[Tuple[Dict[str, Any], float]]:
+    """(config, fetched_at) from the snapshot, or None if it's missing or unusable"""
+    try:
+        with open(path) as f:
+            snapshot = json.load(f)
+        return validate(snapshot['data']), float(snapshot['fetched_at'])
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError, ConfigError) as e:
+        logger.warning(f"Ignoring unreadable config snapshot {path}: {e}")
+        return None
+
+
+def write_snapshot(path: Path, config: Dict[str, Any], fetched_at: float) -> bool:
+    """Atomically replace the snapshot; failures are logged, never raised"""
+    tmp = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+        with os.fdopen(fd, "w") as f:
+            json.dump({"fetched_at": fetched_at, "data": config}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        return True
+    except OSError as e:
+        logger.warning(f"Could not write config snapshot {path}: {e}")
+        if tmp:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+        return False
+
+
+def _refresh(endpoint: str, headers: Dict[str, str], path: Path, loaded: Dict[str, Any]) -> None:
+    """Background: fetch until Directus answers, then rewrite the snapshot"""
+    delay = 1.0
+    while True:
+        with _lock:
+            _state["refresh_attempts"] += 1
+        try:
+            config = fetch(endpoint, headers)
+        except ConfigError as e:
+            with _lock:
+                _state["refresh_error"] = str(e)
+            logger.warning(f"Config refresh failed, retrying in {delay:.0f}s: {e}")
+            time.sleep(delay)
+            delay = min(delay * 2, REFRESH_MAX_BACKOFF_SECONDS)
+            continue
+        now = time.time()
+        write_snapshot(path, config, now)
+        with _lock:
+            _state["refreshed_at"] = now
+            _state["refresh_error"] = None
+            _state["changed_since_load"] = config != loaded
+        if config != loaded:
+            logger.warning("WOPR_CONFIG in Directus differs from the loaded snapshot; the config watcher will apply it")
+        else:
+            logger.info("Config snapshot refreshed from Directus (unchanged)")
+        return
+
+
+def _start_refresh(endpoint: str, headers: Dict[str, str], path: Path, loaded: Dict[str, Any]) -> None:
+    threading.Thread(
+        target=_refresh, args=(endpoint, headers, path, loaded),
+        name="wopr-config-refresh", daemon=True,
+    ).start()
+
+
+def load(endpoint: str, headers: Dict[str, str], environment: str) -> Dict[str, Any]:
+    """Return WOPR_CONFIG, preferring the snapshot; raises ConfigError if neither source works"""
+    path = snapshot_path(environment)
+    _state["snapshot_path"] = str(path)
+
+    snapshot = read_snapshot(path)
+    if snapshot is not None:
+        config, fetched_at = snapshot
+        age = time.time() - fetched_at
+        if SNAPSHOT_MAX_AGE_SECONDS <= 0 or age <= SNAPSHOT_MAX_AGE_SECONDS:
+            _state.update(source="snapshot", fetched_at=fetched_at)
+            logger.info(f"WOPR_CONFIG loaded from snapshot {path} ({age:.0f}s old); refreshing in background")
+            _start_refresh(endpoint, headers, path, config)
+            return config
+        logger.info(f"Config snapshot {path} is {age:.0f}s old, fetching from Directus")
+
+    try:
+        config = fetch(endpoint, headers)
+    except ConfigError:
+        if snapshot is None:
+            raise
+        # Too old is still better than nothing
+        logger.warning("Directus unavailable, using the stale snapshot")
+        config, fetched_at = snapshot
+        _state.update(source="snapshot", fetched_at=fetched_at)
+        _start_refresh(endpoint, headers, path, config)
+        return config
+
+    now = time.time()
+    write_snapshot(path, config, now)
+    _state.update(source="directus", fetched_at=now, refreshed_at=now)
+    return config
+
+
+def age_seconds() -> Optional[float]:
+    """How long ago the running config was fetched from Directus"""
+    fetched_at = _state["fetched_at"]
+    return None if fetched_at is None else round(time.time() - fetched_at, 1)
+
+
+def status() -> Dict[str, Any]:
+    """Where the running config came from and how fresh it is"""
+    with _lock:
+        state = dict(_state)
+    state["age_seconds"] = age_seconds()
+    return state
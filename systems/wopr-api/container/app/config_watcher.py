@@ -0,0 +1,175 @@
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# app/config_watcher.py
+"""
+Hot reload of WOPR_CONFIG.
+
+The running config is a frozen ConfigVersion: the document, its canonical
+JSON body, a sha256 of that body and a version number.  refresh() fetches
+the woprconfig item through the pooled Directus client and compares
+hashes; only a real change builds a new ConfigVersion, swaps it in (a
+single assignment, so readers see the old or the new one, never a mix),
+applies it to app.globals (WOPR_CONFIG, storage_paths) and rewrites the
+boot snapshot (app/config_bootstrap.py).
+
+refresh() runs every CONFIG_WATCH_INTERVAL_SECONDS from a lifespan task,
+and on demand from POST /api/v2/config/reload (point a Directus Flow at
+it).  GET /api/v2/config/all serves current().body with current().etag.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException
+
+from app import config_bootstrap, directus_client
+from app import globals as woprvar
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ConfigVersion:
+    """One immutable revision of WOPR_CONFIG"""
+    version: int
+    data: Dict[str, Any]
+    body: bytes
+    digest: str
+    loaded_at: float
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.digest[:32]}"'
+
+
+def canonical(config: Dict[str, Any]) -> bytes:
+    """Key-order-independent JSON, so the hash only moves when the content does"""
+    return json.dumps(config, sort_keys=True, separators=(",", ":")).encode()
+
+
+def make_version(config: Dict[str, Any], version: int) -> ConfigVersion:
+    body = canonical(config)
+    return ConfigVersion(
+        version=version,
+        data=config,
+        body=body,
+        digest=hashlib.sha256(body).hexdigest(),
+        loaded_at=time.time(),
+    )
+
+
+_current = make_version(woprvar.WOPR_CONFIG, 1)
+_refresh_lock: Optional[asyncio.Lock] = None
+_task: Optional[asyncio.Task] = None
+_stats: Dict[str, Any] = {"checks": 0, "changes": 0, "errors": 0, "last_checked_at": None, "last_error": None}
+
+
+def current() -> ConfigVersion:
+    return _current
+
+
+async def fetch() -> Dict[str, Any]:
+    """The woprconfig document for this environment, straight from Directus"""
+    rows = await directus_client.get_all(
+        "woprconfig",
+        filters={"environment": {"_eq": woprvar.ENVIRONMENT}},
+        fields=["data"],
+    )
+    if not rows:
+        raise HTTPException(status_code=404, detail=f"No configuration found for environment: {woprvar.ENVIRONMENT}")
+    try:
+        return config_bootstrap.validate(rows[0]["data"])
+    except config_bootstrap.ConfigError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+
+async def refresh(reason: str = "poll") -> bool:
+    """Fetch, compare hashes, and swap in a new version if it changed; returns whether it did"""
+    global _current, _refresh_lock
+    if _refresh_lock is None:
+        _refresh_lock = asyncio.Lock()
+    # A webhook landing during a poll waits for it rather than fetching twice
+    async with _refresh_lock:
+        _stats["checks"] += 1
+        try:
+            config = await fetch()
+        except HTTPException as e:
+            _stats["errors"] += 1
+            _stats["last_error"] = str(e.detail)
+            raise
+        _stats["last_checked_at"] = time.time()
+        _stats["last_error"] = None
+
+        body = canonical(config)
+        if hashlib.sha256(body).hexdigest() == _current.digest:
+            logger.debug(f"WOPR_CONFIG unchanged ({reason}), version {_current.version}")
+            return False
+
+        new = make_version(config, _current.version + 1)
+        woprvar.apply_config(new.data)
+        _current = new
+        _stats["changes"] += 1
+        logger.info(f"WOPR_CONFIG changed ({reason}): now version {new.version}, sha256 {new.digest[:12]}")
+        path = config_bootstrap.snapshot_path(woprvar.ENVIRONMENT)
+        await asyncio.to_thread(config_bootstrap.write_snapshot, path, new.data, new.loaded_at)
+        return True
+
+
+async def _watch() -> None:
+    while True:
+        await asyncio.sleep(woprvar.CONFIG_WATCH_INTERVAL_SECONDS)
+        try:
+            await refresh("poll")
+        except HTTPException as e:
+            logger.warning(f"WOPR_CONFIG poll failed, keeping version {_current.version}: {e.detail}")
+
+
+def start() -> None:
+    """Start polling (app lifespan, after directus_client is open)"""
+    global _task
+    if not woprvar.CONFIG_WATCH_ENABLED:
+        logger.info("WOPR_CONFIG watcher disabled")
+        return
+    if _task is None or _task.done():
+        _task = asyncio.create_task(_watch(), name="wopr-config-watch")
+        logger.info(f"WOPR_CONFIG watcher polling every {woprvar.CONFIG_WATCH_INTERVAL_SECONDS}s")
+
+
+async def stop() -> None:
+    global _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+    _task = None
+
+
+def status() -> Dict[str, Any]:
+    return {
+        "version": _current.version,
+        "sha256": _current.digest,
+        "etag": _current.etag,
+        "loaded_at": _current.loaded_at,
+        "watching": _task is not None and not _task.done(),
+        "interval_seconds": woprvar.CONFIG_WATCH_INTERVAL_SECONDS,
+        **_stats,
+    }
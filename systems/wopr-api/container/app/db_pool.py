@@ -0,0 +1,131 @@
+#
+# open_pool()
+# connection()
+# close_pool()
+# metrics()
+#
+# Shared async Postgres pool for the direct-SQL routers (psycopg 3).
+#
+# Routers used to psycopg.connect() inside their async handlers: a
+# blocking connect, handshake and query on the event loop for every
+# request.  They now do
+#
+#     async with db_pool.connection() as conn:
+#         async with conn.cursor(row_factory=dict_row) as cur:
+#             await cur.execute(...)
+#
+# Sized from WOPR_CONFIG['database']: connection_pool_size connections
+# kept open, up to connection_pool_size + max_overflow under load, and a
+# request waits at most connection_timeout_seconds for one (503
+# otherwise).  The connection commits when the block exits cleanly and
+# rolls back if it raises, as psycopg_pool does.
+#
+# connection() opens the pool on first use, so a replica serving no
+# direct-SQL routes holds no connections; the FastAPI lifespan closes it
+# (see app/main.py).
+#
+# Checkouts, timeouts and wait time (p50/p95/p99 over the last
+# DATABASE_METRICS_WINDOW checkouts) are kept for metrics(), alongside
+# psycopg_pool's own counters.
+#
+# app/db_pool.py
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+from fastapi import HTTPException, status
+from psycopg import AsyncConnection
+from psycopg_pool import AsyncConnectionPool, PoolTimeout
+
+from app import globals as woprvar
+from app.stats import percentile
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[AsyncConnectionPool] = None
+_lock: Optional[asyncio.Lock] = None
+_wait_ms: Deque[float] = deque(maxlen=woprvar.DATABASE_METRICS_WINDOW)
+_counts = {"checkouts": 0, "timeouts": 0, "errors": 0, "in_use": 0}
+
+
+async def open_pool() -> AsyncConnectionPool:
+    """Open the pool; connection() calls this on first use"""
+    global _pool, _lock
+    if _pool is not None:
+        return _pool
+    if _lock is None:
+        _lock = asyncio.Lock()
+    async with _lock:
+        if _pool is None:
+            pool = AsyncConnectionPool(
+                woprvar.DATABASE_URL,
+                min_size=woprvar.DATABASE_POOL_SIZE,
+                max_size=woprvar.DATABASE_POOL_SIZE + woprvar.DATABASE_MAX_OVERFLOW,
+                timeout=woprvar.DATABASE_CONNECTION_TIMEOUT_SECONDS,
+                name="wopr-api",
+                open=False,
+            )
+            # Don't wait for min_size connections: a DB that's down at boot shouldn't stop the app
+            await pool.open(wait=False)
+            _pool = pool
+            logger.info(
+                f"DB pool open (size={woprvar.DATABASE_POOL_SIZE}, "
+                f"max={woprvar.DATABASE_POOL_SIZE + woprvar.DATABASE_MAX_OVERFLOW})"
+            )
+    return _pool
+
+
+@asynccontextmanager
+async def connection() -> AsyncIterator[AsyncConnection]:
+    """A pooled connection for the with-block; 503 if none frees up in time"""
+    pool = await open_pool()
+    start = time.perf_counter()
+    acquired = in_body = False
+    try:
+        async with pool.connection() as conn:
+            acquired = True
+            _wait_ms.append((time.perf_counter() - start) * 1000)
+            _counts["checkouts"] += 1
+            _counts["in_use"] += 1
+            try:
+                in_body = True
+                yield conn
+                in_body = False
+            finally:
+                _counts["in_use"] -= 1
+    except PoolTimeout:
+        if acquired:
+            raise
+        _counts["timeouts"] += 1
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"No database connection free within {woprvar.DATABASE_CONNECTION_TIMEOUT_SECONDS}s",
+        )
+    except Exception:
+        # Only getting, committing or returning the connection counts, not the caller's own errors
+        if not in_body:
+            _counts["errors"] += 1
+        raise
+
+
+async def close_pool() -> None:
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        await pool.close()
+
+
+def metrics() -> Dict[str, Any]:
+    """Checkout counters, wait-time percentiles and psycopg_pool's stats"""
+    return {
+        "open": _pool is not None,
+        "min_size": woprvar.DATABASE_POOL_SIZE,
+        "max_size": woprvar.DATABASE_POOL_SIZE + woprvar.DATABASE_MAX_OVERFLOW,
+        **_counts,
+        **{f"wait_ms_p{pct}": percentile(_wait_ms, pct, 2) for pct in (50, 95, 99)},
+        "pool": _pool.get_stats() if _pool is not None else None,
+    }
@@ -1,134 +1,272 @@
 #
 # get_one()
 # get_all()
+# iter_pages()
 # post()
 # update()
 # delete()
 #
+# All calls are async and share one pooled httpx.AsyncClient.  The client is
+# opened and closed by the FastAPI lifespan (see app/main.py); sync callers
+# such as Celery tasks go through run_sync().
+#
+# Reads of catalog collections go through app.catalog_cache; writes to the
+# same collection invalidate it.
+#
 # payload = {
-#  
+#
 #}
 #
 #
 #
 # app/directus_client.py
 
+import asyncio
 import httpx
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Callable, Awaitable, AsyncIterator
 from fastapi import HTTPException
 import logging
 from app import globals as woprvar
+from app import catalog_cache
 
 logger = logging.getLogger(__name__)
 
-# Create session at module level (connection pooling)
-client = httpx.Client(
-    base_url=woprvar.DIRECTUS_URL,
-    headers=woprvar.DIRECTUS_HEADERS,
-    timeout=30.0
-)
+# Shared async client (connection pooling), owned by the app lifespan
+client: Optional[httpx.AsyncClient] = None
+
+
+def _new_client() -> httpx.AsyncClient:
+    """Build the pooled Directus client from the globals settings"""
+    return httpx.AsyncClient(
+        base_url=woprvar.DIRECTUS_URL,
+        headers=woprvar.DIRECTUS_HEADERS,
+        timeout=woprvar.DIRECTUS_TIMEOUT_SECONDS,
+        limits=httpx.Limits(
+            max_connections=woprvar.DIRECTUS_MAX_CONNECTIONS,
+            max_keepalive_connections=woprvar.DIRECTUS_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=woprvar.DIRECTUS_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+    )
+
+
+async def open_client() -> httpx.AsyncClient:
+    """Open the shared Directus client (idempotent)"""
+    global client
+    if client is None or client.is_closed:
+        client = _new_client()
+        logger.info(
+            f"Directus client opened for {woprvar.DIRECTUS_URL} "
+            f"(max_connections={woprvar.DIRECTUS_MAX_CONNECTIONS}, "
+            f"max_keepalive={woprvar.DIRECTUS_MAX_KEEPALIVE_CONNECTIONS})"
+        )
+    return client
+
+
+async def close_client() -> None:
+    """Close the shared Directus client and release pooled connections"""
+    global client
+    if client is not None:
+        await client.aclose()
+        logger.info("Directus client closed")
+    client = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared client, failing loudly if the lifespan never opened it"""
+    if client is None or client.is_closed:
+        raise HTTPException(status_code=503, detail="Directus client is not open")
+    return client
+
+
+def run_sync(func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+    """
+    Run a client coroutine from synchronous code (e.g. Celery tasks).
 
-def _build_params(filters=None, fields=None, sort=None, limit=None, offset=None):
+    Opens a short-lived client around the call since there is no app lifespan
+    outside of uvicorn.
+    """
+    async def _run():
+        await open_client()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            await close_client()
+
+    return asyncio.run(_run())
+
+
+def _cache_key(url: str, params: Dict[str, Any]) -> tuple:
+    return (url, tuple(sorted((k, str(v)) for k, v in params.items())))
+
+
+def _build_params(filters=None, fields=None, sort=None, limit=None, offset=None, deep=None):
     """Build Directus query parameters"""
     params = {}
-    
+
     if filters:
         # Directus filter syntax: filter[field][operator]=value
+        # Dotted keys filter on related fields: "piece_id.name" -> filter[piece_id][name]
         for key, value in filters.items():
+            key = key.replace(".", "][")
             if isinstance(value, dict):
                 for op, val in value.items():
-                    params[f"filter[{key}]{op}"] = val
+                    params[f"filter[{key}][{op}]"] = val
             else:
                 params[f"filter[{key}][_eq]"] = value
-    
+
+    if deep:
+        # deep[relation][_limit]=5 shapes nested relational results
+        for relation, ops in deep.items():
+            for op, val in ops.items():
+                params[f"deep[{relation.replace('.', '][')}][{op}]"] = val
+
     if fields:
         params["fields"] = ",".join(fields)
-    
+
     if sort:
         params["sort"] = ",".join(sort)
-    
+
     if limit:
         params["limit"] = limit
-    
+
     if offset:
         params["offset"] = offset
-    
+
     return params
 
 
-def get_one(collection: str, item_id: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+async def get_one(collection: str, item_id: str, fields: Optional[List[str]] = None) -> Dict[str, Any]:
     """Get single item from Directus collection"""
     url = f"/items/{collection}/{item_id}"
     params = _build_params(fields=fields)
-    
-    try:
-        response = client.get(url, params=params)
-        response.raise_for_status()
-        logger.info(f"GET {collection}/{item_id} succeeded")
-        return response.json()["data"]
-    except httpx.HTTPError as e:
-        logger.error(f"GET {collection}/{item_id} failed: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
 
+    async def load() -> Dict[str, Any]:
+        try:
+            response = await get_client().get(url, params=params)
+            response.raise_for_status()
+            logger.info(f"GET {collection}/{item_id} succeeded")
+            return response.json()["data"]
+        except httpx.HTTPError as e:
+            logger.error(f"GET {collection}/{item_id} failed: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
 
-def get_all(
+    return await catalog_cache.get_or_load(collection, _cache_key(url, params), load)
+
+
+async def get_all(
     collection: str,
     filters: Optional[Dict] = None,
     fields: Optional[List[str]] = None,
     sort: Optional[List[str]] = None,
     limit: Optional[int] = None,
-    offset: Optional[int] = None
+    offset: Optional[int] = None,
+    deep: Optional[Dict[str, Dict[str, Any]]] = None,
 ) -> List[Dict[str, Any]]:
     """Get multiple items from Directus collection"""
     url = f"/items/{collection}"
-    params = _build_params(filters, fields, sort, limit, offset)
-    
+    params = _build_params(filters, fields, sort, limit, offset, deep)
+
+    async def load() -> List[Dict[str, Any]]:
+        try:
+            response = await get_client().get(url, params=params)
+            response.raise_for_status()
+            data = response.json()["data"]
+            logger.info(f"GET {collection} succeeded (returned {len(data)} items)")
+            return data
+        except httpx.HTTPError as e:
+            logger.error(f"GET {collection} failed: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+    return await catalog_cache.get_or_load(collection, _cache_key(url, params), load)
+
+
+async def iter_pages(
+    collection: str,
+    filters: Optional[Dict] = None,
+    fields: Optional[List[str]] = None,
+    page_size: Optional[int] = None,
+    after: Optional[Any] = None,
+    key: str = "id",
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Yield a collection in pages ordered by `key`, using keyset pagination.
+
+    Each page is `filter[key][_gt]=<last key>&sort=key&limit=page_size`, so
+    deep pages cost the same as the first one (no offset scan).  The next
+    page is requested while the caller is still consuming the current one.
+    Not cached; meant for large collections like mlimages.
+    """
+    url = f"/items/{collection}"
+    page_size = page_size or woprvar.DIRECTUS_PAGE_SIZE
+    if fields and "*" not in fields and key not in fields:
+        fields = [*fields, key]
+
+    async def fetch(cursor) -> List[Dict[str, Any]]:
+        page_filters = dict(filters or {})
+        if cursor is not None:
+            page_filters[key] = {"_gt": cursor}
+        params = _build_params(page_filters, fields, [key], page_size)
+        try:
+            response = await get_client().get(url, params=params)
+            response.raise_for_status()
+            return response.json()["data"]
+        except httpx.HTTPError as e:
+            logger.error(f"GET {collection} page after {key}={cursor} failed: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+    pending = asyncio.ensure_future(fetch(after))
     try:
-        response = client.get(url, params=params)
-        response.raise_for_status()
-        logger.info(f"GET {collection} succeeded (returned {len(response.json()['data'])} items)")
-        return response.json()["data"]
-    except httpx.HTTPError as e:
-        logger.error(f"GET {collection} failed: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        while pending is not None:
+            page = await pending
+            pending = None
+            if len(page) == page_size:
+                pending = asyncio.ensure_future(fetch(page[-1][key]))
+            if page:
+                yield page
+    finally:
+        if pending is not None and not pending.done():
+            pending.cancel()
 
 
-def post(collection: str, data: Dict[str, Any]) -> Dict[str, Any]:
+async def post(collection: str, data: Dict[str, Any]) -> Dict[str, Any]:
     """Create new item in Directus collection"""
     url = f"/items/{collection}"
-    
+
     try:
-        response = client.post(url, json=data)
+        response = await get_client().post(url, json=data)
         response.raise_for_status()
         logger.info(f"POST {collection} succeeded")
+        catalog_cache.invalidate(collection)
         return response.json()["data"]
     except httpx.HTTPError as e:
         logger.error(f"POST {collection} failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-def update(collection: str, item_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+async def update(collection: str, item_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
     """Update existing item in Directus collection"""
     url = f"/items/{collection}/{item_id}"
-    
+
     try:
-        response = client.patch(url, json=data)
+        response = await get_client().patch(url, json=data)
         response.raise_for_status()
         logger.info(f"PATCH {collection}/{item_id} succeeded")
+        catalog_cache.invalidate(collection)
         return response.json()["data"]
     except httpx.HTTPError as e:
         logger.error(f"PATCH {collection}/{item_id} failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-def delete(collection: str, item_id: str) -> None:
+async def delete(collection: str, item_id: str) -> None:
     """Delete item from Directus collection"""
     url = f"/items/{collection}/{item_id}"
-    
+
     try:
-        response = client.delete(url)
+        response = await get_client().delete(url)
         response.raise_for_status()
         logger.info(f"DELETE {collection}/{item_id} succeeded")
+        catalog_cache.invalidate(collection)
     except httpx.HTTPError as e:
         logger.error(f"DELETE {collection}/{item_id} failed: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,201 @@
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# app/directus_query.py
+"""
+Directus query parameters for the v2 list routes, checked against an allowlist.
+
+    GET /api/v2/pieces?fields=id,name,game_catalog_uuid.name
+                      &filter[game_catalog_uuid][_eq]=3
+                      &filter[game_catalog_uuid.name][_icontains]=dune
+                      &sort=-date_created,name&limit=50&offset=100
+    GET /api/v2/plays?fields=*,playerid.*&deep[playerid][_limit]=1
+
+Every field path (in fields, filter, sort and deep) must walk the
+allowlist below: the first segment is a field of the collection, each
+further segment is a field of the collection the previous relational
+field points at, up to QUERY_MAX_DEPTH hops.  Operators are limited to
+the read-only Directus filter operators.  Anything else is a 400 before
+we ever talk to Directus.
+
+directus_query(collection) is a FastAPI dependency returning keyword
+arguments for directus_client.get_all().
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Query, Request, status
+
+from app import globals as woprvar
+
+# Directus system fields present on every collection
+SYSTEM_FIELDS = ("id", "status", "user_created", "date_created", "user_updated", "date_updated")
+
+# collection -> {field: related collection or None}
+ALLOWED_FIELDS: Dict[str, Dict[str, Optional[str]]] = {
+    "game_catalog": {
+        "uuid": None, "name": None, "min_players": None, "max_players": None,
+        "url": None, "description": None,
+    },
+    "pieces": {"uuid": None, "name": None, "game_catalog_uuid": "game_catalog"},
+    "players": {"name": None, "isbot": None},
+    "playtracker": {
+        "sessionid": "sessiontracker", "playerid": "players", "gameid": "game_catalog",
+        "note": None, "filename": None,
+    },
+    "sessiontracker": {"uuid": None, "gameid": "game_catalog"},
+    "mlimages": {
+        "uuid": None, "object_rotation": None, "object_position": None, "color_temp": None,
+        "light_intensity": None, "piece_id": "pieces", "game_catalog_id": "game_catalog",
+        "filenames": None,
+    },
+}
+for _collection, _fields in ALLOWED_FIELDS.items():
+    for _name in (*SYSTEM_FIELDS, *woprvar.QUERY_EXTRA_FIELDS.get(_collection, [])):
+        _fields.setdefault(_name, None)
+
+FILTER_OPERATORS = {
+    "_eq", "_neq", "_lt", "_lte", "_gt", "_gte", "_in", "_nin", "_null", "_nnull",
+    "_contains", "_ncontains", "_icontains", "_starts_with", "_istarts_with",
+    "_ends_with", "_iends_with", "_between", "_nbetween", "_empty", "_nempty",
+}
+DEEP_OPERATORS = {"_limit", "_offset", "_sort"}
+
+
+def _bad(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+def _check_path(collection: str, path: str, allow_wildcard: bool = False) -> Optional[str]:
+    """Validate a dotted field path; returns the collection the last segment points at"""
+    segments = path.split(".")
+    if len(segments) - 1 > woprvar.QUERY_MAX_DEPTH:
+        raise _bad(f"'{path}' is nested deeper than {woprvar.QUERY_MAX_DEPTH} relations")
+    current: Optional[str] = collection
+    for i, segment in enumerate(segments):
+        if current is None:
+            raise _bad(f"'{'.'.join(segments[:i])}' is not a relational field")
+        if segment == "*" and allow_wildcard and i == len(segments) - 1:
+            return None
+        if segment not in ALLOWED_FIELDS[current]:
+            raise _bad(f"Unknown or disallowed field '{path}' on {collection}")
+        current = ALLOWED_FIELDS[current][segment]
+    return current
+
+
+def _brackets(key: str, prefix: str) -> List[str]:
+    """'filter[a][b][_eq]' -> ['a', 'b', '_eq']"""
+    inner = key[len(prefix):]
+    if not inner.startswith("[") or not inner.endswith("]"):
+        raise _bad(f"Malformed query parameter '{key}'")
+    return inner[1:-1].split("][")
+
+
+def _parse_filter(collection: str, key: str, value: str) -> Tuple[str, str, str]:
+    parts = _brackets(key, "filter")
+    if parts[-1].startswith("_"):
+        *segments, op = parts
+    else:
+        segments, op = parts, "_eq"
+    if not segments or op not in FILTER_OPERATORS:
+        raise _bad(f"Unsupported filter '{key}'")
+    # filter[a.b][_eq] and filter[a][b][_eq] mean the same thing
+    path = ".".join(p for s in segments for p in s.split("."))
+    _check_path(collection, path)
+    return path, op, value
+
+
+def _parse_deep(collection: str, key: str, value: str) -> Tuple[str, str, Any]:
+    parts = _brackets(key, "deep")
+    if len(parts) != 2 or parts[1] not in DEEP_OPERATORS:
+        raise _bad(f"Unsupported deep parameter '{key}' (allowed: {sorted(DEEP_OPERATORS)})")
+    relation, op = parts
+    target = _check_path(collection, relation)
+    if target is None:
+        raise _bad(f"deep: '{relation}' is not a relational field")
+    if op == "_sort":
+        for field in value.split(","):
+            _check_path(target, field.lstrip("-"))
+        return relation, op, value
+    try:
+        number = int(value)
+    except ValueError:
+        raise _bad(f"deep: {op} must be an integer")
+    if number < 0:
+        raise _bad(f"deep: {op} must not be negative")
+    return relation, op, number
+
+
+def parse_query(
+    collection: str,
+    query_params,
+    fields: Optional[str] = None,
+    sort: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Validate list-route query parameters into directus_client.get_all() kwargs"""
+    kwargs: Dict[str, Any] = {}
+
+    if fields:
+        field_list = [f.strip() for f in fields.split(",") if f.strip()]
+        for field in field_list:
+            _check_path(collection, field, allow_wildcard=True)
+        kwargs["fields"] = field_list
+
+    if sort:
+        sort_list = [s.strip() for s in sort.split(",") if s.strip()]
+        for field in sort_list:
+            _check_path(collection, field.lstrip("-"))
+        kwargs["sort"] = sort_list
+
+    filters: Dict[str, Dict[str, str]] = {}
+    deep: Dict[str, Dict[str, Any]] = {}
+    for key, value in query_params.multi_items():
+        if key.startswith("filter["):
+            path, op, value = _parse_filter(collection, key, value)
+            filters.setdefault(path, {})[op] = value
+        elif key.startswith("deep["):
+            relation, op, value = _parse_deep(collection, key, value)
+            deep.setdefault(relation, {})[op] = value
+        elif key in ("filter", "deep"):
+            # Directus' JSON form isn't checked, so it isn't silently dropped either
+            raise _bad(f"Use {key}[field][_op]=value, not a JSON {key}")
+    if filters:
+        kwargs["filters"] = filters
+    if deep:
+        kwargs["deep"] = deep
+
+    if limit is not None:
+        kwargs["limit"] = limit
+    if offset:
+        kwargs["offset"] = offset
+    return kwargs
+
+
+def directus_query(collection: str) -> Callable[..., Dict[str, Any]]:
+    """FastAPI dependency: allowlisted fields/filter/sort/limit/offset/deep for collection"""
+    if collection not in ALLOWED_FIELDS:
+        raise ValueError(f"No query allowlist for collection {collection}")
+
+    def dependency(
+        request: Request,
+        fields: Optional[str] = Query(None, description="Comma-separated fields; dotted paths expand relations"),
+        sort: Optional[str] = Query(None, description="Comma-separated fields, '-' prefix for descending"),
+        limit: Optional[int] = Query(None, ge=1, le=woprvar.DIRECTUS_MAX_PAGE_SIZE),
+        offset: Optional[int] = Query(None, ge=0),
+    ) -> Dict[str, Any]:
+        return parse_query(collection, request.query_params, fields, sort, limit, offset)
+
+    return dependency
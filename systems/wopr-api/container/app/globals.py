@@ -55,24 +55,18 @@ else:
 DIRECTUS_CONFIG_ENDPOINT = f"{DIRECTUS_URL}/items/woprconfig?environment={ENVIRONMENT}"
 
 def get_directus_config():
-    """Fetch configuration from Directus CMS."""
-    import requests
+    """Fetch configuration: last snapshot if there is one, else Directus (see app/config_bootstrap.py)."""
+    from app import config_bootstrap
     try:
-        response = requests.get(DIRECTUS_CONFIG_ENDPOINT, headers=DIRECTUS_HEADERS)
-        response.raise_for_status()
-        config_data = response.json()
-        return config_data.get('data', [])
-    except requests.RequestException as e:
+        return config_bootstrap.load(DIRECTUS_CONFIG_ENDPOINT, DIRECTUS_HEADERS, ENVIRONMENT)
+    except config_bootstrap.ConfigError as e:
         print(f"Error fetching config from Directus: {e}")
+        logger.info("WOPR_CONFIG fetch failed or is invalid. Exiting.")
         exit(1)
 
-WOPR_CONFIG = get_directus_config()[0]['data']
+WOPR_CONFIG = get_directus_config()
 logger.info("WOPR_CONFIG: %s", WOPR_CONFIG)
 
-if WOPR_CONFIG['nelson'] != "haha":
-    logger.info("WOPR_CONFIG fetch failed or is invalid. Exiting.")
-    exit(1)
-
 APP_NAME = "wopr-api"
 APP_TITLE = "WOPR API"
 APP_VERSION = "0.1.5-alpha"
@@ -86,6 +80,107 @@ APP_OTEL_PORT = WOPR_CONFIG.get('tracing.portInternal', 4318)
 APP_OTEL_URL = f"{APP_OTEL_HOST}:{APP_OTEL_PORT}"
 APP_TRACING_ENABLED = WOPR_CONFIG.get('tracing.enabled', False)
 WOPR_API_URL = APP_API_URL + "/api/v1"
+
+# Directus client pool (httpx.AsyncClient opened/closed in the app lifespan)
+DIRECTUS_SETTINGS = WOPR_CONFIG.get('directus', {})
+DIRECTUS_TIMEOUT_SECONDS = float(DIRECTUS_SETTINGS.get('timeout_seconds', 30.0))
+DIRECTUS_MAX_CONNECTIONS = int(DIRECTUS_SETTINGS.get('max_connections', 100))
+DIRECTUS_MAX_KEEPALIVE_CONNECTIONS = int(DIRECTUS_SETTINGS.get('max_keepalive_connections', 20))
+DIRECTUS_KEEPALIVE_EXPIRY_SECONDS = float(DIRECTUS_SETTINGS.get('keepalive_expiry_seconds', 30.0))
+# Keyset pagination (directus_client.iter_pages): upstream page size and the cap on ?limit=
+DIRECTUS_PAGE_SIZE = int(DIRECTUS_SETTINGS.get('page_size', 500))
+DIRECTUS_MAX_PAGE_SIZE = int(DIRECTUS_SETTINGS.get('max_page_size', 2000))
+
+# Span payload capture (app/payload_capture.py); sampled independently of traces
+PAYLOAD_CAPTURE_SETTINGS = WOPR_CONFIG.get('payload_capture', {})
+PAYLOAD_CAPTURE_ENABLED = bool(PAYLOAD_CAPTURE_SETTINGS.get('enabled', True))
+PAYLOAD_CAPTURE_MAX_BYTES = int(PAYLOAD_CAPTURE_SETTINGS.get('max_bytes', 2048))
+PAYLOAD_CAPTURE_SAMPLE_RATE = float(PAYLOAD_CAPTURE_SETTINGS.get('sample_rate', 1.0))
+
+# Label Studio client pool (app/labelstudio_client.py, opened/closed in the app lifespan)
+LABEL_STUDIO_URL = WOPR_CONFIG['vision']['label_studio_url']
+LABEL_STUDIO_SETTINGS = WOPR_CONFIG.get('labelstudio', {})
+LABEL_STUDIO_TIMEOUT_SECONDS = float(LABEL_STUDIO_SETTINGS.get('timeout_seconds', 10.0))
+LABEL_STUDIO_MAX_CONNECTIONS = int(LABEL_STUDIO_SETTINGS.get('max_connections', 20))
+LABEL_STUDIO_MAX_KEEPALIVE_CONNECTIONS = int(LABEL_STUDIO_SETTINGS.get('max_keepalive_connections', 10))
+LABEL_STUDIO_PAGE_SIZE = int(LABEL_STUDIO_SETTINGS.get('page_size', 100))
+LABEL_STUDIO_PROJECT_CACHE_SECONDS = float(LABEL_STUDIO_SETTINGS.get('project_cache_seconds', 30.0))
+# Bulk mlimages import (app/labelstudio_import.py): chunked POSTs to /api/projects/{id}/import
+LABEL_STUDIO_IMPORT_CHUNK_SIZE = int(LABEL_STUDIO_SETTINGS.get('import_chunk_size', 100))
+LABEL_STUDIO_IMPORT_CONCURRENCY = int(LABEL_STUDIO_SETTINGS.get('import_concurrency', 4))
+LABEL_STUDIO_IMPORT_RETRIES = int(LABEL_STUDIO_SETTINGS.get('import_retries', 3))
+LABEL_STUDIO_IMPORT_RETRY_SECONDS = float(LABEL_STUDIO_SETTINGS.get('import_retry_seconds', 30.0))
+LABEL_STUDIO_IMPORT_TIMEOUT_SECONDS = float(LABEL_STUDIO_SETTINGS.get('import_timeout_seconds', 60.0))
+# Image URLs are served by Label Studio's local-files storage, rooted at storage base_path
+LABEL_STUDIO_LOCAL_FILES_PREFIX = LABEL_STUDIO_SETTINGS.get('local_files_prefix', '/data/local-files/?d=')
+
+# v2 list query parameters (app/directus_query.py): relation depth and extra allowlisted fields
+QUERY_SETTINGS = WOPR_CONFIG.get('query', {})
+QUERY_MAX_DEPTH = int(QUERY_SETTINGS.get('max_depth', 2))
+QUERY_EXTRA_FIELDS = {k: list(v) for k, v in QUERY_SETTINGS.get('extra_fields', {}).items()}
+
+# /api/v2/batch: sub-request cap and the default/maximum latency budget
+BATCH_SETTINGS = WOPR_CONFIG.get('batch', {})
+BATCH_MAX_REQUESTS = int(BATCH_SETTINGS.get('max_requests', 25))
+BATCH_TIMEOUT_MS = int(BATCH_SETTINGS.get('timeout_ms', 5000))
+BATCH_MAX_TIMEOUT_MS = int(BATCH_SETTINGS.get('max_timeout_ms', 30000))
+
+# WOPR_CONFIG hot reload (app/config_watcher.py): Directus poll interval, plus POST /api/v2/config/reload
+CONFIG_WATCH_SETTINGS = WOPR_CONFIG.get('config_watch', {})
+CONFIG_WATCH_ENABLED = bool(CONFIG_WATCH_SETTINGS.get('enabled', True))
+CONFIG_WATCH_INTERVAL_SECONDS = float(CONFIG_WATCH_SETTINGS.get('interval_seconds', 30.0))
+CONFIG_WEBHOOK_TOKEN = os.getenv('WOPR_CONFIG_WEBHOOK_TOKEN', '')
+
+# Camera frame relay (app/camera_relay.py): per-camera slots, queue wait, connect timeout and whole-grab deadline
+CAMERA_RELAY_SETTINGS = WOPR_CONFIG.get('camera_relay', {})
+CAMERA_RELAY_MAX_CONCURRENT = int(CAMERA_RELAY_SETTINGS.get('max_concurrent_per_camera', 4))
+CAMERA_RELAY_QUEUE_TIMEOUT_SECONDS = float(CAMERA_RELAY_SETTINGS.get('queue_timeout_seconds', 2.0))
+CAMERA_RELAY_CONNECT_TIMEOUT_SECONDS = float(CAMERA_RELAY_SETTINGS.get('connect_timeout_seconds', 2.0))
+CAMERA_RELAY_DEADLINE_SECONDS = float(CAMERA_RELAY_SETTINGS.get('deadline_seconds', 10.0))
+CAMERA_RELAY_METRICS_WINDOW = int(CAMERA_RELAY_SETTINGS.get('metrics_window', 512))
+# Per-camera budget for /stream/grab-all; the slowest camera sets the response time
+CAMERA_RELAY_GRAB_ALL_TIMEOUT_SECONDS = float(CAMERA_RELAY_SETTINGS.get('grab_all_timeout_seconds', 3.0))
+
+# System status probes (app/api/v1/status.py, app/status_db.py): pooled DB connections, per-check budget
+STATUS_SETTINGS = WOPR_CONFIG.get('status', {})
+STATUS_DB_POOL_MIN_SIZE = int(STATUS_SETTINGS.get('db_pool_min_size', 1))
+STATUS_DB_POOL_MAX_SIZE = int(STATUS_SETTINGS.get('db_pool_max_size', 4))
+STATUS_DB_CONNECT_TIMEOUT_SECONDS = float(STATUS_SETTINGS.get('db_connect_timeout_seconds', 5.0))
+STATUS_CHECK_TIMEOUT_SECONDS = float(STATUS_SETTINGS.get('check_timeout_seconds', 5.0))
+# Background prober (app/status_prober.py): /status answers from its latest run
+STATUS_PROBE_ENABLED = bool(STATUS_SETTINGS.get('probe_enabled', True))
+STATUS_PROBE_INTERVAL_SECONDS = float(STATUS_SETTINGS.get('probe_interval_seconds', 30.0))
+# Results kept per check (2880 = a day at 30s) and the /status/history windows
+STATUS_HISTORY_SIZE = int(STATUS_SETTINGS.get('history_size', 2880))
+# status_checks retention (app/status_retention.py): per-minute rollup, then batched purge
+STATUS_RETENTION_ENABLED = bool(STATUS_SETTINGS.get('retention_enabled', True))
+STATUS_MAINTENANCE_INTERVAL_SECONDS = float(STATUS_SETTINGS.get('maintenance_interval_seconds', 300.0))
+STATUS_RAW_RETENTION_HOURS = float(STATUS_SETTINGS.get('raw_retention_hours', 48.0))
+STATUS_ROLLUP_RETENTION_DAYS = float(STATUS_SETTINGS.get('rollup_retention_days', 90.0))
+STATUS_ROLLUP_CHUNK_HOURS = float(STATUS_SETTINGS.get('rollup_chunk_hours', 6.0))
+STATUS_PURGE_BATCH_SIZE = int(STATUS_SETTINGS.get('purge_batch_size', 5000))
+STATUS_PURGE_PAUSE_SECONDS = float(STATUS_SETTINGS.get('purge_pause_seconds', 0.1))
+STATUS_LOCK_TIMEOUT_MS = int(STATUS_SETTINGS.get('lock_timeout_ms', 2000))
+STATUS_HISTORY_WINDOWS_SECONDS = [float(w) for w in STATUS_SETTINGS.get('history_windows_seconds', [300, 3600, 86400])]
+
+# Catalog cache (app/catalog_cache.py); only collections listed here are cached
+CACHE_SETTINGS = WOPR_CONFIG.get('cache', {})
+CACHE_MAX_ENTRIES = int(CACHE_SETTINGS.get('max_entries', 512))
+CACHE_TTL_SECONDS = {
+    "game_catalog": 300.0,
+    "pieces": 300.0,
+    "players": 60.0,
+    **{k: float(v) for k, v in CACHE_SETTINGS.get('ttl_seconds', {}).items()},
+}
+
+# Shared async Postgres pool for the direct-SQL routers (app/db_pool.py):
+# connection_pool_size kept open, up to + max_overflow, connection_timeout_seconds to get one
+DATABASE_SETTINGS = WOPR_CONFIG.get('database', {})
+DATABASE_POOL_SIZE = int(DATABASE_SETTINGS.get('connection_pool_size', 5))
+DATABASE_MAX_OVERFLOW = int(DATABASE_SETTINGS.get('max_overflow', 10))
+DATABASE_CONNECTION_TIMEOUT_SECONDS = float(DATABASE_SETTINGS.get('connection_timeout_seconds', 30.0))
+DATABASE_METRICS_WINDOW = int(DATABASE_SETTINGS.get('metrics_window', 512))
+
 DATABASE_URL = (
     'postgresql://' + 
     os.getenv('DBUSER') + ":" + 
@@ -115,12 +210,34 @@ VISION_BASE_SUBDIR = WOPR_CONFIG['vision']['base_path']
 VISION_SOURCE_SUBDIR = WOPR_CONFIG['vision']['source_path']
 VISION_TARGET_SUBDIR = WOPR_CONFIG['vision']['target_path']
 
-storage_paths = {
-    "base_path": BASE_PATH,
-    "archive_base_path": (BASE_PATH / ARCHIVE_SUBDIR).resolve(),
-    "incoming_path": (BASE_PATH / INCOMING_SUBDIR).resolve(),
-    "vision_base_path": (BASE_PATH / VISION_BASE_SUBDIR).resolve(),
-    "labelstudio_base_path": (BASE_PATH / VISION_BASE_SUBDIR).resolve(),
-    "labelstudio_source_path": (BASE_PATH / VISION_SOURCE_SUBDIR).resolve(),
-    "labelstudio_target_path": (BASE_PATH / VISION_TARGET_SUBDIR).resolve(),
-}
\ No newline at end of file
+
+def build_storage_paths(config):
+    """storage_paths for a WOPR_CONFIG document"""
+    base_path = Path(config['storage']['base_path']).resolve()
+    return {
+        "base_path": base_path,
+        "archive_base_path": (base_path / config['storage']['archive_subdir']).resolve(),
+        "incoming_path": (base_path / config['storage']['incoming_subdir']).resolve(),
+        "vision_base_path": (base_path / config['vision']['base_path']).resolve(),
+        "labelstudio_base_path": (base_path / config['vision']['base_path']).resolve(),
+        "labelstudio_source_path": (base_path / config['vision']['source_path']).resolve(),
+        "labelstudio_target_path": (base_path / config['vision']['target_path']).resolve(),
+    }
+
+
+storage_paths = build_storage_paths(WOPR_CONFIG)
+
+
+def apply_config(config):
+    """
+    Swap in a new WOPR_CONFIG (app/config_watcher.py).
+
+    WOPR_CONFIG is rebound, never mutated, so a request holding the old
+    document keeps a consistent view.  storage_paths is updated in place
+    for modules that imported the dict.  Settings read into constants above
+    (pool sizes, cache TTLs, ...) still need a restart.
+    """
+    global WOPR_CONFIG
+    paths = build_storage_paths(config)
+    WOPR_CONFIG = config
+    storage_paths.update(paths)
@@ -0,0 +1,181 @@
+#
+# request()
+# get_project()
+# list_projects()
+# iter_tasks()
+#
+# One pooled httpx.AsyncClient for Label Studio, opened and closed by the
+# FastAPI lifespan (see app/main.py) like app.directus_client.  Sync callers
+# such as Celery tasks go through run_sync().
+#
+# Project metadata is cached for LABEL_STUDIO_PROJECT_CACHE_SECONDS because
+# the dashboards poll it; anything that changes a project's tasks calls
+# invalidate_projects().
+#
+# app/labelstudio_client.py
+
+import asyncio
+import logging
+import os
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+from fastapi import HTTPException, status
+
+from app import globals as woprvar
+from app.catalog_cache import CatalogCache
+
+logger = logging.getLogger(__name__)
+
+LABEL_STUDIO_TOKEN = os.getenv('LABEL_STUDIO_TOKEN', '')
+if not LABEL_STUDIO_TOKEN:
+    logger.warning("LABEL_STUDIO_TOKEN not set - vision endpoints will fail")
+
+# Shared async client (connection pooling), owned by the app lifespan
+client: Optional[httpx.AsyncClient] = None
+
+PROJECTS = "labelstudio.projects"
+project_cache = CatalogCache(
+    ttls={PROJECTS: woprvar.LABEL_STUDIO_PROJECT_CACHE_SECONDS},
+    max_entries=256,
+    name="labelstudio",
+)
+
+
+def _new_client() -> httpx.AsyncClient:
+    """Build the pooled Label Studio client from the globals settings"""
+    return httpx.AsyncClient(
+        base_url=woprvar.LABEL_STUDIO_URL,
+        headers={"Authorization": f"Token {LABEL_STUDIO_TOKEN}"},
+        timeout=woprvar.LABEL_STUDIO_TIMEOUT_SECONDS,
+        limits=httpx.Limits(
+            max_connections=woprvar.LABEL_STUDIO_MAX_CONNECTIONS,
+            max_keepalive_connections=woprvar.LABEL_STUDIO_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+    )
+
+
+async def open_client() -> httpx.AsyncClient:
+    """Open the shared Label Studio client (idempotent)"""
+    global client
+    if client is None or client.is_closed:
+        client = _new_client()
+        logger.info(
+            f"Label Studio client opened for {woprvar.LABEL_STUDIO_URL} "
+            f"(max_connections={woprvar.LABEL_STUDIO_MAX_CONNECTIONS})"
+        )
+    return client
+
+
+async def close_client() -> None:
+    """Close the shared Label Studio client and release pooled connections"""
+    global client
+    if client is not None:
+        await client.aclose()
+        logger.info("Label Studio client closed")
+    client = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared client, failing loudly if it can't be used"""
+    if not LABEL_STUDIO_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="LABEL_STUDIO_TOKEN not configured"
+        )
+    if client is None or client.is_closed:
+        raise HTTPException(status_code=503, detail="Label Studio client is not open")
+    return client
+
+
+def run_sync(func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+    """Run a client coroutine from synchronous code (e.g. Celery tasks)"""
+    async def _run():
+        await open_client()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            await close_client()
+
+    return asyncio.run(_run())
+
+
+async def request(method: str, path: str, **kwargs) -> httpx.Response:
+    """Call Label Studio, mapping failures onto HTTPException like the vision routes always have"""
+    try:
+        response = await get_client().request(method, path, **kwargs)
+        response.raise_for_status()
+        return response
+    except httpx.HTTPStatusError as e:
+        logger.error(f"Label Studio API error: {e.response.status_code} - {e.response.text}")
+        raise HTTPException(
+            status_code=e.response.status_code,
+            detail=f"Label Studio API error: {e.response.text}"
+        )
+    except httpx.HTTPError as e:
+        logger.error(f"Failed to reach Label Studio: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Failed to communicate with Label Studio: {str(e)}"
+        )
+
+
+async def _cached(key: str, path: str) -> Any:
+    async def load() -> Any:
+        return (await request("GET", path)).json()
+    return await project_cache.get_or_load(PROJECTS, key, load)
+
+
+async def list_projects() -> Dict[str, Any]:
+    """GET /api/projects (cached)"""
+    return await _cached("list", "/api/projects")
+
+
+async def get_project(project_id: int) -> Dict[str, Any]:
+    """GET /api/projects/{id} (cached)"""
+    return await _cached(f"project:{project_id}", f"/api/projects/{project_id}")
+
+
+def invalidate_projects() -> int:
+    """Drop cached project metadata (task counts change on every import)"""
+    return project_cache.invalidate(PROJECTS)
+
+
+async def iter_tasks(project_id: int, page_size: Optional[int] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Yield a project's tasks page by page from GET /api/tasks?project=&page=&page_size=.
+
+    The next page is requested while the caller consumes the current one.
+    Label Studio answers a page past the end with 404, which ends the
+    iteration rather than raising.
+    """
+    page_size = page_size or woprvar.LABEL_STUDIO_PAGE_SIZE
+
+    async def fetch(page: int) -> Optional[List[Dict[str, Any]]]:
+        try:
+            response = await request(
+                "GET", "/api/tasks",
+                params={"project": project_id, "page": page, "page_size": page_size},
+            )
+        except HTTPException as e:
+            if e.status_code == status.HTTP_404_NOT_FOUND and page > 1:
+                return None
+            raise
+        data = response.json()
+        # Older Label Studio returns a bare list, newer wraps it in {"tasks": [...], "total": n}
+        return data if isinstance(data, list) else data.get("tasks", [])
+
+    page = 1
+    pending = asyncio.ensure_future(fetch(page))
+    try:
+        while pending is not None:
+            tasks = await pending
+            pending = None
+            if tasks and len(tasks) == page_size:
+                page += 1
+                pending = asyncio.ensure_future(fetch(page))
+            if tasks:
+                yield tasks
+    finally:
+        if pending is not None and not pending.done():
+            pending.cancel()
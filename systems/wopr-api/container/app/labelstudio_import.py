@@ -0,0 +1,236 @@
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# app/labelstudio_import.py
+"""
+Bulk import of mlimages into a Label Studio project.
+
+Images are selected from Directus by game, piece and/or date_created range
+(keyset-paged), turned into task payloads pointing at the file under
+storage_paths['labelstudio_source_path'], and sent to
+POST /api/projects/{id}/import in chunks, a bounded number at a time.
+
+Resuming is idempotent rather than checkpointed: every task carries the
+mlimage id in data.mlimage_id, and a run first reads the project's
+existing tasks and skips anything already there.  Re-running a failed or
+interrupted import only sends what is missing.  Each chunk is retried
+with backoff before it counts as failed.
+
+Callers open directus_client and labelstudio_client first (the lifespan
+does this for the API; the Celery task does it itself).
+"""
+
+import asyncio
+import logging
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import HTTPException
+
+from app import directus_client, labelstudio_client
+from app import globals as woprvar
+
+logger = logging.getLogger(__name__)
+
+
+class ImportIncomplete(Exception):
+    """Images still failed after the last retry; args[0] is the import summary"""
+
+    def __init__(self, summary: Dict[str, Any]):
+        super().__init__(summary)
+        self.summary = summary
+
+    def __str__(self) -> str:
+        s = self.summary
+        return f"{s['failed']} of {s['queued']} images failed to import into project {s['project_id']}"
+
+MLIMAGE_FIELDS = [
+    "id", "uuid", "piece_id", "game_catalog_id", "object_position", "object_rotation",
+    "color_temp", "light_intensity", "filenames", "date_created",
+]
+
+
+def selection_filters(
+    game_catalog_id: Optional[int] = None,
+    piece_id: Optional[int] = None,
+    created_after: Optional[str] = None,
+    created_before: Optional[str] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """Directus filters for the mlimages to import"""
+    filters: Dict[str, Dict[str, Any]] = {}
+    if game_catalog_id is not None:
+        filters["game_catalog_id"] = {"_eq": game_catalog_id}
+    if piece_id is not None:
+        filters["piece_id"] = {"_eq": piece_id}
+    if created_after or created_before:
+        filters["date_created"] = {}
+        if created_after:
+            filters["date_created"]["_gte"] = created_after
+        if created_before:
+            filters["date_created"]["_lt"] = created_before
+    return filters
+
+
+def build_task(image: Dict[str, Any], source_path: Path) -> Optional[Dict[str, Any]]:
+    """Label Studio task payload for one mlimage, or None if its file isn't there"""
+    filename = (image.get("filenames") or {}).get("fullImageFilename")
+    if not filename:
+        return None
+    path = source_path / filename
+    if not path.is_file():
+        return None
+    relative = path.relative_to(woprvar.storage_paths["base_path"])
+    return {
+        "data": {
+            "image": f"{woprvar.LABEL_STUDIO_LOCAL_FILES_PREFIX}{relative}",
+            "mlimage_id": image["id"],
+            "mlimage_uuid": image.get("uuid"),
+            "piece_id": image.get("piece_id"),
+            "game_catalog_id": image.get("game_catalog_id"),
+            "object_position": image.get("object_position"),
+            "object_rotation": image.get("object_rotation"),
+            "color_temp": image.get("color_temp"),
+            "light_intensity": image.get("light_intensity"),
+        }
+    }
+
+
+async def existing_mlimage_ids(project_id: int) -> set:
+    """mlimage ids already imported into the project"""
+    seen = set()
+    async for page in labelstudio_client.iter_tasks(project_id):
+        for task in page:
+            mlimage_id = (task.get("data") or {}).get("mlimage_id")
+            if mlimage_id is not None:
+                seen.add(mlimage_id)
+    return seen
+
+
+async def _import_chunk(project_id: int, chunk: List[Dict[str, Any]]) -> int:
+    """POST one chunk, retrying with backoff; returns tasks created"""
+    attempts = woprvar.LABEL_STUDIO_IMPORT_RETRIES + 1
+    for attempt in range(1, attempts + 1):
+        try:
+            response = await labelstudio_client.request(
+                "POST", f"/api/projects/{project_id}/import", json=chunk,
+                timeout=woprvar.LABEL_STUDIO_IMPORT_TIMEOUT_SECONDS,
+            )
+            return int(response.json().get("task_count", len(chunk)))
+        except HTTPException as e:
+            # 4xx other than throttling won't get better by retrying
+            if 400 <= e.status_code < 500 and e.status_code != 429 or attempt == attempts:
+                raise
+            delay = 2 ** (attempt - 1)
+            logger.warning(f"Import chunk of {len(chunk)} failed ({e.status_code}), retry {attempt} in {delay}s")
+            await asyncio.sleep(delay)
+    raise AssertionError("unreachable")
+
+
+async def bulk_import(
+    project_id: int,
+    filters: Dict[str, Dict[str, Any]],
+    chunk_size: Optional[int] = None,
+    concurrency: Optional[int] = None,
+    dry_run: bool = False,
+    progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Import the selected mlimages into project_id; returns a summary.
+
+    progress, if given, is called with the running summary after each
+    chunk (the Celery task publishes it as task state).
+    """
+    chunk_size = chunk_size or woprvar.LABEL_STUDIO_IMPORT_CHUNK_SIZE
+    concurrency = concurrency or woprvar.LABEL_STUDIO_IMPORT_CONCURRENCY
+    source_path = woprvar.storage_paths["labelstudio_source_path"]
+    start = time.monotonic()
+
+    summary: Dict[str, Any] = {
+        "project_id": project_id,
+        "selected": 0,
+        "already_imported": 0,
+        "missing_file": 0,
+        "queued": 0,
+        "imported": 0,
+        "failed": 0,
+        "chunks_done": 0,
+        "errors": [],
+        "dry_run": dry_run,
+    }
+
+    def report():
+        summary["elapsed_seconds"] = round(time.monotonic() - start, 2)
+        if progress:
+            progress(dict(summary))
+
+    existing = await existing_mlimage_ids(project_id)
+    logger.info(f"Project {project_id} already has {len(existing)} mlimage tasks")
+
+    semaphore = asyncio.Semaphore(concurrency)
+    in_flight: List[asyncio.Task] = []
+
+    async def send(chunk: List[Dict[str, Any]]):
+        async with semaphore:
+            try:
+                created = await _import_chunk(project_id, chunk)
+                summary["imported"] += created
+            except HTTPException as e:
+                summary["failed"] += len(chunk)
+                summary["errors"].append({
+                    "first_mlimage_id": chunk[0]["data"]["mlimage_id"],
+                    "size": len(chunk),
+                    "status": e.status_code,
+                    "detail": str(e.detail)[:500],
+                })
+                logger.error(f"Import chunk starting at mlimage {chunk[0]['data']['mlimage_id']} failed: {e.detail}")
+            summary["chunks_done"] += 1
+            report()
+
+    chunk: List[Dict[str, Any]] = []
+    async for page in directus_client.iter_pages("mlimages", filters=filters, fields=MLIMAGE_FIELDS):
+        for image in page:
+            summary["selected"] += 1
+            if image["id"] in existing:
+                summary["already_imported"] += 1
+                continue
+            task = build_task(image, source_path)
+            if task is None:
+                summary["missing_file"] += 1
+                continue
+            chunk.append(task)
+            summary["queued"] += 1
+            if len(chunk) >= chunk_size:
+                if not dry_run:
+                    # Don't read ahead of the senders by more than one round of chunks
+                    in_flight = [t for t in in_flight if not t.done()]
+                    while len(in_flight) >= concurrency:
+                        await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                        in_flight = [t for t in in_flight if not t.done()]
+                    in_flight.append(asyncio.create_task(send(chunk)))
+                chunk = []
+    if chunk and not dry_run:
+        in_flight.append(asyncio.create_task(send(chunk)))
+    if in_flight:
+        await asyncio.gather(*in_flight)
+
+    if not dry_run and summary["imported"]:
+        labelstudio_client.invalidate_projects()
+    report()
+    logger.info(
+        f"Label Studio import into project {project_id}: {summary['imported']} imported, "
+        f"{summary['already_imported']} already there, {summary['missing_file']} missing files, "
+        f"{summary['failed']} failed in {summary['elapsed_seconds']}s"
+    )
+    return summary
@@ -54,8 +54,20 @@ from app.api.v2 import session
 from app.api.v2 import vision
 from app.api.v2 import players
 from app.api.v2 import plays
+from app.api.v2 import cache
+from app.api.v2 import batch
+from app.api.v1 import status as system_status
 
 from app.celery_app import celery_app
+from app import directus_client
+from app import labelstudio_client
+from app import config_watcher
+from app import camera_relay
+from app import db_pool
+from app import status_db
+from app import status_prober
+from app import status_retention
+from app.payload_capture import PayloadCaptureMiddleware, CAPTURE_REQUEST_HEADERS
 
 # Set normal logging not using woprlogg.
 configure_logging("/var/log/wopr-api.log")
@@ -78,10 +90,24 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("WOPR API starting up...")
     with tracer.start_as_current_span("app_startup") if tracer else nullcontext():
+        await directus_client.open_client()
+        await labelstudio_client.open_client()
+        await status_db.open_pool()
+        status_prober.start(system_status.probe_system)
+        status_retention.start()
+        config_watcher.start()
         logger.info("Yielding into application...")
         yield
     # Shutdown
     logger.info("WOPR API shutting down...")
+    await config_watcher.stop()
+    await status_prober.stop()
+    await status_retention.stop()
+    await directus_client.close_client()
+    await labelstudio_client.close_client()
+    await camera_relay.close_clients()
+    await status_db.close_pool()
+    await db_pool.close_pool()
 
 app = FastAPI(
     title=woprvar.APP_TITLE,
@@ -98,15 +124,6 @@ app = FastAPI(
 )
 
 if tracing_enabled:
-    CAPTURE_REQUEST_HEADERS = [
-        "accept", "accept-language", "accept-encoding",
-        "content-type", "referer", "user-agent"
-    ]
-
-    CAPTURE_RESPONSE_HEADERS = [
-        "content-type", "content-length", "cache-control"
-    ]
-    
     tracing_endpoint = woprvar.APP_OTEL_URL + "/v1/traces"
     tracer = woprtracing.create_tracer(
         tracer_name=woprvar.APP_NAME,
@@ -166,83 +183,19 @@ if tracing_enabled:
     app.include_router(vision.router, prefix="/api/v2/vision", tags=["vision"])
     app.include_router(players.router, prefix="/api/v2/players", tags=["players"])
     app.include_router(plays.router, prefix="/api/v2/plays", tags=["plays"])
-    @app.middleware("http")
-    async def capture_headers_and_payloads(request, call_next):
-        span = trace.get_current_span()
-        logger.debug(f"[MIDDLEWARE] Processing {request.method} {request.url.path}")
-        logger.debug(f"[MIDDLEWARE] Span exists: {span is not None}, Recording: {span.is_recording() if span else 'N/A'}")
-        
-        # Read request body
-        body = await request.body()
-        logger.debug(f"[MIDDLEWARE] Request body length: {len(body)}")
-        
-        # Capture request body in span
-        if span and span.is_recording() and body:
-            try:
-                body_dict = json.loads(body)
-                span.set_attribute("http.request.body", json.dumps(body_dict))
-                logger.debug("[MIDDLEWARE] Set http.request.body attribute")
-            except Exception as e:
-                logger.warning(f"[MIDDLEWARE] Failed to parse request body as JSON: {e}")
-                body_str = body.decode()[:1000]
-                span.set_attribute("http.request.body", body_str)
-                logger.debug("[MIDDLEWARE] Set http.request.body as string")
-        
-        # Reconstruct request so FastAPI can still read the body
-        async def receive():
-            return {"type": "http.request", "body": body}
-        
-        request = Request(request.scope, receive)
-        
-        # Process request
-        response = await call_next(request)
-        logger.debug(f"[MIDDLEWARE] Response status: {response.status_code}")
-        
-        # Capture response headers and body
-        if span and span.is_recording():
-            logger.debug("[MIDDLEWARE] Capturing response data")
-            span.set_attribute("middleware.test.marker", "PAYLOAD_CAPTURE_ACTIVE")
-            span.set_attribute("middleware.request.method", request.method)
-            span.set_attribute("middleware.request.path", request.url.path)
-            for key in CAPTURE_RESPONSE_HEADERS:
-                if key in response.headers:
-                    span.set_attribute(f"http.response.header.{key}", response.headers[key])
-            
-            # Capture response body
-            response_body = b""
-            try:
-                async for chunk in response.body_iterator:
-                    response_body += chunk
-                logger.debug(f"[MIDDLEWARE] Captured response body length: {len(response_body)}")
-            except Exception as e:
-                logger.error(f"[MIDDLEWARE] Failed to read response body: {e}")
-                return response
-            
-            # Store response body in span (truncate if large)
-            if response_body:
-                try:
-                    body_json = json.loads(response_body)
-                    span.set_attribute("http.response.body", json.dumps(body_json))
-                    logger.debug("[MIDDLEWARE] Set http.response.body as JSON")
-                except Exception as e:
-                    logger.warning(f"[MIDDLEWARE] Response not JSON: {e}")
-                    try:
-                        span.set_attribute("http.response.body", response_body.decode()[:1000])
-                    except UnicodeDecodeError:
-                        # Binary response (image, etc.), skip or log differently
-                        span.set_attribute("http.response.body", f"<binary data, {len(response_body)} bytes>")
-                    logger.debug("[MIDDLEWARE] Set http.response.body as string")
-            
-            # Reconstruct response with captured body
-            return Response(
-                content=response_body,
-                status_code=response.status_code,
-                headers=dict(response.headers),
-                media_type=response.media_type
-            )
-        
-        logger.debug("[MIDDLEWARE] No span recording, returning original response")
-        return response
+    app.include_router(cache.router, prefix="/api/v2/cache", tags=["cache"])
+    app.include_router(batch.router, prefix="/api/v2/batch", tags=["batch"])
+    app.include_router(system_status.router, prefix="/api/v2/status", tags=["status"])
+    if woprvar.PAYLOAD_CAPTURE_ENABLED:
+        app.add_middleware(
+            PayloadCaptureMiddleware,
+            max_bytes=woprvar.PAYLOAD_CAPTURE_MAX_BYTES,
+            sample_rate=woprvar.PAYLOAD_CAPTURE_SAMPLE_RATE,
+        )
+        logger.info(
+            f"Payload capture enabled (max_bytes={woprvar.PAYLOAD_CAPTURE_MAX_BYTES}, "
+            f"sample_rate={woprvar.PAYLOAD_CAPTURE_SAMPLE_RATE})"
+        )
 
 else:
     tracer = None
@@ -0,0 +1,165 @@
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# app/payload_capture.py
+"""
+Bounded request/response payload capture for tracing spans.
+
+Pure ASGI middleware: it tees the first `max_bytes` of each body as the
+messages pass through and never buffers, parses or rebuilds the body.
+Binary and streaming content types (images, octet-stream, multipart,
+event-stream, ndjson) are skipped.  Capture is sampled on its own
+`sample_rate`, independent of trace sampling, and only when the current
+span is recording.
+"""
+
+import logging
+import random
+from typing import Iterable, List, Optional
+
+from opentelemetry import trace
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SKIP_CONTENT_TYPES = (
+    "image/",
+    "video/",
+    "audio/",
+    "application/octet-stream",
+    "application/zip",
+    "application/pdf",
+    "multipart/",
+    "text/event-stream",
+    "application/x-ndjson",
+)
+
+CAPTURE_REQUEST_HEADERS = [
+    "accept", "accept-language", "accept-encoding",
+    "content-type", "referer", "user-agent"
+]
+
+CAPTURE_RESPONSE_HEADERS = [
+    "content-type", "content-length", "cache-control"
+]
+
+
+class _Tee:
+    """Keeps the first `limit` bytes of a body and counts the rest"""
+
+    __slots__ = ("limit", "chunks", "kept", "total")
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.chunks: List[bytes] = []
+        self.kept = 0
+        self.total = 0
+
+    def feed(self, chunk: bytes) -> None:
+        self.total += len(chunk)
+        room = self.limit - self.kept
+        if room > 0 and chunk:
+            piece = chunk[:room]
+            self.chunks.append(piece)
+            self.kept += len(piece)
+
+    def text(self) -> str:
+        return b"".join(self.chunks).decode("utf-8", errors="replace")
+
+    @property
+    def truncated(self) -> bool:
+        return self.total > self.kept
+
+
+def _header(headers: Iterable, name: bytes) -> Optional[str]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value.decode("latin-1")
+    return None
+
+
+class PayloadCaptureMiddleware:
+    """Tee the head of request/response bodies onto the current span"""
+
+    def __init__(
+        self,
+        app,
+        max_bytes: int = 2048,
+        sample_rate: float = 1.0,
+        skip_content_types: Iterable[str] = DEFAULT_SKIP_CONTENT_TYPES,
+    ):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.sample_rate = sample_rate
+        self.skip_content_types = tuple(t.lower() for t in skip_content_types)
+
+    def _skippable(self, content_type: Optional[str]) -> bool:
+        if not content_type:
+            return False
+        content_type = content_type.lower()
+        return any(content_type.startswith(t) for t in self.skip_content_types)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        span = trace.get_current_span()
+        if not span.is_recording() or random.random() >= self.sample_rate:
+            return await self.app(scope, receive, send)
+
+        span.set_attribute("middleware.request.method", scope.get("method", ""))
+        span.set_attribute("middleware.request.path", scope.get("path", ""))
+        span.set_attribute("http.payload_capture.max_bytes", self.max_bytes)
+
+        request_type = _header(scope.get("headers", []), b"content-type")
+        request_tee = None if self._skippable(request_type) else _Tee(self.max_bytes)
+        response_tee: Optional[_Tee] = None
+        request_done = False
+
+        async def receive_wrapper():
+            nonlocal request_done
+            message = await receive()
+            if request_tee is not None and message["type"] == "http.request" and not request_done:
+                request_tee.feed(message.get("body", b""))
+                if not message.get("more_body", False):
+                    request_done = True
+                    if request_tee.total:
+                        span.set_attribute("http.request.body", request_tee.text())
+                        span.set_attribute("http.request.body.size", request_tee.total)
+                        span.set_attribute("http.request.body.truncated", request_tee.truncated)
+            return message
+
+        async def send_wrapper(message):
+            nonlocal response_tee
+            if message["type"] == "http.response.start":
+                headers = message.get("headers", [])
+                for key in CAPTURE_RESPONSE_HEADERS:
+                    value = _header(headers, key.encode())
+                    if value is not None:
+                        span.set_attribute(f"http.response.header.{key}", value)
+                response_type = _header(headers, b"content-type")
+                if self._skippable(response_type):
+                    span.set_attribute("http.response.body", f"<skipped {response_type}>")
+                else:
+                    response_tee = _Tee(self.max_bytes)
+            elif message["type"] == "http.response.body" and response_tee is not None:
+                response_tee.feed(message.get("body", b""))
+                if not message.get("more_body", False) and response_tee.total:
+                    span.set_attribute("http.response.body", response_tee.text())
+                    span.set_attribute("http.response.body.size", response_tee.total)
+                    span.set_attribute("http.response.body.truncated", response_tee.truncated)
+            await send(message)
+
+        if request_tee is None and request_type:
+            span.set_attribute("http.request.body", f"<skipped {request_type}>")
+        await self.app(scope, receive_wrapper, send_wrapper)
@@ -0,0 +1,32 @@
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+# app/stats.py
+"""
+Percentiles for the rolling latency windows the metrics endpoints report
+(camera relay, status prober, DB pool) and the benchmarks print.
+"""
+
+import math
+from typing import Iterable, Optional
+
+
+def percentile(samples: Iterable[float], pct: float, digits: Optional[int] = 1) -> Optional[float]:
+    """Nearest-rank percentile of samples, rounded to digits (None: as is); None if empty"""
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    value = ordered[max(1, math.ceil(pct / 100.0 * len(ordered))) - 1]
+    return value if digits is None else round(value, digits)
@@ -0,0 +1,93 @@
+#
+# open_pool()
+# get_pool()
+# close_pool()
+# metrics()
+#
+# Shared asyncpg pool for the status probes (app/api/v1/status.py).
+#
+# The db_up/db_queriable/db_writable checks used to connect and close per
+# call, so every status page refresh opened several fresh Postgres
+# connections.  They now borrow one from this pool instead.
+#
+# The FastAPI lifespan opens the pool at startup and closes it at shutdown
+# (see app/main.py).  If Postgres is down at startup the app still boots;
+# get_pool() retries the open on the next probe, which then fails with
+# the connection error like it did before.  STATUS_DB_POOL_MIN_SIZE
+# connections are kept open, at most STATUS_DB_POOL_MAX_SIZE, and opening
+# one is bounded by STATUS_DB_CONNECT_TIMEOUT_SECONDS.
+#
+# The DSN is DATABASE_URL from the environment (the CNPG app secret).
+#
+# app/status_db.py
+
+import asyncio
+import logging
+import os
+from typing import Any, Dict, Optional
+
+import asyncpg
+
+from app import globals as woprvar
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[asyncpg.Pool] = None
+_lock: Optional[asyncio.Lock] = None
+
+
+def _dsn() -> str:
+    uri = os.getenv("DATABASE_URL")
+    if not uri:
+        raise RuntimeError("DATABASE_URL environment variable not set")
+    return uri
+
+
+async def open_pool() -> Optional[asyncpg.Pool]:
+    """Open the pool at startup; a failure is logged, not raised"""
+    try:
+        return await get_pool()
+    except Exception as e:
+        logger.warning(f"Status DB pool not opened at startup (will retry on first probe): {e}")
+        return None
+
+
+async def get_pool() -> asyncpg.Pool:
+    """The shared pool, opened on first use if the lifespan couldn't"""
+    global _pool, _lock
+    if _pool is not None:
+        return _pool
+    if _lock is None:
+        _lock = asyncio.Lock()
+    async with _lock:
+        if _pool is None:
+            _pool = await asyncpg.create_pool(
+                _dsn(),
+                min_size=woprvar.STATUS_DB_POOL_MIN_SIZE,
+                max_size=woprvar.STATUS_DB_POOL_MAX_SIZE,
+                timeout=woprvar.STATUS_DB_CONNECT_TIMEOUT_SECONDS,
+            )
+            logger.info(
+                f"Status DB pool open (min={woprvar.STATUS_DB_POOL_MIN_SIZE}, "
+                f"max={woprvar.STATUS_DB_POOL_MAX_SIZE})"
+            )
+    return _pool
+
+
+async def close_pool() -> None:
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        await pool.close()
+
+
+def metrics() -> Dict[str, Any]:
+    if _pool is None:
+        return {"open": False}
+    return {
+        "open": True,
+        "size": _pool.get_size(),
+        "idle": _pool.get_idle_size(),
+        "min_size": _pool.get_min_size(),
+        "max_size": _pool.get_max_size(),
+    }
@@ -0,0 +1,204 @@
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# app/status_prober.py
+"""
+Background system status probing.
+
+A lifespan task runs the system checks (app/api/v1/status.py) every
+STATUS_PROBE_INTERVAL_SECONDS and keeps:
+
+  - the newest SystemStatus, which GET /status serves from memory, so
+    any number of viewers cost the database and the other services
+    nothing extra;
+  - per check, a ring buffer of the last STATUS_HISTORY_SIZE results
+    (finish time, pass/fail, duration, error), which GET /status/history
+    summarises over sliding windows: success ratio and p50/p95/p99
+    latency.
+
+A request finding no recent result (prober off or stalled, or at startup)
+probes inline through probe_now(), which concurrent requests share.
+
+The probe itself is passed to start() (status.probe_system), so this
+module knows nothing about what the checks are.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from app import globals as woprvar
+from app.stats import percentile
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Sample:
+    """One check result as kept in the ring buffer"""
+    finished_at: float
+    ok: bool
+    ms: float
+    error: Optional[str] = None
+
+
+class CheckHistory:
+    """The last `size` results of one check, oldest first"""
+
+    def __init__(self, size: int):
+        self.samples: Deque[Sample] = deque(maxlen=max(1, size))
+
+    def add(self, sample: Sample) -> None:
+        self.samples.append(sample)
+
+    def window(self, seconds: float, now: Optional[float] = None) -> Dict[str, Any]:
+        """Success ratio and latency percentiles over the last `seconds`"""
+        since = (time.time() if now is None else now) - seconds
+        recent = [s for s in self.samples if s.finished_at >= since]
+        ms = [s.ms for s in recent]
+        passed = sum(1 for s in recent if s.ok)
+        return {
+            "count": len(recent),
+            "pass": passed,
+            "fail": len(recent) - passed,
+            "success_ratio": round(passed / len(recent), 4) if recent else None,
+            "p50_ms": percentile(ms, 50),
+            "p95_ms": percentile(ms, 95),
+            "p99_ms": percentile(ms, 99),
+        }
+
+    def last(self) -> Optional[Dict[str, Any]]:
+        if not self.samples:
+            return None
+        s = self.samples[-1]
+        return {"finished_at": s.finished_at, "ok": s.ok, "ms": round(s.ms, 1), "error": s.error}
+
+
+# (SystemStatus, [StatusCheck, ...])
+Probe = Callable[[], Awaitable[Tuple[Any, List[Any]]]]
+
+_history: Dict[str, CheckHistory] = {}
+_latest: Optional[Any] = None
+_latest_at: Optional[float] = None
+_task: Optional[asyncio.Task] = None
+_inflight: Optional[asyncio.Future] = None
+_stats: Dict[str, Any] = {"probes": 0, "errors": 0, "last_probe_ms": None, "last_error": None}
+
+
+def record(results: Iterable[Any]) -> None:
+    """Add StatusCheck results to their checks' ring buffers"""
+    for result in results:
+        history = _history.get(result.test_name)
+        if history is None:
+            history = _history[result.test_name] = CheckHistory(woprvar.STATUS_HISTORY_SIZE)
+        history.add(Sample(
+            finished_at=result.test_end_timestamp.timestamp(),
+            ok=result.test_result == "pass",
+            ms=(result.test_end_timestamp - result.test_start_timestamp).total_seconds() * 1000,
+            error=result.error_message,
+        ))
+
+
+async def probe_once(probe: Probe) -> Any:
+    """Run the checks once, record them and make the result the latest"""
+    global _latest, _latest_at
+    start = time.perf_counter()
+    summary, results = await probe()
+    record(results)
+    _latest, _latest_at = summary, time.monotonic()
+    _stats["probes"] += 1
+    _stats["last_probe_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return summary
+
+
+async def probe_now(probe: Probe) -> Any:
+    """probe_once(), shared: callers arriving while a probe runs wait for that one"""
+    global _inflight
+    if _inflight is None or _inflight.done():
+        _inflight = asyncio.ensure_future(probe_once(probe))
+    # A caller giving up (request cancelled) mustn't cancel the probe for the rest
+    return await asyncio.shield(_inflight)
+
+
+def running() -> bool:
+    return _task is not None and not _task.done()
+
+
+def latest(max_age: Optional[float] = None) -> Optional[Any]:
+    """The newest SystemStatus, unless there's none or it's older than max_age"""
+    if _latest is None:
+        return None
+    if max_age is not None and time.monotonic() - _latest_at > max_age:
+        return None
+    return _latest
+
+
+def history(windows: Iterable[float]) -> Dict[str, Any]:
+    now = time.time()
+    windows = list(windows)
+    return {
+        name: {
+            "last": h.last(),
+            "samples": len(h.samples),
+            "windows": {f"{w:g}": h.window(w, now) for w in windows},
+        }
+        for name, h in sorted(_history.items())
+    }
+
+
+async def _run(probe: Probe) -> None:
+    while True:
+        try:
+            await probe_now(probe)
+        except Exception as e:
+            # The checks catch their own failures; this is the probe itself breaking
+            _stats["errors"] += 1
+            _stats["last_error"] = str(e)
+            logger.error(f"Status probe failed: {e}")
+        await asyncio.sleep(woprvar.STATUS_PROBE_INTERVAL_SECONDS)
+
+
+def start(probe: Probe) -> None:
+    """Start probing (app lifespan, after the status DB pool is open)"""
+    global _task
+    if not woprvar.STATUS_PROBE_ENABLED:
+        logger.info("Status prober disabled; /status probes inline")
+        return
+    if _task is None or _task.done():
+        _task = asyncio.create_task(_run(probe), name="wopr-status-prober")
+        logger.info(f"Status prober running every {woprvar.STATUS_PROBE_INTERVAL_SECONDS}s")
+
+
+async def stop() -> None:
+    global _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+    _task = None
+
+
+def status() -> Dict[str, Any]:
+    return {
+        "probing": running(),
+        "interval_seconds": woprvar.STATUS_PROBE_INTERVAL_SECONDS,
+        "history_size": woprvar.STATUS_HISTORY_SIZE,
+        "latest_age_seconds": round(time.monotonic() - _latest_at, 1) if _latest_at is not None else None,
+        **_stats,
+    }
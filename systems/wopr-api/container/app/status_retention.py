@@ -0,0 +1,228 @@
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# app/status_retention.py
+"""
+Retention for the status_checks table.
+
+Every db_writable probe inserts a row into status_checks, so with the
+background prober (app/status_prober.py) the table grows without bound.
+A lifespan task runs maintain() every STATUS_MAINTENANCE_INTERVAL_SECONDS:
+
+  rollup  closed minutes of status_checks are summarised into
+          status_checks_minutely (minute, test_name, pass/fail/other
+          counts, total and max duration).  Starts from the newest minute
+          already rolled up (re-rolled, it's an upsert), in chunks of at
+          most STATUS_ROLLUP_CHUNK_HOURS so a large backlog doesn't become
+          one long statement.
+  purge   raw rows older than STATUS_RAW_RETENTION_HOURS, and only those
+          already rolled up, are deleted STATUS_PURGE_BATCH_SIZE at a time,
+          each batch its own short transaction with a lock_timeout, with a
+          pause between batches, so the prober's inserts never wait long.
+          Rollup rows older than STATUS_ROLLUP_RETENTION_DAYS go the same way.
+
+The functions take the asyncpg pool to use (app/status_db.py in the app),
+so a benchmark can point them at a scratch schema.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+import asyncpg
+
+from app import globals as woprvar
+from app import status_db
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_DDL = """
+CREATE TABLE IF NOT EXISTS status_checks_minutely (
+    minute TIMESTAMPTZ NOT NULL,
+    test_name VARCHAR(100) NOT NULL,
+    pass_count INTEGER NOT NULL,
+    fail_count INTEGER NOT NULL,
+    other_count INTEGER NOT NULL,  -- 'norun' and anything else
+    total_ms DOUBLE PRECISION NOT NULL,
+    max_ms DOUBLE PRECISION NOT NULL,
+    PRIMARY KEY (minute, test_name)
+);
+"""
+
+_ROLLUP_SQL = """
+INSERT INTO status_checks_minutely
+    (minute, test_name, pass_count, fail_count, other_count, total_ms, max_ms)
+SELECT
+    date_trunc('minute', created_at),
+    test_name,
+    count(*) FILTER (WHERE test_result = 'pass'),
+    count(*) FILTER (WHERE test_result = 'fail'),
+    count(*) FILTER (WHERE test_result NOT IN ('pass', 'fail')),
+    coalesce(sum(extract(epoch FROM test_end_timestamp - test_start_timestamp) * 1000), 0),
+    coalesce(max(extract(epoch FROM test_end_timestamp - test_start_timestamp) * 1000), 0)
+FROM status_checks
+WHERE created_at >= $1 AND created_at < $2
+GROUP BY 1, 2
+ON CONFLICT (minute, test_name) DO UPDATE SET
+    pass_count = EXCLUDED.pass_count,
+    fail_count = EXCLUDED.fail_count,
+    other_count = EXCLUDED.other_count,
+    total_ms = EXCLUDED.total_ms,
+    max_ms = EXCLUDED.max_ms
+"""
+
+_PURGE_RAW_SQL = """
+DELETE FROM status_checks
+WHERE id IN (
+    SELECT id FROM status_checks WHERE created_at < $1 ORDER BY created_at LIMIT $2
+)
+"""
+
+_PURGE_ROLLUP_SQL = """
+DELETE FROM status_checks_minutely
+WHERE (minute, test_name) IN (
+    SELECT minute, test_name FROM status_checks_minutely WHERE minute < $1 ORDER BY minute LIMIT $2
+)
+"""
+
+_task: Optional[asyncio.Task] = None
+_stats: Dict[str, Any] = {"runs": 0, "errors": 0, "last_run_at": None, "last_error": None, "last": None}
+
+
+def _rowcount(status: str) -> int:
+    # asyncpg returns the command tag, e.g. "DELETE 5000" or "INSERT 0 12"
+    return int(status.rsplit(" ", 1)[-1])
+
+
+async def ensure_schema(pool: asyncpg.Pool) -> None:
+    async with pool.acquire() as conn:
+        await conn.execute(ROLLUP_DDL)
+
+
+async def rollup(pool: asyncpg.Pool, until: Optional[datetime] = None) -> Dict[str, Any]:
+    """Summarise closed minutes into status_checks_minutely; returns minutes covered and rows upserted"""
+    async with pool.acquire() as conn:
+        if until is None:
+            until = await conn.fetchval("SELECT date_trunc('minute', now())")
+        start = await conn.fetchval("SELECT max(minute) FROM status_checks_minutely")
+        if start is None:
+            start = await conn.fetchval("SELECT date_trunc('minute', min(created_at)) FROM status_checks")
+        if start is None or start >= until:
+            return {"from": None, "until": until, "rows": 0}
+        chunk = timedelta(hours=woprvar.STATUS_ROLLUP_CHUNK_HOURS)
+        rows, lo = 0, start
+        while lo < until:
+            hi = min(lo + chunk, until)
+            rows += _rowcount(await conn.execute(_ROLLUP_SQL, lo, hi))
+            lo = hi
+        return {"from": start, "until": until, "rows": rows}
+
+
+async def purge(pool: asyncpg.Pool, sql: str, before: datetime) -> Dict[str, Any]:
+    """Delete in batches of STATUS_PURGE_BATCH_SIZE until none are left before `before`"""
+    deleted, batches, slowest = 0, 0, 0.0
+    while True:
+        start = time.perf_counter()
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                # Give up on a batch rather than queue behind (or in front of) a long lock
+                await conn.execute(f"SET LOCAL lock_timeout = '{int(woprvar.STATUS_LOCK_TIMEOUT_MS)}ms'")
+                count = _rowcount(await conn.execute(sql, before, woprvar.STATUS_PURGE_BATCH_SIZE))
+        slowest = max(slowest, time.perf_counter() - start)
+        deleted += count
+        batches += 1
+        if count < woprvar.STATUS_PURGE_BATCH_SIZE:
+            break
+        await asyncio.sleep(woprvar.STATUS_PURGE_PAUSE_SECONDS)
+    return {"deleted": deleted, "batches": batches, "slowest_batch_ms": round(slowest * 1000, 1)}
+
+
+async def maintain(pool: Optional[asyncpg.Pool] = None) -> Dict[str, Any]:
+    """Roll up, then purge raw rows past retention that are rolled up, then old rollups"""
+    pool = pool or await status_db.get_pool()
+    start = time.perf_counter()
+    await ensure_schema(pool)
+    rolled = await rollup(pool)
+    now = datetime.now(timezone.utc)
+    # Never purge a minute the rollup hasn't reached (the newest one is re-rolled next time)
+    raw_before = now - timedelta(hours=woprvar.STATUS_RAW_RETENTION_HOURS)
+    if rolled["until"] is not None:
+        raw_before = min(raw_before, rolled["until"] - timedelta(minutes=1))
+    raw = await purge(pool, _PURGE_RAW_SQL, raw_before)
+    rollups = await purge(pool, _PURGE_ROLLUP_SQL, now - timedelta(days=woprvar.STATUS_ROLLUP_RETENTION_DAYS))
+    return {
+        "rollup_rows": rolled["rows"],
+        "raw": raw,
+        "rollup": rollups,
+        "ms": round((time.perf_counter() - start) * 1000, 1),
+    }
+
+
+async def run_once() -> Dict[str, Any]:
+    _stats["runs"] += 1
+    try:
+        result = await maintain()
+    except Exception as e:
+        _stats["errors"] += 1
+        _stats["last_error"] = str(e)
+        raise
+    _stats["last_run_at"] = time.time()
+    _stats["last_error"] = None
+    _stats["last"] = result
+    if result["raw"]["deleted"] or result["rollup"]["deleted"]:
+        logger.info(f"status_checks maintenance: {result}")
+    return result
+
+
+async def _run() -> None:
+    while True:
+        try:
+            await run_once()
+        except Exception as e:
+            logger.warning(f"status_checks maintenance failed: {e}")
+        await asyncio.sleep(woprvar.STATUS_MAINTENANCE_INTERVAL_SECONDS)
+
+
+def start() -> None:
+    """Start the maintenance task (app lifespan, after the status DB pool is open)"""
+    global _task
+    if not woprvar.STATUS_RETENTION_ENABLED:
+        logger.info("status_checks retention disabled")
+        return
+    if _task is None or _task.done():
+        _task = asyncio.create_task(_run(), name="wopr-status-retention")
+        logger.info(f"status_checks maintenance every {woprvar.STATUS_MAINTENANCE_INTERVAL_SECONDS}s")
+
+
+async def stop() -> None:
+    global _task
+    if _task is not None:
+        _task.cancel()
+        try:
+            await _task
+        except asyncio.CancelledError:
+            pass
+    _task = None
+
+
+def status() -> Dict[str, Any]:
+    return {
+        "running": _task is not None and not _task.done(),
+        "interval_seconds": woprvar.STATUS_MAINTENANCE_INTERVAL_SECONDS,
+        "raw_retention_hours": woprvar.STATUS_RAW_RETENTION_HOURS,
+        "rollup_retention_days": woprvar.STATUS_ROLLUP_RETENTION_DAYS,
+        **_stats,
+    }
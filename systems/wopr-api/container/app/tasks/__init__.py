@@ -4,9 +4,11 @@
 import logging
 from app import globals as woprvar
 from .session_tasks import *  # noqa
+from .vision_tasks import *  # noqa
 
 # Export tasks for discovery
 __all__ = [
     'archive_session',
+    'labelstudio_bulk_import',
 ]
 
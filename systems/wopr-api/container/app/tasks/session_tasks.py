@@ -1,6 +1,6 @@
 from pathlib import Path
 from app.celery_app import celery_app
-from app.directus_client import get_one, get_all
+from app.directus_client import get_one, get_all, run_sync
 from app import globals as woprvar
 from app.logging import configure_logging
 from app.lib.safe_file import SafeFS
@@ -17,7 +17,7 @@ def archive_session(session_id: str) -> dict[str, list[dict[str, str]]]:
     """Archive a session by moving its files to the archive directory."""
     logger.info(f"Archiving session {session_id}")
     
-    session_data = get_one("sessions", session_id)
+    session_data = run_sync(get_one, "sessions", session_id)
     if not session_data:
         logger.error(f"Session {session_id} not found")
         raise ValueError(f"Session {session_id} not found")
@@ -35,7 +35,7 @@ def archive_session(session_id: str) -> dict[str, list[dict[str, str]]]:
     incoming_path = woprvar.storage_paths["incoming_path"]
     archive_path = (archive_base_path / session_uuid).resolve()
 
-    session_plays = get_all("plays", filters={"session_id": {"_eq": session_id}})
+    session_plays = run_sync(get_all, "plays", filters={"session_id": {"_eq": session_id}})
     if not session_plays:
         logger.error(f"No plays found for session {session_id}")
         raise ValueError(f"No plays found for session {session_id}")
@@ -0,0 +1,63 @@
+# Copyright 2026 Bob Bomar
+# Licensed under the Apache License, Version 2.0
+
+import asyncio
+import logging
+from typing import Optional
+
+from app.celery_app import celery_app
+from app import directus_client, labelstudio_client
+from app import globals as woprvar
+from app.labelstudio_import import ImportIncomplete, bulk_import, selection_filters
+
+logger = logging.getLogger(__name__)
+
+
+async def _run_import(project_id: int, filters: dict, chunk_size: Optional[int], dry_run: bool, progress) -> dict:
+    # No app lifespan in the worker: open both pooled clients around the run
+    await directus_client.open_client()
+    await labelstudio_client.open_client()
+    try:
+        return await bulk_import(project_id, filters, chunk_size=chunk_size, dry_run=dry_run, progress=progress)
+    finally:
+        await labelstudio_client.close_client()
+        await directus_client.close_client()
+
+
+@celery_app.task(name="labelstudio_bulk_import", bind=True, max_retries=3)
+def labelstudio_bulk_import(
+    self,
+    project_id: int,
+    game_catalog_id: Optional[int] = None,
+    piece_id: Optional[int] = None,
+    created_after: Optional[str] = None,
+    created_before: Optional[str] = None,
+    chunk_size: Optional[int] = None,
+    dry_run: bool = False,
+) -> dict:
+    """
+    Import mlimages into a Label Studio project, publishing progress as task state.
+
+    A run that ends with failed chunks retries itself; the retry skips
+    everything that already landed, so it only resends the failures.  If
+    images still fail after max_retries, ImportIncomplete (carrying the
+    summary) marks the task FAILURE.
+    """
+    filters = selection_filters(game_catalog_id, piece_id, created_after, created_before)
+    logger.info(f"Label Studio import into project {project_id} (attempt {self.request.retries + 1}), filters: {filters}")
+
+    def progress(summary: dict) -> None:
+        summary["attempt"] = self.request.retries + 1
+        self.update_state(state="PROGRESS", meta=summary)
+
+    summary = asyncio.run(_run_import(project_id, filters, chunk_size, dry_run, progress))
+    summary["attempt"] = self.request.retries + 1
+
+    if summary["failed"] and self.request.retries < self.max_retries:
+        countdown = woprvar.LABEL_STUDIO_IMPORT_RETRY_SECONDS * 2 ** self.request.retries
+        logger.warning(f"{summary['failed']} images failed to import; resuming in {countdown}s")
+        raise self.retry(countdown=countdown)
+    if summary["failed"]:
+        logger.error(f"{summary['failed']} images still failed after {summary['attempt']} attempts")
+        raise ImportIncomplete(summary)
+    return summary
@@ -0,0 +1,43 @@
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# app/webhook_token.py
+"""
+Shared-token check for the endpoints that change state (X-WOPR-Webhook-Token
+against WOPR_CONFIG_WEBHOOK_TOKEN).
+
+/config/reload only re-reads Directus, so it stays open while no token is
+configured.  Endpoints that write to the database use
+require_webhook_token, which refuses them until a token is set.
+"""
+
+import hmac
+
+from fastapi import Header, HTTPException, status
+
+from app import globals as woprvar
+
+
+def token_ok(supplied: str, required: bool = False) -> bool:
+    """Whether supplied matches the configured token (or none is configured and required is False)"""
+    if not woprvar.CONFIG_WEBHOOK_TOKEN:
+        return not required
+    return hmac.compare_digest(supplied.encode(), woprvar.CONFIG_WEBHOOK_TOKEN.encode())
+
+
+async def require_webhook_token(x_wopr_webhook_token: str = Header("")) -> None:
+    """Dependency: 403 unless X-WOPR-Webhook-Token matches a configured WOPR_CONFIG_WEBHOOK_TOKEN"""
+    if not token_ok(x_wopr_webhook_token, required=True):
+        detail = "Invalid webhook token" if woprvar.CONFIG_WEBHOOK_TOKEN else "WOPR_CONFIG_WEBHOOK_TOKEN is not set"
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# bench/batch.py
+"""
+A Streamlit-style page load: N sequential v2 calls vs one /api/v2/batch.
+
+Serves the real v2 routers with uvicorn against a fake Directus.
+--ingress-ms adds a fixed delay per client round-trip to stand in for the
+ingress hop the pages pay on every call.  A second batch with a tight
+budget shows per-sub-request 504s.
+
+    python -m bench.batch --iterations 20 --latency-ms 20 --ingress-ms 15
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from bench.fakes import FakeDirectus, ThreadedServer, install_globals, percentile
+
+PAGE_LOAD = [
+    ("games", "/api/v2/games"),
+    ("pieces", "/api/v2/pieces"),
+    ("players", "/api/v2/players"),
+    ("plays", "/api/v2/plays"),
+    ("images", "/api/v2/images/all"),
+    ("game", "/api/v2/games/1"),
+]
+
+
+def _build_app():
+    from contextlib import asynccontextmanager
+    from fastapi import FastAPI
+    from app import directus_client
+    from app.api.v2 import batch, games, images, pieces, players, plays
+
+    @asynccontextmanager
+    async def lifespan(app):
+        await directus_client.open_client()
+        yield
+        await directus_client.close_client()
+
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(games.router, prefix="/api/v2/games")
+    app.include_router(pieces.router, prefix="/api/v2/pieces")
+    app.include_router(players.router, prefix="/api/v2/players")
+    app.include_router(plays.router, prefix="/api/v2/plays")
+    app.include_router(images.router, prefix="/api/v2/images")
+    app.include_router(batch.router, prefix="/api/v2/batch")
+    # players.py turns the root logger up to DEBUG on stdout
+    logging.getLogger().setLevel(logging.WARNING)
+    return app
+
+
+async def _run(args, api: ThreadedServer) -> None:
+    import httpx
+
+    async def call(client, method, url, **kwargs):
+        await asyncio.sleep(args.ingress_ms / 1000)
+        response = await client.request(method, url, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    async with httpx.AsyncClient(base_url=api.url, timeout=None) as client:
+        sequential, batched = [], []
+        for _ in range(args.iterations):
+            start = time.perf_counter()
+            for _, path in PAGE_LOAD:
+                await call(client, "GET", path)
+            sequential.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            body = await call(client, "POST", "/api/v2/batch", json={
+                "requests": [{"id": sub_id, "path": path} for sub_id, path in PAGE_LOAD],
+            })
+            batched.append((time.perf_counter() - start) * 1000)
+            assert all(r["status"] == 200 for r in body["results"].values()), body
+
+        for name, timings in (("sequential", sequential), ("batch", batched)):
+            print(f"{name:<11} calls={len(PAGE_LOAD) if name == 'sequential' else 1} "
+                  f"p50={percentile(timings, 50):7.1f}ms p99={percentile(timings, 99):7.1f}ms")
+
+        body = await call(client, "POST", "/api/v2/batch", json={
+            "timeout_ms": max(1, int(args.latency_ms / 2)),
+            "requests": [{"id": sub_id, "path": path} for sub_id, path in PAGE_LOAD],
+        })
+        statuses = {sub_id: r["status"] for sub_id, r in body["results"].items()}
+        print(f"tight budget ({body['budget_ms']}ms): elapsed={body['elapsed_ms']}ms statuses={statuses}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch endpoint benchmark")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--ingress-ms", type=float, default=15.0)
+    args = parser.parse_args()
+
+    with FakeDirectus(latency_ms=args.latency_ms) as fake:
+        install_globals(fake.url)
+        print(f"latency={args.latency_ms}ms ingress={args.ingress_ms}ms page={len(PAGE_LOAD)} calls")
+        with ThreadedServer(_build_app()) as api:
+            asyncio.run(_run(args, api))
+
+
+if __name__ == "__main__":
+    main()
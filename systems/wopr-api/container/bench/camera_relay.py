@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# bench/camera_relay.py
+"""
+/api/v2/stream/grab: old sync requests.get route vs app.camera_relay.
+
+A fake camera serves a --frame-kb JPEG after --latency-ms, in 64KB chunks.
+--tabs concurrent previews hit each route while a sync (threadpool) route
+is polled alongside, to show whether grabs starve the threadpool.  Reports
+grab p50/p99, time to first byte, statuses, and the side route's p99.
+Each route runs in its own subprocess so neither inherits the other's
+connections or heap.
+
+    python -m bench.camera_relay --tabs 80 --latency-ms 300 --frame-kb 2048
+"""
+
+import argparse
+import asyncio
+import collections
+import json
+import subprocess
+import sys
+import time
+
+from starlette.applications import Starlette
+from starlette.responses import StreamingResponse
+from starlette.routing import Route
+
+from bench.fakes import ThreadedServer, install_globals, percentile
+
+
+def _camera(latency: float, frame: bytes) -> Starlette:
+    async def grab(request):
+        await asyncio.sleep(latency)
+
+        async def body():
+            for i in range(0, len(frame), 65536):
+                yield frame[i:i + 65536]
+                await asyncio.sleep(0)
+        return StreamingResponse(body(), media_type="image/jpeg", headers={"content-length": str(len(frame))})
+    return Starlette(routes=[Route("/grab/{camera_id}", grab)])
+
+
+def _build_app():
+    from contextlib import asynccontextmanager
+    from fastapi import FastAPI, Response
+    import requests
+    from app import globals as woprvar
+    from app import camera_relay
+    from app.api.v2 import stream
+
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        await camera_relay.close_clients()
+
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(stream.router, prefix="/api/v2/stream")
+
+    @app.get("/old/grab/{camera_id}")
+    def old_grab(camera_id: str):
+        """grab as it was: blocking requests.get, whole frame buffered"""
+        camera = woprvar.WOPR_CONFIG['camera']['camDict'][camera_id]
+        response = requests.get(f"http://{camera['host']}:{camera['port']}/grab/{camera['id']}")
+        response.raise_for_status()
+        return Response(content=response.content)
+
+    @app.get("/sync-ping")
+    def sync_ping():
+        return {"ok": True}
+
+    return app
+
+
+async def _storm(client, url: str, tabs: int) -> dict:
+    statuses = collections.Counter()
+    grabs, ttfbs, pings = [], [], []
+    done = asyncio.Event()
+
+    async def tab():
+        start = time.perf_counter()
+        async with client.stream("GET", url) as response:
+            first = None
+            async for _ in response.aiter_raw():
+                if first is None:
+                    first = time.perf_counter() - start
+            statuses[response.status_code] += 1
+            if response.status_code == 200:
+                grabs.append((time.perf_counter() - start) * 1000)
+                ttfbs.append(first * 1000)
+
+    async def pinger():
+        while not done.is_set():
+            start = time.perf_counter()
+            await client.get("/sync-ping")
+            pings.append((time.perf_counter() - start) * 1000)
+            await asyncio.sleep(0.02)
+
+    ping_task = asyncio.create_task(pinger())
+    start = time.perf_counter()
+    await asyncio.gather(*(tab() for _ in range(tabs)))
+    wall = (time.perf_counter() - start) * 1000
+    done.set()
+    await ping_task
+    return {"statuses": dict(statuses), "grabs": grabs, "ttfbs": ttfbs, "pings": pings, "wall": wall}
+
+
+async def _run(args, api: ThreadedServer) -> dict:
+    import httpx
+
+    url = {"old": "/old/grab/0", "relay": "/api/v2/stream/grab/0"}[args.route]
+    limits = httpx.Limits(max_connections=args.tabs + 10)
+    async with httpx.AsyncClient(base_url=api.url, timeout=None, limits=limits) as client:
+        r = await _storm(client, url, args.tabs)
+        metrics = (await client.get("/api/v2/stream/metrics")).json()["cameras"].get("0")
+    return {
+        "wall": r["wall"], "statuses": r["statuses"], "metrics": metrics,
+        "grab_p50": percentile(r["grabs"], 50), "grab_p99": percentile(r["grabs"], 99),
+        "ttfb_p50": percentile(r["ttfbs"], 50), "ping_p99": percentile(r["pings"], 99),
+    }
+
+
+def _child(args) -> None:
+    frame = b"\xff\xd8" + b"x" * (args.frame_kb * 1024 - 4) + b"\xff\xd9"
+    with ThreadedServer(_camera(args.latency_ms / 1000, frame)) as camera:
+        host, port = camera.url.removeprefix("http://").split(":")
+        install_globals(
+            "http://127.0.0.1:1",
+            WOPR_CONFIG={"camera": {"camDict": {"0": {"host": host, "port": port, "id": 0}}}},
+            CAMERA_RELAY_MAX_CONCURRENT=args.max_concurrent,
+            CAMERA_RELAY_QUEUE_TIMEOUT_SECONDS=args.queue_timeout,
+        )
+        with ThreadedServer(_build_app()) as api:
+            print(json.dumps(asyncio.run(_run(args, api))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Camera relay benchmark")
+    parser.add_argument("--tabs", type=int, default=80)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--frame-kb", type=int, default=2048)
+    parser.add_argument("--max-concurrent", type=int, default=8)
+    parser.add_argument("--queue-timeout", type=float, default=5.0)
+    parser.add_argument("--route", choices=["old", "relay"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.route:
+        _child(args)
+        return
+
+    print(f"tabs={args.tabs} camera_latency={args.latency_ms}ms frame={args.frame_kb}KB "
+          f"relay max_concurrent={args.max_concurrent} queue_timeout={args.queue_timeout}s")
+    for route in ("old", "relay"):
+        out = subprocess.run(
+            [sys.executable, "-m", "bench.camera_relay", "--route", route,
+             "--tabs", str(args.tabs), "--latency-ms", str(args.latency_ms), "--frame-kb", str(args.frame_kb),
+             "--max-concurrent", str(args.max_concurrent), "--queue-timeout", str(args.queue_timeout)],
+            check=True, capture_output=True, text=True,
+        ).stdout.strip().splitlines()[-1]
+        r = json.loads(out)
+        print(f"{route:<6} wall={r['wall']:8.1f}ms grab_p50={r['grab_p50']:8.1f}ms grab_p99={r['grab_p99']:8.1f}ms "
+              f"ttfb_p50={r['ttfb_p50']:8.1f}ms sync_ping_p99={r['ping_p99']:7.1f}ms statuses={r['statuses']}")
+        if r["metrics"]:
+            m = r["metrics"]
+            print(f"{'':<6} relay metrics: queue_p99={m['queue_ms_p99']}ms ttfb_p50={m['ttfb_ms_p50']}ms "
+                  f"total_p99={m['total_ms_p99']}ms busy={m['busy']} timeout={m['timeout']}")
+
+
+if __name__ == "__main__":
+    main()
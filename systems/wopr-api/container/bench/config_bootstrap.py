@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# bench/config_bootstrap.py
+"""
+Time to a usable WOPR_CONFIG with a slow Directus, as app/globals.py sees it.
+
+1. Cold: no snapshot, so load() waits on Directus (the old behaviour).
+2. Warm: snapshot written by the cold run; Directus is refreshed in the
+   background.
+3. Outage: snapshot present, Directus down.
+
+    python -m bench.config_bootstrap --latency-ms 2000
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from bench.fakes import ThreadedServer, install_globals
+
+
+def _directus(latency: float) -> Starlette:
+    async def woprconfig(request):
+        await asyncio.sleep(latency)
+        return JSONResponse({"data": [{"data": {"nelson": "haha", "baseDomain": "bench"}}]})
+    return Starlette(routes=[Route("/items/woprconfig", woprconfig)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WOPR_CONFIG bootstrap benchmark")
+    parser.add_argument("--latency-ms", type=float, default=2000.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["WOPR_CONFIG_SNAPSHOT"] = os.path.join(tmp, "woprconfig-bench.json")
+        # app/__init__.py imports app.globals, which is what we're standing in for
+        install_globals("http://127.0.0.1:1")
+        from app import config_bootstrap
+
+        with ThreadedServer(_directus(args.latency_ms / 1000)) as directus:
+            endpoint = f"{directus.url}/items/woprconfig?environment=bench"
+            for label in ("cold", "warm"):
+                start = time.perf_counter()
+                config_bootstrap.load(endpoint, {}, "bench")
+                elapsed = time.perf_counter() - start
+                print(f"{label:<7} boot={elapsed * 1000:8.1f}ms source={config_bootstrap.status()['source']}")
+
+        # Directus gone: the port is closed now
+        start = time.perf_counter()
+        config_bootstrap.load(endpoint, {}, "bench")
+        elapsed = time.perf_counter() - start
+        status = config_bootstrap.status()
+        print(f"{'outage':<7} boot={elapsed * 1000:8.1f}ms source={status['source']} age={status['age_seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
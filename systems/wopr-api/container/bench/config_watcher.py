@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# bench/config_watcher.py
+"""
+/api/v2/config/all: Directus proxy vs in-memory config with ETag/304.
+
+1. Proxy: --polls GETs for an environment other than our own, each one
+   a Directus round trip (what every environment got before).
+2. Memory: the same polls for our own environment with If-None-Match,
+   answered 304 without touching Directus.
+3. Change: edit the config upstream, POST /reload, and check the next
+   poll gets a 200 with a new ETag and version.
+
+    python -m bench.config_watcher --polls 500 --latency-ms 20
+"""
+
+import argparse
+import asyncio
+import copy
+import os
+import tempfile
+import time
+
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from bench.fakes import ThreadedServer, install_globals, percentile
+
+CONFIG = {"nelson": "haha", "camera": {"camDict": {"0": {"host": "cam0", "port": 5000, "id": 0}}}, "pad": "x" * 4096}
+
+
+class FakeConfigDirectus:
+    """woprconfig items only; counts requests"""
+
+    def __init__(self, latency_ms: float):
+        self.latency = latency_ms / 1000.0
+        self.requests = 0
+        self.config = copy.deepcopy(CONFIG)
+
+    async def woprconfig(self, request):
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        return JSONResponse({"data": [{"data": self.config}]})
+
+    def app(self) -> Starlette:
+        return Starlette(routes=[Route("/items/woprconfig", self.woprconfig)])
+
+
+def _build_app():
+    from fastapi import FastAPI
+    from app import directus_client
+    from app.api.v2 import config
+    from contextlib import asynccontextmanager
+
+    @asynccontextmanager
+    async def lifespan(app):
+        await directus_client.open_client()
+        yield
+        await directus_client.close_client()
+
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(config.router, prefix="/api/v2/config")
+    return app
+
+
+async def _polls(client, polls: int, environment: str, etag: str = "") -> list:
+    headers = {"If-None-Match": etag} if etag else {}
+
+    async def one():
+        start = time.perf_counter()
+        response = await client.get("/api/v2/config/all", params={"environment": environment}, headers=headers)
+        assert response.status_code in (200, 304), response.status_code
+        return (time.perf_counter() - start) * 1000
+    return await asyncio.gather(*(one() for _ in range(polls)))
+
+
+async def _run(args, directus: FakeConfigDirectus, api: ThreadedServer) -> None:
+    import httpx
+
+    async with httpx.AsyncClient(base_url=api.url, timeout=None) as client:
+        before = directus.requests
+        timings = await _polls(client, args.polls, "other")
+        print(f"{'proxy':<7} polls={args.polls} upstream={directus.requests - before:5d} "
+              f"p50={percentile(timings, 50):7.1f}ms p99={percentile(timings, 99):7.1f}ms")
+
+        first = await client.get("/api/v2/config/all", params={"environment": "bench"})
+        etag = first.headers["etag"]
+        before = directus.requests
+        timings = await _polls(client, args.polls, "bench", etag)
+        print(f"{'memory':<7} polls={args.polls} upstream={directus.requests - before:5d} "
+              f"p50={percentile(timings, 50):7.1f}ms p99={percentile(timings, 99):7.1f}ms (304)")
+
+        directus.config["camera"]["camDict"]["0"]["host"] = "cam0-new"
+        reload = (await client.post("/api/v2/config/reload")).json()
+        again = await client.get("/api/v2/config/all", params={"environment": "bench"},
+                                 headers={"If-None-Match": etag})
+        print(f"{'change':<7} reload changed={reload['changed']} version={reload['version']} "
+              f"status={again.status_code} new_etag={again.headers['etag'] != etag} "
+              f"host={again.json()['camera']['camDict']['0']['host']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Config hot reload benchmark")
+    parser.add_argument("--polls", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    directus = FakeConfigDirectus(args.latency_ms)
+    with tempfile.TemporaryDirectory() as tmp, ThreadedServer(directus.app()) as upstream:
+        os.environ["DIRECTUS_URL"] = upstream.url
+        os.environ["WOPR_CONFIG_SNAPSHOT"] = os.path.join(tmp, "woprconfig-bench.json")
+        install_globals(upstream.url, WOPR_CONFIG=copy.deepcopy(CONFIG))
+        print(f"polls={args.polls} latency={args.latency_ms}ms config={len(str(CONFIG))}B")
+        with ThreadedServer(_build_app()) as api:
+            asyncio.run(_run(args, directus, api))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# bench/db_pool.py
+"""
+Direct-SQL routers: psycopg.connect() per request vs app/db_pool.py.
+
+Needs a real Postgres ($DATABASE_URL).  --clients concurrent callers
+each run --requests handler bodies (one short query, as the pieces and
+mlimages lookups do):
+
+1. connect: the old get_db(), a blocking psycopg.connect() inside the
+   async handler, so every caller queues behind the one connecting
+2. pool: async with db_pool.connection(), sized by --pool-size and
+   --max-overflow
+
+Reports wall time, throughput, per-request p50/p99 and the pool's
+checkout wait percentiles.
+
+    DATABASE_URL=postgresql://... python -m bench.db_pool --clients 20 --requests 50
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+
+import psycopg
+from psycopg.rows import dict_row
+
+from bench.fakes import install_globals, percentile
+
+QUERY = "SELECT now() AS ts, %s::int AS n"
+
+
+async def _connect_per_request(dsn, n):
+    with psycopg.connect(dsn, row_factory=dict_row) as conn:
+        with conn.cursor() as cur:
+            cur.execute(QUERY, (n,))
+            return cur.fetchone()
+
+
+async def _pooled(db_pool, n):
+    async with db_pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(QUERY, (n,))
+            return await cur.fetchone()
+
+
+async def _drive(args, handler):
+    timings = []
+
+    async def client():
+        for n in range(args.requests):
+            start = time.perf_counter()
+            await handler(n)
+            timings.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(args.clients)))
+    return (time.perf_counter() - start) * 1000, timings
+
+
+def _report(label, elapsed, timings):
+    print(f"{label:<8} total={elapsed:8.1f}ms {len(timings) / elapsed * 1000:8.1f} req/s "
+          f"p50={percentile(timings, 50):7.1f}ms p99={percentile(timings, 99):7.1f}ms")
+
+
+async def _run(args, dsn):
+    from app import db_pool
+
+    elapsed, timings = await _drive(args, lambda n: _connect_per_request(dsn, n))
+    _report("connect", elapsed, timings)
+
+    await db_pool.open_pool()
+    try:
+        await _pooled(db_pool, 0)  # let the pool fill before timing
+        elapsed, timings = await _drive(args, lambda n: _pooled(db_pool, n))
+        _report("pool", elapsed, timings)
+        m = db_pool.metrics()
+        print(f"pool     checkouts={m['checkouts']} timeouts={m['timeouts']} "
+              f"wait p50={m['wait_ms_p50']}ms p95={m['wait_ms_p95']}ms p99={m['wait_ms_p99']}ms "
+              f"connections={m['pool']['pool_size']}")
+    finally:
+        await db_pool.close_pool()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Direct-SQL connection pool benchmark")
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=50, help="per client")
+    parser.add_argument("--pool-size", type=int, default=5)
+    parser.add_argument("--max-overflow", type=int, default=10)
+    args = parser.parse_args()
+
+    dsn = os.environ["DATABASE_URL"]
+    install_globals(
+        "http://127.0.0.1:1",
+        DATABASE_URL=dsn,
+        DATABASE_POOL_SIZE=args.pool_size,
+        DATABASE_MAX_OVERFLOW=args.max_overflow,
+        DATABASE_METRICS_WINDOW=args.clients * args.requests,
+    )
+    logging.getLogger().setLevel(logging.CRITICAL)
+    print(f"clients={args.clients} x {args.requests} requests, "
+          f"pool={args.pool_size}+{args.max_overflow}")
+    asyncio.run(_run(args, dsn))
+
+
+if __name__ == "__main__":
+    main()
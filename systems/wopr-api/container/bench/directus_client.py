@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# bench/directus_client.py
+"""
+Load benchmark: blocking httpx.Client vs pooled httpx.AsyncClient.
+
+Simulates N concurrent "handlers" on one event loop, each doing a get_all()
+against a fake Directus with fixed latency.  The blocking variant is the old
+module-level httpx.Client called from async def handlers; the async variant
+is app.directus_client as used by the v2 routers.  Event-loop lag is sampled
+by a ticker coroutine while the load runs; it is the delay every other
+request on the worker would see, so it is the number that matters.
+
+    python -m bench.directus_client --concurrency 50 --requests 500 --latency-ms 20
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from bench.fakes import FakeDirectus, install_globals, percentile
+
+
+async def _ticker(lags: list, stop: asyncio.Event, interval: float = 0.005) -> None:
+    """Record how late the loop wakes us up (event-loop blocking)"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append((time.perf_counter() - start - interval) * 1000)
+
+
+async def _drive(call, total: int, concurrency: int) -> dict:
+    latencies = []
+    lags = []
+    stop = asyncio.Event()
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with sem:
+            start = time.perf_counter()
+            await call()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    ticker = asyncio.create_task(_ticker(lags, stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    wall = time.perf_counter() - start
+    stop.set()
+    await ticker
+    return {
+        "wall_s": wall,
+        "rps": total / wall,
+        "p50_ms": percentile(latencies, 50),
+        "p99_ms": percentile(latencies, 99),
+        "loop_lag_p99_ms": percentile(lags, 99),
+        "loop_lag_max_ms": max(lags) if lags else 0.0,
+    }
+
+
+async def run_blocking(url: str, total: int, concurrency: int) -> dict:
+    client = httpx.Client(base_url=url, timeout=30.0)
+
+    async def call():
+        # What the v2 handlers used to do: a sync round-trip inside async def
+        response = client.get("/items/game_catalog")
+        response.raise_for_status()
+        return response.json()["data"]
+
+    try:
+        return await _drive(call, total, concurrency)
+    finally:
+        client.close()
+
+
+async def run_async(total: int, concurrency: int) -> dict:
+    from app import directus_client
+
+    await directus_client.open_client()
+    try:
+        return await _drive(lambda: directus_client.get_all("game_catalog"), total, concurrency)
+    finally:
+        await directus_client.close_client()
+
+
+def _report(name: str, result: dict) -> None:
+    print(
+        f"{name:<10} wall={result['wall_s']:.2f}s rps={result['rps']:.1f} "
+        f"p50={result['p50_ms']:.1f}ms p99={result['p99_ms']:.1f}ms "
+        f"loop_lag_p99={result['loop_lag_p99_ms']:.1f}ms loop_lag_max={result['loop_lag_max_ms']:.1f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Directus client load benchmark")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--max-connections", type=int, default=100)
+    parser.add_argument("--max-keepalive", type=int, default=20)
+    args = parser.parse_args()
+
+    with FakeDirectus(latency_ms=args.latency_ms) as fake:
+        install_globals(
+            fake.url,
+            DIRECTUS_MAX_CONNECTIONS=args.max_connections,
+            DIRECTUS_MAX_KEEPALIVE_CONNECTIONS=args.max_keepalive,
+        )
+        print(
+            f"fake Directus at {fake.url}, latency={args.latency_ms}ms, "
+            f"requests={args.requests}, concurrency={args.concurrency}"
+        )
+        _report("blocking", asyncio.run(run_blocking(fake.url, args.requests, args.concurrency)))
+        _report("async", asyncio.run(run_async(args.requests, args.concurrency)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# bench/fakes.py
+"""
+Local stand-ins used by the benchmarks.
+
+app/globals.py fetches WOPR_CONFIG from Directus at import time, so the
+benchmarks register a small replacement module before importing anything
+from app.  FakeDirectus serves /items/{collection} on 127.0.0.1 with a fixed
+artificial latency so client behaviour can be measured without a cluster.
+"""
+
+import asyncio
+import os
+import socket
+import sys
+import threading
+import time
+import types
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+
+def install_globals(directus_url: str, **overrides: Any) -> types.ModuleType:
+    """Register a minimal app.globals pointing at directus_url"""
+    mod = types.ModuleType("app.globals")
+    mod.APP_NAME = "wopr-api"
+    mod.APP_VERSION = "bench"
+    mod.DIRECTUS_URL = directus_url
+    mod.DIRECTUS_HEADERS = {}
+    mod.DIRECTUS_TIMEOUT_SECONDS = 30.0
+    mod.DIRECTUS_MAX_CONNECTIONS = 100
+    mod.DIRECTUS_MAX_KEEPALIVE_CONNECTIONS = 20
+    mod.DIRECTUS_KEEPALIVE_EXPIRY_SECONDS = 30.0
+    mod.DIRECTUS_PAGE_SIZE = 500
+    mod.DIRECTUS_MAX_PAGE_SIZE = 2000
+    mod.LABEL_STUDIO_URL = directus_url
+    mod.LABEL_STUDIO_TIMEOUT_SECONDS = 10.0
+    mod.LABEL_STUDIO_MAX_CONNECTIONS = 20
+    mod.LABEL_STUDIO_MAX_KEEPALIVE_CONNECTIONS = 10
+    mod.LABEL_STUDIO_PAGE_SIZE = 100
+    mod.LABEL_STUDIO_PROJECT_CACHE_SECONDS = 30.0
+    mod.LABEL_STUDIO_IMPORT_CHUNK_SIZE = 100
+    mod.LABEL_STUDIO_IMPORT_CONCURRENCY = 4
+    mod.LABEL_STUDIO_IMPORT_RETRIES = 3
+    mod.LABEL_STUDIO_IMPORT_RETRY_SECONDS = 30.0
+    mod.LABEL_STUDIO_IMPORT_TIMEOUT_SECONDS = 60.0
+    mod.LABEL_STUDIO_LOCAL_FILES_PREFIX = "/data/local-files/?d="
+    mod.QUERY_MAX_DEPTH = 2
+    mod.QUERY_EXTRA_FIELDS = {}
+    mod.BATCH_MAX_REQUESTS = 25
+    mod.BATCH_TIMEOUT_MS = 5000
+    mod.BATCH_MAX_TIMEOUT_MS = 30000
+    # Catalog cache off unless a benchmark opts in with CACHE_TTL_SECONDS=...
+    mod.CACHE_MAX_ENTRIES = 512
+    mod.CACHE_TTL_SECONDS = {}
+    mod.CAMERA_RELAY_MAX_CONCURRENT = 4
+    mod.CAMERA_RELAY_QUEUE_TIMEOUT_SECONDS = 2.0
+    mod.CAMERA_RELAY_CONNECT_TIMEOUT_SECONDS = 2.0
+    mod.CAMERA_RELAY_DEADLINE_SECONDS = 10.0
+    mod.CAMERA_RELAY_METRICS_WINDOW = 512
+    mod.CAMERA_RELAY_GRAB_ALL_TIMEOUT_SECONDS = 3.0
+    mod.DATABASE_URL = os.environ.get("DATABASE_URL", "postgresql://127.0.0.1:1/wopr")
+    mod.DATABASE_POOL_SIZE = 5
+    mod.DATABASE_MAX_OVERFLOW = 10
+    mod.DATABASE_CONNECTION_TIMEOUT_SECONDS = 30.0
+    mod.DATABASE_METRICS_WINDOW = 512
+    mod.STATUS_DB_POOL_MIN_SIZE = 1
+    mod.STATUS_DB_POOL_MAX_SIZE = 4
+    mod.STATUS_DB_CONNECT_TIMEOUT_SECONDS = 5.0
+    mod.STATUS_CHECK_TIMEOUT_SECONDS = 5.0
+    mod.STATUS_PROBE_ENABLED = True
+    mod.STATUS_PROBE_INTERVAL_SECONDS = 30.0
+    mod.STATUS_HISTORY_SIZE = 2880
+    mod.STATUS_HISTORY_WINDOWS_SECONDS = [300.0, 3600.0, 86400.0]
+    mod.STATUS_RETENTION_ENABLED = True
+    mod.STATUS_MAINTENANCE_INTERVAL_SECONDS = 300.0
+    mod.STATUS_RAW_RETENTION_HOURS = 48.0
+    mod.STATUS_ROLLUP_RETENTION_DAYS = 90.0
+    mod.STATUS_ROLLUP_CHUNK_HOURS = 6.0
+    mod.STATUS_PURGE_BATCH_SIZE = 5000
+    mod.STATUS_PURGE_PAUSE_SECONDS = 0.1
+    mod.STATUS_LOCK_TIMEOUT_MS = 2000
+    mod.ENVIRONMENT = "bench"
+    mod.CONFIG_WATCH_ENABLED = False
+    mod.CONFIG_WATCH_INTERVAL_SECONDS = 30.0
+    mod.CONFIG_WEBHOOK_TOKEN = ""
+    mod.WOPR_CONFIG = {}
+    mod.apply_config = lambda config: setattr(mod, "WOPR_CONFIG", config)
+    mod.storage_paths = {"base_path": Path("/tmp")}
+    for key, value in overrides.items():
+        setattr(mod, key, value)
+
+    # Register before importing app: app/__init__.py imports app.globals
+    sys.modules["app.globals"] = mod
+    import app
+    app.globals = mod
+    return mod
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _ordered(value: Any) -> Any:
+    """Numeric comparison for numeric values (ids), string otherwise"""
+    try:
+        return (0, float(value))
+    except (TypeError, ValueError):
+        return (1, str(value))
+
+
+def make_rows(collection: str, count: int) -> List[Dict[str, Any]]:
+    """Deterministic rows with a few columns of realistic width"""
+    return [
+        {
+            "id": i,
+            "name": f"{collection}-{i}",
+            "description": "x" * 64,
+            "date_created": f"2026-01-01T00:{(i // 60) % 60:02d}:{i % 60:02d}Z",
+            "game_catalog_id": i % 7,
+            "piece_id": i % 31,
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+class FakeDirectus:
+    """Threaded uvicorn server emulating the Directus items API"""
+
+    def __init__(self, latency_ms: float = 20.0, rows: int = 50):
+        self.latency = latency_ms / 1000.0
+        self.rows = rows
+        self.port = _free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.requests = 0
+        self._collections: Dict[str, List[Dict[str, Any]]] = {}
+        self._server: Optional["ThreadedServer"] = None
+
+    def collection(self, name: str) -> List[Dict[str, Any]]:
+        if name not in self._collections:
+            self._collections[name] = make_rows(name, self.rows)
+        return self._collections[name]
+
+    async def _items(self, request: Request) -> JSONResponse:
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        rows = self.collection(request.path_params["collection"])
+        params = request.query_params
+        for key, value in params.items():
+            # filter[field][_eq]=value and filter[field][_gt]=value only
+            if key.startswith("filter["):
+                field, _, op = key[len("filter["):].rstrip("]").partition("][")
+                if op == "_eq":
+                    rows = [r for r in rows if str(r.get(field)) == value]
+                elif op == "_gt":
+                    rows = [r for r in rows if _ordered(r.get(field)) > _ordered(value)]
+                elif op == "_lt":
+                    rows = [r for r in rows if _ordered(r.get(field)) < _ordered(value)]
+        if "sort" in params:
+            for key in reversed(params["sort"].split(",")):
+                rows = sorted(rows, key=lambda r: r.get(key.lstrip("-")), reverse=key.startswith("-"))
+        offset = int(params.get("offset", 0))
+        limit = int(params.get("limit", -1))
+        rows = rows[offset:] if limit < 0 else rows[offset:offset + limit]
+        if "fields" in params and params["fields"] != "*":
+            keep = params["fields"].split(",")
+            rows = [{k: r.get(k) for k in keep} for r in rows]
+        return JSONResponse({"data": rows})
+
+    async def _item(self, request: Request) -> JSONResponse:
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        rows = self.collection(request.path_params["collection"])
+        item_id = request.path_params["item_id"]
+        if request.method == "DELETE":
+            return JSONResponse(None, status_code=204)
+        match = next((r for r in rows if str(r["id"]) == item_id), {"id": item_id})
+        if request.method == "PATCH":
+            match = {**match, **(await request.json())}
+        return JSONResponse({"data": match})
+
+    async def _create(self, request: Request) -> JSONResponse:
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        return JSONResponse({"data": {"id": self.rows + 1, **(await request.json())}})
+
+    def _app(self) -> Starlette:
+        return Starlette(routes=[
+            Route("/items/{collection}", self._items, methods=["GET"]),
+            Route("/items/{collection}", self._create, methods=["POST"]),
+            Route("/items/{collection}/{item_id}", self._item, methods=["GET", "PATCH", "DELETE"]),
+        ])
+
+    def __enter__(self) -> "FakeDirectus":
+        self._server = ThreadedServer(self._app(), self.port).__enter__()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.__exit__(*exc)
+
+
+class FakeLabelStudio:
+    """Threaded uvicorn server emulating the Label Studio projects/tasks API"""
+
+    def __init__(self, latency_ms: float = 20.0, tasks: int = 1000, per_task_ms: float = 0.0):
+        self.latency = latency_ms / 1000.0
+        # Extra latency per task returned, to model LS serializing big pages
+        self.per_task = per_task_ms / 1000.0
+        self.port = _free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.requests = 0
+        self.tasks: List[Dict[str, Any]] = [
+            {"id": i, "project": 1, "data": {"image": f"/data/local-files/?d=source/{i}.jpg"},
+             "annotations": [], "predictions": [], "meta": {"note": "x" * 64}}
+            for i in range(1, tasks + 1)
+        ]
+        self._server: Optional["ThreadedServer"] = None
+
+    async def _projects(self, request: Request) -> JSONResponse:
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        return JSONResponse({"count": 1, "results": [{"id": 1, "title": "bench", "task_number": len(self.tasks)}]})
+
+    async def _project(self, request: Request) -> JSONResponse:
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        return JSONResponse({"id": int(request.path_params["project_id"]), "title": "bench",
+                             "task_number": len(self.tasks)})
+
+    async def _task_list(self, request: Request) -> JSONResponse:
+        self.requests += 1
+        params = request.query_params
+        page = int(params.get("page", 1))
+        size = int(params.get("page_size", len(self.tasks) or 1))
+        rows = self.tasks[(page - 1) * size:page * size]
+        await asyncio.sleep(self.latency + self.per_task * len(rows))
+        if not rows and page > 1:
+            return JSONResponse({"detail": "Invalid page."}, status_code=404)
+        return JSONResponse({"tasks": rows, "total": len(self.tasks)})
+
+    async def _project_tasks(self, request: Request) -> JSONResponse:
+        """Old unpaginated project tasks endpoint"""
+        self.requests += 1
+        await asyncio.sleep(self.latency + self.per_task * len(self.tasks))
+        return JSONResponse(self.tasks)
+
+    async def _create_task(self, request: Request) -> JSONResponse:
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        body = await request.json()
+        task = {"id": len(self.tasks) + 1, "project": int(request.path_params["project_id"]), "data": body["data"]}
+        self.tasks.append(task)
+        return JSONResponse(task, status_code=201)
+
+    async def _import(self, request: Request) -> JSONResponse:
+        self.requests += 1
+        body = await request.json()
+        await asyncio.sleep(self.latency + self.per_task * len(body))
+        start = len(self.tasks) + 1
+        for i, item in enumerate(body):
+            self.tasks.append({"id": start + i, "project": int(request.path_params["project_id"]), **item})
+        return JSONResponse({"task_count": len(body), "task_ids": list(range(start, start + len(body)))},
+                            status_code=201)
+
+    def _app(self) -> Starlette:
+        return Starlette(routes=[
+            Route("/api/projects", self._projects, methods=["GET"]),
+            Route("/api/projects/{project_id}", self._project, methods=["GET"]),
+            Route("/api/projects/{project_id}/tasks", self._project_tasks, methods=["GET"]),
+            Route("/api/projects/{project_id}/tasks", self._create_task, methods=["POST"]),
+            Route("/api/projects/{project_id}/import", self._import, methods=["POST"]),
+            Route("/api/tasks", self._task_list, methods=["GET"]),
+        ])
+
+    def __enter__(self) -> "FakeLabelStudio":
+        self._server = ThreadedServer(self._app(), self.port).__enter__()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.__exit__(*exc)
+
+
+class ThreadedServer:
+    """Run an ASGI app under uvicorn on a background thread"""
+
+    def __init__(self, app: Any, port: Optional[int] = None):
+        self.app = app
+        self.port = port or _free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self._server: Optional[uvicorn.Server] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "ThreadedServer":
+        config = uvicorn.Config(self.app, host="127.0.0.1", port=self.port, log_level="warning")
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self._server.started:
+            if time.monotonic() > deadline:
+                raise RuntimeError("benchmark server did not start")
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=5)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """app.stats.percentile, unrounded and 0.0 when empty (call after install_globals)"""
+    from app.stats import percentile as nearest_rank
+    value = nearest_rank(values, pct, digits=None)
+    return 0.0 if value is None else value
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# bench/grab_all.py
+"""
+Rendering every camera preview: one grab per camera in turn vs grab-all.
+
+Fake cameras answer after --latencies-ms (one camera each, each its own
+host:port) with a --frame-kb JPEG; --dead adds a camera that never
+answers within the grab-all timeout.  Reports the wall time for a page's
+worth of previews each way over --rounds rounds.
+
+    python -m bench.grab_all --latencies-ms 120,250,400 --frame-kb 512 --dead
+"""
+
+import argparse
+import asyncio
+import contextlib
+import time
+
+from starlette.applications import Starlette
+from starlette.responses import Response
+from starlette.routing import Route
+
+from bench.fakes import ThreadedServer, install_globals, percentile
+
+
+def _camera(latency: float, frame: bytes) -> Starlette:
+    async def grab(request):
+        await asyncio.sleep(latency)
+        return Response(frame, media_type="image/jpeg")
+    return Starlette(routes=[Route("/grab/{camera_id}", grab)])
+
+
+def _build_app():
+    from contextlib import asynccontextmanager
+    from fastapi import FastAPI
+    from app import camera_relay
+    from app.api.v2 import stream
+
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        await camera_relay.close_clients()
+
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(stream.router, prefix="/api/v2/stream")
+    return app
+
+
+async def _run(args, api: ThreadedServer, camera_ids) -> None:
+    import httpx
+
+    async with httpx.AsyncClient(base_url=api.url, timeout=None) as client:
+        sequential, fanout, multipart = [], [], []
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            for camera_id in camera_ids:
+                with contextlib.suppress(httpx.ReadTimeout):
+                    await client.get(f"/api/v2/stream/grab/{camera_id}", timeout=args.timeout)
+            sequential.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            r = await client.get("/api/v2/stream/grab-all")
+            fanout.append((time.perf_counter() - start) * 1000)
+            manifest = r.json()["cameras"]
+
+            start = time.perf_counter()
+            r = await client.get("/api/v2/stream/grab-all", params={"format": "multipart"})
+            multipart.append((time.perf_counter() - start) * 1000)
+
+    for label, timings in (("one by one", sequential), ("grab-all json", fanout), ("grab-all multipart", multipart)):
+        print(f"{label:<20} p50={percentile(timings, 50):8.1f}ms p99={percentile(timings, 99):8.1f}ms")
+    print("last manifest:", [(c["camera_id"], c["status"], c["ms"], c.get("bytes", c.get("error"))) for c in manifest])
+    print("multipart:", r.headers["content-type"].split(";")[0], r.headers["x-cameras-ok"], "of", r.headers["x-cameras"], "ok")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="grab-all benchmark")
+    parser.add_argument("--latencies-ms", default="120,250,400")
+    parser.add_argument("--frame-kb", type=int, default=512)
+    parser.add_argument("--dead", action="store_true", help="add a camera slower than the timeout")
+    parser.add_argument("--timeout", type=float, default=1.0, help="per-camera timeout (s)")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    latencies = [float(ms) / 1000 for ms in args.latencies_ms.split(",")]
+    if args.dead:
+        latencies.append(args.timeout * 5)
+    frame = b"\xff\xd8" + b"x" * (args.frame_kb * 1024 - 4) + b"\xff\xd9"
+    with contextlib.ExitStack() as stack:
+        cam_dict = {}
+        for i, latency in enumerate(latencies):
+            camera = stack.enter_context(ThreadedServer(_camera(latency, frame)))
+            host, port = camera.url.removeprefix("http://").split(":")
+            cam_dict[str(i)] = {"host": host, "port": port, "id": i}
+        install_globals(
+            "http://127.0.0.1:1",
+            WOPR_CONFIG={"camera": {"camDict": cam_dict}},
+            CAMERA_RELAY_GRAB_ALL_TIMEOUT_SECONDS=args.timeout,
+        )
+        print(f"cameras={len(cam_dict)} latencies={[round(l * 1000) for l in latencies]}ms "
+              f"frame={args.frame_kb}KB timeout={args.timeout}s")
+        api = stack.enter_context(ThreadedServer(_build_app()))
+        asyncio.run(_run(args, api, list(cam_dict)))
+
+
+if __name__ == "__main__":
+    main()
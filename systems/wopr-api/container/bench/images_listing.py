@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# bench/images_listing.py
+"""
+/api/v2/images/all: one-shot JSON list vs keyset pages vs NDJSON stream.
+
+Serves the real images router with uvicorn against a fake Directus holding
+--rows mlimages rows.  Reports time to first byte, total time and the peak
+Python heap (tracemalloc, whole process) for each mode.  The client discards
+the body as it arrives, so the difference between modes is the API's own
+buffering.
+
+    python -m bench.images_listing --rows 50000 --latency-ms 20
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from bench.fakes import FakeDirectus, ThreadedServer, install_globals
+
+
+async def _measure(client, url: str, params: dict) -> dict:
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    first = None
+    size = 0
+    async with client.stream("GET", url, params=params) as response:
+        response.raise_for_status()
+        async for chunk in response.aiter_raw():
+            if first is None:
+                first = time.perf_counter() - start
+            size += len(chunk)
+    total = time.perf_counter() - start
+    return {
+        "ttfb_ms": (first or total) * 1000,
+        "total_ms": total * 1000,
+        "bytes": size,
+        "peak_heap_mb": tracemalloc.get_traced_memory()[1] / 1e6,
+    }
+
+
+async def _walk_pages(client, url: str, limit: int) -> dict:
+    """Follow X-Next-Cursor the way a paging client would"""
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    params = {"limit": limit}
+    rows = 0
+    pages = 0
+    while True:
+        response = await client.get(url, params=params)
+        response.raise_for_status()
+        rows += len(response.json())
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params = {"limit": limit, "after": cursor}
+    return {
+        "total_ms": (time.perf_counter() - start) * 1000,
+        "rows": rows,
+        "pages": pages,
+        "peak_heap_mb": tracemalloc.get_traced_memory()[1] / 1e6,
+    }
+
+
+def _build_app():
+    from contextlib import asynccontextmanager
+    from fastapi import FastAPI
+    from app import directus_client
+    from app.api.v2 import images
+
+    @asynccontextmanager
+    async def lifespan(app):
+        await directus_client.open_client()
+        yield
+        await directus_client.close_client()
+
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(images.router, prefix="/api/v2/images")
+    return app
+
+
+async def _run(args, fake: FakeDirectus, api: ThreadedServer) -> None:
+    import httpx
+
+    tracemalloc.start()
+    try:
+        async with httpx.AsyncClient(base_url=api.url, timeout=None) as client:
+            url = "/api/v2/images/all"
+            for name, params in (("json (all rows)", {}), ("ndjson stream", {"stream": "true"})):
+                before = fake.requests
+                result = await _measure(client, url, params)
+                print(
+                    f"{name:<16} ttfb={result['ttfb_ms']:8.1f}ms total={result['total_ms']:8.1f}ms "
+                    f"bytes={result['bytes']:>10} peak_heap={result['peak_heap_mb']:7.1f}MB "
+                    f"upstream_requests={fake.requests - before}"
+                )
+            result = await _walk_pages(client, url, args.page_size)
+            print(
+                f"{'keyset pages':<16} total={result['total_ms']:8.1f}ms rows={result['rows']} "
+                f"pages={result['pages']} peak_heap={result['peak_heap_mb']:7.1f}MB"
+            )
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="mlimages listing benchmark")
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--page-size", type=int, default=500)
+    args = parser.parse_args()
+
+    with FakeDirectus(latency_ms=args.latency_ms, rows=args.rows) as fake:
+        install_globals(fake.url, DIRECTUS_PAGE_SIZE=args.page_size)
+        print(f"rows={args.rows} latency={args.latency_ms}ms page_size={args.page_size}")
+        with ThreadedServer(_build_app()) as api:
+            asyncio.run(_run(args, fake, api))
+
+
+if __name__ == "__main__":
+    main()
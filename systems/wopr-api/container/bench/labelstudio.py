@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# bench/labelstudio.py
+"""
+Vision routes against a fake Label Studio: old per-call clients vs the pooled client.
+
+1. Task listing: the old route (fresh AsyncClient, one unpaginated
+   /api/projects/{id}/tasks response parsed in full and re-serialized,
+   mounted at /old/...) vs the new streamed
+   /api/v2/vision/projects/{id}/tasks.  Time to first byte, total time and
+   peak Python heap (whole process, so both include the fake server).
+2. Dashboard polling: --polls concurrent get_project calls, old (fresh
+   client per call) vs new (pooled + project cache).  Upstream request
+   count and p50/p99.
+
+    python -m bench.labelstudio --tasks 20000 --per-task-us 50 --polls 200
+"""
+
+import argparse
+import asyncio
+import os
+import time
+import tracemalloc
+
+from bench.fakes import FakeLabelStudio, ThreadedServer, install_globals, percentile
+
+os.environ.setdefault("LABEL_STUDIO_TOKEN", "bench")
+
+
+def _build_app():
+    from contextlib import asynccontextmanager
+    from fastapi import FastAPI
+    from app import globals as woprvar
+    from app import labelstudio_client
+    from app.api.v2 import vision
+
+    @asynccontextmanager
+    async def lifespan(app):
+        await labelstudio_client.open_client()
+        yield
+        await labelstudio_client.close_client()
+
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(vision.router, prefix="/api/v2/vision")
+
+    @app.get("/old/projects/{project_id}/tasks")
+    async def old_list_tasks(project_id: int):
+        """list_tasks as it was before the pooled client"""
+        import httpx
+        async with httpx.AsyncClient(timeout=None) as client:
+            response = await client.get(f"{woprvar.LABEL_STUDIO_URL}/api/projects/{project_id}/tasks")
+            response.raise_for_status()
+            return response.json()
+
+    return app
+
+
+async def _timed_stream(client, url: str) -> dict:
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    first = None
+    async with client.stream("GET", url) as response:
+        response.raise_for_status()
+        async for _ in response.aiter_raw():
+            if first is None:
+                first = time.perf_counter() - start
+    total = time.perf_counter() - start
+    return {"ttfb_ms": (first or total) * 1000, "total_ms": total * 1000,
+            "peak_heap_mb": tracemalloc.get_traced_memory()[1] / 1e6}
+
+
+async def _poll(call, polls: int) -> list:
+    async def one():
+        start = time.perf_counter()
+        await call()
+        return (time.perf_counter() - start) * 1000
+    return await asyncio.gather(*(one() for _ in range(polls)))
+
+
+async def _run(args, ls: FakeLabelStudio, api: ThreadedServer) -> None:
+    import httpx
+
+    tracemalloc.start()
+    try:
+        async with httpx.AsyncClient(base_url=api.url, timeout=None) as client:
+            result = await _timed_stream(client, "/old/projects/1/tasks")
+            print(f"{'old list_tasks':<18} ttfb={result['ttfb_ms']:8.1f}ms total={result['total_ms']:8.1f}ms "
+                  f"peak_heap={result['peak_heap_mb']:7.1f}MB upstream_pages=1")
+            before = ls.requests
+            result = await _timed_stream(client, "/api/v2/vision/projects/1/tasks")
+            print(f"{'streamed list':<18} ttfb={result['ttfb_ms']:8.1f}ms total={result['total_ms']:8.1f}ms "
+                  f"peak_heap={result['peak_heap_mb']:7.1f}MB upstream_pages={ls.requests - before}")
+    finally:
+        tracemalloc.stop()
+
+    async def old_get_project():
+        async with httpx.AsyncClient(timeout=None) as client:
+            (await client.get(f"{ls.url}/api/projects/1")).raise_for_status()
+
+    before = ls.requests
+    timings = await _poll(old_get_project, args.polls)
+    print(f"{'old get_project':<18} polls={args.polls} upstream={ls.requests - before} "
+          f"p50={percentile(timings, 50):7.1f}ms p99={percentile(timings, 99):7.1f}ms")
+
+    async with httpx.AsyncClient(base_url=api.url, timeout=None) as client:
+        await client.get("/api/v2/vision/projects/1")  # warm the cache once
+        before = ls.requests
+
+        async def new_get_project():
+            (await client.get("/api/v2/vision/projects/1")).raise_for_status()
+
+        timings = await _poll(new_get_project, args.polls)
+        print(f"{'pooled+cached':<18} polls={args.polls} upstream={ls.requests - before} "
+              f"p50={percentile(timings, 50):7.1f}ms p99={percentile(timings, 99):7.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Label Studio client benchmark")
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--per-task-us", type=float, default=50.0)
+    parser.add_argument("--polls", type=int, default=200)
+    args = parser.parse_args()
+
+    with FakeLabelStudio(latency_ms=args.latency_ms, tasks=args.tasks, per_task_ms=args.per_task_us / 1000) as ls:
+        install_globals(ls.url, LABEL_STUDIO_URL=ls.url)
+        print(f"tasks={args.tasks} latency={args.latency_ms}ms per_task={args.per_task_us}us")
+        with ThreadedServer(_build_app()) as api:
+            asyncio.run(_run(args, ls, api))
+
+
+if __name__ == "__main__":
+    main()
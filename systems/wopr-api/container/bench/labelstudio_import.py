@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# bench/labelstudio_import.py
+"""
+Loading a capture sweep into Label Studio: one POST per task vs bulk_import.
+
+1. Old: one POST /api/projects/{id}/tasks per image, as a client looping
+   over POST /api/v2/vision/tasks does.
+2. New: app.labelstudio_import.bulk_import (chunked /import, bounded
+   concurrency) into an empty project.
+3. Resume: bulk_import again over the same selection, which should send
+   nothing.
+
+    python -m bench.labelstudio_import --images 500 --latency-ms 20
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from bench.fakes import FakeDirectus, FakeLabelStudio, install_globals
+
+os.environ.setdefault("LABEL_STUDIO_TOKEN", "bench")
+
+
+async def _run(args, ls: FakeLabelStudio, directus: FakeDirectus, source: Path) -> None:
+    import httpx
+    from app import directus_client, labelstudio_client
+    from app.labelstudio_import import bulk_import
+
+    images = directus.collection("mlimages")
+
+    start = time.perf_counter()
+    before = ls.requests
+    async with httpx.AsyncClient(base_url=ls.url, timeout=None) as client:
+        for image in images:
+            data = {"image": f"/data/local-files/?d=source/{image['filenames']['fullImageFilename']}",
+                    "mlimage_id": image["id"]}
+            (await client.post("/api/projects/1/tasks", json={"data": data})).raise_for_status()
+    elapsed = time.perf_counter() - start
+    print(f"{'per-task POST':<14} imported={len(images):6d} upstream={ls.requests - before:6d} "
+          f"total={elapsed * 1000:9.1f}ms")
+
+    ls.tasks.clear()
+    await directus_client.open_client()
+    await labelstudio_client.open_client()
+    try:
+        for label in ("bulk_import", "resume"):
+            start = time.perf_counter()
+            before = ls.requests
+            summary = await bulk_import(1, {}, chunk_size=args.chunk_size, concurrency=args.concurrency)
+            elapsed = time.perf_counter() - start
+            print(f"{label:<14} imported={summary['imported']:6d} upstream={ls.requests - before:6d} "
+                  f"total={elapsed * 1000:9.1f}ms skipped={summary['already_imported']}")
+    finally:
+        await labelstudio_client.close_client()
+        await directus_client.close_client()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Label Studio bulk import benchmark")
+    parser.add_argument("--images", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--per-task-us", type=float, default=200.0)
+    parser.add_argument("--chunk-size", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, \
+            FakeDirectus(latency_ms=args.latency_ms, rows=args.images) as directus, \
+            FakeLabelStudio(latency_ms=args.latency_ms, tasks=0, per_task_ms=args.per_task_us / 1000) as ls:
+        base = Path(tmp)
+        source = base / "source"
+        source.mkdir()
+        for image in directus.collection("mlimages"):
+            name = f"{image['piece_id']}-{image['game_catalog_id']}-{image['id']}.jpg"
+            image["filenames"] = {"fullImageFilename": name}
+            (source / name).touch()
+        install_globals(directus.url, LABEL_STUDIO_URL=ls.url,
+                        storage_paths={"base_path": base, "labelstudio_source_path": source})
+        print(f"images={args.images} latency={args.latency_ms}ms per_task={args.per_task_us}us "
+              f"chunk={args.chunk_size} concurrency={args.concurrency}")
+        asyncio.run(_run(args, ls, directus, source))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# bench/mlimages_paging.py
+"""
+ml_image_metadata listing: offset paging vs keyset paging.
+
+Needs a real Postgres ($DATABASE_URL); everything happens in a scratch
+schema (--schema, dropped afterwards).  Seeds --rows images over --games
+games with --pieces pieces each, date_created to the second so there are
+ties, then walks --pages pages of --limit through the v1 router's
+handlers for each filter the endpoint takes:
+
+1. offset: list_mlimages(offset=page * limit)
+2. keyset: list_mlimages_page(cursor=previous next_cursor)
+
+once on the bare table and again after
+migrations/001_ml_image_metadata_keyset.sql.  Reports total time, p50
+and the last (deepest) page, and checks both walks returned the same
+rows.
+
+    DATABASE_URL=postgresql://... python -m bench.mlimages_paging --rows 500000 --pages 100
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+from pathlib import Path
+
+import psycopg
+from psycopg.conninfo import make_conninfo
+
+from bench.fakes import install_globals, percentile
+
+MIGRATION = Path(__file__).resolve().parent.parent / "migrations" / "001_ml_image_metadata_keyset.sql"
+
+TABLE_DDL = """
+CREATE TABLE ml_image_metadata (
+    id SERIAL PRIMARY KEY,
+    uuid UUID NOT NULL DEFAULT gen_random_uuid(),
+    filename VARCHAR(255),
+    object_rotation INTEGER DEFAULT 0,
+    object_position INTEGER DEFAULT 10,
+    color_temp VARCHAR(255),
+    light_intensity INTEGER,
+    game_uuid INTEGER,
+    piece_id INTEGER,
+    status VARCHAR(255) NOT NULL DEFAULT 'draft',
+    user_created UUID,
+    date_created TIMESTAMPTZ,
+    user_updated UUID,
+    date_updated TIMESTAMPTZ
+)
+"""
+
+SEED_SQL = """
+INSERT INTO ml_image_metadata (filename, game_uuid, piece_id, status, light_intensity, date_created)
+SELECT
+    'bench-' || i || '.jpg',
+    g,
+    g * 1000 + i %% %(pieces)s,
+    CASE WHEN i %% 3 = 0 THEN 'draft' ELSE 'published' END,
+    i %% 100,
+    date_trunc('second', now() - make_interval(secs => i / 4.0))
+FROM (
+    SELECT i, 1 + (i * 7919) %% %(games)s AS g FROM generate_series(1, %(rows)s) AS i
+) seed
+"""
+
+
+def _migration_statements():
+    sql = "\n".join(line for line in MIGRATION.read_text().splitlines() if not line.startswith("--"))
+    return [stmt.strip() for stmt in sql.split(";") if stmt.strip()]
+
+
+async def _walk(handler, pages):
+    timings, ids = [], []
+    state = {"offset": 0, "cursor": None}
+    for _ in range(pages):
+        start = time.perf_counter()
+        rows, more = await handler(state)
+        timings.append((time.perf_counter() - start) * 1000)
+        ids.extend(row["id"] for row in rows)
+        if not more:
+            break
+    return timings, ids
+
+
+async def _run_cases(args, cases):
+    from app import db_pool
+    from app.api.v1 import mlimages
+
+    async def offset(filters, state):
+        rows = await mlimages.list_mlimages(limit=args.limit, offset=state["offset"], **filters)
+        state["offset"] += args.limit
+        return rows, len(rows) == args.limit
+
+    async def keyset(filters, state):
+        page = await mlimages.list_mlimages_page(limit=args.limit, cursor=state["cursor"], **filters)
+        state["cursor"] = page["next_cursor"]
+        return page["items"], page["next_cursor"] is not None
+
+    await db_pool.open_pool()
+    try:
+        for label, filters in cases:
+            walked = {}
+            for mode, handler in (("offset", offset), ("keyset", keyset)):
+                timings, ids = await _walk(lambda state: handler(filters, state), args.pages)
+                walked[mode] = ids
+                print(f"  {label:<14} {mode:<7} pages={len(timings):4d} total={sum(timings):9.1f}ms "
+                      f"p50={percentile(timings, 50):7.1f}ms last={timings[-1]:7.1f}ms")
+            if walked["offset"] != walked["keyset"]:
+                print(f"  {label:<14} MISMATCH: offset and keyset walks returned different rows")
+    finally:
+        await db_pool.close_pool()
+
+
+async def _run(args, dsn, cases):
+    with psycopg.connect(dsn, autocommit=True) as admin:
+        admin.execute(f'DROP SCHEMA IF EXISTS "{args.schema}" CASCADE')
+        admin.execute(f'CREATE SCHEMA "{args.schema}"')
+        admin.execute(f'SET search_path = "{args.schema}"')
+        try:
+            admin.execute(TABLE_DDL)
+            admin.execute(SEED_SQL, {"rows": args.rows, "games": args.games, "pieces": args.pieces})
+            admin.execute("ANALYZE ml_image_metadata")
+            print("without indexes:")
+            await _run_cases(args, cases)
+
+            start = time.perf_counter()
+            for stmt in _migration_statements():
+                admin.execute(stmt)
+            print(f"with {MIGRATION.name} ({(time.perf_counter() - start) * 1000:.0f}ms to build):")
+            await _run_cases(args, cases)
+        finally:
+            admin.execute(f'DROP SCHEMA "{args.schema}" CASCADE')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ml_image_metadata paging benchmark")
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--games", type=int, default=20)
+    parser.add_argument("--pieces", type=int, default=50, help="per game")
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--schema", default="bench_mlimages_paging")
+    args = parser.parse_args()
+
+    dsn = os.environ["DATABASE_URL"]
+    install_globals(
+        "http://127.0.0.1:1",
+        DATABASE_URL=make_conninfo(dsn, options=f"-csearch_path={args.schema}"),
+    )
+    from app.api.v1 import mlimages  # noqa: F401  (configures logging on import)
+    logging.getLogger().setLevel(logging.CRITICAL)
+
+    cases = [
+        ("all", {}),
+        ("game", {"game_id": 1}),
+        ("game+status", {"game_id": 1, "status": "published"}),
+        ("piece", {"piece_id": 1000 + 7}),
+        ("status", {"status": "draft"}),
+    ]
+    print(f"rows={args.rows} games={args.games} pieces/game={args.pieces}, "
+          f"{args.pages} pages of {args.limit}")
+    asyncio.run(_run(args, dsn, cases))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# bench/payload_capture.py
+"""
+Request latency and peak RSS with span payload capture on and off.
+
+Each mode runs in its own subprocess so ru_maxrss is not shared.  The app
+under test has a large JSON list endpoint, a JPEG endpoint shaped like
+/api/v2/stream/grab and a JSON POST echo; every request runs inside a
+recording SDK span (no exporter) the way FastAPIInstrumentor would.
+
+    python -m bench.payload_capture --requests 200 --rows 20000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+from bench.fakes import make_rows, percentile
+
+
+def _build_app(capture: bool, max_bytes: int, rows: int, jpeg_bytes: int):
+    from fastapi import FastAPI, Response
+    from opentelemetry import trace
+    from opentelemetry.sdk.trace import TracerProvider
+    from app.payload_capture import PayloadCaptureMiddleware
+
+    trace.set_tracer_provider(TracerProvider())
+    tracer = trace.get_tracer("bench")
+
+    app = FastAPI()
+    listing = make_rows("mlimages", rows)
+    frame = b"\xff\xd8" + os.urandom(jpeg_bytes) + b"\xff\xd9"
+
+    @app.get("/list")
+    async def get_list():
+        return listing
+
+    @app.get("/grab")
+    async def grab():
+        return Response(content=frame, media_type="image/jpeg")
+
+    @app.post("/echo")
+    async def echo(payload: dict):
+        return payload
+
+    if capture:
+        app.add_middleware(PayloadCaptureMiddleware, max_bytes=max_bytes, sample_rate=1.0)
+
+    async def server_span(scope, receive, send):
+        if scope["type"] != "http":
+            return await app(scope, receive, send)
+        with tracer.start_as_current_span(f"{scope['method']} {scope['path']}"):
+            await app(scope, receive, send)
+
+    return server_span
+
+
+async def _run(args) -> dict:
+    import httpx
+
+    asgi = _build_app(args.mode == "on", args.max_bytes, args.rows, args.jpeg_kb * 1024)
+    payload = {"rows": make_rows("echo", 200)}
+    results = {}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=asgi), base_url="http://bench") as client:
+        for name, call in (
+            ("list", lambda: client.get("/list")),
+            ("grab", lambda: client.get("/grab")),
+            ("echo", lambda: client.post("/echo", json=payload)),
+        ):
+            await call()  # warm-up
+            timings = []
+            for _ in range(args.requests):
+                start = time.perf_counter()
+                response = await call()
+                response.raise_for_status()
+                timings.append((time.perf_counter() - start) * 1000)
+            results[name] = {"p50_ms": percentile(timings, 50), "p99_ms": percentile(timings, 99)}
+    results["max_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Payload capture latency/RSS benchmark")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--jpeg-kb", type=int, default=2048)
+    parser.add_argument("--max-bytes", type=int, default=2048)
+    parser.add_argument("--mode", choices=["on", "off"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        from bench.fakes import install_globals
+        install_globals("http://unused")
+        print(json.dumps(asyncio.run(_run(args))))
+        return
+
+    print(f"rows={args.rows} jpeg={args.jpeg_kb}KB requests={args.requests} max_bytes={args.max_bytes}")
+    for mode in ("off", "on"):
+        out = subprocess.run(
+            [sys.executable, "-m", "bench.payload_capture", "--mode", mode,
+             "--requests", str(args.requests), "--rows", str(args.rows),
+             "--jpeg-kb", str(args.jpeg_kb), "--max-bytes", str(args.max_bytes)],
+            check=True, capture_output=True, text=True,
+        ).stdout.strip().splitlines()[-1]
+        result = json.loads(out)
+        endpoints = " ".join(
+            f"{name}: p50={result[name]['p50_ms']:.1f}ms p99={result[name]['p99_ms']:.1f}ms"
+            for name in ("list", "grab", "echo")
+        )
+        print(f"capture={mode:<3} max_rss={result['max_rss_mb']:.0f}MB  {endpoints}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# bench/status_checks.py
+"""
+System status: every check in turn vs get_system_status() running them at once.
+
+The api and cam checks hit fake services answering after --api-ms and
+--cam-ms (--cam-ms above --timeout-s shows a hung camera being cut off).
+The web checks go to https://wopr.<domain>, so they're stood in for by a
+--web-ms sleep.  Without --dsn the DB checks are --db-ms sleeps too; with
+--dsn they run for real, and the two read-only DB probes are also timed with a
+connection opened per probe (the old way) vs borrowed from status_db.
+
+    python -m bench.status_checks --api-ms 150 --cam-ms 400 --web-ms 300
+    DATABASE_URL=postgresql://... python -m bench.status_checks --dsn
+"""
+
+import argparse
+import asyncio
+import contextlib
+import logging
+import os
+import time
+
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from bench.fakes import ThreadedServer, install_globals, percentile
+
+
+def _service(path: str, latency: float) -> Starlette:
+    async def answer(request):
+        await asyncio.sleep(latency)
+        return JSONResponse({"status": "ok"})
+    return Starlette(routes=[Route(path, answer)])
+
+
+def _sleeper(name: str, seconds: float):
+    async def check():
+        from app.api.v1.status import StatusCheck
+        from datetime import datetime, timezone
+
+        start = datetime.now(timezone.utc)
+        await asyncio.sleep(seconds)
+        return StatusCheck(test_name=name, test_start_timestamp=start, test_result="pass",
+                           test_end_timestamp=datetime.now(timezone.utc))
+    return check
+
+
+async def _connect_per_probe(dsn: str) -> None:
+    import asyncpg
+
+    for query in ("SELECT 1", "SELECT COUNT(*) FROM settings"):
+        conn = await asyncpg.connect(dsn)
+        try:
+            await conn.fetchval(query)
+        finally:
+            await conn.close()
+
+
+async def _pooled_probes() -> None:
+    from app.api.v1 import status
+
+    await asyncio.gather(status.check_db_up(), status.check_db_queriable())
+
+
+async def _run(args) -> None:
+    from app import status_db
+    from app.api.v1 import status
+
+    # status.py logs every check at DEBUG to stdout
+    logging.getLogger().setLevel(logging.CRITICAL)
+    if args.dsn:
+        await status_db.open_pool()
+    else:
+        status.SYSTEM_CHECKS = tuple(
+            (name, _sleeper(name, args.db_ms / 1000) if name.startswith("db_") else check)
+            for name, check in status.SYSTEM_CHECKS
+        )
+    status.SYSTEM_CHECKS = tuple(
+        (name, _sleeper(name, args.web_ms / 1000) if name.startswith("wopr_web") else check)
+        for name, check in status.SYSTEM_CHECKS
+    )
+
+    serial, concurrent = [], []
+    for _ in range(args.rounds):
+        start = time.perf_counter()
+        results = [await status._run_check(name, check) for name, check in status.SYSTEM_CHECKS]
+        serial.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        summary = await status.get_system_status()
+        concurrent.append((time.perf_counter() - start) * 1000)
+
+    for label, timings in (("one by one", serial), ("gather", concurrent)):
+        print(f"{label:<12} p50={percentile(timings, 50):8.1f}ms p99={percentile(timings, 99):8.1f}ms")
+    print("last results:", {r.test_name: r.test_result for r in results})
+    print("failed:", [name for name, value in summary.model_dump().items() if value is False])
+
+    if args.dsn:
+        dsn = os.environ["DATABASE_URL"]
+        for label, probe in (("db connect/probe", lambda: _connect_per_probe(dsn)), ("db pooled", _pooled_probes)):
+            timings = []
+            for _ in range(args.rounds):
+                start = time.perf_counter()
+                await probe()
+                timings.append((time.perf_counter() - start) * 1000)
+            print(f"{label:<17} p50={percentile(timings, 50):8.1f}ms p99={percentile(timings, 99):8.1f}ms")
+        print("pool:", status_db.metrics())
+        await status_db.close_pool()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="System status benchmark")
+    parser.add_argument("--api-ms", type=float, default=150.0)
+    parser.add_argument("--cam-ms", type=float, default=400.0)
+    parser.add_argument("--web-ms", type=float, default=300.0)
+    parser.add_argument("--db-ms", type=float, default=50.0, help="stand-in DB check latency without --dsn")
+    parser.add_argument("--dsn", action="store_true", help="run the DB checks against $DATABASE_URL")
+    parser.add_argument("--timeout-s", type=float, default=1.0, help="per-check timeout")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    with contextlib.ExitStack() as stack:
+        api = stack.enter_context(ThreadedServer(_service("/health", args.api_ms / 1000)))
+        cam = stack.enter_context(ThreadedServer(_service("/status", args.cam_ms / 1000)))
+        cam_host, cam_port = cam.url.rsplit(":", 1)
+        install_globals(
+            "http://127.0.0.1:1",
+            APP_DOMAIN="invalid",
+            WOPR_API_URL=api.url,
+            HACK_CAMERA_DICT={"1": {"url": cam_host, "port": cam_port}},
+            STATUS_CHECK_TIMEOUT_SECONDS=args.timeout_s,
+        )
+        os.environ.setdefault("WOPR_API_URL", api.url)
+        print(f"api={args.api_ms:.0f}ms cam={args.cam_ms:.0f}ms web={args.web_ms:.0f}ms "
+              f"db={'real' if args.dsn else f'{args.db_ms:.0f}ms'} timeout={args.timeout_s}s")
+        asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
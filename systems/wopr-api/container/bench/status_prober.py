@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# bench/status_prober.py
+"""
+Status page viewers: every /status request probing inline vs the background prober.
+
+--viewers clients poll GET /api/v2/status every --poll-ms for --seconds,
+first with the prober off (requests run the checks, concurrent ones
+sharing a run) and then with it on (--interval-s).  The checks are the
+bench.status_checks stand-ins; each run counts how many times the
+services behind them were hit.
+Reports request latency, probes run, and the /status/history summary.
+
+    python -m bench.status_prober --viewers 10 --poll-ms 2000 --seconds 10
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from bench.fakes import ThreadedServer, install_globals, percentile
+from bench.status_checks import _sleeper
+
+
+def _build_app(hits):
+    from contextlib import asynccontextmanager
+    from fastapi import FastAPI
+    from app import status_prober
+    from app.api.v1 import status
+
+    def counted(name, check):
+        async def run():
+            hits[name] = hits.get(name, 0) + 1
+            return await check()
+        return run
+
+    status.SYSTEM_CHECKS = tuple((name, counted(name, check)) for name, check in status.SYSTEM_CHECKS)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        status_prober.start(status.probe_system)
+        yield
+        await status_prober.stop()
+
+    app = FastAPI(lifespan=lifespan)
+    app.include_router(status.router, prefix="/api/v2/status")
+    return app
+
+
+async def _viewers(url, args):
+    import httpx
+
+    timings = []
+    stop = time.monotonic() + args.seconds
+
+    async def viewer(client):
+        while time.monotonic() < stop:
+            start = time.perf_counter()
+            r = await client.get("/api/v2/status")
+            r.raise_for_status()
+            timings.append((time.perf_counter() - start) * 1000)
+            await asyncio.sleep(args.poll_ms / 1000)
+
+    async with httpx.AsyncClient(base_url=url, timeout=None) as client:
+        await asyncio.gather(*(viewer(client) for _ in range(args.viewers)))
+        history = (await client.get("/api/v2/status/history", params={"windows": f"{args.seconds:g}"})).json()
+    return timings, history
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Status prober benchmark")
+    parser.add_argument("--viewers", type=int, default=10)
+    parser.add_argument("--poll-ms", type=float, default=2000.0)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--interval-s", type=float, default=5.0, help="prober interval")
+    parser.add_argument("--check-ms", type=float, default=200.0, help="stand-in latency of each check")
+    args = parser.parse_args()
+
+    install_globals("http://127.0.0.1:1")
+    from app.api.v1 import status
+
+    logging.getLogger().setLevel(logging.CRITICAL)
+    status.SYSTEM_CHECKS = tuple((name, _sleeper(name, args.check_ms / 1000)) for name, _ in status.SYSTEM_CHECKS)
+    originals = status.SYSTEM_CHECKS
+    print(f"viewers={args.viewers} poll={args.poll_ms:.0f}ms for {args.seconds:g}s, "
+          f"{len(originals)} checks at {args.check_ms:.0f}ms, prober every {args.interval_s:g}s")
+
+    import app.globals as woprvar
+    for label, enabled in (("inline", False), ("prober", True)):
+        woprvar.STATUS_PROBE_ENABLED = enabled
+        woprvar.STATUS_PROBE_INTERVAL_SECONDS = args.interval_s
+        status.SYSTEM_CHECKS = originals
+        hits = {}
+        with ThreadedServer(_build_app(hits)) as api:
+            timings, history = asyncio.run(_viewers(api.url, args))
+        probes = max(hits.values()) if hits else 0
+        print(f"{label:<7} requests={len(timings):4d} p50={percentile(timings, 50):7.1f}ms "
+              f"p99={percentile(timings, 99):7.1f}ms probes={probes:4d} check calls={sum(hits.values())}")
+    db_up = history["checks"].get("db_up", {}).get("windows", {}).get(f"{args.seconds:g}")
+    print(f"history db_up over {args.seconds:g}s:", db_up)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# bench/status_retention.py
+"""
+status_checks retention: one big DELETE vs status_retention.maintain().
+
+Needs a real Postgres ($DATABASE_URL); everything happens in a scratch
+schema (--schema, dropped afterwards).  Seeds --rows probe rows spread
+over --days, then with a writer inserting a probe row every --insert-ms
+(as the prober does) expires everything older than --keep-hours:
+
+1. single: DELETE FROM status_checks WHERE created_at < cutoff
+2. batched: rollup into status_checks_minutely, then batched purge
+
+Reports each one's duration, the longest single statement, and the
+writer's insert latency while it ran.
+
+    DATABASE_URL=postgresql://... python -m bench.status_retention --rows 2000000 --days 30
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+import asyncpg
+
+from bench.fakes import install_globals, percentile
+
+TABLE_DDL = """
+CREATE TABLE status_checks (
+    id SERIAL PRIMARY KEY,
+    test_name VARCHAR(100) NOT NULL,
+    test_start_timestamp TIMESTAMPTZ NOT NULL,
+    test_result VARCHAR(20) NOT NULL,
+    test_end_timestamp TIMESTAMPTZ NOT NULL,
+    error_message TEXT,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+CREATE INDEX idx_status_checks_test_name ON status_checks(test_name);
+CREATE INDEX idx_status_checks_created_at ON status_checks(created_at DESC);
+"""
+
+SEED_SQL = """
+INSERT INTO status_checks (test_name, test_start_timestamp, test_result, test_end_timestamp, created_at)
+SELECT
+    (ARRAY['db_writable-probe', 'db_up', 'wopr_cam_up'])[1 + i % 3],
+    ts,
+    CASE WHEN i % 97 = 0 THEN 'fail' ELSE 'pass' END,
+    ts + make_interval(secs => (i % 50) / 1000.0),
+    ts
+FROM (
+    SELECT i, now() - make_interval(secs => $2::float8 * i / $1::int) AS ts
+    FROM generate_series(1, $1::int) AS i
+) seed
+"""
+
+
+async def _reset(pool, rows, seconds):
+    async with pool.acquire() as conn:
+        await conn.execute("DROP TABLE IF EXISTS status_checks, status_checks_minutely")
+        await conn.execute(TABLE_DDL)
+        await conn.execute(SEED_SQL, rows, seconds)
+        await conn.execute("ANALYZE status_checks")
+
+
+async def _writer(pool, interval, stop, latencies):
+    while not stop.is_set():
+        start = time.perf_counter()
+        now = datetime.now(timezone.utc)
+        async with pool.acquire() as conn:
+            await conn.execute(
+                "INSERT INTO status_checks (test_name, test_start_timestamp, test_result, test_end_timestamp) "
+                "VALUES ($1, $2, $3, $4)", "db_writable-probe", now, "pass", now)
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(interval)
+
+
+async def _timed(pool, args, work):
+    stop, latencies = asyncio.Event(), []
+    writer = asyncio.create_task(_writer(pool, args.insert_ms / 1000, stop, latencies))
+    start = time.perf_counter()
+    result = await work()
+    elapsed = (time.perf_counter() - start) * 1000
+    stop.set()
+    await writer
+    return elapsed, result, latencies
+
+
+async def _run(args):
+    from app import status_retention
+
+    dsn = os.environ["DATABASE_URL"]
+    admin = await asyncpg.connect(dsn)
+    await admin.execute(f'CREATE SCHEMA IF NOT EXISTS "{args.schema}"')
+    pool = await asyncpg.create_pool(dsn, min_size=2, max_size=4, server_settings={"search_path": args.schema})
+    seconds = args.days * 86400
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=args.keep_hours)
+    try:
+        await _reset(pool, args.rows, seconds)
+
+        async def single():
+            async with pool.acquire() as conn:
+                return await conn.execute("DELETE FROM status_checks WHERE created_at < $1", cutoff)
+
+        elapsed, tag, latencies = await _timed(pool, args, single)
+        print(f"single   total={elapsed:9.1f}ms longest statement={elapsed:9.1f}ms {tag:<14} "
+              f"insert p50={percentile(latencies, 50):6.1f}ms p99={percentile(latencies, 99):7.1f}ms")
+
+        await _reset(pool, args.rows, seconds)
+        elapsed, result, latencies = await _timed(pool, args, lambda: status_retention.maintain(pool))
+        print(f"batched  total={elapsed:9.1f}ms longest batch={result['raw']['slowest_batch_ms']:9.1f}ms "
+              f"deleted={result['raw']['deleted']} in {result['raw']['batches']} batches, "
+              f"rollup rows={result['rollup_rows']} "
+              f"insert p50={percentile(latencies, 50):6.1f}ms p99={percentile(latencies, 99):7.1f}ms")
+        async with pool.acquire() as conn:
+            raw = await conn.fetchval("SELECT count(*) FROM status_checks")
+            minutes = await conn.fetchval("SELECT count(*) FROM status_checks_minutely")
+        print(f"left: {raw} raw rows, {minutes} minute rollups")
+    finally:
+        await pool.close()
+        await admin.execute(f'DROP SCHEMA "{args.schema}" CASCADE')
+        await admin.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="status_checks retention benchmark")
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--days", type=float, default=30.0)
+    parser.add_argument("--keep-hours", type=float, default=48.0)
+    parser.add_argument("--insert-ms", type=float, default=50.0)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--schema", default="bench_status_retention")
+    args = parser.parse_args()
+
+    install_globals(
+        "http://127.0.0.1:1",
+        STATUS_RAW_RETENTION_HOURS=args.keep_hours,
+        STATUS_PURGE_BATCH_SIZE=args.batch_size,
+    )
+    print(f"rows={args.rows} over {args.days:g} days, keep {args.keep_hours:g}h, batch={args.batch_size}")
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+-- Copyright 2026 Bob Bomar
+--
+-- Licensed under the Apache License, Version 2.0 (the "License");
+-- you may not use this file except in compliance with the License.
+-- You may obtain a copy of the License at
+--
+--     http://www.apache.org/licenses/LICENSE-2.0
+--
+-- Unless required by applicable law or agreed to in writing, software
+-- distributed under the License is distributed on an "AS IS" BASIS,
+-- WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+-- See the License for the specific language governing permissions and
+-- limitations under the License.
+
+-- ml_image_metadata listing indexes (GET /mlimages and /mlimages/page)
+--
+-- Both listings sort by (date_created DESC, id DESC) and filter on any of
+-- game_uuid, piece_id and status.  Each index below is a filter prefix
+-- followed by the sort key, so Postgres reads a page straight off the
+-- index and, for /page, starts at the cursor's (date_created, id).
+--
+--   no filter            idx_ml_image_metadata_created
+--   game_uuid            idx_ml_image_metadata_game_created
+--   game_uuid + status   idx_ml_image_metadata_game_status_created
+--   piece_id (+ any)     idx_ml_image_metadata_piece_created
+--                        (a piece belongs to one game; status is rechecked
+--                        on the few rows per piece)
+--   status               idx_ml_image_metadata_status_created
+--
+-- CONCURRENTLY keeps Directus writing while they build, so run this
+-- outside a transaction:
+--
+--     psql "$DATABASE_URL" -f migrations/001_ml_image_metadata_keyset.sql
+--
+-- A failed concurrent build leaves an INVALID index behind; drop it and
+-- re-run.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ml_image_metadata_created
+    ON ml_image_metadata (date_created DESC, id DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ml_image_metadata_game_created
+    ON ml_image_metadata (game_uuid, date_created DESC, id DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ml_image_metadata_game_status_created
+    ON ml_image_metadata (game_uuid, status, date_created DESC, id DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ml_image_metadata_piece_created
+    ON ml_image_metadata (piece_id, date_created DESC, id DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_ml_image_metadata_status_created
+    ON ml_image_metadata (status, date_created DESC, id DESC);
+
+ANALYZE ml_image_metadata;
@@ -0,0 +1,76 @@
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v2 import batch
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(batch.router, prefix="/api/v2/batch")
+
+    @app.get("/api/v2/echo")
+    async def echo(q: str = ""):
+        return {"q": q}
+
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("path", [
+    "/api/v2/batch",
+    "/api/v2/batch/",
+    "/api/v2/./batch",
+    "/api/v2/x/../batch",
+    "/api/v2/%62atch",
+    "/api/v2/%2e/batch",
+    "/api/v2//batch",
+    "/api/v2/../v1/status",
+    "/api/v2/%2e%2e/v1/status",
+    "/api/v2/x/..",
+    "/api/v1/status",
+    "//evil/api/v2/echo",
+])
+def test_batch_rejects_batch_and_escaping_paths(client, path):
+    r = client.post("/api/v2/batch", json={"requests": [{"id": "a", "path": path}]})
+    assert r.status_code == 422, path
+
+
+@pytest.mark.parametrize("path", ["/api/v2/echo", "/api/v2/echo?q=1", "/api/v2/batches-report"])
+def test_batch_allows_v2_paths(path):
+    assert batch._allowed_path(path)
+
+
+def test_batch_runs_sub_requests(client):
+    r = client.post("/api/v2/batch", json={"requests": [
+        {"id": "a", "path": "/api/v2/echo", "params": {"q": "hi"}},
+    ]})
+    assert r.status_code == 200
+    assert r.json()["results"]["a"] == {"status": 200, "body": {"q": "hi"}, "elapsed_ms": pytest.approx(0, abs=5000)}
+
+
+def test_batch_refuses_nested_batch_even_if_path_check_missed(client, monkeypatch):
+    monkeypatch.setattr(batch, "_allowed_path", lambda path: True)
+    inner = {"requests": [{"id": "x", "path": "/api/v2/echo"}]}
+    r = client.post("/api/v2/batch", json={"requests": [
+        {"id": "nested", "method": "POST", "path": "/api/v2/batch", "body": inner},
+    ]})
+    assert r.status_code == 200
+    nested = r.json()["results"]["nested"]
+    assert nested["status"] == 422
+    assert "nested" in nested["body"]["detail"]
@@ -0,0 +1,67 @@
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import asyncio
+
+import pytest
+
+from app import camera_relay
+from app import globals as woprvar
+
+
+def _cameras(**hosts):
+    woprvar.WOPR_CONFIG = {"camera": {"camDict": {
+        camera_id: {"host": host, "port": 5000, "id": 0} for camera_id, host in hosts.items()
+    }}}
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    saved = woprvar.WOPR_CONFIG
+    yield
+    asyncio.run(camera_relay.close_clients())
+    woprvar.WOPR_CONFIG = saved
+
+
+def test_prune_waits_for_leases():
+    async def run():
+        _cameras(cam1="a")
+        old = await camera_relay._client("http://a:5000")
+        _cameras(cam1="b")
+        new = await camera_relay._client("http://b:5000")
+        assert "http://a:5000" not in camera_relay.clients
+        assert not old.is_closed  # cam1's grab on host a is still in flight
+        await camera_relay._unlease(old)
+        assert old.is_closed
+        await camera_relay._unlease(new)
+        assert not new.is_closed
+
+    asyncio.run(run())
+
+
+def test_connections_scale_with_cameras_on_host():
+    async def run():
+        _cameras(cam1="a", cam2="a", cam3="b")
+        client = await camera_relay._client("http://a:5000")
+        await camera_relay._unlease(client)
+        assert camera_relay.metrics()["clients"] == {"http://a:5000": 2 * woprvar.CAMERA_RELAY_MAX_CONCURRENT}
+
+        _cameras(cam1="a", cam2="a", cam3="a")
+        resized = await camera_relay._client("http://a:5000")
+        await camera_relay._unlease(resized)
+        assert resized is not client and client.is_closed
+        assert camera_relay.metrics()["clients"] == {"http://a:5000": 3 * woprvar.CAMERA_RELAY_MAX_CONCURRENT}
+
+    asyncio.run(run())
@@ -0,0 +1,49 @@
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import asyncio
+
+from app.catalog_cache import MISSING, CatalogCache
+
+
+def test_get_or_load_caches_and_respects_invalidation():
+    cache = CatalogCache(ttls={"projects": 60}, name="labelstudio")
+    calls = []
+
+    async def load():
+        calls.append(1)
+        if len(calls) == 1:
+            cache.invalidate("projects")  # a write lands while loading
+        return {"n": len(calls)}
+
+    async def run():
+        first = await cache.get_or_load("projects", "all", load)
+        second = await cache.get_or_load("projects", "all", load)
+        third = await cache.get_or_load("projects", "all", load)
+        return first, second, third
+
+    assert asyncio.run(run()) == ({"n": 1}, {"n": 2}, {"n": 2})
+    assert len(calls) == 2
+    assert cache.stats()["name"] == "labelstudio"
+
+
+def test_get_or_load_uncached_collection():
+    cache = CatalogCache(ttls={})
+
+    async def load():
+        return "fresh"
+
+    assert asyncio.run(cache.get_or_load("pieces", 1, load)) == "fresh"
+    assert cache.get("pieces", 1) is MISSING
@@ -0,0 +1,80 @@
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from fastapi import HTTPException
+from psycopg_pool import PoolTimeout
+
+from app import db_pool
+
+
+class FakePool:
+    """pool.connection() stand-in: fails to connect, or commits (and maybe fails to)"""
+
+    def __init__(self, connect_error=None, commit_error=None):
+        self.connect_error = connect_error
+        self.commit_error = commit_error
+
+    @asynccontextmanager
+    async def connection(self):
+        if self.connect_error is not None:
+            raise self.connect_error
+        yield object()
+        if self.commit_error is not None:
+            raise self.commit_error
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    def install(**kwargs):
+        monkeypatch.setattr(db_pool, "_pool", FakePool(**kwargs))
+        monkeypatch.setattr(db_pool, "_counts", {"checkouts": 0, "timeouts": 0, "errors": 0, "in_use": 0})
+    return install
+
+
+async def _use(body_error=None):
+    async with db_pool.connection():
+        if body_error is not None:
+            raise body_error
+
+
+def test_caller_errors_are_not_pool_errors(pool):
+    pool()
+    with pytest.raises(KeyError):
+        asyncio.run(_use(KeyError("row")))
+    assert db_pool._counts == {"checkouts": 1, "timeouts": 0, "errors": 0, "in_use": 0}
+
+
+def test_connect_and_commit_failures_are_pool_errors(pool):
+    pool(connect_error=OSError("refused"))
+    with pytest.raises(OSError):
+        asyncio.run(_use())
+    assert db_pool._counts["errors"] == 1
+
+    pool(commit_error=OSError("connection lost"))
+    with pytest.raises(OSError):
+        asyncio.run(_use())
+    assert db_pool._counts["errors"] == 1
+
+
+def test_acquire_timeout_is_503(pool):
+    pool(connect_error=PoolTimeout("busy"))
+    with pytest.raises(HTTPException) as e:
+        asyncio.run(_use())
+    assert e.value.status_code == 503
+    assert db_pool._counts["timeouts"] == 1
@@ -0,0 +1,70 @@
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app import catalog_cache, directus_client
+
+
+@pytest.fixture
+def directus(monkeypatch):
+    """Directus answering GET /items/pieces from a list the test edits; counts requests"""
+    state = {"rows": [{"id": 1}], "requests": 0, "fail": False}
+
+    def handler(request):
+        state["requests"] += 1
+        if state["fail"]:
+            return httpx.Response(502)
+        if request.method == "PATCH":
+            return httpx.Response(200, json={"data": {"id": 1}})
+        return httpx.Response(200, json={"data": list(state["rows"])})
+
+    client = httpx.AsyncClient(base_url="http://directus", transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(directus_client, "client", client)
+    monkeypatch.setattr(catalog_cache, "catalog_cache", catalog_cache.CatalogCache(ttls={"pieces": 60}))
+    return state
+
+
+def test_get_all_reads_through_the_cache(directus):
+    async def run():
+        first = await directus_client.get_all("pieces")
+        directus["rows"].append({"id": 2})
+        cached = await directus_client.get_all("pieces")
+        await directus_client.update("pieces", "1", {"name": "x"})
+        fresh = await directus_client.get_all("pieces")
+        return first, cached, fresh
+
+    first, cached, fresh = asyncio.run(run())
+    assert first == cached == [{"id": 1}]
+    assert fresh == [{"id": 1}, {"id": 2}]
+    assert directus["requests"] == 3
+
+
+def test_uncached_collection_and_errors_always_go_upstream(directus):
+    async def run():
+        await directus_client.get_one("players", "1")
+        await directus_client.get_one("players", "1")
+        directus["fail"] = True
+        with pytest.raises(HTTPException):
+            await directus_client.get_one("pieces", "1")
+        directus["fail"] = False
+        return await directus_client.get_one("pieces", "1")
+
+    assert asyncio.run(run()) == [{"id": 1}]
+    assert directus["requests"] == 4
@@ -0,0 +1,126 @@
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import pytest
+from fastapi import HTTPException
+from starlette.datastructures import QueryParams
+
+from app.directus_query import directus_query, parse_query
+
+
+def _parse(collection, query="", **kwargs):
+    return parse_query(collection, QueryParams(query), **kwargs)
+
+
+def _rejected(collection, query="", **kwargs):
+    with pytest.raises(HTTPException) as e:
+        _parse(collection, query, **kwargs)
+    assert e.value.status_code == 400
+    return e.value.detail
+
+
+def test_allowed_query_becomes_get_all_kwargs():
+    kwargs = _parse(
+        "pieces",
+        "filter[game_catalog_uuid][_eq]=3&filter[game_catalog_uuid.name][_icontains]=dune"
+        "&filter[name]=pawn&deep[game_catalog_uuid][_limit]=1",
+        fields="id,name,game_catalog_uuid.*",
+        sort="-date_created,name",
+        limit=50,
+        offset=100,
+    )
+    assert kwargs == {
+        "fields": ["id", "name", "game_catalog_uuid.*"],
+        "sort": ["-date_created", "name"],
+        "filters": {
+            "game_catalog_uuid": {"_eq": "3"},
+            "game_catalog_uuid.name": {"_icontains": "dune"},
+            "name": {"_eq": "pawn"},
+        },
+        "deep": {"game_catalog_uuid": {"_limit": 1}},
+        "limit": 50,
+        "offset": 100,
+    }
+
+
+def test_bracketed_and_dotted_filter_paths_agree():
+    dotted = _parse("pieces", "filter[game_catalog_uuid.name][_eq]=x")
+    bracketed = _parse("pieces", "filter[game_catalog_uuid][name][_eq]=x")
+    assert dotted == bracketed
+
+
+@pytest.mark.parametrize("fields", [
+    "password",
+    "id,secret",
+    "name.id",                           # not a relational field
+    "game_catalog_uuid.password",
+    "*.name",                            # wildcard only as the last segment
+    "game_catalog_uuid.*.name",
+])
+def test_rejects_unknown_or_disallowed_fields(fields):
+    _rejected("pieces", fields=fields)
+
+
+@pytest.mark.parametrize("sort", ["password", "-secret", "game_catalog_uuid.password", "*"])
+def test_rejects_disallowed_sort_fields(sort):
+    _rejected("pieces", sort=sort)
+
+
+@pytest.mark.parametrize("query", [
+    "filter[name][_regex]=.*",
+    "filter[name][_and]=x",
+    "filter[name][_or]=x",
+    "filter[name][_some]=x",
+    "filter[_eq]=x",                      # no field
+    "filter[password][_eq]=x",
+    "filter[game_catalog_uuid][password][_eq]=x",
+    "filter=x",                           # malformed
+    "filter[name=x",
+])
+def test_rejects_disallowed_filters(query):
+    _rejected("pieces", query)
+
+
+def test_rejects_paths_deeper_than_max_depth():
+    # playtracker -> sessiontracker -> game_catalog -> name is three hops; the cap is 2
+    assert _parse("playtracker", fields="sessionid.gameid.name")
+    detail = _rejected("playtracker", fields="sessionid.gameid.name.x")
+    assert "deeper" in detail
+    _rejected("playtracker", "filter[sessionid][gameid][name][x][_eq]=1")
+    _rejected("playtracker", sort="sessionid.gameid.name.x")
+
+
+@pytest.mark.parametrize("query", [
+    "deep[playerid][_filter]=x",          # only _limit/_offset/_sort
+    "deep[playerid][_limit][x]=1",
+    "deep[playerid]=1",
+    "deep[note][_limit]=1",               # not relational
+    "deep[password][_limit]=1",
+    "deep[playerid][_limit]=abc",
+    "deep[playerid][_limit]=-1",
+    "deep[playerid][_sort]=password",
+    "deep[playerid][_sort]=-secret",
+])
+def test_rejects_disallowed_deep_keys(query):
+    _rejected("playtracker", query)
+
+
+def test_deep_sort_checks_the_related_collection():
+    assert _parse("playtracker", "deep[playerid][_sort]=-name")["deep"] == {"playerid": {"_sort": "-name"}}
+
+
+def test_unknown_collection_has_no_dependency():
+    with pytest.raises(ValueError):
+        directus_query("directus_users")
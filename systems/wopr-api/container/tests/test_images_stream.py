@@ -0,0 +1,52 @@
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import asyncio
+import json
+
+from fastapi import HTTPException
+
+from app.api.v2 import images
+
+
+async def _pages(*pages, error=None):
+    for page in pages:
+        yield page
+    if error is not None:
+        raise error
+
+
+def _stream(first, pages, limit=None):
+    async def collect():
+        return [chunk async for chunk in images._ndjson(first, pages, limit)]
+    lines = "".join(asyncio.run(collect())).splitlines()
+    return [json.loads(line) for line in lines]
+
+
+def test_ndjson_ends_with_row_count():
+    records = _stream([{"id": 1}], _pages([{"id": 2}, {"id": 3}]))
+    assert records == [{"id": 1}, {"id": 2}, {"id": 3}, {"_stream": "end", "rows": 3}]
+
+
+def test_ndjson_limit_counts_rows_sent():
+    records = _stream([{"id": 1}, {"id": 2}], _pages([{"id": 3}]), limit=1)
+    assert records == [{"id": 1}, {"_stream": "end", "rows": 1}]
+
+
+def test_ndjson_upstream_error_mid_stream_is_reported():
+    error = HTTPException(status_code=502, detail="upstream gone")
+    records = _stream([{"id": 1}], _pages([{"id": 2}], error=error))
+    assert records[:-1] == [{"id": 1}, {"id": 2}]
+    assert records[-1] == {"_stream": "error", "rows": 2, "error": "upstream gone"}
@@ -0,0 +1,25 @@
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+from app.labelstudio_import import ImportIncomplete
+
+
+def test_import_incomplete_survives_rebuild_from_args():
+    summary = {"project_id": 7, "queued": 10, "failed": 3, "imported": 7}
+    error = ImportIncomplete(summary)
+    # Celery's JSON result backend stores exc args and rebuilds with cls(*args)
+    rebuilt = type(error)(*error.args)
+    assert rebuilt.summary == summary
+    assert str(rebuilt) == "3 of 10 images failed to import into project 7"
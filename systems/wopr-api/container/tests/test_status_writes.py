@@ -0,0 +1,46 @@
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import globals as woprvar
+from app import status_retention
+from app.api.v1 import status
+
+
+@pytest.fixture
+def client(monkeypatch):
+    async def run_once():
+        return {"rolled_up": 0, "purged": 0}
+    monkeypatch.setattr(status_retention, "run_once", run_once)
+    app = FastAPI()
+    app.include_router(status.router, prefix="/api/v2/status")
+    return TestClient(app)
+
+
+def test_db_writes_refused_without_configured_token(client, monkeypatch):
+    monkeypatch.setattr(woprvar, "CONFIG_WEBHOOK_TOKEN", "")
+    assert client.post("/api/v2/status/maintenance").status_code == 403
+    assert client.get("/api/v2/status/inittable").status_code == 403
+
+
+def test_db_writes_need_matching_token(client, monkeypatch):
+    monkeypatch.setattr(woprvar, "CONFIG_WEBHOOK_TOKEN", "s3cret")
+    assert client.post("/api/v2/status/maintenance", headers={"X-WOPR-Webhook-Token": "nope"}).status_code == 403
+    r = client.post("/api/v2/status/maintenance", headers={"X-WOPR-Webhook-Token": "s3cret"})
+    assert r.status_code == 200
+    assert r.json() == {"rolled_up": 0, "purged": 0}
@@ -0,0 +1,55 @@
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+pytest.importorskip("celery")  # vision imports the Celery app for import jobs
+from app.api.v2 import vision  # noqa: E402
+
+
+async def _pages(*pages, error=None):
+    for page in pages:
+        yield page
+    if error is not None:
+        raise error
+
+
+def _body(first, pages, ndjson):
+    async def collect():
+        return "".join([chunk async for chunk in vision._stream_tasks(first, pages, ndjson)])
+    return asyncio.run(collect())
+
+
+def test_ndjson_tasks_end_with_row_count():
+    lines = _body([{"id": 1}], _pages([{"id": 2}]), ndjson=True).splitlines()
+    assert [json.loads(line) for line in lines] == [{"id": 1}, {"id": 2}, {"_stream": "end", "rows": 2}]
+
+
+def test_ndjson_tasks_transport_error_is_reported():
+    error = httpx.ConnectError("Label Studio went away")
+    lines = _body([{"id": 1}], _pages([{"id": 2}], error=error), ndjson=True).splitlines()
+    assert json.loads(lines[-1]) == {"_stream": "error", "rows": 2, "error": "Label Studio went away"}
+
+
+def test_json_array_left_unterminated_on_error():
+    error = HTTPException(status_code=502, detail="upstream gone")
+    body = _body([{"id": 1}], _pages(error=error), ndjson=False)
+    assert body == '[{"id": 1}'
+    assert json.loads(_body([{"id": 1}], _pages([{"id": 2}]), ndjson=False)) == [{"id": 1}, {"id": 2}]
@@ -14,18 +14,17 @@ import cv2
 import time
 import logging
 import sys
+import itertools
+from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import List, Optional
 from pathlib import Path
-import io
-from PIL import Image
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
-from picamera2 import Picamera2
-from libcamera import Transform
 
 # OTel imports
 from opentelemetry import metrics
@@ -39,10 +38,14 @@ from opentelemetry.trace.status import Status, StatusCode
 #from wopr.config import init_config, get_str, get_int, get_bool
 from wopr.logging import setup_logging
 from wopr.tracing import create_tracer
-from wopr.storage import imagefilename
+from wopr.storage import imagefilename, DerivativePool
 
 # Import globals module for constants
 import globals as g
+from camera_manager import CameraManager
+from change_detector import ChangeDetector, ChangeWatcher
+from image_writer import ImageWriter, WriterBusy
+from stage_metrics import Registry, labels
 
 # Initialize config first
 WOPR_API_URL = "https://api.wopr.tailandtraillabs.org/api/v2/config"
@@ -66,33 +69,132 @@ resource = Resource(attributes={
     SERVICE_VERSION: g.APP_VERSION,
 })
 
-metric_reader = PeriodicExportingMetricReader(
-    OTLPMetricExporter(
-        endpoint=f"{g.APP_OTEL_URL}/v1/metrics",
-    )
-)
-meter_provider = MeterProvider(resource=resource, metric_readers=[metric_reader])
+# OTLP push is optional; GET /metrics (below) is served from memory either way
+metric_readers = []
+if g.OTLP_METRICS_ENABLED:
+    metric_readers.append(PeriodicExportingMetricReader(
+        OTLPMetricExporter(
+            endpoint=f"{g.APP_OTEL_URL}/v1/metrics",
+        )
+    ))
+meter_provider = MeterProvider(resource=resource, metric_readers=metric_readers)
 metrics.set_meter_provider(meter_provider)
 meter = metrics.get_meter(__name__)
 
+# Local metrics for GET /metrics (Prometheus text format)
+registry = Registry()
+stage_seconds = registry.histogram(
+    "wopr_camera_stage_seconds",
+    "Capture pipeline stage duration (device_init, lock_wait, mode_switch, frame_capture, "
+    "queue_wait, colour_convert, encode, write, grab_encode)",
+)
+
+
+class _Instrument:
+    """An OTel instrument that also feeds its local /metrics counterpart"""
+
+    def __init__(self, otel, local, scale: float = 1.0):
+        self.otel = otel
+        self.local = local
+        self.scale = scale
+
+    def add(self, amount, attributes=None):
+        self.otel.add(amount, attributes)
+        self.local.inc(amount, **(attributes or {}))
+
+    def record(self, amount, attributes=None):
+        self.otel.record(amount, attributes)
+        self.local.observe(amount * self.scale, **(attributes or {}))
+
+
 # Custom metrics
-capture_counter = meter.create_counter(
-    "wopr.camera.captures.total",
-    description="Total number of camera captures attempted",
-    unit="1",
+capture_counter = _Instrument(
+    meter.create_counter(
+        "wopr.camera.captures.total",
+        description="Total number of camera captures attempted",
+        unit="1",
+    ),
+    registry.counter("wopr_camera_captures_total", "Camera captures attempted, by endpoint and status"),
+)
+capture_duration = _Instrument(
+    meter.create_histogram(
+        "wopr.camera.capture.duration",
+        description="Camera capture duration in milliseconds",
+        unit="ms",
+    ),
+    registry.histogram("wopr_camera_capture_seconds", "Whole capture request duration, by endpoint"),
+    scale=0.001,
 )
-capture_duration = meter.create_histogram(
-    "wopr.camera.capture.duration",
-    description="Camera capture duration in milliseconds",
-    unit="ms",
+capture_errors = _Instrument(
+    meter.create_counter(
+        "wopr.camera.errors.total",
+        description="Total number of camera capture errors",
+        unit="1",
+    ),
+    registry.counter("wopr_camera_errors_total", "Camera capture errors, by endpoint and error type"),
 )
-capture_errors = meter.create_counter(
-    "wopr.camera.errors.total",
-    description="Total number of camera capture errors",
-    unit="1",
+
+
+def _observe_still(timings: dict) -> None:
+    """Still-session stage timings (ms, from CameraDevice) into the stage histogram"""
+    stage_seconds.observe(timings.get("lock_wait", 0) / 1000, stage="lock_wait")
+    stage_seconds.observe((timings.get("switch_to_still", 0) + timings.get("switch_to_preview", 0)) / 1000, stage="mode_switch")
+    for ms in timings.get("capture", []):
+        stage_seconds.observe(ms / 1000, stage="frame_capture")
+
+# Camera devices are opened once and kept for the life of the process
+camera_manager = CameraManager(g.CAMERA_DICT, g.CAMERA_SETTINGS)
+
+# Thumbnail/preview for every written capture (wopr.storage derivatives)
+derivative_pool = DerivativePool(workers=g.DERIVATIVE_WORKERS, sizes=g.DERIVATIVE_SIZES) if g.DERIVATIVES_ENABLED else None
+
+# JPEG encode and write happen here, off the request thread
+image_writer = ImageWriter(
+    workers=g.CAMERA_WRITE_WORKERS,
+    max_queue=g.CAMERA_WRITE_QUEUE_SIZE,
+    fsync=g.CAMERA_WRITE_FSYNC,
+    job_history=g.CAMERA_WRITE_JOB_HISTORY,
+    on_written=derivative_pool.submit if derivative_pool else None,
+    on_stage=lambda stage, seconds: stage_seconds.observe(seconds, stage=stage),
 )
 
-app = FastAPI(title=g.APP_TITLE, version=g.APP_VERSION)
+
+def _frame_ages():
+    return {
+        labels(camera=camera_id): status["newest_age_ms"] / 1000
+        for camera_id, status in camera_manager.status().items()
+        if status.get("newest_age_ms") is not None
+    }
+
+
+registry.gauge("wopr_camera_write_queue_depth", "Frames waiting for the encode/write pool", lambda: image_writer.pending)
+registry.gauge("wopr_camera_write_in_progress", "Frames being encoded or written", lambda: image_writer.in_progress)
+registry.gauge("wopr_camera_frame_age_seconds", "Age of each open camera's newest buffered frame", _frame_ages)
+registry.gauge(
+    "wopr_camera_device_errors",
+    "Read errors since each camera was opened",
+    lambda: {labels(camera=camera_id): status["errors"] for camera_id, status in camera_manager.status().items()},
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    for camera_id in g.CAMERA_PRESTART:
+        try:
+            camera_manager.get(camera_id)
+        except Exception as e:
+            logger.error(f"Camera {camera_id} failed to start: {e}")
+    yield
+    for watcher in list(watchers.values()):
+        watcher.stop()
+    camera_manager.close_all()
+    # Drain queued writes so accepted captures reach disk
+    image_writer.shutdown(wait=True)
+    if derivative_pool:
+        derivative_pool.shutdown(wait=True)
+
+
+app = FastAPI(title=g.APP_TITLE, version=g.APP_VERSION, lifespan=lifespan)
 
 # Instrument FastAPI automatically (only if tracer is enabled)
 if tracer:
@@ -114,6 +216,23 @@ class Subject(str, Enum):
 
 class CaptureRequest(BaseModel):
     filename: Optional[str] = Field(None, description="Optional filename override")
+    wait: bool = Field(True, description="Wait until the file is written; false returns 202 once queued (poll /writes/{job_id})")
+
+class WatchRequest(BaseModel):
+    game_id: str = Field(..., min_length=1, description="Captures go to /remote/wopr/games/{game_id}/")
+    filename: str = Field("{timestamp}-capture-{seq:03d}.jpg", description="Pattern; {timestamp}, {seq} and {game_id} are filled in")
+
+class FrameSpec(BaseModel):
+    filename: str = Field(..., description="Pattern; {index}, {n}, {exposure_us} and {gain} are filled in")
+    count: int = Field(1, ge=1, description="Frames to take with these settings")
+    exposure_us: Optional[int] = Field(None, gt=0, description="Manual exposure time; omit for auto")
+    gain: Optional[float] = Field(None, gt=0, description="Manual analogue gain; omit for auto")
+
+class BurstRequest(BaseModel):
+    camera_id: str = Field("0", description="camDict id")
+    frames: List[FrameSpec] = Field(..., min_length=1, description="Taken in order in one still session")
+    quality: int = Field(95, ge=1, le=100)
+    wait: bool = Field(True, description="Wait until every file is written; false returns 202 once captured")
 
 @app.exception_handler(ValueError)
 async def value_error_handler(request, exc: ValueError):
@@ -147,6 +266,31 @@ def _trace_if_enabled(span_name: str):
         return nullcontext()
 
 
+def _queue_write(frame, filepath, quality: int = 95, block_seconds: float = 0.0):
+    """Hand a frame to the write pool; 503 if its queue is full"""
+    try:
+        return image_writer.submit(frame, str(filepath), quality, block_seconds)
+    except WriterBusy as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+def _write_accepted(job) -> JSONResponse:
+    """202 for a write still in the pool"""
+    return JSONResponse(
+        status_code=202,
+        content={"filename": job.path, "job_id": job.id, "status": job.status, "status_url": f"/writes/{job.id}"},
+    )
+
+
+def _record_size(span, frame) -> None:
+    """Log and tag the span with the still's actual size (set by the backend's still mode)"""
+    height, width = frame.shape[:2]
+    if span:
+        span.set_attribute("camera.width", width)
+        span.set_attribute("camera.height", height)
+    logger.info(f"Captured {width}x{height}")
+
+
 @app.post("/capture", response_class=PlainTextResponse)
 def capture(req: CaptureRequest):
     with _trace_if_enabled("camera.capture") as span:
@@ -163,36 +307,28 @@ def capture(req: CaptureRequest):
                 span.set_attribute("camera.filepath", str(filepath))
                 span.set_attribute("camera.filename_override", bool(req.filename))
 
-            resolution = "4k"
-            width = "4056"
-            height = "3040"
-            
-            if span:
-                span.set_attribute("camera.resolution", resolution)
-                span.set_attribute("camera.width", width)
-                span.set_attribute("camera.height", height)
-            
-            logger.info(f"Capturing {width}x{height} to {filepath}")
-
-            # Camera initialization and capture
-            with _trace_if_enabled("camera.device_init"):
-                cap = cv2.VideoCapture(0, cv2.CAP_V4L2)
-                if not cap.isOpened():
-                    raise RuntimeError("Camera device could not be opened")
+            logger.info(f"Capturing still to {filepath}")
 
-                cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc("M", "J", "P", "G"))
-                cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
-                cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+            # Camera is already open in preview mode; switch to still for this one frame
+            with _trace_if_enabled("camera.device_init"), stage_seconds.time(stage="device_init"):
+                device = camera_manager.get("0")
 
             with _trace_if_enabled("camera.frame_capture"):
-                ret, frame = cap.read()
-                cap.release()
-
-                if not ret:
-                    raise RuntimeError("Camera capture failed (no frame read)")
+                still, timings = device.capture_still()
+                _observe_still(timings)
+                frame = still.array
+            _record_size(span, frame)
+            logger.info(f"Still stage timings (ms): {timings}")
 
             with _trace_if_enabled("camera.image_write"):
-                cv2.imwrite(filepath, frame)
+                job = _queue_write(frame, filepath)
+                if not req.wait:
+                    capture_counter.add(1, {"endpoint": "capture", "status": "queued"})
+                    return _write_accepted(job)
+                if not job.wait(g.CAMERA_WRITE_TIMEOUT_SECONDS):
+                    if not job.done:
+                        return _write_accepted(job)
+                    raise RuntimeError(f"Image write failed: {job.error}")
 
             duration_ms = (time.time() - start_time) * 1000
             capture_duration.record(duration_ms, {"endpoint": "capture"})
@@ -230,53 +366,34 @@ def capture_ml(req: CaptureRequest):
                 span.set_attribute("camera.filepath", str(filepath))
                 span.set_attribute("camera.ml_mode", True)
 
-            resolution = "4k"
-            width = g.WOPR_CONFIG["camera"]["camDict"][str(camera_id)]["width"]
-            height = g.WOPR_CONFIG["camera"]["camDict"][str(camera_id)]["height"]
-            camType = g.WOPR_CONFIG["camera"]["camDict"][str(camera_id)]["type"]
-            if span:
-                span.set_attribute("camera.resolution", resolution)
-                span.set_attribute("camera.width", width)
-                span.set_attribute("camera.height", height)
-            
-            logger.info(f"Capturing {width}x{height} to {filepath}")
-
-            if camType == "usb":
-                # Camera initialization and capture
-                with _trace_if_enabled("camera.device_init"):
-                    cap = cv2.VideoCapture(0, cv2.CAP_V4L2)
-                    if not cap.isOpened():
-                        raise RuntimeError("Camera device could not be opened")
-
-                    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc("M", "J", "P", "G"))
-                    cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
-                    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
-
-                with _trace_if_enabled("camera.frame_capture"):
-                    ret, frame = cap.read()
-                    cap.release()
-                    if not ret:
-                        raise RuntimeError("Camera capture failed (no frame read)")
-
-                with _trace_if_enabled("camera.image_write"):
-                    cv2.imwrite(str(filepath), frame)
-            elif camType == "imx477":
-                picam2 = Picamera2()
-                camera_config = picam2.create_preview_configuration(
-                    main={"size": (width, height), "format": "RGB888"},
-                    transform=Transform(hflip=1,vflip=1)
-                )
-                picam2.options["quality"] = 95
-                picam2.options["compress_level"] = 1
-                picam2.configure(camera_config)
-                picam2.start()
-                time.sleep(2)
-                picam2.capture_file(
-                    str(filepath),
-                    format='jpeg'
-                )
-                picam2.stop()
-                picam2.close()
+            logger.info(f"Capturing still to {filepath}")
+
+            with _trace_if_enabled("camera.device_init"), stage_seconds.time(stage="device_init"):
+                device = camera_manager.get(str(camera_id))
+
+            # Full-res still read after this request, so a lighting change just made is in it;
+            # the device drops back to preview afterwards without closing
+            with _trace_if_enabled("camera.frame_capture") as capture_span:
+                still, timings = device.capture_still()
+                _observe_still(timings)
+                frame = still.array
+                if capture_span:
+                    for stage, ms in timings.items():
+                        capture_span.set_attribute(f"camera.still.{stage}_ms", ms)
+            _record_size(span, frame)
+
+            # Encode and write run in the pool; the camera is free for the next capture
+            with _trace_if_enabled("camera.image_write"):
+                job = _queue_write(frame, filepath, quality=95)
+                del frame, still
+                if not req.wait:
+                    capture_counter.add(1, {"endpoint": "capture_ml", "status": "queued"})
+                    return _write_accepted(job)
+                if not job.wait(g.CAMERA_WRITE_TIMEOUT_SECONDS):
+                    if not job.done:
+                        return _write_accepted(job)
+                    raise RuntimeError(f"Image write failed: {job.error}")
+            timings.update({f"write_{stage}": ms for stage, ms in job.timings_ms.items()})
 
             duration_ms = (time.time() - start_time) * 1000
             capture_duration.record(duration_ms, {"endpoint": "capture_ml"})
@@ -285,7 +402,7 @@ def capture_ml(req: CaptureRequest):
             logger.info(f"Captured image to {filepath}")
             if span:
                 span.set_status(Status(StatusCode.OK))
-            return JSONResponse({"filename": str(filepath)})
+            return JSONResponse({"filename": str(filepath), "timings_ms": timings})
             
         except Exception as e:
             capture_errors.add(1, {"error_type": type(e).__name__, "endpoint": "capture_ml"})
@@ -296,57 +413,207 @@ def capture_ml(req: CaptureRequest):
             raise
 
 
+@app.post("/capture_burst")
+def capture_burst(req: BurstRequest):
+    """
+    Several full-res frames in one camera session.
+
+    The camera switches to still mode once, applies each spec's
+    exposure/gain bracket, takes `count` frames per spec and switches
+    back; frames go through the write pool as they're taken (waiting for
+    room, so a long burst is paced by the disk rather than rejected).
+    """
+    with _trace_if_enabled("camera.capture_burst") as span:
+        start_time = time.time()
+        total = sum(spec.count for spec in req.frames)
+        if total > g.CAMERA_BURST_MAX_FRAMES:
+            raise ValueError(f"Burst of {total} frames exceeds the limit of {g.CAMERA_BURST_MAX_FRAMES}")
+        if req.camera_id not in g.CAMERA_DICT:
+            raise HTTPException(status_code=404, detail=f"Unknown camera {req.camera_id}")
+
+        ml_dir = Path("/remote/wopr") / "ml" / "incoming"
+        ml_dir.mkdir(parents=True, exist_ok=True)
+        if span:
+            span.set_attribute("camera.id", req.camera_id)
+            span.set_attribute("camera.burst_frames", total)
+
+        try:
+            with _trace_if_enabled("camera.device_init"), stage_seconds.time(stage="device_init"):
+                device = camera_manager.get(req.camera_id)
+
+            results, jobs = [], []
+            index = 0
+            with _trace_if_enabled("camera.frame_capture"), device.still_session() as session:
+                for spec in req.frames:
+                    if spec.exposure_us is not None or spec.gain is not None or session.manual:
+                        session.set_controls(spec.exposure_us, spec.gain)
+                    for n in range(spec.count):
+                        try:
+                            name = spec.filename.format(index=index, n=n, exposure_us=spec.exposure_us or "auto", gain=spec.gain or "auto")
+                        except (KeyError, IndexError, ValueError) as e:
+                            raise ValueError(f"Bad filename pattern {spec.filename!r}: {e}")
+                        frame = session.capture()
+                        job = _queue_write(frame.array, ml_dir / Path(name).name, req.quality, g.CAMERA_WRITE_TIMEOUT_SECONDS)
+                        jobs.append(job)
+                        results.append({"index": index, "exposure_us": spec.exposure_us, "gain": spec.gain, "job_id": job.id})
+                        index += 1
+            timings = dict(session.timings_ms)
+            _observe_still(timings)
+
+            waited = req.wait and all(job.wait(g.CAMERA_WRITE_TIMEOUT_SECONDS) for job in jobs)
+            for result, job in zip(results, jobs):
+                result.update(filename=job.path, status=job.status, error=job.error)
+            failed = [job for job in jobs if job.status == "failed"]
+            if failed:
+                raise RuntimeError(f"{len(failed)} of {len(jobs)} burst writes failed: {failed[0].error}")
+
+            duration_ms = (time.time() - start_time) * 1000
+            capture_duration.record(duration_ms, {"endpoint": "capture_burst"})
+            capture_counter.add(total, {"endpoint": "capture_burst", "status": "success" if waited else "queued"})
+            logger.info(f"Burst of {total} frames from camera {req.camera_id} in {duration_ms:.0f}ms")
+            if span:
+                span.set_status(Status(StatusCode.OK))
+            return JSONResponse(
+                status_code=200 if waited else 202,
+                content={"camera_id": req.camera_id, "frames": results, "timings_ms": timings},
+            )
+
+        except Exception as e:
+            capture_errors.add(1, {"error_type": type(e).__name__, "endpoint": "capture_burst"})
+            capture_counter.add(1, {"endpoint": "capture_burst", "status": "error"})
+            if span:
+                span.set_status(Status(StatusCode.ERROR, str(e)))
+                span.record_exception(e)
+            raise
+
+
+# camera id -> running change watcher
+watchers = {}
+
+
+def _auto_capture(camera_id: str, req: WatchRequest, seq):
+    """Full-res still for a settled board change, written through the pool"""
+    device = camera_manager.get(camera_id)
+    still, timings = device.capture_still()
+    _observe_still(timings)
+    n = next(seq)
+    name = req.filename.format(timestamp=datetime.now().strftime("%Y%m%d-%H%M%S"), seq=n, game_id=req.game_id)
+    game_dir = Path("/remote/wopr") / "games" / Path(req.game_id).name
+    game_dir.mkdir(parents=True, exist_ok=True)
+    job = image_writer.submit(still.array, str(game_dir / Path(name).name), 95, g.CAMERA_WRITE_TIMEOUT_SECONDS)
+    capture_counter.add(1, {"endpoint": "watch", "status": "queued"})
+    logger.info(f"Board change on camera {camera_id}: capture {n} -> {job.path}")
+    return {"filename": job.path, "job_id": job.id, "timings_ms": timings}
+
+
+@app.post("/watch/{camera_id}")
+def start_watch(camera_id: str, req: WatchRequest):
+    """
+    Capture automatically when the board changes and then settles.
+
+    Replaces any watcher already on the camera.
+    """
+    if camera_id not in g.CAMERA_DICT:
+        raise HTTPException(status_code=404, detail=f"Unknown camera {camera_id}")
+    try:
+        req.filename.format(timestamp="", seq=0, game_id=req.game_id)
+    except (KeyError, IndexError, ValueError) as e:
+        raise ValueError(f"Bad filename pattern {req.filename!r}: {e}")
+    if camera_id in watchers:
+        watchers.pop(camera_id).stop()
+    seq = itertools.count(1)
+    watcher = ChangeWatcher(
+        camera_manager.get(camera_id),
+        ChangeDetector(**g.CHANGE_DETECTION),
+        lambda event: _auto_capture(camera_id, req, seq),
+    )
+    watchers[camera_id] = watcher.start()
+    logger.info(f"Watching camera {camera_id} for board changes (game {req.game_id})")
+    return watcher.status()
+
+
+@app.delete("/watch/{camera_id}")
+def stop_watch(camera_id: str):
+    watcher = watchers.pop(camera_id, None)
+    if watcher is None:
+        raise HTTPException(status_code=404, detail=f"Camera {camera_id} is not being watched")
+    watcher.stop()
+    return watcher.status()
+
+
+@app.get("/watch")
+def watch_status():
+    """Change watchers: state, frames seen, captures taken and changes skipped"""
+    return {camera_id: watcher.status() for camera_id, watcher in sorted(watchers.items())}
+
+
 @app.get("/status")
 def status():
     with _trace_if_enabled("camera.status"):
         return {"status": "ready"}
 
+@app.get("/writes")
+def writes():
+    """Write pool: queue depth, done/failed/rejected, queue-wait/encode/write latency"""
+    return image_writer.metrics()
+
+
+@app.get("/writes/{job_id}")
+def write_status(job_id: str):
+    """Outcome of a queued write (capture with wait=false)"""
+    job = image_writer.job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired write job {job_id}")
+    return job.to_dict()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Stage histograms, capture counters and queue/frame-age gauges (Prometheus text format)"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@app.get("/cameras")
+def cameras():
+    """Open camera devices: backend, frames read, newest frame age, errors"""
+    return camera_manager.status()
+
+
 @app.get("/grab/{camera_id}")
 @app.get("/grab/{camera_id}/")
-def grab_camera(camera_id: int):
+def grab_camera(camera_id: int, quality: Optional[int] = None, width: Optional[int] = None):
+    """Newest preview frame as JPEG; ?quality= and ?width= override camera.grab_quality/grab_width"""
+    quality = g.CAMERA_GRAB_QUALITY if quality is None else quality
+    width = g.CAMERA_GRAB_WIDTH if width is None else width
+    if not 1 <= quality <= 100 or width < 0:
+        raise HTTPException(status_code=400, detail="quality must be 1-100 and width >= 0")
     with _trace_if_enabled("camera.grab") as span:
         if span:
             span.set_attribute("camera.id", camera_id)
-    camType = g.WOPR_CONFIG["camera"]["camDict"][str(camera_id)]["type"]
-    if camType == "blank":
-        return "no id"
-    width = g.WOPR_CONFIG["camera"]["camDict"][str(camera_id)]["width"]
-    height = g.WOPR_CONFIG["camera"]["camDict"][str(camera_id)]["height"]
-    if camType == "imx477":
-        picam2 = Picamera2()
-        camera_config = picam2.create_preview_configuration(
-                    main={"size": (width, height), "format": "RGB888"},
-                    transform=Transform(hflip=1,vflip=1)
-                )
-        picam2.configure(camera_config)
-        picam2.start()
-        time.sleep(2)
-        image_array = picam2.capture_array("main")
-        picam2.stop()
-        picam2.close()
-        image_array = cv2.cvtColor(image_array, cv2.COLOR_BGR2RGB)
-        img = Image.fromarray(image_array)
-        buf = io.BytesIO()
-        img.save(buf, format='JPEG')
-        return PlainTextResponse(content=buf.getvalue(), media_type="image/jpeg")
-    else:
+        camType = g.WOPR_CONFIG["camera"]["camDict"][str(camera_id)]["type"]
+        if camType == "blank":
+            return "no id"
         try:
-            cap = cv2.VideoCapture(camera_id, cv2.CAP_V4L2)
-            if not cap.isOpened():
-                raise RuntimeError("Camera device could not be opened")
-
-            ret, frame = cap.read()
-            cap.release()
-
-            if not ret:
-                raise RuntimeError("Camera capture failed (no frame read)")
-
-            _, img_encoded = cv2.imencode('.jpg', frame)
+            # Newest buffered frame, encoded once per frame however many viewers ask
+            with stage_seconds.time(stage="grab_encode"):
+                frame, data, cached = camera_manager.get(str(camera_id)).jpeg(
+                    quality, width, max_age=g.CAMERA_MAX_FRAME_AGE_SECONDS)
             if span:
+                span.set_attribute("camera.frame_age_ms", frame.age * 1000)
+                span.set_attribute("camera.jpeg_cached", cached)
                 span.set_status(Status(StatusCode.OK))
-            return PlainTextResponse(content=img_encoded.tobytes(), media_type="image/jpeg")
-        
+            return Response(
+                content=data,
+                media_type="image/jpeg",
+                headers={
+                    "X-Frame-Seq": str(frame.seq),
+                    "X-Frame-Age-Ms": f"{frame.age * 1000:.0f}",
+                    "X-Jpeg-Cached": "1" if cached else "0",
+                },
+            )
+
         except Exception as e:
+            logger.error(f"Camera {camera_id} grab failed: {e}")
             if span:
                 span.set_status(Status(StatusCode.ERROR, str(e)))
                 span.record_exception(e)
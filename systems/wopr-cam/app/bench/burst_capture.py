@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# bench/burst_capture.py
+"""
+An exposure-bracketed sweep: one capture per frame vs one /capture_burst.
+
+The synthetic backend stands in for the imx477 (see bench.still_capture
+for the knobs); --rtt-ms is the API -> wopr-cam round trip each per-frame
+capture pays.  Files go through ImageWriter into a temp dir.
+
+1. Per frame: for each frame, a round trip plus capture_still() with its
+   own switch to still and back, then wait for the file.
+2. Burst: one still session, set_controls() per bracket, every frame
+   queued as it's taken, then wait for all files.
+
+    python -m bench.burst_capture --brackets 3 --count 4 --switch-ms 150
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from camera_manager import CameraManager, SyntheticBackend
+from image_writer import ImageWriter
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Burst capture benchmark")
+    parser.add_argument("--brackets", type=int, default=3, help="exposure steps")
+    parser.add_argument("--count", type=int, default=4, help="frames per step")
+    parser.add_argument("--width", type=int, default=4056)
+    parser.add_argument("--height", type=int, default=3040)
+    parser.add_argument("--frame-ms", type=float, default=33.0)
+    parser.add_argument("--still-frame-ms", type=float, default=100.0)
+    parser.add_argument("--switch-ms", type=float, default=150.0)
+    parser.add_argument("--settle-frames", type=int, default=3)
+    parser.add_argument("--rtt-ms", type=float, default=20.0)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    def backend(camera=None, settings=None):
+        return SyntheticBackend(
+            args.width, args.height,
+            frame_seconds=args.frame_ms / 1000,
+            preview_size=(args.width // 2, args.height // 2),
+            still_frame_seconds=args.still_frame_ms / 1000,
+            switch_seconds=args.switch_ms / 1000,
+            control_settle_frames=args.settle_frames,
+        )
+
+    exposures = [1000 * 2 ** i for i in range(args.brackets)]
+    frames = len(exposures) * args.count
+    print(f"frames={frames} ({args.brackets} brackets x {args.count}) still_read={args.still_frame_ms}ms "
+          f"switch={args.switch_ms}ms settle={args.settle_frames} frames rtt={args.rtt_ms}ms")
+
+    directory = tempfile.mkdtemp(prefix="wopr-burst-")
+    manager = CameraManager({"0": {"type": "synthetic"}}, {"frame_interval_seconds": 0}, backend_factory=backend)
+    writer = ImageWriter(workers=args.workers, max_queue=8)
+    device = manager.get("0")
+    device.latest()
+    try:
+        start = time.perf_counter()
+        for exposure in exposures:
+            for n in range(args.count):
+                time.sleep(args.rtt_ms / 1000)
+                with device.still_session() as session:
+                    session.set_controls(exposure_us=exposure)
+                    frame = session.capture()
+                writer.submit(frame.array, os.path.join(directory, f"single-{exposure}-{n}.jpg")).wait()
+        single = (time.perf_counter() - start) * 1000
+        print(f"per frame  total={single:8.1f}ms per-frame={single / frames:7.1f}ms")
+
+        start = time.perf_counter()
+        time.sleep(args.rtt_ms / 1000)
+        jobs = []
+        with device.still_session() as session:
+            for exposure in exposures:
+                session.set_controls(exposure_us=exposure)
+                for n in range(args.count):
+                    frame = session.capture()
+                    jobs.append(writer.submit(frame.array, os.path.join(directory, f"burst-{exposure}-{n}.jpg"), block_seconds=30))
+        captured = (time.perf_counter() - start) * 1000
+        assert all(job.wait() for job in jobs)
+        burst = (time.perf_counter() - start) * 1000
+        print(f"burst      total={burst:8.1f}ms per-frame={burst / frames:7.1f}ms (session {captured:.1f}ms)")
+        print("session timings:", session.timings_ms)
+        print("writer:", {k: v for k, v in writer.metrics().items() if k.endswith("p50") or k in ("done", "failed")})
+    finally:
+        writer.shutdown()
+        manager.close_all()
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
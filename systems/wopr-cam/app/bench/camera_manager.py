@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# bench/camera_manager.py
+"""
+Grab latency: open/warm-up/read/close per request vs the long-lived device.
+
+The synthetic backend stands in for the imx477: --warmup-s is the settle
+sleep grab used to pay on every call, --frame-ms the sensor read time.
+
+1. Per request: open(), read(), close() for each grab (the old path).
+2. Manager: CameraManager.get(...).latest(max_age) for each grab.
+3. Fresh: next_frame() for each grab (what captures use).
+
+    python -m bench.camera_manager --grabs 20 --warmup-s 2 --frame-ms 100
+"""
+
+import argparse
+import math
+import time
+
+from camera_manager import CameraManager, SyntheticBackend
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(pct / 100.0 * len(ordered))) - 1]
+
+
+def _report(label, timings):
+    print(f"{label:<12} grabs={len(timings):4d} p50={percentile(timings, 50):9.1f}ms "
+          f"p99={percentile(timings, 99):9.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Camera manager benchmark")
+    parser.add_argument("--grabs", type=int, default=20)
+    parser.add_argument("--width", type=int, default=4056)
+    parser.add_argument("--height", type=int, default=3040)
+    parser.add_argument("--warmup-s", type=float, default=2.0)
+    parser.add_argument("--frame-ms", type=float, default=100.0)
+    parser.add_argument("--max-age-s", type=float, default=1.0)
+    parser.add_argument("--old-grabs", type=int, default=3, help="old path is slow; fewer samples")
+    args = parser.parse_args()
+
+    def backend(camera=None, settings=None):
+        return SyntheticBackend(args.width, args.height, args.frame_ms / 1000, args.warmup_s)
+
+    print(f"frame={args.width}x{args.height} warmup={args.warmup_s}s frame_time={args.frame_ms}ms")
+
+    timings = []
+    for _ in range(args.old_grabs):
+        start = time.perf_counter()
+        b = backend()
+        b.open()
+        b.read()
+        b.close()
+        timings.append((time.perf_counter() - start) * 1000)
+    _report("per request", timings)
+
+    manager = CameraManager({"0": {"type": "synthetic"}}, {"ring_size": 3, "frame_interval_seconds": 0}, backend_factory=backend)
+    start = time.perf_counter()
+    device = manager.get("0")
+    device.latest()
+    print(f"{'first open':<12} {(time.perf_counter() - start) * 1000:9.1f}ms (paid once per process)")
+    try:
+        timings = []
+        for _ in range(args.grabs):
+            start = time.perf_counter()
+            device.latest(max_age=args.max_age_s)
+            timings.append((time.perf_counter() - start) * 1000)
+            time.sleep(0.05)
+        _report("manager", timings)
+
+        timings = []
+        for _ in range(args.grabs):
+            start = time.perf_counter()
+            device.next_frame()
+            timings.append((time.perf_counter() - start) * 1000)
+        _report("fresh frame", timings)
+        print("status:", device.status())
+    finally:
+        manager.close_all()
+
+
+if __name__ == "__main__":
+    main()
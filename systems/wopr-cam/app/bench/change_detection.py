@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# bench/change_detection.py
+"""
+Replay a frame sequence through ChangeDetector.
+
+Without --dir, a scripted game at preview size is generated: sensor
+noise throughout, a "hand" that sweeps over the board and leaves (no
+change), and hands that move a piece (a change), plus a lighting
+flicker.  Reports the events against the script and the per-frame
+detector cost.  --save writes the generated frames (named by
+millisecond timestamp) so they can be replayed with --dir, as can frames
+recorded from a real camera.
+
+    python -m bench.change_detection --fps 10
+    python -m bench.change_detection --save /tmp/game && python -m bench.change_detection --dir /tmp/game
+"""
+
+import argparse
+import os
+import time
+
+import cv2
+import numpy as np
+
+from change_detector import ChangeDetector, load_sequence, replay
+
+
+def _board(width, height, pieces):
+    board = np.zeros((height, width, 3), dtype=np.uint8)
+    board[:, :] = (60, 110, 60)
+    step = width // 8
+    for i in range(0, 8, 2):
+        board[:, i * step:(i + 1) * step] = (70, 125, 70)
+    size = step // 2
+    for x, y in pieces:
+        cv2.circle(board, (x, y), size // 2, (25, 25, 25), -1)
+    return board
+
+
+def generate(width=1014, height=760, fps=10.0, seed=0):
+    """Scripted (timestamp, frame) sequence and the captures it should produce"""
+    rng = np.random.default_rng(seed)
+    pieces = [(width // 4, height // 3), (width // 2, height // 2), (3 * width // 4, 2 * height // 3)]
+    script = []  # (seconds, action)
+    t = 2.0
+    for move in range(4):
+        script.append((t, "sweep"))  # hand in and out, nothing moved
+        t += 5.0
+        script.append((t, "move"))
+        t += 5.0
+    script.append((t, "flicker"))
+    duration = t + 3.0
+
+    frames, expected = [], 0
+    board = _board(width, height, pieces)
+    moved = 0
+    for i in range(int(duration * fps)):
+        ts = i / fps
+        frame = board
+        for start, action in script:
+            dt = ts - start
+            if action in ("sweep", "move") and 0 <= dt < 1.5:
+                frame = board.copy()
+                x = int(dt / 1.5 * width * 1.4) - width // 5
+                cv2.rectangle(frame, (x, height // 4), (x + width // 5, height), (150, 180, 210), -1)
+            if action == "move" and dt >= 0.75 and len(pieces) and ts - 1 / fps < start + 0.75:
+                # The piece moves while the hand is over the board
+                px, py = pieces[moved % len(pieces)]
+                pieces[moved % len(pieces)] = (px + width // 16, py)
+                moved += 1
+                board = _board(width, height, pieces)
+                expected += 1
+            if action == "flicker" and 0 <= dt < 0.3:
+                frame = cv2.convertScaleAbs(board, alpha=1.0, beta=6)
+        noise = rng.integers(-4, 5, frame.shape, dtype=np.int16)
+        frames.append((ts, np.clip(frame.astype(np.int16) + noise, 0, 255).astype(np.uint8)))
+    return frames, expected
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Change detection replay")
+    parser.add_argument("--dir", help="replay image files from here instead of generating")
+    parser.add_argument("--save", help="write the generated frames here and exit")
+    parser.add_argument("--fps", type=float, default=10.0)
+    parser.add_argument("--scale-width", type=int, default=320)
+    parser.add_argument("--settle-s", type=float, default=1.5)
+    parser.add_argument("--pixel-threshold", type=int, default=25)
+    args = parser.parse_args()
+
+    if args.dir:
+        frames, expected = list(load_sequence(args.dir, args.fps)), None
+    else:
+        frames, expected = generate(fps=args.fps)
+    if args.save:
+        os.makedirs(args.save, exist_ok=True)
+        for ts, frame in frames:
+            cv2.imwrite(os.path.join(args.save, f"{int(ts * 1000):08d}.jpg"), frame)
+        print(f"saved {len(frames)} frames to {args.save}")
+        return
+
+    detector = ChangeDetector(scale_width=args.scale_width, settle_seconds=args.settle_s, pixel_threshold=args.pixel_threshold)
+    start = time.perf_counter()
+    events = replay(detector, frames)
+    elapsed = (time.perf_counter() - start) * 1000
+    captures = [e for e in events if e.kind == "capture"]
+    duration = frames[-1][0] - frames[0][0] if frames else 0
+    print(f"frames={len(frames)} ({duration:.1f}s at {frames[0][1].shape[1]}x{frames[0][1].shape[0]}) "
+          f"detector={elapsed / len(frames):.2f}ms/frame")
+    for e in events:
+        print(f"  t={e.timestamp:6.1f}s {e.kind:<9} changed={e.changed_fraction:.4f} moving={e.moving_seconds:.1f}s")
+    print(f"captures={len(captures)}" + (f" expected={expected}" if expected is not None else "")
+          + f" skipped={len(events) - len(captures)}"
+          + f" (a capture every {args.settle_s}s would have taken {int(duration / args.settle_s)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# bench/grab_encode.py
+"""
+Preview grab encode: convert/PIL/save per request vs one imencode per frame.
+
+--viewers threads each poll a synthetic camera's preview every --poll-ms,
+as browser tabs and the api's grab-all do.  Three paths over the same
+frames:
+
+1. pil: cvtColor to RGB, Image.fromarray, save to a BytesIO, per request
+   (the old imx477 grab: two full-frame copies and a PIL encode).
+2. imencode: one cv2.imencode from the ring buffer's array, per request.
+3. shared: CameraDevice.jpeg(), the same encode done once per frame and
+   served to every viewer.
+
+Reports per-grab latency, encodes done and the numpy memory allocated per
+grab (tracemalloc; PIL's own buffers aren't counted, so the pil figure is
+a floor).
+
+    python -m bench.grab_encode --viewers 4 --poll-ms 50 --seconds 5
+"""
+
+import argparse
+import io
+import math
+import threading
+import time
+import tracemalloc
+
+import cv2
+
+from camera_manager import CameraDevice, SyntheticBackend, encode_jpeg
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(pct / 100.0 * len(ordered))) - 1]
+
+
+def _pil(device, quality, width):
+    from PIL import Image
+
+    frame = device.latest(max_age=1.0)
+    rgb = cv2.cvtColor(frame.array, cv2.COLOR_BGR2RGB)
+    img = Image.fromarray(rgb)
+    if width and width < img.width:
+        img = img.resize((width, img.height * width // img.width))
+    buffer = io.BytesIO()
+    img.save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def _imencode(device, quality, width):
+    return encode_jpeg(device.latest(max_age=1.0).array, quality, width)
+
+
+def _shared(device, quality, width):
+    return device.jpeg(quality, width, max_age=1.0)[1]
+
+
+def _run(label, grab, device, args):
+    timings, sizes = [], []
+    lock = threading.Lock()
+    stop = time.monotonic() + args.seconds
+
+    def viewer():
+        while time.monotonic() < stop:
+            start = time.perf_counter()
+            data = grab(device, args.quality, args.width)
+            elapsed = (time.perf_counter() - start) * 1000
+            with lock:
+                timings.append(elapsed)
+                sizes.append(len(data))
+            time.sleep(args.poll_ms / 1000)
+
+    threads = [threading.Thread(target=viewer) for _ in range(args.viewers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    # Allocation per grab, measured apart from the timed run
+    tracemalloc.start()
+    grab(device, args.quality, args.width)
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    grab(device, args.quality, args.width)
+    allocated = tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+    return timings, sum(sizes) // len(sizes), allocated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Preview grab encode benchmark")
+    parser.add_argument("--width", type=int, default=0, help="grab width; 0 = preview size")
+    parser.add_argument("--preview-width", type=int, default=2028)
+    parser.add_argument("--preview-height", type=int, default=1520)
+    parser.add_argument("--frame-ms", type=float, default=100.0)
+    parser.add_argument("--quality", type=int, default=80)
+    parser.add_argument("--viewers", type=int, default=4)
+    parser.add_argument("--poll-ms", type=float, default=50.0)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    backend = SyntheticBackend(args.preview_width * 2, args.preview_height * 2, args.frame_ms / 1000, 0,
+                               preview_size=(args.preview_width, args.preview_height))
+    device = CameraDevice("0", backend, frame_interval=0, idle_seconds=3600).start()
+    device.next_frame()
+    frame_mb = args.preview_width * args.preview_height * 3 / 1e6
+    print(f"preview={args.preview_width}x{args.preview_height} ({frame_mb:.1f}MB) grab width={args.width or 'preview'} "
+          f"quality={args.quality} viewers={args.viewers} poll={args.poll_ms:.0f}ms frame={args.frame_ms:.0f}ms")
+    try:
+        for label, grab in (("pil", _pil), ("imencode", _imencode), ("shared", _shared)):
+            encodes, seq = device.jpeg_encodes, device.status()["frames_read"]
+            timings, size, allocated = _run(label, grab, device, args)
+            frames = device.status()["frames_read"] - seq
+            done = device.jpeg_encodes - encodes if label == "shared" else len(timings) + 2
+            print(f"{label:<9} grabs={len(timings):4d} p50={percentile(timings, 50):7.1f}ms "
+                  f"p99={percentile(timings, 99):7.1f}ms encodes={done:4d} (frames {frames:3d}) "
+                  f"jpeg={size // 1024}KB numpy alloc/grab={allocated / 1e6:5.1f}MB")
+    finally:
+        device.stop()
+
+
+if __name__ == "__main__":
+    main()
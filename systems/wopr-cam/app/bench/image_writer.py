@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# bench/image_writer.py
+"""
+Capture handler time: inline cv2.imwrite vs the ImageWriter pool.
+
+Frames come from the synthetic backend at full imx477 size and are written
+to --dir (point it at the NFS mount to see real write latency).
+
+1. Inline: encode + write in the handler, as capture_ml did.
+2. Wait: submit to the pool and wait for the file (wait=true).
+3. Ack: submit and return (wait=false); all files awaited at the end.
+
+For each, the time a handler holds its request, and the wall time until
+every file is on disk.
+
+    python -m bench.image_writer --captures 20 --workers 2 --fsync file --dir /tmp/wopr-bench
+"""
+
+import argparse
+import math
+import os
+import shutil
+import tempfile
+import time
+
+import cv2
+
+from camera_manager import SyntheticBackend
+from image_writer import FSYNC_POLICIES, ImageWriter
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(pct / 100.0 * len(ordered))) - 1]
+
+
+def _report(label, handler, wall):
+    print(f"{label:<8} handler p50={percentile(handler, 50):8.1f}ms p99={percentile(handler, 99):8.1f}ms "
+          f"all-on-disk={wall:8.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Image writer benchmark")
+    parser.add_argument("--captures", type=int, default=20)
+    parser.add_argument("--width", type=int, default=4056)
+    parser.add_argument("--height", type=int, default=3040)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--queue", type=int, default=32)
+    parser.add_argument("--fsync", choices=FSYNC_POLICIES, default="file")
+    parser.add_argument("--dir", default=None, help="where to write (default: a temp dir)")
+    args = parser.parse_args()
+
+    directory = args.dir or tempfile.mkdtemp(prefix="wopr-writer-")
+    os.makedirs(directory, exist_ok=True)
+    camera = SyntheticBackend(args.width, args.height)
+    camera.open()
+    frames = [camera.read() for _ in range(4)]
+    print(f"frame={args.width}x{args.height} workers={args.workers} fsync={args.fsync} dir={directory}")
+
+    try:
+        handler = []
+        start = time.perf_counter()
+        for i in range(args.captures):
+            t = time.perf_counter()
+            cv2.imwrite(os.path.join(directory, f"inline-{i}.jpg"), frames[i % len(frames)], [cv2.IMWRITE_JPEG_QUALITY, 95])
+            handler.append((time.perf_counter() - t) * 1000)
+        _report("inline", handler, (time.perf_counter() - start) * 1000)
+
+        for mode in ("wait", "ack"):
+            writer = ImageWriter(workers=args.workers, max_queue=args.queue, fsync=args.fsync)
+            handler, jobs = [], []
+            start = time.perf_counter()
+            for i in range(args.captures):
+                t = time.perf_counter()
+                job = writer.submit(frames[i % len(frames)], os.path.join(directory, f"{mode}-{i}.jpg"))
+                if mode == "wait":
+                    job.wait()
+                handler.append((time.perf_counter() - t) * 1000)
+                jobs.append(job)
+            for job in jobs:
+                job.wait()
+            _report(mode, handler, (time.perf_counter() - start) * 1000)
+            m = writer.metrics()
+            print(f"{'':<8} encode p50={m['encode_ms_p50']}ms write p50={m['write_ms_p50']}ms "
+                  f"queue_wait p99={m['queue_wait_ms_p99']}ms done={m['done']} failed={m['failed']}")
+            writer.shutdown()
+    finally:
+        if args.dir is None:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# bench/still_capture.py
+"""
+Full-resolution stills: reconfigure-per-shot vs preview/still mode switching.
+
+The synthetic backend stands in for the imx477: --warmup-s is the settle
+after configure/start, --still-frame-ms a full-resolution readout,
+--frame-ms a preview readout and --switch-ms one Picamera2.switch_mode.
+
+1. Teardown: open at full resolution, warm up, read, close for each still
+   (what capture_ml did before the camera manager).
+2. Session: device left running in preview; capture_still() switches to
+   still, reads, switches back.  Per-stage timings come from the session.
+
+Also reports how long preview frames stop for while a still is taken,
+which is what a /grab caller sees.
+
+    python -m bench.still_capture --stills 20 --switch-ms 150 --still-frame-ms 250
+"""
+
+import argparse
+import math
+import time
+
+from camera_manager import CameraManager, SyntheticBackend
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(pct / 100.0 * len(ordered))) - 1]
+
+
+def _report(label, timings):
+    print(f"{label:<20} n={len(timings):4d} p50={percentile(timings, 50):9.1f}ms "
+          f"p99={percentile(timings, 99):9.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Still capture benchmark")
+    parser.add_argument("--stills", type=int, default=20)
+    parser.add_argument("--width", type=int, default=4056)
+    parser.add_argument("--height", type=int, default=3040)
+    parser.add_argument("--preview-width", type=int, default=2028)
+    parser.add_argument("--preview-height", type=int, default=1520)
+    parser.add_argument("--warmup-s", type=float, default=2.0)
+    parser.add_argument("--frame-ms", type=float, default=33.0)
+    parser.add_argument("--still-frame-ms", type=float, default=250.0)
+    parser.add_argument("--switch-ms", type=float, default=150.0)
+    parser.add_argument("--old-stills", type=int, default=3, help="teardown path is slow; fewer samples")
+    args = parser.parse_args()
+
+    def backend(camera=None, settings=None):
+        return SyntheticBackend(
+            args.width, args.height,
+            frame_seconds=args.frame_ms / 1000,
+            warmup_seconds=args.warmup_s,
+            preview_size=(args.preview_width, args.preview_height),
+            still_frame_seconds=args.still_frame_ms / 1000,
+            switch_seconds=args.switch_ms / 1000,
+        )
+
+    print(f"still={args.width}x{args.height} preview={args.preview_width}x{args.preview_height} "
+          f"warmup={args.warmup_s}s still_read={args.still_frame_ms}ms switch={args.switch_ms}ms")
+
+    timings = []
+    for _ in range(args.old_stills):
+        start = time.perf_counter()
+        b = SyntheticBackend(args.width, args.height, args.still_frame_ms / 1000, args.warmup_s)
+        b.open()
+        b.read()
+        b.close()
+        timings.append((time.perf_counter() - start) * 1000)
+    _report("teardown", timings)
+
+    manager = CameraManager({"0": {"type": "synthetic"}}, {"ring_size": 3, "frame_interval_seconds": 0}, backend_factory=backend)
+    device = manager.get("0")
+    device.latest()
+    try:
+        totals, stages, gaps = [], {}, []
+        for _ in range(args.stills):
+            before = device.latest().seq
+            start = time.perf_counter()
+            frame, stage_ms = device.capture_still()
+            totals.append((time.perf_counter() - start) * 1000)
+            assert frame.array.shape[:2] == (args.height, args.width)
+            for stage, ms in stage_ms.items():
+                stages.setdefault(stage, []).extend(ms if isinstance(ms, list) else [ms])
+            # Preview resumes after the switch back; time until its next frame
+            while device.latest().seq == before:
+                time.sleep(0.001)
+            gaps.append((time.perf_counter() - start) * 1000)
+            time.sleep(0.1)
+        _report("session", totals)
+        for stage in ("lock_wait", "switch_to_still", "capture", "switch_to_preview"):
+            _report(f"  {stage}", stages[stage])
+        _report("preview gap", gaps)
+        print("status:", device.status())
+    finally:
+        manager.close_all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,686 @@
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# app/camera_manager.py
+"""
+Long-lived camera devices for wopr-cam.
+
+A CameraDevice owns one backend (USB via OpenCV, imx477 via Picamera2, or
+the synthetic source) for the life of the process.  The device is opened
+and warmed up once; a background thread then reads frames into a ring
+buffer of the newest `ring_size`, so a grab is a lookup rather than a
+2-3 second open/warm-up/close.
+
+The reader goes quiet after `idle_seconds` without a consumer (the device
+stays open and warm) and wakes on the next request.  Read errors close and
+reopen the backend with backoff.
+
+Cameras with more than one mode (imx477) run in a low-resolution preview
+mode, which is what the ring buffer holds.  Full-resolution stills go
+through still_session(): switch to the still mode, capture one or more
+frames, switch back, all without stopping or closing the device.  Each
+session records per-stage timings (lock wait, switch, capture, switch
+back).
+
+Preview grabs go through jpeg(): the newest frame is encoded once, straight
+from the ring buffer's array with a single cv2.imencode, and the bytes are
+kept with the frame's sequence number, so every viewer polling the same
+frame (and the grab-all fan-out) shares one encode.
+
+Backends need open()/read()/close(), plus to_still()/to_preview() if they
+have modes; read() returns a BGR uint8 array as OpenCV expects.  Nothing
+here reads globals, so the manager can be driven from a benchmark with
+SyntheticBackend and no hardware.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("wopr-cam")
+
+
+@dataclass(frozen=True)
+class Frame:
+    """One captured frame (BGR) and when it was read"""
+    seq: int
+    timestamp: float
+    monotonic: float
+    array: np.ndarray
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.monotonic
+
+
+class CameraBackend:
+    """A single camera device: open once, read many, close once"""
+    name = "base"
+    supports_controls = False
+    # Frames read and dropped after set_controls() before they apply
+    control_settle_frames = 0
+
+    def open(self) -> None:
+        raise NotImplementedError
+
+    def read(self) -> np.ndarray:
+        raise NotImplementedError
+
+    def to_still(self) -> None:
+        """Switch to full-resolution stills; single-mode devices do nothing"""
+
+    def to_preview(self) -> None:
+        """Back to the preview mode after to_still()"""
+
+    def set_controls(self, exposure_us: Optional[int] = None, gain: Optional[float] = None) -> None:
+        """Manual exposure time (us) and/or analogue gain; neither returns to auto"""
+        raise NotImplementedError(f"{self.name} camera has no exposure/gain controls")
+
+    def close(self) -> None:
+        pass
+
+
+class SyntheticBackend(CameraBackend):
+    """
+    Generated frames: a fixed gradient with a square that moves each frame.
+
+    Stands in for the imx477: frame_seconds models preview readout,
+    still_frame_seconds a full-resolution readout, switch_seconds each
+    mode switch, and warmup_seconds the settle paid once at open().
+    """
+    name = "synthetic"
+    supports_controls = True
+
+    def __init__(
+        self,
+        width: int = 1920,
+        height: int = 1080,
+        frame_seconds: float = 0.0,
+        warmup_seconds: float = 0.0,
+        preview_size: Optional[Tuple[int, int]] = None,
+        still_frame_seconds: Optional[float] = None,
+        switch_seconds: float = 0.0,
+        control_settle_frames: int = 0,
+    ):
+        self.width = width
+        self.height = height
+        self.frame_seconds = frame_seconds
+        self.warmup_seconds = warmup_seconds
+        self.preview_size = preview_size or (width, height)
+        self.still_frame_seconds = frame_seconds if still_frame_seconds is None else still_frame_seconds
+        self.switch_seconds = switch_seconds
+        self.control_settle_frames = control_settle_frames
+        self.controls: Dict[str, Any] = {}
+        self.still = False
+        self._bases: Dict[Tuple[int, int], np.ndarray] = {}
+        self._n = 0
+
+    @staticmethod
+    def _base(width: int, height: int) -> np.ndarray:
+        ramp = np.linspace(0, 255, width, dtype=np.uint8)
+        base = np.empty((height, width, 3), dtype=np.uint8)
+        base[:, :, 0] = ramp
+        base[:, :, 1] = ramp[::-1]
+        base[:, :, 2] = 128
+        return base
+
+    def open(self) -> None:
+        self._bases = {size: self._base(*size) for size in {(self.width, self.height), self.preview_size}}
+        self.still = False
+        time.sleep(self.warmup_seconds)
+
+    def read(self) -> np.ndarray:
+        if not self._bases:
+            raise RuntimeError("Synthetic camera is not open")
+        width, height = (self.width, self.height) if self.still else self.preview_size
+        delay = self.still_frame_seconds if self.still else self.frame_seconds
+        if delay:
+            time.sleep(delay)
+        frame = self._bases[(width, height)].copy()
+        size = max(8, min(width, height) // 8)
+        x = (self._n * size // 4) % max(1, width - size)
+        y = (height - size) // 2
+        frame[y:y + size, x:x + size] = 255
+        self._n += 1
+        return frame
+
+    def to_still(self) -> None:
+        time.sleep(self.switch_seconds)
+        self.still = True
+
+    def to_preview(self) -> None:
+        time.sleep(self.switch_seconds)
+        self.still = False
+
+    def set_controls(self, exposure_us: Optional[int] = None, gain: Optional[float] = None) -> None:
+        self.controls = {k: v for k, v in (("exposure_us", exposure_us), ("gain", gain)) if v is not None}
+
+    def close(self) -> None:
+        self._bases = {}
+
+
+class OpenCVBackend(CameraBackend):
+    """USB (V4L2) camera through cv2.VideoCapture, MJPG at the configured size"""
+    name = "usb"
+
+    def __init__(self, index: int, width: Optional[int] = None, height: Optional[int] = None):
+        self.index = index
+        self.width = width
+        self.height = height
+        self._cap = None
+
+    def open(self) -> None:
+        import cv2
+        cap = cv2.VideoCapture(self.index, cv2.CAP_V4L2)
+        if not cap.isOpened():
+            raise RuntimeError(f"Camera device {self.index} could not be opened")
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc("M", "J", "P", "G"))
+        if self.width and self.height:
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        # Keep the driver queue short so reads are recent
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self._cap = cap
+
+    def read(self) -> np.ndarray:
+        ret, frame = self._cap.read()
+        if not ret:
+            raise RuntimeError(f"Camera {self.index} capture failed (no frame read)")
+        return frame
+
+    def close(self) -> None:
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+
+
+class Picamera2Backend(CameraBackend):
+    """
+    imx477 through Picamera2; RGB888 is BGR in memory, as OpenCV wants.
+
+    Runs a preview configuration at preview_size; to_still()/to_preview()
+    use Picamera2.switch_mode, which reconfigures the running camera
+    without closing it or paying the warm-up again.
+    """
+    name = "imx477"
+    supports_controls = True
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        flip: bool = True,
+        warmup_seconds: float = 2.0,
+        buffer_count: int = 2,
+        preview_size: Optional[Tuple[int, int]] = None,
+        control_settle_frames: int = 3,
+    ):
+        self.width = width
+        self.height = height
+        self.flip = flip
+        self.control_settle_frames = control_settle_frames
+        self.warmup_seconds = warmup_seconds
+        self.buffer_count = buffer_count
+        self.preview_size = preview_size or (width, height)
+        self._picam2 = None
+        self._preview_config = None
+        self._still_config = None
+
+    def open(self) -> None:
+        from picamera2 import Picamera2
+        from libcamera import Transform
+        picam2 = Picamera2()
+        transform = Transform(hflip=int(self.flip), vflip=int(self.flip))
+        self._preview_config = picam2.create_preview_configuration(
+            main={"size": self.preview_size, "format": "RGB888"},
+            transform=transform,
+            buffer_count=self.buffer_count,
+        )
+        self._still_config = picam2.create_still_configuration(
+            main={"size": (self.width, self.height), "format": "RGB888"},
+            transform=transform,
+        )
+        picam2.configure(self._preview_config)
+        picam2.start()
+        time.sleep(self.warmup_seconds)
+        self._picam2 = picam2
+
+    def read(self) -> np.ndarray:
+        return self._picam2.capture_array("main")
+
+    def to_still(self) -> None:
+        self._picam2.switch_mode(self._still_config)
+
+    def to_preview(self) -> None:
+        self._picam2.switch_mode(self._preview_config)
+
+    def set_controls(self, exposure_us: Optional[int] = None, gain: Optional[float] = None) -> None:
+        if exposure_us is None and gain is None:
+            self._picam2.set_controls({"AeEnable": True})
+            return
+        # Whichever of the two isn't given stays where auto-exposure left it
+        controls: Dict[str, Any] = {"AeEnable": False}
+        if exposure_us is not None:
+            controls["ExposureTime"] = int(exposure_us)
+        if gain is not None:
+            controls["AnalogueGain"] = float(gain)
+        self._picam2.set_controls(controls)
+
+    def close(self) -> None:
+        if self._picam2 is not None:
+            self._picam2.stop()
+            self._picam2.close()
+            self._picam2 = None
+
+
+def backend_for(camera: Dict[str, Any], settings: Optional[Dict[str, Any]] = None) -> CameraBackend:
+    """
+    Backend for a camDict entry.
+
+    WOPR_CAM_BACKEND=synthetic forces the synthetic source for every camera
+    (no hardware needed); camDict type "synthetic" does it per camera.
+    """
+    settings = settings or {}
+    kind = os.getenv("WOPR_CAM_BACKEND") or camera.get("type", "usb")
+    width = int(camera.get("width") or 1920)
+    height = int(camera.get("height") or 1080)
+    # Preview mode size: per camera, else camera-wide, else half the still size
+    preview_size = (
+        int(camera.get("preview_width") or settings.get("preview_width") or width // 2),
+        int(camera.get("preview_height") or settings.get("preview_height") or height // 2),
+    )
+    if kind == "synthetic":
+        return SyntheticBackend(
+            width, height,
+            frame_seconds=float(settings.get("synthetic_frame_seconds", 0.05)),
+            preview_size=preview_size,
+        )
+    if kind == "imx477":
+        return Picamera2Backend(
+            width, height,
+            flip=bool(camera.get("flipImg", True)),
+            warmup_seconds=float(settings.get("capture_delay_seconds", 2)),
+            buffer_count=int(settings.get("buffer_count", 2)),
+            preview_size=preview_size,
+            control_settle_frames=int(settings.get("control_settle_frames", 3)),
+        )
+    if kind == "usb":
+        return OpenCVBackend(int(camera.get("id", 0)), camera.get("width"), camera.get("height"))
+    raise ValueError(f"Unsupported camera type: {kind}")
+
+
+@dataclass
+class StillSession:
+    """Stills taken while a device is in its still mode (see CameraDevice.still_session)"""
+    device: "CameraDevice"
+    timings_ms: Dict[str, Any] = field(default_factory=dict)
+    manual: bool = False
+
+    def set_controls(self, exposure_us: Optional[int] = None, gain: Optional[float] = None) -> None:
+        """
+        Exposure/gain for the following captures; neither means auto.
+
+        Drops the backend's control_settle_frames so the next capture has
+        the new values.  The session returns the camera to auto on exit.
+        """
+        backend = self.device.backend
+        if not backend.supports_controls:
+            raise ValueError(f"Camera {self.device.camera_id} ({backend.name}) has no exposure/gain controls")
+        start = time.perf_counter()
+        backend.set_controls(exposure_us, gain)
+        self.manual = exposure_us is not None or gain is not None
+        for _ in range(backend.control_settle_frames):
+            backend.read()
+        self.timings_ms.setdefault("controls", []).append(round((time.perf_counter() - start) * 1000, 2))
+
+    def capture(self) -> Frame:
+        """One full-resolution frame"""
+        start = time.perf_counter()
+        array = self.device.backend.read()
+        self.timings_ms.setdefault("capture", []).append(round((time.perf_counter() - start) * 1000, 2))
+        self.device.stills += 1
+        return Frame(self.device.stills, time.time(), time.monotonic(), array)
+
+
+def encode_jpeg(array: np.ndarray, quality: int = 80, width: int = 0) -> bytes:
+    """
+    One cv2.imencode straight from a BGR frame, no colour conversion or
+    intermediate image; only a narrower `width` adds a (smaller) resize.
+    """
+    import cv2
+
+    height, frame_width = array.shape[:2]
+    if 0 < width < frame_width:
+        array = cv2.resize(array, (width, max(1, height * width // frame_width)), interpolation=cv2.INTER_AREA)
+    ok, encoded = cv2.imencode(".jpg", array, [cv2.IMWRITE_JPEG_QUALITY, int(quality)])
+    if not ok:
+        raise RuntimeError("JPEG encode failed")
+    return encoded.tobytes()
+
+
+# /grab widths narrower than the frame are rounded down to a multiple of this
+JPEG_WIDTH_STEP = 32
+
+# Defaults for WOPR_CONFIG['camera'] ring_size, frame_interval_seconds,
+# idle_seconds and grab_cache_variants; the one place they are set
+DEFAULT_RING_SIZE = 3
+DEFAULT_FRAME_INTERVAL_SECONDS = 0.1
+DEFAULT_IDLE_SECONDS = 30.0
+DEFAULT_JPEG_VARIANTS = 4
+
+
+def _jpeg_variant(array: np.ndarray, quality: int, width: int) -> Tuple[int, int]:
+    """(quality, width) as encoded: quality clamped to 1-100, width 0 or a narrower step"""
+    quality = min(100, max(1, int(quality)))
+    frame_width = array.shape[1]
+    if width <= 0 or width >= frame_width:
+        width = 0
+    else:
+        width = max(JPEG_WIDTH_STEP, width - width % JPEG_WIDTH_STEP)
+    return quality, width
+
+
+class CameraDevice:
+    """One open camera plus the thread keeping its newest (preview) frames"""
+
+    def __init__(
+        self,
+        camera_id: str,
+        backend: CameraBackend,
+        ring_size: int = DEFAULT_RING_SIZE,
+        frame_interval: float = DEFAULT_FRAME_INTERVAL_SECONDS,
+        idle_seconds: float = DEFAULT_IDLE_SECONDS,
+        jpeg_variants: int = DEFAULT_JPEG_VARIANTS,
+    ):
+        self.camera_id = camera_id
+        self.backend = backend
+        self.frame_interval = frame_interval
+        self.idle_seconds = idle_seconds
+        self._ring: Deque[Frame] = deque(maxlen=max(1, ring_size))
+        self._cond = threading.Condition()
+        # Backends aren't thread-safe: the reader and still sessions take turns
+        self._backend_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._seq = 0
+        self._last_used = time.monotonic()
+        self.opened_at: Optional[float] = None
+        self.open_seconds: Optional[float] = None
+        self.errors = 0
+        self.reopens = 0
+        self.last_error: Optional[str] = None
+        self.stills = 0
+        self.last_still_timings_ms: Optional[Dict[str, Any]] = None
+        # (quality, width) -> (frame seq, JPEG bytes), newest frame only, at
+        # most jpeg_variants of them; each variant encodes under its own lock
+        self.jpeg_variants = max(1, jpeg_variants)
+        self._jpegs: Dict[Tuple[int, int], Tuple[int, bytes]] = {}
+        self._jpeg_locks: Dict[Tuple[int, int], threading.Lock] = {}
+        self._jpeg_lock = threading.Lock()
+        self.jpeg_encodes = 0
+        self.jpeg_hits = 0
+
+    # Lifecycle
+
+    def start(self) -> "CameraDevice":
+        start = time.monotonic()
+        self.backend.open()
+        self.open_seconds = time.monotonic() - start
+        self.opened_at = time.time()
+        logger.info(f"Camera {self.camera_id} ({self.backend.name}) open in {self.open_seconds:.2f}s")
+        self._thread = threading.Thread(target=self._run, name=f"camera-{self.camera_id}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.backend.close()
+        logger.info(f"Camera {self.camera_id} closed")
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self) -> None:
+        backoff = 0.5
+        while not self._stop.is_set():
+            if time.monotonic() - self._last_used > self.idle_seconds:
+                # Nobody's looking: stop reading until someone asks
+                self._wake.wait(timeout=1.0)
+                self._wake.clear()
+                continue
+            started = time.monotonic()
+            try:
+                with self._backend_lock:
+                    array = self.backend.read()
+            except Exception as e:
+                self.errors += 1
+                self.last_error = str(e)
+                logger.error(f"Camera {self.camera_id} read failed, reopening in {backoff:.1f}s: {e}")
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 10.0)
+                with self._backend_lock:
+                    self._reopen()
+                continue
+            backoff = 0.5
+            self._push(array)
+            remaining = self.frame_interval - (time.monotonic() - started)
+            if remaining > 0:
+                self._stop.wait(remaining)
+
+    def _reopen(self) -> None:
+        try:
+            self.backend.close()
+        except Exception as e:
+            logger.warning(f"Camera {self.camera_id} close failed: {e}")
+        try:
+            self.backend.open()
+            self.reopens += 1
+        except Exception as e:
+            self.errors += 1
+            self.last_error = str(e)
+            logger.error(f"Camera {self.camera_id} reopen failed: {e}")
+
+    def _push(self, array: np.ndarray) -> None:
+        with self._cond:
+            self._seq += 1
+            self._ring.append(Frame(self._seq, time.time(), time.monotonic(), array))
+            self._cond.notify_all()
+
+    # Consumers
+
+    def _touch(self) -> None:
+        self._last_used = time.monotonic()
+        self._wake.set()
+
+    def latest(self, max_age: Optional[float] = None, timeout: float = 5.0) -> Frame:
+        """Newest frame, waiting for a fresh one if the newest is older than max_age"""
+        self._touch()
+        with self._cond:
+            if self._ring and (max_age is None or self._ring[-1].age <= max_age):
+                return self._ring[-1]
+        return self.next_frame(timeout)
+
+    def next_frame(self, timeout: float = 5.0) -> Frame:
+        """The first frame read after this call (e.g. after a lighting change)"""
+        self._touch()
+        called = time.monotonic()
+        with self._cond:
+            ok = self._cond.wait_for(lambda: self._ring and self._ring[-1].monotonic > called, timeout)
+            if not ok:
+                raise TimeoutError(f"Camera {self.camera_id}: no frame within {timeout}s ({self.last_error or 'no error'})")
+            return self._ring[-1]
+
+    def jpeg(self, quality: int = 80, width: int = 0, max_age: Optional[float] = None,
+             timeout: float = 5.0) -> Tuple[Frame, bytes, bool]:
+        """
+        The newest frame as JPEG bytes, and whether they came from the cache.
+
+        Encoded at most once per frame for each (quality, width): callers
+        asking while that variant is encoding wait for it rather than
+        starting their own, without holding up other variants.  width=0
+        (or anything not narrower than the frame) encodes the preview
+        frame as read; narrower widths are rounded down to JPEG_WIDTH_STEP.
+        Only the newest frame's variants are kept, jpeg_variants at most.
+        """
+        frame = self.latest(max_age, timeout)
+        key = _jpeg_variant(frame.array, quality, width)
+        with self._jpeg_lock:
+            lock = self._jpeg_locks.setdefault(key, threading.Lock())
+        with lock:
+            with self._jpeg_lock:
+                cached = self._jpegs.get(key)
+                if cached is not None and cached[0] == frame.seq:
+                    self.jpeg_hits += 1
+                    # Most recently used last, so a burst of odd variants evicts before the default
+                    self._jpegs[key] = self._jpegs.pop(key)
+                    return frame, cached[1], True
+            data = encode_jpeg(frame.array, *key)
+            with self._jpeg_lock:
+                self.jpeg_encodes += 1
+                self._keep_jpeg(key, frame.seq, data)
+        return frame, data, False
+
+    def _keep_jpeg(self, key: Tuple[int, int], seq: int, data: bytes) -> None:
+        # Under _jpeg_lock.  An encode of an older frame than what's cached isn't kept
+        if any(cached_seq > seq for cached_seq, _ in self._jpegs.values()):
+            return
+        for stale in [k for k, (cached_seq, _) in self._jpegs.items() if cached_seq != seq]:
+            del self._jpegs[stale]
+        self._jpegs.pop(key, None)
+        while len(self._jpegs) >= self.jpeg_variants:
+            del self._jpegs[next(iter(self._jpegs))]
+        self._jpegs[key] = (seq, data)
+        for idle in [k for k, lock in self._jpeg_locks.items() if k not in self._jpegs and not lock.locked()]:
+            del self._jpeg_locks[idle]
+
+    @contextmanager
+    def still_session(self) -> Iterator[StillSession]:
+        """
+        Hold the device in its still mode for one or more captures.
+
+        The reader pauses for the duration; the preview mode is restored
+        on exit whether or not the captures succeeded.  Stage timings end
+        up in session.timings_ms and last_still_timings_ms.
+        """
+        self._touch()
+        start = time.perf_counter()
+        with self._backend_lock:
+            session = StillSession(self)
+            timings = session.timings_ms
+            timings["lock_wait"] = round((time.perf_counter() - start) * 1000, 2)
+            stage = time.perf_counter()
+            self.backend.to_still()
+            timings["switch_to_still"] = round((time.perf_counter() - stage) * 1000, 2)
+            try:
+                yield session
+            finally:
+                stage = time.perf_counter()
+                if session.manual:
+                    self.backend.set_controls()
+                self.backend.to_preview()
+                timings["switch_to_preview"] = round((time.perf_counter() - stage) * 1000, 2)
+                timings["total"] = round((time.perf_counter() - start) * 1000, 2)
+                self.last_still_timings_ms = timings
+
+    def capture_still(self) -> Tuple[Frame, Dict[str, Any]]:
+        """One full-resolution frame and the session's stage timings"""
+        with self.still_session() as session:
+            frame = session.capture()
+        return frame, dict(session.timings_ms)
+
+    def frames(self) -> List[Frame]:
+        """The ring buffer, oldest first"""
+        with self._cond:
+            return list(self._ring)
+
+    def status(self) -> Dict[str, Any]:
+        with self._cond:
+            newest = self._ring[-1] if self._ring else None
+        return {
+            "camera_id": self.camera_id,
+            "backend": self.backend.name,
+            "running": self.running,
+            "idle": time.monotonic() - self._last_used > self.idle_seconds,
+            "opened_at": self.opened_at,
+            "open_seconds": self.open_seconds,
+            "frames_read": self._seq,
+            "buffered": len(self._ring),
+            "newest_age_ms": round(newest.age * 1000, 1) if newest else None,
+            "errors": self.errors,
+            "reopens": self.reopens,
+            "last_error": self.last_error,
+            "stills": self.stills,
+            "last_still_timings_ms": self.last_still_timings_ms,
+            "jpeg_encodes": self.jpeg_encodes,
+            "jpeg_hits": self.jpeg_hits,
+            "jpeg_cached_variants": len(self._jpegs),
+        }
+
+
+class CameraManager:
+    """camera_id -> CameraDevice, opened on first use and kept for the process"""
+
+    def __init__(
+        self,
+        cameras: Dict[str, Dict[str, Any]],
+        settings: Optional[Dict[str, Any]] = None,
+        backend_factory: Callable[[Dict[str, Any], Dict[str, Any]], CameraBackend] = backend_for,
+    ):
+        self.cameras = cameras
+        self.settings = settings or {}
+        self.backend_factory = backend_factory
+        self._devices: Dict[str, CameraDevice] = {}
+        self._lock = threading.Lock()
+
+    def get(self, camera_id: str) -> CameraDevice:
+        camera_id = str(camera_id)
+        device = self._devices.get(camera_id)
+        if device is not None:
+            return device
+        with self._lock:
+            device = self._devices.get(camera_id)
+            if device is None:
+                if camera_id not in self.cameras:
+                    raise KeyError(f"Unknown camera {camera_id}")
+                device = CameraDevice(
+                    camera_id,
+                    self.backend_factory(self.cameras[camera_id], self.settings),
+                    ring_size=int(self.settings.get("ring_size", DEFAULT_RING_SIZE)),
+                    frame_interval=float(self.settings.get("frame_interval_seconds", DEFAULT_FRAME_INTERVAL_SECONDS)),
+                    idle_seconds=float(self.settings.get("idle_seconds", DEFAULT_IDLE_SECONDS)),
+                    jpeg_variants=int(self.settings.get("grab_cache_variants", DEFAULT_JPEG_VARIANTS)),
+                ).start()
+                self._devices[camera_id] = device
+        return device
+
+    def close_all(self) -> None:
+        with self._lock:
+            for device in self._devices.values():
+                device.stop()
+            self._devices.clear()
+
+    def status(self) -> Dict[str, Any]:
+        return {camera_id: device.status() for camera_id, device in sorted(self._devices.items())}
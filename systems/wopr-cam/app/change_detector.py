@@ -0,0 +1,262 @@
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# app/change_detector.py
+"""
+Board change detection on the preview frame stream.
+
+Each frame is shrunk to `scale_width` wide, converted to grayscale and
+blurred; everything after that is whole-array cv2.absdiff/threshold work
+on a ~320x240 image, so a frame costs about a millisecond.
+
+ChangeDetector is a small state machine fed (timestamp, frame):
+
+    stable    frames match each other; `baseline` is the board as last captured
+    moving    consecutive frames differ by more than `motion_fraction`
+              (a hand over the board, a piece being moved)
+    settling  no motion; once that lasts `settle_seconds` the settled frame
+              is compared with the baseline
+
+If the settled board differs from the baseline by more than
+`change_fraction` the detector emits a "capture" event; otherwise
+"no_change" (someone reached in and put everything back), and no 4K
+capture or NFS write happens.  The settled frame only becomes the new
+baseline once the caller commit()s the capture; after a rollback() (the
+capture failed) the same comparison is made again settle_seconds later,
+so a move isn't lost to a busy writer or a camera timeout.
+
+The detector knows nothing about cameras or time sources, so recorded
+frame sequences can be replayed through it (replay(), load_sequence()).
+ChangeWatcher runs one against a live CameraDevice.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger("wopr-cam")
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """What the detector decided once the board settled"""
+    kind: str  # "capture" or "no_change"
+    timestamp: float
+    changed_fraction: float
+    moving_seconds: float
+
+
+class ChangeDetector:
+    """Frame-difference state machine; see the module docstring"""
+
+    def __init__(
+        self,
+        scale_width: int = 320,
+        blur: int = 5,
+        pixel_threshold: int = 25,
+        motion_fraction: float = 0.002,
+        change_fraction: float = 0.005,
+        settle_seconds: float = 1.5,
+    ):
+        self.scale_width = scale_width
+        self.blur = blur | 1 if blur else 0
+        self.pixel_threshold = pixel_threshold
+        self.motion_fraction = motion_fraction
+        self.change_fraction = change_fraction
+        self.settle_seconds = settle_seconds
+        self.state = "stable"
+        self.baseline: Optional[np.ndarray] = None
+        # Settled frame of the last "capture" event, until commit() or rollback()
+        self.pending: Optional[np.ndarray] = None
+        self._previous: Optional[np.ndarray] = None
+        self._moving_since: Optional[float] = None
+        self._still_since: Optional[float] = None
+        self._diff: Optional[np.ndarray] = None
+        self.last_motion = 0.0
+
+    def prepare(self, frame: np.ndarray) -> np.ndarray:
+        """Downscaled, blurred grayscale copy of a BGR (or gray) frame"""
+        height, width = frame.shape[:2]
+        # INTER_LINEAR plus the blur rather than INTER_AREA, which costs ~10x at preview sizes
+        scaled = cv2.resize(frame, (self.scale_width, max(1, height * self.scale_width // width)), interpolation=cv2.INTER_LINEAR)
+        gray = cv2.cvtColor(scaled, cv2.COLOR_BGR2GRAY) if scaled.ndim == 3 else scaled
+        if self.blur:
+            gray = cv2.GaussianBlur(gray, (self.blur, self.blur), 0)
+        return gray
+
+    def _fraction(self, a: np.ndarray, b: np.ndarray) -> float:
+        """Share of pixels differing by more than pixel_threshold"""
+        self._diff = cv2.absdiff(a, b, dst=self._diff if self._diff is not None and self._diff.shape == a.shape else None)
+        return cv2.countNonZero(cv2.threshold(self._diff, self.pixel_threshold, 255, cv2.THRESH_BINARY)[1]) / a.size
+
+    def reset(self, frame: Optional[np.ndarray] = None) -> None:
+        """Forget history; with a frame, take it as the captured baseline"""
+        self.state = "stable"
+        self.baseline = self.prepare(frame) if frame is not None else None
+        self._previous = self.baseline
+        self.pending = None
+        self._moving_since = self._still_since = None
+
+    def commit(self) -> None:
+        """The capture for the last "capture" event succeeded: its frame is the new baseline"""
+        if self.pending is not None:
+            self.baseline = self.pending
+            self.pending = None
+
+    def rollback(self, timestamp: float) -> None:
+        """The capture failed: keep the old baseline and compare again once settled from `timestamp`"""
+        self.pending = None
+        if self.state == "stable" and self._moving_since is not None:
+            self.state = "settling"
+            self._still_since = timestamp
+
+    def feed(self, timestamp: float, frame: np.ndarray) -> Optional[ChangeEvent]:
+        """Advance by one frame; returns an event when the board settles after moving"""
+        current = self.prepare(frame)
+        if self.baseline is None:
+            self.baseline = self._previous = current
+            return None
+
+        self.last_motion = self._fraction(current, self._previous)
+        self._previous = current
+        if self.last_motion > self.motion_fraction:
+            if self.state != "moving":
+                self._moving_since = timestamp
+            self.state = "moving"
+            self._still_since = None
+            return None
+
+        if self.state == "moving":
+            self.state = "settling"
+            self._still_since = timestamp
+        if self.state != "settling" or timestamp - self._still_since < self.settle_seconds:
+            return None
+
+        changed = self._fraction(current, self.baseline)
+        moving_seconds = self._still_since - self._moving_since
+        self.state = "stable"
+        if changed > self.change_fraction:
+            self.pending = current
+            return ChangeEvent("capture", timestamp, round(changed, 5), round(moving_seconds, 3))
+        return ChangeEvent("no_change", timestamp, round(changed, 5), round(moving_seconds, 3))
+
+
+def replay(detector: ChangeDetector, frames: Iterable[Tuple[float, np.ndarray]]) -> List[ChangeEvent]:
+    """Run a recorded (timestamp, frame) sequence through a detector; every capture succeeds"""
+    events = []
+    for timestamp, frame in frames:
+        event = detector.feed(timestamp, frame)
+        if event is not None:
+            if event.kind == "capture":
+                detector.commit()
+            events.append(event)
+    return events
+
+
+def load_sequence(directory: str, fps: float = 10.0) -> Iterator[Tuple[float, np.ndarray]]:
+    """
+    Frames saved as image files, in name order.
+
+    A name starting with a number of milliseconds (`000125.jpg`,
+    `1500-board.png`) is its timestamp; otherwise frames are 1/fps apart.
+    """
+    names = sorted(n for n in os.listdir(directory) if n.lower().endswith((".jpg", ".jpeg", ".png")))
+    for i, name in enumerate(names):
+        prefix = name.split("-")[0].split(".")[0]
+        timestamp = int(prefix) / 1000 if prefix.isdigit() else i / fps
+        frame = cv2.imread(os.path.join(directory, name))
+        if frame is None:
+            raise ValueError(f"Could not read frame {name}")
+        yield timestamp, frame
+
+
+class ChangeWatcher:
+    """
+    Feeds a CameraDevice's preview frames to a ChangeDetector on a thread.
+
+    on_capture(event) is called on the watcher thread for each "capture"
+    event (app.py takes a full-res still there); the detector's baseline
+    moves only if it returns, and if it raises the capture is retried once
+    the board has settled again.  "no_change" events are only counted.
+    Watching keeps the device busy, so it doesn't idle.
+    """
+
+    def __init__(self, device, detector: ChangeDetector, on_capture: Callable[[ChangeEvent], Any], history: int = 50):
+        self.device = device
+        self.detector = detector
+        self.on_capture = on_capture
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=history)
+        self.counts = {"frames": 0, "capture": 0, "no_change": 0, "errors": 0}
+        self.started_at: Optional[float] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "ChangeWatcher":
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, name=f"watch-{self.device.camera_id}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                frame = self.device.next_frame(timeout=10)
+                self.counts["frames"] += 1
+                event = self.detector.feed(frame.monotonic, frame.array)
+                if event is None:
+                    continue
+                self.counts[event.kind] += 1
+                record = {"kind": event.kind, "at": time.time(), "changed_fraction": event.changed_fraction,
+                          "moving_seconds": event.moving_seconds}
+                if event.kind == "capture":
+                    try:
+                        record["result"] = self.on_capture(event)
+                    except Exception as e:
+                        self.detector.rollback(frame.monotonic)
+                        record["error"] = str(e)
+                        self.events.append(record)
+                        raise
+                    self.detector.commit()
+                self.events.append(record)
+            except Exception as e:
+                self.counts["errors"] += 1
+                logger.error(f"Change watcher on camera {self.device.camera_id}: {e}")
+                self._stop.wait(1.0)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "camera_id": self.device.camera_id,
+            "running": self.running,
+            "started_at": self.started_at,
+            "state": self.detector.state,
+            "last_motion": round(self.detector.last_motion, 5),
+            **self.counts,
+            "events": list(self.events),
+        }
@@ -29,7 +29,9 @@ APP_AUTHOR = "Bob Bomar"
 APP_AUTHOR_EMAIL = "bob@bomar.us"
 APP_DOMAIN = "wopr.tailandtraillabs.org"
 APP_API_URL = "https://api." + APP_DOMAIN
-APP_OTEL_URL = "https://otel." + APP_DOMAIN
+APP_OTEL_URL = os.getenv("WOPR_CAM_OTEL_URL", "https://otel." + APP_DOMAIN)
+# Push metrics over OTLP as well as serving GET /metrics
+OTLP_METRICS_ENABLED = os.getenv("WOPR_CAM_OTLP_METRICS", "true").lower() == "true"
 #WOPR_API_URL = os.getenv('WOPR_API_URL', APP_API_URL+"/api/v1")
 WOPR_API_URL = APP_API_URL + "/api/v2"
 
@@ -60,3 +62,46 @@ if result:
     WOPR_CONFIG=result
 else:
     WOPR_CONFIG={}
+
+# Camera manager (camera_manager.py): devices stay open, newest frames kept in a ring buffer
+CAMERA_SETTINGS = WOPR_CONFIG.get('camera', {})
+CAMERA_DICT = CAMERA_SETTINGS.get('camDict', {})
+# ring_size, frame_interval_seconds, idle_seconds and grab_cache_variants are
+# read (with their defaults) by CameraManager from CAMERA_SETTINGS
+# /grab serves the buffered frame if it's at most this old, else waits for the next one
+CAMERA_MAX_FRAME_AGE_SECONDS = float(CAMERA_SETTINGS.get('max_frame_age_seconds', 1.0))
+# /grab JPEG quality and width (0 = preview size); encoded once per frame and shared
+CAMERA_GRAB_QUALITY = int(CAMERA_SETTINGS.get('grab_quality', 80))
+CAMERA_GRAB_WIDTH = int(CAMERA_SETTINGS.get('grab_width', 0))
+# Cameras to open at startup (comma-separated camDict ids); others open on first use
+CAMERA_PRESTART = [c for c in os.getenv('WOPR_CAM_CAMERAS', '').split(',') if c]
+
+# JPEG encode/write pool (image_writer.py); fsync is never, file or always
+CAMERA_WRITE_WORKERS = int(CAMERA_SETTINGS.get('write_workers', 2))
+CAMERA_WRITE_QUEUE_SIZE = int(CAMERA_SETTINGS.get('write_queue_size', 8))
+CAMERA_WRITE_FSYNC = CAMERA_SETTINGS.get('write_fsync', 'file')
+# How long a capture waits for its file before answering 202 with the job id
+CAMERA_WRITE_TIMEOUT_SECONDS = float(CAMERA_SETTINGS.get('write_timeout_seconds', 30.0))
+CAMERA_WRITE_JOB_HISTORY = int(CAMERA_SETTINGS.get('write_job_history', 256))
+# Most frames one /capture_burst may take
+CAMERA_BURST_MAX_FRAMES = int(CAMERA_SETTINGS.get('burst_max_frames', 64))
+
+# Thumbnail/preview derivatives made after each capture is written (wopr.storage)
+STORAGE_SETTINGS = WOPR_CONFIG.get('storage', {})
+DERIVATIVES_ENABLED = bool(CAMERA_SETTINGS.get('derivatives', True))
+DERIVATIVE_WORKERS = int(CAMERA_SETTINGS.get('derivative_workers', 1))
+DERIVATIVE_SIZES = {
+    'preview': tuple(STORAGE_SETTINGS.get('preview_size', [1600, 1600])),
+    'thumb': tuple(STORAGE_SETTINGS.get('thumbnail_size', [480, 480])),
+}
+
+# Board change detection (change_detector.py): ChangeDetector keyword arguments
+CHANGE_DETECTION = {
+    'scale_width': 320,
+    'blur': 5,
+    'pixel_threshold': 25,
+    'motion_fraction': 0.002,
+    'change_fraction': 0.005,
+    'settle_seconds': 1.5,
+    **CAMERA_SETTINGS.get('change_detection', {}),
+}
@@ -0,0 +1,268 @@
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# app/image_writer.py
+"""
+JPEG encode and write off the request thread.
+
+Capture handlers hand a frame to ImageWriter.submit() and get a WriteJob
+back straight away; a small thread pool encodes (cv2.imencode releases the
+GIL) and writes it.  Writes go to a temp file in the target directory and
+are renamed into place, so a reader on /remote/wopr never sees half a
+JPEG.
+
+fsync policy:
+    never   rename only; fastest, a crash can lose recent files
+    file    fsync the temp file before the rename
+    always  fsync the file, then the directory so the rename is durable
+
+The queue is bounded (each 4056x3040 frame is ~37MB): submit() raises
+WriterBusy when `max_queue` frames are waiting, or first waits up to
+`block_seconds` for room, which is how a burst paces the sensor to the
+disk.  Finished jobs are kept for `job_history` lookups so a client that
+took the fast ack can poll for the outcome.  `on_written` is called with
+each file's path once it is in place (app.py queues derivatives there),
+`on_stage` with (stage, seconds) for queue_wait, colour_convert, encode
+and write (app.py feeds the /metrics histograms).
+"""
+
+import itertools
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Optional
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger("wopr-cam")
+
+FSYNC_POLICIES = ("never", "file", "always")
+
+
+class WriterBusy(RuntimeError):
+    """The write queue is full"""
+
+
+@dataclass
+class WriteJob:
+    """One frame on its way to disk"""
+    id: str
+    path: str
+    quality: int
+    enqueued_at: float
+    status: str = "queued"
+    bytes: int = 0
+    error: Optional[str] = None
+    timings_ms: Dict[str, float] = field(default_factory=dict)
+    future: Future = field(default_factory=Future, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """True once the file is in place (and synced, per policy)"""
+        try:
+            self.future.result(timeout)
+        except Exception:
+            pass
+        return self.status == "done"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "path": self.path,
+            "status": self.status,
+            "bytes": self.bytes,
+            "error": self.error,
+            "timings_ms": self.timings_ms,
+        }
+
+
+def _pct(samples: Deque[float], pct: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[max(1, math.ceil(pct / 100.0 * len(ordered))) - 1], 1)
+
+
+def write_atomic(path: str, data: bytes, fsync: str = "file") -> None:
+    """Write data to path via a temp file and rename"""
+    directory = os.path.dirname(path) or "."
+    fd, tmp = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            if fsync != "never":
+                os.fsync(f.fileno())
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+    if fsync == "always":
+        dir_fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+class ImageWriter:
+    """Bounded encode/write pool; see the module docstring"""
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_queue: int = 8,
+        fsync: str = "file",
+        job_history: int = 256,
+        metrics_window: int = 512,
+        on_written: Optional[Callable[[str], Any]] = None,
+        on_stage: Optional[Callable[[str, float], Any]] = None,
+    ):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync policy must be one of {FSYNC_POLICIES}, not {fsync!r}")
+        self.workers = max(1, workers)
+        self.max_queue = max(1, max_queue)
+        self.fsync = fsync
+        self.on_written = on_written
+        self.on_stage = on_stage
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="image-writer")
+        self._lock = threading.Lock()
+        self._room = threading.Condition(self._lock)
+        self._ids = itertools.count(1)
+        self._jobs: "OrderedDict[str, WriteJob]" = OrderedDict()
+        self._job_history = job_history
+        self.pending = 0
+        self.in_progress = 0
+        self.counts = {"done": 0, "failed": 0, "rejected": 0}
+        self.bytes = 0
+        self._queue_ms: Deque[float] = deque(maxlen=metrics_window)
+        self._encode_ms: Deque[float] = deque(maxlen=metrics_window)
+        self._write_ms: Deque[float] = deque(maxlen=metrics_window)
+        self._total_ms: Deque[float] = deque(maxlen=metrics_window)
+
+    def submit(self, array: np.ndarray, path: str, quality: int = 95, block_seconds: float = 0.0) -> WriteJob:
+        """Queue a BGR frame for JPEG encode and write; raises WriterBusy when full"""
+        with self._lock:
+            if block_seconds > 0:
+                self._room.wait_for(lambda: self.pending < self.max_queue, block_seconds)
+            if self.pending >= self.max_queue:
+                self.counts["rejected"] += 1
+                raise WriterBusy(f"Image write queue full ({self.max_queue} frames waiting)")
+            self.pending += 1
+            job = WriteJob(id=f"w{next(self._ids)}", path=str(path), quality=quality, enqueued_at=time.perf_counter())
+            self._jobs[job.id] = job
+            while len(self._jobs) > self._job_history:
+                oldest = next(iter(self._jobs.values()))
+                if not oldest.done:
+                    break
+                self._jobs.popitem(last=False)
+        self._pool.submit(self._run, job, array)
+        return job
+
+    def _stage(self, job: WriteJob, name: str, start: float, samples: Optional[Deque[float]] = None) -> None:
+        seconds = time.perf_counter() - start
+        job.timings_ms[name] = round(seconds * 1000, 2)
+        if samples is not None:
+            samples.append(job.timings_ms[name])
+        if self.on_stage is not None:
+            self.on_stage(name, seconds)
+
+    def _run(self, job: WriteJob, array: np.ndarray) -> None:
+        with self._lock:
+            self.pending -= 1
+            self.in_progress += 1
+            self._room.notify()
+        self._stage(job, "queue_wait", job.enqueued_at, self._queue_ms)
+        try:
+            job.status = "encoding"
+            stage = time.perf_counter()
+            # Picamera2's XBGR8888 formats carry a padding channel JPEG can't hold
+            if array.ndim == 3 and array.shape[2] == 4:
+                array = cv2.cvtColor(array, cv2.COLOR_BGRA2BGR)
+            self._stage(job, "colour_convert", stage)
+
+            stage = time.perf_counter()
+            ok, encoded = cv2.imencode(".jpg", array, [cv2.IMWRITE_JPEG_QUALITY, job.quality])
+            if not ok:
+                raise RuntimeError("JPEG encode failed")
+            self._stage(job, "encode", stage, self._encode_ms)
+            del array
+
+            job.status = "writing"
+            stage = time.perf_counter()
+            write_atomic(job.path, encoded.data, self.fsync)
+            self._stage(job, "write", stage, self._write_ms)
+
+            job.bytes = encoded.nbytes
+            job.status = "done"
+            if self.on_written is not None:
+                try:
+                    self.on_written(job.path)
+                except Exception as e:
+                    logger.error(f"Post-write hook for {job.path} failed: {e}")
+        except Exception as e:
+            logger.error(f"Image write {job.id} to {job.path} failed: {e}")
+            job.error = str(e)
+            job.status = "failed"
+        job.timings_ms["total"] = round((time.perf_counter() - job.enqueued_at) * 1000, 2)
+        with self._lock:
+            self.in_progress -= 1
+            self.counts[job.status] += 1
+            self.bytes += job.bytes
+            if job.status == "done":
+                self._total_ms.append(job.timings_ms["total"])
+        job.future.set_result(job.status)
+
+    def job(self, job_id: str) -> Optional[WriteJob]:
+        return self._jobs.get(job_id)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth, counters and latency percentiles (ms)"""
+        return {
+            "workers": self.workers,
+            "fsync": self.fsync,
+            "max_queue": self.max_queue,
+            "queue_depth": self.pending,
+            "in_progress": self.in_progress,
+            **self.counts,
+            "bytes": self.bytes,
+            **{
+                f"{name}_ms_p{pct}": _pct(samples, pct)
+                for name, samples in (
+                    ("queue_wait", self._queue_ms),
+                    ("encode", self._encode_ms),
+                    ("write", self._write_ms),
+                    ("total", self._total_ms),
+                )
+                for pct in (50, 95, 99)
+            },
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop taking work; by default finish what's queued first"""
+        self._pool.shutdown(wait=wait)
@@ -0,0 +1,76 @@
+# Copyright 2026 Bob Bomar
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+import pytest
+
+pytest.importorskip("cv2")
+
+from bench.change_detection import generate  # noqa: E402
+from change_detector import ChangeDetector, replay  # noqa: E402
+
+# bench.change_detection's script: a sweep every 10s from t=2, a move 5s
+# after each, and a lighting flicker at t=42
+MOVES = [7.0, 17.0, 27.0, 37.0]
+SWEEPS = [2.0, 12.0, 22.0, 32.0]
+FLICKER = 42.0
+
+
+@pytest.fixture(scope="module")
+def game():
+    return generate()
+
+
+def _after(timestamp, starts):
+    """The scripted action that started last before timestamp"""
+    return max(start for start in starts if start <= timestamp)
+
+
+def test_replay_captures_only_moves(game):
+    frames, expected = game
+    events = replay(ChangeDetector(), frames)
+
+    captures = [e for e in events if e.kind == "capture"]
+    assert len(captures) == expected == len(MOVES)
+    # One capture per move, none for the hand sweeps or the flicker
+    assert sorted(_after(e.timestamp, MOVES + SWEEPS) for e in captures) == MOVES
+    for e in events:
+        if e.kind == "no_change":
+            assert _after(e.timestamp, MOVES + SWEEPS) in SWEEPS
+    assert all(e.timestamp < FLICKER for e in events)
+
+
+def test_rollback_emits_the_change_again_once_settled(game):
+    frames, _ = game
+    detector = ChangeDetector()
+    events, failed_at = [], None
+    for timestamp, frame in frames:
+        event = detector.feed(timestamp, frame)
+        if event is None:
+            continue
+        if event.kind == "capture":
+            if failed_at is None:
+                failed_at = event.timestamp
+                detector.rollback(timestamp)  # first capture fails
+            else:
+                detector.commit()
+        events.append(event)
+
+    captures = [e for e in events if e.kind == "capture"]
+    assert len(captures) == len(MOVES) + 1
+    retry = captures[1]
+    assert retry.timestamp - failed_at == pytest.approx(detector.settle_seconds, abs=0.15)
+    assert retry.changed_fraction == pytest.approx(captures[0].changed_fraction, rel=0.2)
+    # Once committed, the rest of the game plays out as without the failure
+    assert sorted(_after(e.timestamp, MOVES + SWEEPS) for e in captures[1:]) == MOVES
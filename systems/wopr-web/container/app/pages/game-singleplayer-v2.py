@@ -75,27 +75,38 @@ if "playnote" not in st.session_state:
 # -------------------------
 # API Calls
 # -------------------------
+def fetch_batch(requests, timeout_ms=10000):
+	"""Run several v2 calls in one round-trip; returns bodies keyed by id, raises on any failure"""
+	url = f"{API_BASE}/api/v2/batch"
+	log.info(f"POST {url} ids={[r['id'] for r in requests]}")
+	response = httpx.post(url, json={"requests": requests, "timeout_ms": timeout_ms}, timeout=30.0)
+	response.raise_for_status()
+	results = response.json()["results"]
+	failed = {k: v["status"] for k, v in results.items() if v["status"] >= 400}
+	if failed:
+		raise RuntimeError(f"Batch sub-requests failed: {failed}")
+	return {k: v["body"] for k, v in results.items()}
+
+
 @st.cache_data(ttl=240)
+def fetch_bootstrap():
+	results = fetch_batch([
+		{"id": "config", "path": "/api/v2/config/all"},
+		{"id": "games", "path": "/api/v2/games"},
+	])
+	log.info("Config and games fetched")
+	return results
+
+
 def fetch_config():
-	url = f"{API_BASE}/api/v2/config/all"
-	log.info(f"GET {url}")
-	response = httpx.get(url, timeout=30.0)
-	response.raise_for_status()
-	log.info("Config fetched")
-	return response.json()
+	return fetch_bootstrap()["config"]
 
 
 config = fetch_config()
 
 
-@st.cache_data(ttl=240)
 def fetch_games():
-	url = f"{API_BASE}/api/v2/games"
-	log.info(f"GET {url}")
-	response = httpx.get(url, timeout=30.0)
-	response.raise_for_status()
-	log.info("Games fetched")
-	return response.json()
+	return fetch_bootstrap()["games"]
 
 def newSession(game_id):
 	url = f"{API_BASE}/api/v2/session/new/{game_id}"
@@ -123,19 +134,18 @@ def takeCapture(sessionuuid, camid, suffix):
 	return response.json()
 
 
-def workplayer(playername, playerkind):
-	isbot = playerkind != "human"
-	payload = {
-		"name": playername,
-		"isbot": isbot,
-	}
-	url = f"{API_BASE}/api/v2/players"
-	log.info(f"POST {url} name={playername} isbot={isbot}")
-	response = httpx.post(url, json=payload, timeout=30.0)
-	response.raise_for_status()
-	player = response.json()
-	log.info(f"Player OK id={player.get('id')} name={player.get('name')} isbot={player.get('isbot')}")
-	return player
+def workplayers(players):
+	"""Create (playername, playerkind) players in one batch, in order"""
+	requests = [
+		{"id": str(i), "method": "POST", "path": "/api/v2/players",
+		 "body": {"name": playername, "isbot": playerkind != "human"}}
+		for i, (playername, playerkind) in enumerate(players)
+	]
+	results = fetch_batch(requests)
+	created = [results[str(i)] for i in range(len(players))]
+	for player in created:
+		log.info(f"Player OK id={player.get('id')} name={player.get('name')} isbot={player.get('isbot')}")
+	return created
 
 
 def player_key_sort(k: str) -> int:
@@ -170,10 +180,11 @@ if not st.session_state.start_game_info:
 		submitted = st.form_submit_button("Unleash the spice", key="submit_game_setup")
 		if submitted:
 			log.info("Game setup submitted")
-			player1info = workplayer(playername, "human")
-			bot1info = workplayer(bot1character, "bot")
-			bot2info = workplayer(bot2character, "bot")
-			players = [player1info, bot1info, bot2info]
+			players = workplayers([
+				(playername, "human"),
+				(bot1character, "bot"),
+				(bot2character, "bot"),
+			])
 
 			gameinfo = {f"player{i}": player for i, player in enumerate(players)}
 			st.session_state.start_game_info = gameinfo
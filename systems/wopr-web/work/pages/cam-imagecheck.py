@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
 import streamlit as st
 import httpx
 import pandas as pd
@@ -25,67 +26,48 @@ API_BASE = "https://api.wopr.tailandtraillabs.org"
 
 @st.cache_data(ttl=60)
 def fetch_games():
-    response = httpx.get(f"{API_BASE}/api/v2/games")
+    response = httpx.get(f"{API_BASE}/api/v2/games", params={"fields": "id,name"})
     response.raise_for_status()
     return response.json()
 
+PIECES_PAGE_SIZE = 2000  # the API's DIRECTUS_MAX_PAGE_SIZE
+
 def fetch_pieces_directus(game_catalog_id):
-    """Fetch ALL pieces from Directus with pagination"""
+    """Fetch ALL pieces for a game, only the columns this page renders, keyset-paged on id"""
     all_pieces = []
-    limit = 100
-    offset = 0
-    
+    params = {
+        "filter[game_catalog_uuid][_eq]": game_catalog_id,
+        "fields": "id,name",
+        "sort": "id",
+        "limit": PIECES_PAGE_SIZE,
+    }
     while True:
-        url = f"{DIRECTUS_BASE}/items/pieces"
-        params = {
-            "filter[game_catalog_uuid][_eq]": game_catalog_id,
-            "limit": limit,
-            "offset": offset
-        }
-        response = httpx.get(url, params=params)
+        response = httpx.get(f"{API_BASE}/api/v2/pieces", params=params)
         response.raise_for_status()
-        data = response.json()
-        
-        items = data.get("data", [])
-        if not items:
-            break
-            
-        all_pieces.extend(items)
-        offset += limit
-        
-        # Safety valve
-        if offset > 1000:
-            break
-    
-    return all_pieces
+        page = response.json()
+        all_pieces.extend(page)
+        if len(page) < PIECES_PAGE_SIZE:
+            return all_pieces
+        params["filter[id][_gt]"] = page[-1]["id"]
 
 def fetch_mlimages_directus(game_catalog_id):
-    """Fetch ALL mlimages from Directus with pagination"""
+    """Fetch ALL mlimages for a game, streamed as NDJSON by the API (keyset-paged upstream)"""
     all_images = []
-    limit = 100
-    offset = 0
-    
-    while True:
-        url = f"{DIRECTUS_BASE}/items/mlimages"
-        params = {
-            "filter[game_catalog_id][_eq]": game_catalog_id,
-            "limit": limit,
-            "offset": offset
-        }
-        response = httpx.get(url, params=params)
+    trailer = None
+    url = f"{API_BASE}/api/v2/images/gameid/{game_catalog_id}"
+    with httpx.stream("GET", url, params={"stream": "true"}, timeout=60) as response:
         response.raise_for_status()
-        data = response.json()
-        
-        items = data.get("data", [])
-        if not items:
-            break
-            
-        all_images.extend(items)
-        offset += limit
-        
-        # Safety valve
-        if offset > 10000:
-            break
+        for line in response.iter_lines():
+            if line:
+                record = json.loads(line)
+                if "_stream" in record:
+                    trailer = record
+                else:
+                    all_images.append(record)
+    # The stream ends with {"_stream": "end"|"error", "rows": n}; anything else is a partial list
+    if trailer is None or trailer["_stream"] != "end" or trailer["rows"] != len(all_images):
+        reason = trailer.get("error") if trailer else "stream ended early"
+        raise RuntimeError(f"Incomplete mlimages listing ({len(all_images)} rows): {reason}")
     
     st.sidebar.write(f"Loaded {len(all_images)} images...")
     return all_images